@@ -0,0 +1,95 @@
+"""add trace rollups
+
+Revision ID: b5c6d7e8f9a0
+Revises: a4b5c6d7e8f9
+Create Date: 2026-10-18 22:37:00.800586
+
+The rollups of the spans exported before this migration are built with scripts/rebuild_trace_rollups.py.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b5c6d7e8f9a0"
+down_revision: Union[str, None] = "a4b5c6d7e8f9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Deploy ordering: set to "migrate-first", "code-first", or "breaking".
+# None = auto-detect from upgrade() ops. Required when using op.execute / op.get_bind.
+deploy_strategy: Union[str, None] = None
+
+
+def upgrade() -> None:
+    call_type_enum = postgresql.ENUM("api", "sandbox", "qa", "webhook", "cron", name="call_type", create_type=False)
+    op.create_table(
+        "span_rollups",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("bucket_start", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("call_type", call_type_enum, nullable=True),
+        sa.Column("model_id", sa.UUID(), nullable=True),
+        sa.Column("span_count", sa.BigInteger(), nullable=False),
+        sa.Column("root_span_count", sa.BigInteger(), nullable=False),
+        sa.Column("llm_span_count", sa.BigInteger(), nullable=False),
+        sa.Column("input_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("output_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("root_duration_seconds", sa.Float(), nullable=False),
+        sa.Column("credits", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "bucket_start",
+            "project_id",
+            "call_type",
+            "model_id",
+            name="uq_span_rollups_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+        schema="traces",
+    )
+    op.create_index(
+        "ix_traces_span_rollups_project_id_bucket_start",
+        "span_rollups",
+        ["project_id", "bucket_start"],
+        unique=False,
+        schema="traces",
+    )
+    op.create_table(
+        "conversation_rollups",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("bucket_start", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("call_type", call_type_enum, nullable=True),
+        sa.Column("conversation_id", sa.String(), nullable=False),
+        sa.Column("credits", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "bucket_start",
+            "project_id",
+            "call_type",
+            "conversation_id",
+            name="uq_conversation_rollups_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+        schema="traces",
+    )
+    op.create_index(
+        "ix_traces_conversation_rollups_project_id_bucket_start",
+        "conversation_rollups",
+        ["project_id", "bucket_start"],
+        unique=False,
+        schema="traces",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_traces_conversation_rollups_project_id_bucket_start", table_name="conversation_rollups", schema="traces"
+    )
+    op.drop_table("conversation_rollups", schema="traces")
+    op.drop_index("ix_traces_span_rollups_project_id_bucket_start", table_name="span_rollups", schema="traces")
+    op.drop_table("span_rollups", schema="traces")
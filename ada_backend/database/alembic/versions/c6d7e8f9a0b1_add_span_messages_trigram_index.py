@@ -0,0 +1,49 @@
+"""add span messages trigram index
+
+Revision ID: c6d7e8f9a0b1
+Revises: b5c6d7e8f9a0
+Create Date: 2026-10-18 23:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c6d7e8f9a0b1"
+down_revision: Union[str, None] = "b5c6d7e8f9a0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Deploy ordering: set to "migrate-first", "code-first", or "breaking".
+# None = auto-detect from upgrade() ops. Required when using op.execute / op.get_bind.
+deploy_strategy: Union[str, None] = "migrate-first"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Built concurrently so that the span exporter keeps writing messages meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_traces_span_messages_input_content_trgm",
+            "span_messages",
+            ["input_content"],
+            unique=False,
+            schema="traces",
+            postgresql_using="gin",
+            postgresql_ops={"input_content": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_traces_span_messages_input_content_trgm",
+            table_name="span_messages",
+            schema="traces",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
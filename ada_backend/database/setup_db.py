@@ -1,7 +1,12 @@
+import asyncio
 import logging
-from contextlib import contextmanager
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from ada_backend.database import trace_models  # noqa: F401  # Import to register trace models with Base.metadata
@@ -99,5 +104,77 @@ def get_db_session():
         session.close()
 
 
+def get_async_db_url() -> str:
+    """The database URL with the async driver: asyncpg for PostgreSQL, aiosqlite for SQLite."""
+    url = make_url(get_db_url())
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    url = url.set(drivername="postgresql+asyncpg")
+    # asyncpg takes the libpq sslmode values under "ssl"
+    if "sslmode" in url.query:
+        url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": url.query["sslmode"]})
+    return url.render_as_string(hide_password=False)
+
+
+def _build_async_sessionmaker(pool_size: int, max_overflow: int) -> async_sessionmaker[AsyncSession]:
+    url = get_async_db_url()
+    kwargs = {"echo": False}
+    if not url.startswith("sqlite"):
+        kwargs.update(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.ADA_DB_POOL_TIMEOUT,
+            pool_recycle=settings.ADA_DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+        )
+    async_engine = create_async_engine(url, **kwargs)
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+# asyncpg connections belong to the event loop that opened them: the API loop and the loop of each queue worker
+# thread get their own engine and pool. Loops dispose of their engine with dispose_async_db_engine before closing.
+_async_sessionmakers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, async_sessionmaker[AsyncSession]] = (
+    weakref.WeakKeyDictionary()
+)
+_async_pool_sizes: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[int, int]] = weakref.WeakKeyDictionary()
+
+
+def set_async_db_pool_size(loop: asyncio.AbstractEventLoop, pool_size: int, max_overflow: int) -> None:
+    """Pool size of the engine created for `loop`, instead of the API loop's ADA_DB_ASYNC_* settings."""
+    _async_pool_sizes[loop] = (pool_size, max_overflow)
+
+
+async def dispose_async_db_engine() -> None:
+    """Close the pooled connections of the running loop's engine. Call it before closing the loop."""
+    async_session_factory = _async_sessionmakers.pop(asyncio.get_running_loop(), None)
+    if async_session_factory is not None:
+        await async_session_factory.kw["bind"].dispose()
+
+
+@asynccontextmanager
+async def get_async_db_session() -> AsyncIterator[AsyncSession]:
+    """
+    Async context manager for database sessions, for the run hot path (run creation and status updates,
+    variable resolution, credit checks, graph loading) so that its queries do not block the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    async_session_factory = _async_sessionmakers.get(loop)
+    if async_session_factory is None:
+        pool_size, max_overflow = _async_pool_sizes.get(
+            loop, (settings.ADA_DB_ASYNC_POOL_SIZE, settings.ADA_DB_ASYNC_MAX_OVERFLOW)
+        )
+        async_session_factory = _build_async_sessionmaker(pool_size, max_overflow)
+        _async_sessionmakers[loop] = async_session_factory
+    session = async_session_factory()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
 if __name__ == "__main__":
     init_db()
@@ -1,7 +1,7 @@
 import sqlalchemy as sa
 from openinference.semconv.trace import OpenInferenceSpanKindValues
 from opentelemetry.trace.status import StatusCode
-from sqlalchemy import TIMESTAMP, UUID, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import TIMESTAMP, UUID, BigInteger, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import mapped_column
@@ -70,7 +70,16 @@ class SpanMessage(Base):
     """Represents span messages in the traces schema."""
 
     __tablename__ = "span_messages"
-    __table_args__ = {"schema": "traces"}
+    __table_args__ = (
+        # Trigram index for the ILIKE '%term%' search of runs by input message (pg_trgm extension)
+        Index(
+            "ix_traces_span_messages_input_content_trgm",
+            "input_content",
+            postgresql_using="gin",
+            postgresql_ops={"input_content": "gin_trgm_ops"},
+        ),
+        {"schema": "traces"},
+    )
 
     id = mapped_column(Integer, primary_key=True, autoincrement=True)
     span_id = mapped_column(String, ForeignKey("traces.spans.span_id", ondelete="CASCADE"), nullable=False, index=True)
@@ -79,3 +88,68 @@ class SpanMessage(Base):
 
     def __str__(self):
         return f"SpanMessage(span_id={self.span_id})"
+
+
+class SpanRollup(Base):
+    """Hourly totals of the spans of a project, call type and model, maintained by the span exporter."""
+
+    __tablename__ = "span_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "bucket_start",
+            "project_id",
+            "call_type",
+            "model_id",
+            name="uq_span_rollups_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("ix_traces_span_rollups_project_id_bucket_start", "project_id", "bucket_start"),
+        {"schema": "traces"},
+    )
+
+    id = mapped_column(Integer, primary_key=True, autoincrement=True)
+    bucket_start = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    project_id = mapped_column(UUID(as_uuid=True), nullable=False)
+    call_type = mapped_column(make_pg_enum(CallType), nullable=True)
+    model_id = mapped_column(UUID(as_uuid=True), nullable=True)
+
+    span_count = mapped_column(BigInteger, nullable=False, default=0)
+    root_span_count = mapped_column(BigInteger, nullable=False, default=0)
+    # Spans with a token count, i.e. LLM calls
+    llm_span_count = mapped_column(BigInteger, nullable=False, default=0)
+    input_tokens = mapped_column(BigInteger, nullable=False, default=0)
+    output_tokens = mapped_column(BigInteger, nullable=False, default=0)
+    root_duration_seconds = mapped_column(Float, nullable=False, default=0.0)
+    credits = mapped_column(Float, nullable=False, default=0.0)
+
+    def __str__(self):
+        return f"SpanRollup(project_id={self.project_id}, bucket_start={self.bucket_start})"
+
+
+class ConversationRollup(Base):
+    """Hourly credits of a conversation, maintained by the span exporter."""
+
+    __tablename__ = "conversation_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "bucket_start",
+            "project_id",
+            "call_type",
+            "conversation_id",
+            name="uq_conversation_rollups_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("ix_traces_conversation_rollups_project_id_bucket_start", "project_id", "bucket_start"),
+        {"schema": "traces"},
+    )
+
+    id = mapped_column(Integer, primary_key=True, autoincrement=True)
+    bucket_start = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    project_id = mapped_column(UUID(as_uuid=True), nullable=False)
+    call_type = mapped_column(make_pg_enum(CallType), nullable=True)
+    conversation_id = mapped_column(String, nullable=False)
+
+    credits = mapped_column(Float, nullable=False, default=0.0)
+
+    def __str__(self):
+        return f"ConversationRollup(conversation_id={self.conversation_id}, bucket_start={self.bucket_start})"
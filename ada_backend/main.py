@@ -12,6 +12,7 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
 from ada_backend.admin.admin import setup_admin
+from ada_backend.database.setup_db import dispose_async_db_engine
 from ada_backend.error_handlers import register_error_handlers
 from ada_backend.graphql.schema import graphql_router
 from ada_backend.instrumentation import setup_performance_instrumentation
@@ -60,6 +61,7 @@ from ada_backend.routers.webhooks.webhook_config_router import router as webhook
 from ada_backend.routers.webhooks.webhook_internal_router import router as webhook_internal_router
 from ada_backend.routers.webhooks.webhook_trigger_router import router as webhook_trigger_router
 from ada_backend.routers.widget_router import router as widget_router
+from ada_backend.services.auth_cache_service import start_auth_invalidation_listener_thread
 from ada_backend.services.rate_limit_service import limiter
 from ada_backend.utils.redis_client import xgroup_create_if_not_exists
 from ada_backend.workers.git_sync_queue_worker import _request_git_sync_drain, start_git_sync_queue_worker_thread
@@ -112,6 +114,8 @@ async def lifespan(app: FastAPI):
 
     - Ensures required Redis consumer groups exist.
     - Starts the run queue worker thread on startup and joins it on shutdown.
+    - Listens for the revocations to drop from the auth caches.
+    - Closes the async database pool of the API loop on shutdown.
     """
     # Ensure Redis consumer groups exist before processing starts
     xgroup_create_if_not_exists(settings.REDIS_INGESTION_STREAM, settings.REDIS_CONSUMER_GROUP)
@@ -121,10 +125,13 @@ async def lifespan(app: FastAPI):
     worker_thread = start_run_queue_worker_thread()
     qa_worker_thread = start_qa_queue_worker_thread()
     git_sync_worker_thread = start_git_sync_queue_worker_thread()
+    auth_invalidation_stop_event = threading.Event()
+    auth_invalidation_thread = start_auth_invalidation_listener_thread(auth_invalidation_stop_event)
 
     try:
         yield
     finally:
+        auth_invalidation_stop_event.set()
         _request_drain()
         _request_qa_drain()
         _request_git_sync_drain()
@@ -132,6 +139,8 @@ async def lifespan(app: FastAPI):
         _join_worker(worker_thread, "run queue", "run", timeout)
         _join_worker(qa_worker_thread, "QA queue", "QA session", timeout)
         _join_worker(git_sync_worker_thread, "git sync queue", "git sync", timeout)
+        auth_invalidation_thread.join(timeout=timeout)
+        await dispose_async_db_engine()
 
 
 app = FastAPI(
@@ -2,12 +2,21 @@ from dataclasses import dataclass
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import func, literal, select
+from sqlalchemy import Select, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, aliased
 
 import ada_backend.database.models as db
 
 
+@dataclass
+class CostTablesDTO:
+    # Credits per input and output token, by LLM model id
+    llm_costs: dict[UUID, tuple[Optional[float], Optional[float]]]
+    # Credits per call, by component version id
+    component_costs_per_call: dict[UUID, Optional[float]]
+
+
 @dataclass
 class OrganizationLimitAndUsageDTO:
     organization_id: UUID
@@ -224,14 +233,34 @@ def get_organization_limit(
     return organization_limit
 
 
-def get_organization_total_credits(session: Session, organization_id: UUID, year: int, month: int) -> float:
-    """Get total credits for all projects in an organization for a specific year and month."""
-    total = (
-        session.query(func.sum(db.Usage.credits_used))
+async def get_organization_limit_async(
+    session: AsyncSession,
+    organization_id: UUID,
+) -> Optional[db.OrganizationLimit]:
+    result = await session.execute(
+        select(db.OrganizationLimit).where(db.OrganizationLimit.organization_id == organization_id).limit(1)
+    )
+    return result.scalars().first()
+
+
+def _organization_total_credits_query(organization_id: UUID, year: int, month: int) -> Select:
+    return (
+        select(func.sum(db.Usage.credits_used))
         .join(db.Project, db.Project.id == db.Usage.project_id)
-        .filter(db.Project.organization_id == organization_id, db.Usage.year == year, db.Usage.month == month)
-        .scalar()
+        .where(db.Project.organization_id == organization_id, db.Usage.year == year, db.Usage.month == month)
     )
+
+
+def get_organization_total_credits(session: Session, organization_id: UUID, year: int, month: int) -> float:
+    """Get total credits for all projects in an organization for a specific year and month."""
+    total = session.execute(_organization_total_credits_query(organization_id, year, month)).scalar()
+    return round(float(total) if total else 0.0, 2)
+
+
+async def get_organization_total_credits_async(
+    session: AsyncSession, organization_id: UUID, year: int, month: int
+) -> float:
+    total = (await session.execute(_organization_total_credits_query(organization_id, year, month))).scalar()
     return round(float(total) if total else 0.0, 2)
 
 
@@ -316,3 +345,29 @@ def get_component_cost_per_call(session: Session, component_instance_id: UUID) -
         return None
 
     return result[0]
+
+
+def get_cost_tables(session: Session) -> CostTablesDTO:
+    """Load the LLM and component cost tables in full."""
+    llm_cost_aliased = aliased(db.LLMCost, flat=True)
+    llm_rows = session.execute(
+        select(llm_cost_aliased.llm_model_id, db.Cost.credits_per_input_token, db.Cost.credits_per_output_token).join(
+            llm_cost_aliased, llm_cost_aliased.id == db.Cost.id
+        )
+    ).all()
+    component_cost_aliased = aliased(db.ComponentCost, flat=True)
+    component_rows = session.execute(
+        select(component_cost_aliased.component_version_id, db.Cost.credits_per_call).join(
+            component_cost_aliased, component_cost_aliased.id == db.Cost.id
+        )
+    ).all()
+    return CostTablesDTO(
+        llm_costs={row[0]: (row[1], row[2]) for row in llm_rows},
+        component_costs_per_call={row[0]: row[1] for row in component_rows},
+    )
+
+
+def get_component_version_id(session: Session, component_instance_id: UUID) -> Optional[UUID]:
+    return session.execute(
+        select(db.ComponentInstance.component_version_id).where(db.ComponentInstance.id == component_instance_id)
+    ).scalar_one_or_none()
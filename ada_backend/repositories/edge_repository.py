@@ -2,6 +2,8 @@ import logging
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ada_backend.database import models as db
@@ -23,6 +25,13 @@ def get_edges(session: Session, graph_runner_id: UUID) -> list[db.GraphRunnerEdg
     return session.query(db.GraphRunnerEdge).filter(db.GraphRunnerEdge.graph_runner_id == graph_runner_id).all()
 
 
+async def get_edges_async(session: AsyncSession, graph_runner_id: UUID) -> list[db.GraphRunnerEdge]:
+    result = await session.execute(
+        select(db.GraphRunnerEdge).where(db.GraphRunnerEdge.graph_runner_id == graph_runner_id)
+    )
+    return list(result.scalars().all())
+
+
 def upsert_edge(
     session: Session,
     id: UUID,
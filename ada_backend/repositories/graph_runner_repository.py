@@ -4,7 +4,8 @@ from pathlib import Path
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import exists, select
+from sqlalchemy import Select, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ada_backend.database import models as db
@@ -47,6 +48,26 @@ def get_graph_runner_for_env(
     )
 
 
+async def get_graph_runner_for_env_async(
+    session: AsyncSession,
+    project_id: UUID,
+    env: db.EnvType,
+) -> Optional[db.GraphRunner]:
+    result = await session.execute(
+        select(db.GraphRunner)
+        .join(
+            db.ProjectEnvironmentBinding,
+            db.GraphRunner.id == db.ProjectEnvironmentBinding.graph_runner_id,
+        )
+        .where(
+            db.ProjectEnvironmentBinding.project_id == project_id,
+            db.ProjectEnvironmentBinding.environment == env,
+        )
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
 # TODO: move logic to service
 def insert_graph_runner(
     session: Session,
@@ -113,19 +134,13 @@ def graph_runner_exists(session: Session, graph_id: UUID) -> bool:
     return session.execute(stmt).scalar()
 
 
-def get_component_nodes(session: Session, graph_runner_id: UUID) -> list[ComponentNodeDTO]:
-    """
-    Retrieves the component nodes associated with a graph.
+async def graph_runner_exists_async(session: AsyncSession, graph_id: UUID) -> bool:
+    return (await session.execute(select(exists().where(db.GraphRunner.id == graph_id)))).scalar()
 
-    Args:
-        session (Session): SQLAlchemy session.
-        graph_runner_id (UUID): ID of the graph whose nodes to retrieve.
 
-    Returns:
-        list[ComponentNodeDTO]
-    """
-    results = (
-        session.query(db.ComponentInstance, db.GraphRunnerNode, db.Component)
+def _component_nodes_query(graph_runner_id: UUID) -> Select:
+    return (
+        select(db.ComponentInstance, db.GraphRunnerNode, db.Component)
         .join(
             db.GraphRunnerNode,
             db.ComponentInstance.id == db.GraphRunnerNode.node_id,
@@ -138,9 +153,11 @@ def get_component_nodes(session: Session, graph_runner_id: UUID) -> list[Compone
             db.Component,
             db.ComponentVersion.component_id == db.Component.id,
         )
-        .filter(db.GraphRunnerNode.graph_runner_id == graph_runner_id)
-        .all()
+        .where(db.GraphRunnerNode.graph_runner_id == graph_runner_id)
     )
+
+
+def _to_component_node_dtos(graph_runner_id: UUID, results) -> list[ComponentNodeDTO]:
     return [
         ComponentNodeDTO(
             id=component_instance.id,
@@ -154,6 +171,26 @@ def get_component_nodes(session: Session, graph_runner_id: UUID) -> list[Compone
     ]
 
 
+def get_component_nodes(session: Session, graph_runner_id: UUID) -> list[ComponentNodeDTO]:
+    """
+    Retrieves the component nodes associated with a graph.
+
+    Args:
+        session (Session): SQLAlchemy session.
+        graph_runner_id (UUID): ID of the graph whose nodes to retrieve.
+
+    Returns:
+        list[ComponentNodeDTO]
+    """
+    results = session.execute(_component_nodes_query(graph_runner_id)).all()
+    return _to_component_node_dtos(graph_runner_id, results)
+
+
+async def get_component_nodes_async(session: AsyncSession, graph_runner_id: UUID) -> list[ComponentNodeDTO]:
+    results = (await session.execute(_component_nodes_query(graph_runner_id))).all()
+    return _to_component_node_dtos(graph_runner_id, results)
+
+
 def get_component_instances_for_graph_runner(session: Session, graph_runner_id: UUID) -> list[db.ComponentInstance]:
     return (
         session.query(db.ComponentInstance)
@@ -1,7 +1,9 @@
 from typing import Optional, Union
 from uuid import UUID
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager, joinedload
 
 from ada_backend.database import models as db
 
@@ -57,6 +59,20 @@ def get_input_port_instances_for_component_instance(
     return query.all()
 
 
+async def get_input_port_instances_with_field_expressions_async(
+    session: AsyncSession,
+    component_instance_ids: list[UUID],
+) -> list[db.InputPortInstance]:
+    """Input port instances of several component instances that have a field expression, in one query."""
+    result = await session.execute(
+        select(db.InputPortInstance)
+        .join(db.InputPortInstance.field_expression)
+        .where(db.InputPortInstance.component_instance_id.in_(component_instance_ids))
+        .options(contains_eager(db.InputPortInstance.field_expression))
+    )
+    return list(result.scalars().all())
+
+
 def update_input_port_instance(
     session: Session,
     input_port_instance_id: UUID,
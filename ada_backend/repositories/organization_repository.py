@@ -4,6 +4,8 @@ from typing import Optional
 from uuid import UUID
 
 from pydantic import SecretStr
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ada_backend.database import models as db
@@ -56,6 +58,21 @@ def get_organization_secrets(
     ]
 
 
+async def list_organization_secret_keys_async(
+    session: AsyncSession,
+    organization_id: UUID,
+    secret_type: db.OrgSecretType,
+) -> list[str]:
+    """Keys of the organization secrets of a type, without loading and decrypting the secrets."""
+    result = await session.execute(
+        select(db.OrganizationSecret.key).where(
+            db.OrganizationSecret.organization_id == organization_id,
+            db.OrganizationSecret.secret_type == secret_type,
+        )
+    )
+    return list(result.scalars().all())
+
+
 def get_organization_secrets_from_project_id(
     sessin: Session,
     project_id: UUID,
@@ -165,6 +182,19 @@ def list_variable_secrets_for_set(
     )
 
 
+async def list_variable_secrets_for_set_async(
+    session: AsyncSession,
+    variable_set_id: UUID,
+) -> list[db.OrganizationSecret]:
+    result = await session.execute(
+        select(db.OrganizationSecret).where(
+            db.OrganizationSecret.variable_set_id == variable_set_id,
+            db.OrganizationSecret.secret_type == db.OrgSecretType.VARIABLE,
+        )
+    )
+    return list(result.scalars().all())
+
+
 def list_variable_secrets_for_definitions(
     session: Session,
     definition_ids: list[UUID],
@@ -181,6 +211,21 @@ def list_variable_secrets_for_definitions(
     )
 
 
+async def list_variable_secrets_for_definitions_async(
+    session: AsyncSession,
+    definition_ids: list[UUID],
+    variable_set_id: Optional[UUID] = None,
+) -> list[db.OrganizationSecret]:
+    result = await session.execute(
+        select(db.OrganizationSecret).where(
+            db.OrganizationSecret.variable_definition_id.in_(definition_ids),
+            db.OrganizationSecret.variable_set_id == variable_set_id,
+            db.OrganizationSecret.secret_type == db.OrgSecretType.VARIABLE,
+        )
+    )
+    return list(result.scalars().all())
+
+
 def delete_organization_secret(
     session: Session,
     organization_id: UUID,
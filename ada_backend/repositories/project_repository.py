@@ -4,6 +4,7 @@ from uuid import UUID
 
 from sqlalchemy import and_, distinct, exists, or_, select
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
 from ada_backend.database import models as db
@@ -48,6 +49,10 @@ def get_project(
     raise ValueError("Either project_id or project_name must be provided")
 
 
+async def get_project_async(session: AsyncSession, project_id: UUID) -> Optional[db.Project]:
+    return await session.get(db.Project, project_id)
+
+
 def get_project_with_details(
     session: Session,
     project_id: UUID,
@@ -3,6 +3,7 @@ from typing import Optional
 from uuid import UUID, uuid4
 
 from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ada_backend.database import models as db
@@ -11,19 +12,17 @@ from ada_backend.schemas.run_schema import OrgRunResponseSchema
 RUN_INPUT_RETENTION_DAYS = 7
 
 
-def create_run(
-    session: Session,
+def _new_run(
     project_id: UUID,
-    trigger: db.CallType = db.CallType.API,
-    webhook_id: UUID | None = None,
-    integration_trigger_id: UUID | None = None,
-    attempt_number: int = 1,
-    event_id: str | None = None,
-    retry_group_id: UUID | None = None,
-    env: db.EnvType | None = None,
-    graph_runner_id: UUID | None = None,
+    trigger: db.CallType,
+    webhook_id: UUID | None,
+    integration_trigger_id: UUID | None,
+    attempt_number: int,
+    event_id: str | None,
+    retry_group_id: UUID | None,
+    env: db.EnvType | None,
+    graph_runner_id: UUID | None,
 ) -> db.Run:
-    """Create a new run with status pending. Caller manages transaction."""
     run_id = uuid4()
     run_retry_group_id = retry_group_id or uuid4()
     kwargs: dict = {
@@ -40,17 +39,76 @@ def create_run(
     }
     if event_id is not None:
         kwargs["event_id"] = event_id
-    run = db.Run(**kwargs)
+    return db.Run(**kwargs)
+
+
+def create_run(
+    session: Session,
+    project_id: UUID,
+    trigger: db.CallType = db.CallType.API,
+    webhook_id: UUID | None = None,
+    integration_trigger_id: UUID | None = None,
+    attempt_number: int = 1,
+    event_id: str | None = None,
+    retry_group_id: UUID | None = None,
+    env: db.EnvType | None = None,
+    graph_runner_id: UUID | None = None,
+) -> db.Run:
+    """Create a new run with status pending. Caller manages transaction."""
+    run = _new_run(
+        project_id,
+        trigger,
+        webhook_id,
+        integration_trigger_id,
+        attempt_number,
+        event_id,
+        retry_group_id,
+        env,
+        graph_runner_id,
+    )
     session.add(run)
     session.commit()
     session.refresh(run)
     return run
 
 
+async def create_run_async(
+    session: AsyncSession,
+    project_id: UUID,
+    trigger: db.CallType = db.CallType.API,
+    webhook_id: UUID | None = None,
+    integration_trigger_id: UUID | None = None,
+    attempt_number: int = 1,
+    event_id: str | None = None,
+    retry_group_id: UUID | None = None,
+    env: db.EnvType | None = None,
+    graph_runner_id: UUID | None = None,
+) -> db.Run:
+    run = _new_run(
+        project_id,
+        trigger,
+        webhook_id,
+        integration_trigger_id,
+        attempt_number,
+        event_id,
+        retry_group_id,
+        env,
+        graph_runner_id,
+    )
+    session.add(run)
+    await session.commit()
+    await session.refresh(run)
+    return run
+
+
 def get_run(session: Session, run_id: UUID) -> Optional[db.Run]:
     return session.query(db.Run).filter(db.Run.id == run_id).first()
 
 
+async def get_run_async(session: AsyncSession, run_id: UUID) -> Optional[db.Run]:
+    return await session.get(db.Run, run_id)
+
+
 def get_latest_run_by_retry_group(session: Session, retry_group_id: UUID) -> Optional[db.Run]:
     return (
         session.query(db.Run)
@@ -191,6 +249,31 @@ def fail_run_if_pending(
     return get_run(session, run_id)
 
 
+def _apply_run_status(
+    run: db.Run,
+    status: db.RunStatus,
+    error: Optional[dict],
+    trace_id: Optional[str],
+    result_id: Optional[str],
+    started_at: Optional[datetime],
+    finished_at: Optional[datetime],
+    graph_runner_id: Optional[UUID],
+) -> None:
+    run.status = status
+    if error is not None:
+        run.error = error
+    if trace_id is not None:
+        run.trace_id = trace_id
+    if result_id is not None:
+        run.result_id = result_id
+    if started_at is not None:
+        run.started_at = started_at
+    if finished_at is not None:
+        run.finished_at = finished_at
+    if graph_runner_id is not None:
+        run.graph_runner_id = graph_runner_id
+
+
 def update_run_status(
     session: Session,
     run_id: UUID,
@@ -206,19 +289,27 @@ def update_run_status(
     run = get_run(session, run_id)
     if run is None:
         return None
-    run.status = status
-    if error is not None:
-        run.error = error
-    if trace_id is not None:
-        run.trace_id = trace_id
-    if result_id is not None:
-        run.result_id = result_id
-    if started_at is not None:
-        run.started_at = started_at
-    if finished_at is not None:
-        run.finished_at = finished_at
-    if graph_runner_id is not None:
-        run.graph_runner_id = graph_runner_id
+    _apply_run_status(run, status, error, trace_id, result_id, started_at, finished_at, graph_runner_id)
     session.commit()
     session.refresh(run)
     return run
+
+
+async def update_run_status_async(
+    session: AsyncSession,
+    run_id: UUID,
+    status: db.RunStatus,
+    error: Optional[dict] = None,
+    trace_id: Optional[str] = None,
+    result_id: Optional[str] = None,
+    started_at: Optional[datetime] = None,
+    finished_at: Optional[datetime] = None,
+    graph_runner_id: Optional[UUID] = None,
+) -> Optional[db.Run]:
+    run = await get_run_async(session, run_id)
+    if run is None:
+        return None
+    _apply_run_status(run, status, error, trace_id, result_id, started_at, finished_at, graph_runner_id)
+    await session.commit()
+    await session.refresh(run)
+    return run
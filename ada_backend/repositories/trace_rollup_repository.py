@@ -0,0 +1,216 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, delete, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ada_backend.database.trace_models import ConversationRollup, SpanRollup
+
+ROLLUP_BUCKET = timedelta(hours=1)
+SPAN_ROLLUP_TOTALS = (
+    "span_count",
+    "root_span_count",
+    "llm_span_count",
+    "input_tokens",
+    "output_tokens",
+    "root_duration_seconds",
+    "credits",
+)
+# Same project ids as the spans exporter accepts, which PostgreSQL can cast to uuid
+UUID_PATTERN = r"^\{?[0-9a-fA-F]{8}-?([0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}\}?$"
+
+REBUILD_SPAN_ROLLUPS_QUERY = f"""
+    INSERT INTO traces.span_rollups (
+        bucket_start, project_id, call_type, model_id, {", ".join(SPAN_ROLLUP_TOTALS)}
+    )
+    SELECT
+        date_trunc('hour', s.start_time, 'UTC') AS bucket_start,
+        s.project_id::uuid AS project_id,
+        s.call_type,
+        s.model_id,
+        COUNT(*) AS span_count,
+        COUNT(*) FILTER (WHERE s.parent_id IS NULL) AS root_span_count,
+        COUNT(*) FILTER (
+            WHERE s.llm_token_count_prompt IS NOT NULL OR s.llm_token_count_completion IS NOT NULL
+        ) AS llm_span_count,
+        COALESCE(SUM(s.llm_token_count_prompt), 0) AS input_tokens,
+        COALESCE(SUM(s.llm_token_count_completion), 0) AS output_tokens,
+        COALESCE(SUM(EXTRACT(EPOCH FROM s.end_time - s.start_time)) FILTER (WHERE s.parent_id IS NULL), 0)
+            AS root_duration_seconds,
+        COALESCE(
+            SUM(
+                COALESCE(su.credits_input_token, 0)
+                + COALESCE(su.credits_output_token, 0)
+                + COALESCE(su.credits_per_call, 0)
+            ),
+            0
+        ) AS credits
+    FROM traces.spans s
+    LEFT JOIN credits.span_usages su ON su.span_id = s.span_id
+    WHERE s.start_time >= :start_time
+    AND s.start_time < :end_time
+    AND s.project_id ~ :uuid_pattern
+    {{project_filter}}
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT ON CONSTRAINT uq_span_rollups_bucket DO UPDATE SET
+        {", ".join(f"{column} = EXCLUDED.{column}" for column in SPAN_ROLLUP_TOTALS)}
+"""
+
+REBUILD_CONVERSATION_ROLLUPS_QUERY = """
+    INSERT INTO traces.conversation_rollups (bucket_start, project_id, call_type, conversation_id, credits)
+    SELECT
+        date_trunc('hour', s.start_time, 'UTC') AS bucket_start,
+        s.project_id::uuid AS project_id,
+        s.call_type,
+        s.attributes->>'conversation_id' AS conversation_id,
+        COALESCE(
+            SUM(
+                COALESCE(su.credits_input_token, 0)
+                + COALESCE(su.credits_output_token, 0)
+                + COALESCE(su.credits_per_call, 0)
+            ),
+            0
+        ) AS credits
+    FROM traces.spans s
+    LEFT JOIN credits.span_usages su ON su.span_id = s.span_id
+    WHERE s.start_time >= :start_time
+    AND s.start_time < :end_time
+    AND s.project_id ~ :uuid_pattern
+    AND s.attributes->>'conversation_id' IS NOT NULL
+    {project_filter}
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT ON CONSTRAINT uq_conversation_rollups_bucket DO UPDATE SET credits = EXCLUDED.credits
+"""
+
+
+def rollup_bucket_start(timestamp: datetime) -> datetime:
+    """Start of the hourly rollup bucket of a timestamp, in UTC."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.astimezone()
+    return timestamp.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+@dataclass
+class SpanRollupEntry:
+    """What one exported span adds to the rollups."""
+
+    start_time: datetime
+    project_id: UUID
+    call_type: Optional[str]
+    model_id: Optional[UUID]
+    conversation_id: Optional[str]
+    is_root: bool
+    duration_seconds: float
+    input_tokens: Optional[int]
+    output_tokens: Optional[int]
+    credits: float
+
+
+@dataclass
+class TraceRollups:
+    """Rollup increments of a batch of spans, summed by rollup row."""
+
+    spans: dict[tuple, dict[str, float]] = field(default_factory=dict)
+    conversations: dict[tuple, float] = field(default_factory=dict)
+
+    def add(self, entry: Optional[SpanRollupEntry]) -> None:
+        if entry is None:
+            return
+        bucket_start = rollup_bucket_start(entry.start_time)
+        span_key = (bucket_start, entry.project_id, entry.call_type, entry.model_id)
+        totals = self.spans.setdefault(span_key, dict.fromkeys(SPAN_ROLLUP_TOTALS, 0))
+        totals["span_count"] += 1
+        if entry.is_root:
+            totals["root_span_count"] += 1
+            totals["root_duration_seconds"] += entry.duration_seconds
+        if entry.input_tokens is not None or entry.output_tokens is not None:
+            totals["llm_span_count"] += 1
+        totals["input_tokens"] += entry.input_tokens or 0
+        totals["output_tokens"] += entry.output_tokens or 0
+        totals["credits"] += entry.credits
+        if entry.conversation_id is not None:
+            conversation_key = (bucket_start, entry.project_id, entry.call_type, entry.conversation_id)
+            self.conversations[conversation_key] = self.conversations.get(conversation_key, 0) + entry.credits
+
+
+def _sort_key(key: tuple) -> tuple:
+    return tuple("" if value is None else str(value) for value in key)
+
+
+def upsert_trace_rollups(session: Session, rollups: TraceRollups) -> None:
+    """
+    Add the increments of a batch to the rollup rows, in the caller's transaction.
+    Rows are written in key order so that concurrent exports lock them in the same order.
+    """
+    if rollups.spans:
+        rows = [
+            {"bucket_start": key[0], "project_id": key[1], "call_type": key[2], "model_id": key[3], **totals}
+            for key, totals in sorted(rollups.spans.items(), key=lambda item: _sort_key(item[0]))
+        ]
+        statement = insert(SpanRollup).values(rows)
+        session.execute(
+            statement.on_conflict_do_update(
+                constraint="uq_span_rollups_bucket",
+                set_={
+                    column: getattr(SpanRollup, column) + getattr(statement.excluded, column)
+                    for column in SPAN_ROLLUP_TOTALS
+                },
+            )
+        )
+    if rollups.conversations:
+        rows = [
+            {
+                "bucket_start": key[0],
+                "project_id": key[1],
+                "call_type": key[2],
+                "conversation_id": key[3],
+                "credits": credits,
+            }
+            for key, credits in sorted(rollups.conversations.items(), key=lambda item: _sort_key(item[0]))
+        ]
+        statement = insert(ConversationRollup).values(rows)
+        session.execute(
+            statement.on_conflict_do_update(
+                constraint="uq_conversation_rollups_bucket",
+                set_={"credits": ConversationRollup.credits + statement.excluded.credits},
+            )
+        )
+
+
+def rebuild_trace_rollups(
+    session: Session,
+    start_time: datetime,
+    end_time: datetime,
+    project_ids: Optional[list[UUID]] = None,
+) -> None:
+    """
+    Recompute from the spans the rollup buckets between start_time and end_time (widened to whole hours),
+    e.g. to backfill the spans exported before the rollups existed. Commits the rebuilt buckets.
+    """
+    params: dict[str, object] = {
+        "start_time": rollup_bucket_start(start_time),
+        "end_time": rollup_bucket_start(end_time - timedelta(microseconds=1)) + ROLLUP_BUCKET,
+        "uuid_pattern": UUID_PATTERN,
+    }
+    project_filter = ""
+    if project_ids is not None:
+        project_filter = "AND s.project_id IN :project_ids"
+        params["project_ids"] = [str(project_id) for project_id in project_ids]
+
+    for rollup_model in (SpanRollup, ConversationRollup):
+        statement = delete(rollup_model).where(
+            rollup_model.bucket_start >= params["start_time"],
+            rollup_model.bucket_start < params["end_time"],
+        )
+        if project_ids is not None:
+            statement = statement.where(rollup_model.project_id.in_(project_ids))
+        session.execute(statement)
+    for query in (REBUILD_SPAN_ROLLUPS_QUERY, REBUILD_CONVERSATION_ROLLUPS_QUERY):
+        statement = text(query.format(project_filter=project_filter))
+        if project_ids is not None:
+            statement = statement.bindparams(bindparam("project_ids", expanding=True))
+        session.execute(statement, params)
+    session.commit()
@@ -2,8 +2,9 @@ import logging
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import func, or_
+from sqlalchemy import Select, func, or_, select
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ada_backend.database import models as db
@@ -12,29 +13,47 @@ from ada_backend.database.models import VariableType
 LOGGER = logging.getLogger(__name__)
 
 
-def list_org_definitions(
-    session: Session,
+def _org_definitions_query(
     organization_id: UUID,
     project_id: Optional[UUID] = None,
     var_type: Optional[VariableType] = None,
-) -> list[db.OrgVariableDefinition]:
-    query = session.query(db.OrgVariableDefinition).filter(db.OrgVariableDefinition.organization_id == organization_id)
+) -> Select:
+    query = select(db.OrgVariableDefinition).where(db.OrgVariableDefinition.organization_id == organization_id)
 
     if var_type is not None:
-        query = query.filter(db.OrgVariableDefinition.type == var_type)
+        query = query.where(db.OrgVariableDefinition.type == var_type)
 
     if project_id is not None:
         query = query.outerjoin(
             db.OrgVariableDefinitionProjectAssociation,
             db.OrgVariableDefinition.id == db.OrgVariableDefinitionProjectAssociation.definition_id,
-        ).filter(
+        ).where(
             or_(
                 db.OrgVariableDefinitionProjectAssociation.project_id == project_id,
                 db.OrgVariableDefinitionProjectAssociation.id.is_(None),
             )
         )
 
-    return query.order_by(db.OrgVariableDefinition.display_order, db.OrgVariableDefinition.name).all()
+    return query.order_by(db.OrgVariableDefinition.display_order, db.OrgVariableDefinition.name)
+
+
+def list_org_definitions(
+    session: Session,
+    organization_id: UUID,
+    project_id: Optional[UUID] = None,
+    var_type: Optional[VariableType] = None,
+) -> list[db.OrgVariableDefinition]:
+    return list(session.execute(_org_definitions_query(organization_id, project_id, var_type)).scalars().all())
+
+
+async def list_org_definitions_async(
+    session: AsyncSession,
+    organization_id: UUID,
+    project_id: Optional[UUID] = None,
+    var_type: Optional[VariableType] = None,
+) -> list[db.OrgVariableDefinition]:
+    result = await session.execute(_org_definitions_query(organization_id, project_id, var_type))
+    return list(result.scalars().all())
 
 
 def get_org_definition(
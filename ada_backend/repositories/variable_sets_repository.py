@@ -2,8 +2,9 @@ import logging
 from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, select
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ada_backend.database import models as db
@@ -27,6 +28,22 @@ def get_org_variable_set(
     )
 
 
+async def get_org_variable_set_async(
+    session: AsyncSession,
+    organization_id: UUID,
+    set_id: str,
+) -> Optional[db.OrgVariableSet]:
+    result = await session.execute(
+        select(db.OrgVariableSet)
+        .where(
+            db.OrgVariableSet.organization_id == organization_id,
+            db.OrgVariableSet.set_id == set_id,
+        )
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
 def list_org_variable_sets(
     session: Session,
     organization_id: UUID,
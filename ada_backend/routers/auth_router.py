@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from enum import Enum
 from typing import Annotated
@@ -10,7 +11,7 @@ from supabase import Client, create_client
 
 from ada_backend.context import get_request_context
 from ada_backend.database.models import ApiKeyType
-from ada_backend.database.setup_db import get_db, get_db_session
+from ada_backend.database.setup_db import get_db
 from ada_backend.repositories.project_repository import get_project
 from ada_backend.schemas.auth_schema import (
     ApiKeyCreatedResponse,
@@ -27,9 +28,16 @@ from ada_backend.services.api_key_service import (
     deactivate_api_key_service,
     generate_scoped_api_key,
     get_api_keys_service,
-    verify_api_key,
+    verify_api_key_cached,
     verify_ingestion_api_key,
 )
+from ada_backend.services.auth_cache_service import (
+    cache_supabase_user,
+    get_cached_supabase_user,
+    get_project_organization_id,
+    get_unverified_token_expiry,
+    verify_supabase_token_locally,
+)
 from ada_backend.services.user_roles_service import get_user_access_to_organization, is_user_super_admin
 from settings import settings
 
@@ -51,6 +59,24 @@ bearer = HTTPBearer()
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
+def _verify_supabase_token(supabase_token: str) -> tuple[SupabaseUser, float | None]:
+    """Verify the token locally when its signing key is known, otherwise ask Supabase (blocking)."""
+    verified = verify_supabase_token_locally(supabase_token)
+    if verified is not None:
+        return verified
+
+    user_response = supabase.auth.get_user(supabase_token)
+    if not user_response or not user_response.user:
+        raise HTTPException(status_code=401, detail="Invalid Supabase token")
+
+    user = SupabaseUser(
+        id=user_response.user.id,
+        email=user_response.user.email,
+        token=supabase_token,
+    )
+    return user, get_unverified_token_expiry(supabase_token)
+
+
 # TODO : move to a utils file
 async def get_user_from_supabase_token(
     authorization: HTTPAuthorizationCredentials = Depends(bearer),
@@ -59,6 +85,8 @@ async def get_user_from_supabase_token(
     Validate Supabase JWT from Authorization header and return user info.
     Also sets the user in the request context.
 
+    Validated tokens are reused until they expire, for at most AUTH_CACHE_TTL_SECONDS.
+
     Args:
         authorization (Optional[str]): Supabase JWT in the 'Authorization' header.
 
@@ -74,6 +102,11 @@ async def get_user_from_supabase_token(
         except ValueError:
             pass
 
+    cached_user = get_cached_supabase_user(supabase_token)
+    if cached_user is not None:
+        _set_user_in_context(cached_user)
+        return cached_user
+
     # Bypass authentication in offline mode
     if settings.OFFLINE_MODE:
         user = SupabaseUser(
@@ -83,15 +116,9 @@ async def get_user_from_supabase_token(
         return user
 
     try:
-        user_response = supabase.auth.get_user(supabase_token)
-        if not user_response or not user_response.user:
-            raise HTTPException(status_code=401, detail="Invalid Supabase token")
-
-        user = SupabaseUser(
-            id=user_response.user.id,
-            email=user_response.user.email,
-            token=supabase_token,
-        )
+        # The JWKS refresh and the Supabase fallback are network calls: keep them off the event loop
+        user, expires_at = await asyncio.to_thread(_verify_supabase_token, supabase_token)
+        cache_supabase_user(supabase_token, user, expires_at)
 
         _set_user_in_context(user)
 
@@ -125,12 +152,12 @@ def user_has_access_to_project_dependency(allowed_roles: set[str]):
         session: Session = Depends(get_db),
     ) -> SupabaseUser:
         try:
-            project = get_project(session, project_id)
-            if not project:
+            organization_id = get_project_organization_id(session, project_id)
+            if organization_id is None:
                 raise HTTPException(status_code=404, detail="Project not found")
             access = await get_user_access_to_organization(
                 user=user,
-                organization_id=project.organization_id,
+                organization_id=organization_id,
             )
 
             LOGGER.info(f"User {user.id=} has access to project {project_id=} with role {access.role=}")
@@ -411,6 +438,8 @@ async def verify_api_key_dependency(
     with a request-scoped session the connection stayed checked out (idle-in-transaction on the
     org_api_keys lookup) for the entire run, so under concurrency every in-flight request pinned a
     pool connection and exhausted the pool, crash-looping the API (DRA-1313).
+
+    Verifications are reused for AUTH_CACHE_TTL_SECONDS, so most requests make no lookup at all.
     """
     if not x_api_key:
         raise HTTPException(status_code=401, detail="Missing API key")
@@ -418,8 +447,7 @@ async def verify_api_key_dependency(
     cleaned_x_api_key = x_api_key.replace("\\n", "\n").strip('"')
 
     try:
-        with get_db_session() as session:
-            return verify_api_key(session, private_key=cleaned_x_api_key)
+        return verify_api_key_cached(cleaned_x_api_key)
     except ValueError as e:
         LOGGER.error("API key verification failed", exc_info=True)
         raise HTTPException(status_code=401, detail="Invalid API key") from e
@@ -45,6 +45,9 @@ async def get_root_traces(
     ),
     start_time: Optional[datetime] = Query(None, description="Start of date range filter (ISO 8601)"),
     end_time: Optional[datetime] = Query(None, description="End of date range filter (ISO 8601)"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page; takes precedence over page for deep pagination"
+    ),
     session: Session = Depends(get_db),
 ) -> PaginatedRootTracesResponse:
     if not user.id:
@@ -70,6 +73,7 @@ async def get_root_traces(
             search=search,
             start_time=start_time,
             end_time=end_time,
+            cursor=cursor,
         )
         return response
     except ValueError as e:
@@ -85,6 +85,10 @@ class Pagination(BaseModel):
     page: int
     size: int
     total_pages: int
+    # Pass as cursor to get the next page, None on the last page
+    next_cursor: str | None = None
+    # When true, more traces match than total_pages covers
+    total_capped: bool = False
 
 
 class PaginatedRootTracesResponse(BaseModel):
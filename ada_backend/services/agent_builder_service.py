@@ -35,6 +35,7 @@ from engine.errors import EngineError
 from engine.field_expressions.ast import ConcatNode, JsonBuildNode, LiteralNode, VarNode
 from engine.field_expressions.serializer import from_json as expression_from_json
 from engine.graph_runner.field_expression_management import evaluate_expression
+from engine.trace.credit_calculator import register_component_instance_version
 
 LOGGER = logging.getLogger(__name__)
 
@@ -215,6 +216,7 @@ async def instantiate_component(
         raise ValueError(f"Component instance {component_instance_id} not found.")
     component_version_id = component_instance.component_version_id
     LOGGER.debug(f"Init instantiation for component {component_name} version: {component_version_id}\n")
+    register_component_instance_version(component_instance.id, component_version_id)
 
     # Fetch basic parameters
     input_params: dict[str, Any] = get_component_params(
@@ -1,28 +1,49 @@
 import logging
 import traceback
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Optional
 from uuid import UUID
 
 import networkx as nx
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ada_backend.context import set_run_variables
-from ada_backend.database.models import CallType, EnvType, OrgSecretType, ResponseFormat
+from ada_backend.database.models import (
+    CallType,
+    EnvType,
+    GraphRunnerEdge,
+    InputPortInstance,
+    OrgSecretType,
+    ResponseFormat,
+)
 from ada_backend.database.models import GraphRunner as GraphRunnerModel
-from ada_backend.database.setup_db import get_db_session
-from ada_backend.repositories.credits_repository import get_organization_limit, get_organization_total_credits
-from ada_backend.repositories.edge_repository import get_edges
+from ada_backend.database.setup_db import get_async_db_session, get_db_session
+from ada_backend.repositories.credits_repository import (
+    get_organization_limit_async,
+    get_organization_total_credits_async,
+)
+from ada_backend.repositories.edge_repository import get_edges, get_edges_async
 from ada_backend.repositories.graph_runner_repository import (
     delete_temp_folder,
     get_component_nodes,
-    get_graph_runner_for_env,
+    get_component_nodes_async,
+    get_graph_runner_for_env_async,
     graph_runner_exists,
+    graph_runner_exists_async,
+)
+from ada_backend.repositories.input_port_instance_repository import (
+    get_input_port_instances_for_component_instance,
+    get_input_port_instances_with_field_expressions_async,
+)
+from ada_backend.repositories.organization_repository import (
+    get_organization_secrets,
+    list_organization_secret_keys_async,
 )
-from ada_backend.repositories.input_port_instance_repository import get_input_port_instances_for_component_instance
-from ada_backend.repositories.organization_repository import get_organization_secrets
-from ada_backend.repositories.project_repository import get_project, get_project_with_details
+from ada_backend.repositories.project_repository import get_project, get_project_async, get_project_with_details
+from ada_backend.schemas.pipeline.graph_schema import ComponentNodeDTO
 from ada_backend.schemas.project_schema import ChatResponse
 from ada_backend.services.agent_builder_service import instantiate_component
 from ada_backend.services.errors import (
@@ -39,7 +60,7 @@ from ada_backend.services.file_response_service import (
 )
 from ada_backend.services.graph_reachability import find_reachable_nodes
 from ada_backend.services.tag_service import compose_tag_name
-from ada_backend.services.variable_resolution_service import resolve_variables
+from ada_backend.services.variable_resolution_service import resolve_variables_async
 from engine.errors import EngineError
 from engine.field_expressions.serializer import from_json as expression_from_json
 from engine.graph_runner.graph_runner import GraphRunner
@@ -61,24 +82,24 @@ def _extract_set_ids(input_data: dict) -> list[str]:
     return set_ids if set_ids else ([set_id] if set_id else [])
 
 
+def _llm_providers_from_secret_keys(secret_keys: list[str]) -> list[str]:
+    organization_llm_providers = [secret_key.split("_")[0] for secret_key in secret_keys]
+    # TODO: Remove when add from front side
+    organization_llm_providers.append("custom_llm")
+
+    return organization_llm_providers
+
+
 def get_organization_llm_providers(session: Session, organization_id: UUID) -> list[str]:
     organization_secrets = get_organization_secrets(
         session,
         organization_id=organization_id,
     )
-    organization_secrets = (
-        [
-            organization_secret.key.split("_")[0]
-            for organization_secret in organization_secrets
-            if organization_secret.secret_type == OrgSecretType.LLM_API_KEY
-        ]
-        if organization_secrets
-        else []
-    )
-    # TODO: Remove when add from front side
-    organization_secrets.append("custom_llm")
-
-    return organization_secrets
+    return _llm_providers_from_secret_keys([
+        organization_secret.key
+        for organization_secret in organization_secrets or []
+        if organization_secret.secret_type == OrgSecretType.LLM_API_KEY
+    ])
 
 
 def setup_tracing_context(
@@ -102,17 +123,66 @@ def setup_tracing_context(
     return project_details.organization_id, organization_llm_providers
 
 
+async def setup_tracing_context_async(
+    session: AsyncSession,
+    project_id: UUID,
+    **additional_tracing_params,
+) -> tuple[UUID, list[str]]:
+    """setup_tracing_context on the async session of the run hot path."""
+    project = await get_project_async(session, project_id)
+    if not project:
+        raise ProjectNotFound(project_id)
+
+    organization_llm_providers = _llm_providers_from_secret_keys(
+        await list_organization_secret_keys_async(session, project.organization_id, OrgSecretType.LLM_API_KEY)
+    )
+
+    set_tracing_span(
+        project_id=str(project_id),
+        organization_id=str(project.organization_id),
+        organization_llm_providers=organization_llm_providers,
+        **additional_tracing_params,
+    )
+
+    return project.organization_id, organization_llm_providers
+
+
+@dataclass
+class GraphTopology:
+    """Nodes, edges and field expressions of a graph runner, loaded before its components are instantiated."""
+
+    component_nodes: list[ComponentNodeDTO]
+    edges: list[GraphRunnerEdge]
+    # Input port instances that have a field expression, by component instance
+    expression_ports: dict[UUID, list[InputPortInstance]] = field(default_factory=dict)
+
+
+async def load_graph_topology_async(session: AsyncSession, graph_runner_id: UUID) -> GraphTopology:
+    component_nodes = await get_component_nodes_async(session, graph_runner_id)
+    edges = await get_edges_async(session, graph_runner_id)
+    expression_ports: dict[UUID, list[InputPortInstance]] = {}
+    for input_port_instance in await get_input_port_instances_with_field_expressions_async(
+        session, [node.id for node in component_nodes]
+    ):
+        expression_ports.setdefault(input_port_instance.component_instance_id, []).append(input_port_instance)
+    return GraphTopology(component_nodes=component_nodes, edges=edges, expression_ports=expression_ports)
+
+
 async def build_graph_runner(
     session: Session,
     graph_runner_id: UUID,
     project_id: UUID,
     variables: dict[str, Any] | None = None,
     event_callback=None,
+    topology: Optional[GraphTopology] = None,
 ) -> GraphRunner:
     trace_manager = get_trace_manager()
     # TODO: Add the get_graph_runner_nodes function when we will handle nested graphs
-    component_nodes = get_component_nodes(session, graph_runner_id)
-    edges = get_edges(session, graph_runner_id)
+    if topology is not None:
+        component_nodes, edges = topology.component_nodes, topology.edges
+    else:
+        component_nodes = get_component_nodes(session, graph_runner_id)
+        edges = get_edges(session, graph_runner_id)
 
     trigger_node_ids = {str(node.id) for node in component_nodes if node.is_trigger}
 
@@ -148,9 +218,12 @@ async def build_graph_runner(
     component_instance_ids = [node.id for node in reachable_component_nodes]
     expressions: list[GraphRunner.ExpressionSpec] = []
     for component_instance_id in component_instance_ids:
-        input_port_instances = get_input_port_instances_for_component_instance(
-            session, component_instance_id, eager_load_field_expression=True
-        )
+        if topology is not None:
+            input_port_instances = topology.expression_ports.get(component_instance_id, [])
+        else:
+            input_port_instances = get_input_port_instances_for_component_instance(
+                session, component_instance_id, eager_load_field_expression=True
+            )
         for input_port_instance in input_port_instances:
             if input_port_instance.field_expression and input_port_instance.field_expression.expression_json:
                 expression_ast = expression_from_json(input_port_instance.field_expression.expression_json)
@@ -198,21 +271,23 @@ async def get_agent_for_project(
     project_id: UUID,
     variables: dict[str, Any] | None = None,
     event_callback=None,
+    topology: Optional[GraphTopology] = None,
 ) -> GraphRunner:
-    project = get_project(session, project_id=project_id)
-    if not project:
-        raise ProjectNotFound(project_id)
+    if topology is None:
+        project = get_project(session, project_id=project_id)
+        if not project:
+            raise ProjectNotFound(project_id)
+        if not graph_runner_exists(session, graph_id=graph_runner_id):
+            raise GraphNotFound(graph_runner_id)
 
-    if graph_runner_exists(session, graph_id=graph_runner_id):
-        return await build_graph_runner(
-            session,
-            graph_runner_id,
-            project_id,
-            variables=variables,
-            event_callback=event_callback,
-        )
-    else:
-        raise GraphNotFound(graph_runner_id)
+    return await build_graph_runner(
+        session,
+        graph_runner_id,
+        project_id,
+        variables=variables,
+        event_callback=event_callback,
+        topology=topology,
+    )
 
 
 async def run_env_agent(
@@ -225,13 +300,13 @@ async def run_env_agent(
     graph_runner_id: Optional[UUID] = None,
 ) -> ChatResponse:
     set_ids = _extract_set_ids(input_data)
-    with get_db_session() as session:
+    async with get_async_db_session() as session:
         if graph_runner_id is not None:
-            graph_runner = session.get(GraphRunnerModel, graph_runner_id)
+            graph_runner = await session.get(GraphRunnerModel, graph_runner_id)
             if not graph_runner:
                 raise EnvironmentNotFound(project_id, env.value)
         else:
-            graph_runner = get_graph_runner_for_env(session=session, project_id=project_id, env=env)
+            graph_runner = await get_graph_runner_for_env_async(session=session, project_id=project_id, env=env)
             if not graph_runner:
                 raise EnvironmentNotFound(project_id, env.value)
             graph_runner_id = graph_runner.id
@@ -263,24 +338,25 @@ async def run_agent(
     if set_ids is None:
         set_ids = _extract_set_ids(input_data)
 
-    # Short-lived session for setup queries — freed before graph building begins.
-    with get_db_session() as session:
-        project_details = get_project_with_details(session, project_id=project_id)
-        if not project_details:
+    # Setup queries and the graph topology go through the async pool: they do not block the event loop,
+    # and the connection is returned before the components are built.
+    async with get_async_db_session() as session:
+        project = await get_project_async(session, project_id)
+        if not project:
             raise ProjectNotFound(project_id)
 
-        organization_id = project_details.organization_id
+        organization_id = project.organization_id
 
-        variables = resolve_variables(session, organization_id, set_ids, project_id=project_id)
+        variables = await resolve_variables_async(session, organization_id, set_ids, project_id=project_id)
         set_run_variables(variables)
 
         today = datetime.now()
-        organization_limit = get_organization_limit(
+        organization_limit = await get_organization_limit_async(
             session=session,
             organization_id=organization_id,
         )
         if organization_limit and organization_limit.limit is not None:
-            current_usage = get_organization_total_credits(
+            current_usage = await get_organization_total_credits_async(
                 session,
                 organization_id,
                 today.year,
@@ -299,7 +375,7 @@ async def run_agent(
 
         save_input_files_to_temp_folder(input_data, uuid_for_temp_folder)
 
-        setup_tracing_context(
+        await setup_tracing_context_async(
             session=session,
             project_id=project_id,
             conversation_id=conversation_id,
@@ -309,10 +385,14 @@ async def run_agent(
             graph_runner_id=graph_runner_id,
             tag_name=tag_name,
         )
+
+        if not await graph_runner_exists_async(session, graph_id=graph_runner_id):
+            raise GraphNotFound(graph_runner_id)
+        topology = await load_graph_topology_async(session, graph_runner_id)
     # Setup session freed — DB connection returned to pool before graph building.
 
-    # Separate short-lived session for graph building (component instantiation may make
-    # external API calls, so keep it isolated from the setup session above).
+    # Separate short-lived session for component instantiation (it may make external API calls, and the
+    # component factories are synchronous, so it stays on the sync session).
     with get_db_session() as session:
         agent = await get_agent_for_project(
             session,
@@ -320,6 +400,7 @@ async def run_agent(
             graph_runner_id=graph_runner_id,
             variables=variables,
             event_callback=event_callback,
+            topology=topology,
         )
     # Graph session freed — DB connection returned to pool before LLM execution.
     try:
@@ -6,6 +6,7 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 
 from ada_backend.database.models import ApiKeyType, OrgApiKey, ProjectApiKey
+from ada_backend.database.setup_db import get_db_session
 from ada_backend.mixpanel_analytics import track_api_key_generated
 from ada_backend.repositories.api_key_repository import (
     create_api_key,
@@ -21,8 +22,12 @@ from ada_backend.schemas.auth_schema import (
     ApiKeyGetResponse,
     VerifiedApiKey,
 )
-from ada_backend.services.errors import ApiKeyAccessDenied, InvalidApiKey
-from ada_backend.services.project_service import get_project_by_id
+from ada_backend.services.auth_cache_service import (
+    get_or_verify_api_key,
+    get_project_organization_id,
+    invalidate_api_key,
+)
+from ada_backend.services.errors import ApiKeyAccessDenied, InvalidApiKey, ProjectNotFound
 from settings import settings
 
 API_KEY_PREFIX = "taylor_"
@@ -149,13 +154,28 @@ def verify_api_key(session: Session, private_key: str) -> VerifiedApiKey:
     raise ValueError(f"Unsupported API key scope: {api_key.type!r}")
 
 
+def _verify_api_key_in_new_session(private_key: str) -> VerifiedApiKey:
+    with get_db_session() as session:
+        return verify_api_key(session, private_key)
+
+
+def verify_api_key_cached(private_key: str) -> VerifiedApiKey:
+    """
+    verify_api_key, reusing the verifications of the last AUTH_CACHE_TTL_SECONDS. On a miss the lookup uses a
+    short-lived session; deactivated keys are dropped from the cache right away.
+    """
+    return get_or_verify_api_key(private_key, _verify_api_key_in_new_session)
+
+
 def deactivate_api_key_service(
     session: Session,
     key_id: UUID,
     revoker_user_id: UUID,
 ) -> UUID:
     """Service function to deactivate an API key."""
-    return deactivate_api_key(session, key_id, revoker_user_id)
+    deactivated_key_id = deactivate_api_key(session, key_id, revoker_user_id)
+    invalidate_api_key(key_id)
+    return deactivated_key_id
 
 
 def verify_ingestion_api_key(
@@ -177,8 +197,10 @@ def verify_project_access(
         if verified_api_key.project_id != project_id:
             raise ApiKeyAccessDenied("project")
     elif verified_api_key.organization_id:
-        project = get_project_by_id(session, project_id)
-        if project.organization_id != verified_api_key.organization_id:
+        organization_id = get_project_organization_id(session, project_id)
+        if organization_id is None:
+            raise ProjectNotFound(project_id)
+        if organization_id != verified_api_key.organization_id:
             raise ApiKeyAccessDenied("organization")
     else:
         raise InvalidApiKey()
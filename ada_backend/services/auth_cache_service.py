@@ -0,0 +1,285 @@
+"""
+Short-lived, size-bounded caches of the authentication checks made on every request: API key verification,
+Supabase token validation, project -> organization lookups and organization roles.
+
+Revocations (API key deactivated, project deleted) drop the entries of this process and are published on
+Redis so that the other processes drop theirs; changes made outside of the backend (Supabase roles,
+memberships) are picked up when the entries expire.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+from uuid import UUID
+
+import jwt
+from cachetools import Cache, TLRUCache, TTLCache
+from sqlalchemy.orm import Session
+
+from ada_backend.repositories.project_repository import get_project
+from ada_backend.schemas.auth_schema import OrganizationAccess, SupabaseUser, VerifiedApiKey
+from settings import settings
+
+LOGGER = logging.getLogger(__name__)
+
+AUTH_CACHE_TTL_SECONDS = settings.AUTH_CACHE_TTL_SECONDS
+AUTH_CACHE_MAX_ENTRIES = settings.AUTH_CACHE_MAX_ENTRIES
+SUPABASE_JWT_SECRET = settings.SUPABASE_JWT_SECRET
+
+# Audience of the access tokens issued by Supabase Auth to signed-in users
+_SUPABASE_JWT_AUDIENCE = "authenticated"
+_JWKS_LIFESPAN_SECONDS = 600
+
+
+class _LockedCache:
+    """cachetools caches are not thread-safe: the dependencies run on the event loop and in worker threads."""
+
+    def __init__(self, cache: Cache) -> None:
+        self._cache = cache
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._cache[key] = value
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def pop_matching(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        with self._lock:
+            for key in [key for key, value in self._cache.items() if predicate(key, value)]:
+                self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+def _ttl_cache() -> _LockedCache:
+    return _LockedCache(TTLCache(maxsize=AUTH_CACHE_MAX_ENTRIES, ttl=AUTH_CACHE_TTL_SECONDS))
+
+
+def _supabase_user_ttu(_key: str, value: tuple[SupabaseUser, Optional[float]], now: float) -> float:
+    # Entries never outlive the token: the expiry is a wall-clock timestamp, the cache timer is monotonic
+    _user, expires_at = value
+    if expires_at is None:
+        return now + AUTH_CACHE_TTL_SECONDS
+    return now + min(AUTH_CACHE_TTL_SECONDS, expires_at - time.time())
+
+
+# Keyed by a digest of the presented key, so that a hit needs neither BACKEND_SECRET_KEY nor the database
+_verified_api_keys = _ttl_cache()
+# Keyed by a digest of the token
+_supabase_users = _LockedCache(TLRUCache(maxsize=AUTH_CACHE_MAX_ENTRIES, ttu=_supabase_user_ttu))
+_project_organizations = _ttl_cache()
+_organization_accesses = _ttl_cache()
+_super_admins = _ttl_cache()
+
+_jwks_client: Optional[jwt.PyJWKClient] = None
+_jwks_client_lock = threading.Lock()
+
+
+def _digest(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+def get_or_verify_api_key(private_key: str, verify: Callable[[str], VerifiedApiKey]) -> VerifiedApiKey:
+    """Return the verification of the key made in the last AUTH_CACHE_TTL_SECONDS, or verify it now."""
+    cache_key = _digest(private_key)
+    verified_api_key = _verified_api_keys.get(cache_key)
+    if verified_api_key is None:
+        verified_api_key = verify(private_key)
+        _verified_api_keys.set(cache_key, verified_api_key)
+    return verified_api_key
+
+
+def get_cached_supabase_user(token: str) -> Optional[SupabaseUser]:
+    cached = _supabase_users.get(_digest(token))
+    return cached[0] if cached is not None else None
+
+
+def cache_supabase_user(token: str, user: SupabaseUser, expires_at: Optional[float]) -> None:
+    if expires_at is not None and expires_at <= time.time():
+        return
+    _supabase_users.set(_digest(token), (user, expires_at))
+
+
+def _get_jwks_client() -> jwt.PyJWKClient:
+    global _jwks_client
+    with _jwks_client_lock:
+        if _jwks_client is None:
+            _jwks_client = jwt.PyJWKClient(
+                f"{settings.SUPABASE_PROJECT_URL}/auth/v1/.well-known/jwks.json",
+                cache_jwk_set=True,
+                lifespan=_JWKS_LIFESPAN_SECONDS,
+            )
+        return _jwks_client
+
+
+def get_unverified_token_expiry(token: str) -> Optional[float]:
+    """The exp claim of a token validated elsewhere, only used to bound how long it stays cached."""
+    try:
+        expires_at = jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except jwt.PyJWTError:
+        return None
+    return float(expires_at) if isinstance(expires_at, (int, float)) else None
+
+
+def verify_supabase_token_locally(token: str) -> Optional[tuple[SupabaseUser, float]]:
+    """
+    Verify the signature and expiry of a Supabase access token with the project signing keys (JWKS, cached by
+    the client) or the legacy shared secret, and return the user with the token expiry.
+
+    Returns None when the token cannot be verified here (unknown signing key, no shared secret, claims of another
+    kind of token): the caller then asks Supabase. Raises jwt.PyJWTError when the token is expired or forged.
+    """
+    algorithm = jwt.get_unverified_header(token).get("alg")
+    if algorithm == "HS256":
+        key = SUPABASE_JWT_SECRET
+        if not key:
+            return None
+    elif algorithm in ("RS256", "ES256"):
+        try:
+            key = _get_jwks_client().get_signing_key_from_jwt(token).key
+        except jwt.PyJWKClientError as e:
+            LOGGER.warning(f"Could not get the signing key of the Supabase token: {e}")
+            return None
+    else:
+        return None
+
+    try:
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=_SUPABASE_JWT_AUDIENCE,
+            options={"require": ["exp", "sub"]},
+        )
+    except (jwt.InvalidAudienceError, jwt.MissingRequiredClaimError):
+        return None
+    return SupabaseUser(id=UUID(claims["sub"]), email=claims.get("email") or "", token=token), float(claims["exp"])
+
+
+def get_project_organization_id(session: Session, project_id: UUID) -> Optional[UUID]:
+    """Organization of the project, None when the project does not exist."""
+    organization_id = _project_organizations.get(project_id)
+    if organization_id is None:
+        project = get_project(session, project_id)
+        if not project:
+            return None
+        organization_id = project.organization_id
+        _project_organizations.set(project_id, organization_id)
+    return organization_id
+
+
+def get_cached_organization_access(user_id: UUID, organization_id: UUID) -> Optional[OrganizationAccess]:
+    return _organization_accesses.get((user_id, organization_id))
+
+
+def cache_organization_access(user_id: UUID, access: OrganizationAccess) -> None:
+    _organization_accesses.set((user_id, access.org_id), access)
+
+
+def get_cached_super_admin(user_id: UUID) -> Optional[bool]:
+    return _super_admins.get(user_id)
+
+
+def cache_super_admin(user_id: UUID, is_super_admin: bool) -> None:
+    _super_admins.set(user_id, is_super_admin)
+
+
+def _drop_api_key(api_key_id: UUID) -> None:
+    _verified_api_keys.pop_matching(lambda _key, verified: verified.api_key_id == api_key_id)
+
+
+def _drop_project(project_id: UUID) -> None:
+    _project_organizations.pop(project_id)
+    _verified_api_keys.pop_matching(lambda _key, verified: verified.project_id == project_id)
+
+
+def clear_auth_caches() -> None:
+    for cache in (_verified_api_keys, _supabase_users, _project_organizations, _organization_accesses, _super_admins):
+        cache.clear()
+
+
+_INVALIDATION_HANDLERS: dict[str, Callable[[UUID], None]] = {
+    "api_key": _drop_api_key,
+    "project": _drop_project,
+}
+
+
+def _publish_invalidation(kind: str, resource_id: UUID) -> None:
+    # Imported here: redis_client imports the ingestion schemas, which import the engine components
+    from ada_backend.utils.redis_client import publish_auth_invalidation
+
+    publish_auth_invalidation({"kind": kind, "id": str(resource_id)})
+
+
+def invalidate_api_key(api_key_id: UUID) -> None:
+    """Forget the verification of a deactivated API key, in every process."""
+    _drop_api_key(api_key_id)
+    _publish_invalidation("api_key", api_key_id)
+
+
+def invalidate_project(project_id: UUID) -> None:
+    """Forget a deleted project and the verification of its API keys, in every process."""
+    _drop_project(project_id)
+    _publish_invalidation("project", project_id)
+
+
+def handle_auth_invalidation(data: Any) -> None:
+    try:
+        event = json.loads(data)
+        handler = _INVALIDATION_HANDLERS[event["kind"]]
+        resource_id = UUID(event["id"])
+    except (TypeError, ValueError, KeyError) as e:
+        LOGGER.warning(f"Ignoring malformed auth invalidation {data!r}: {e}")
+        return
+    handler(resource_id)
+
+
+def _auth_invalidation_listener_loop(stop_event: threading.Event) -> None:
+    from ada_backend.utils.redis_client import AUTH_INVALIDATION_CHANNEL, get_redis_client, reset_redis_client
+
+    while not stop_event.is_set():
+        client = get_redis_client()
+        if not client:
+            stop_event.wait(AUTH_CACHE_TTL_SECONDS)
+            continue
+        pubsub = client.pubsub()
+        try:
+            pubsub.subscribe(AUTH_INVALIDATION_CHANNEL)
+            # Invalidations published while this process was not subscribed are lost
+            clear_auth_caches()
+            while not stop_event.is_set():
+                message = pubsub.get_message(timeout=1.0)
+                if message and message.get("type") == "message":
+                    handle_auth_invalidation(message.get("data"))
+        except Exception as e:
+            LOGGER.error(f"Auth invalidation listener lost its subscription: {e}")
+            reset_redis_client()
+            stop_event.wait(1.0)
+        finally:
+            try:
+                pubsub.close()
+            except Exception as e:
+                LOGGER.debug(f"PubSub cleanup for {AUTH_INVALIDATION_CHANNEL}: {e}")
+
+
+def start_auth_invalidation_listener_thread(stop_event: threading.Event) -> threading.Thread:
+    thread = threading.Thread(
+        target=_auth_invalidation_listener_loop,
+        args=(stop_event,),
+        name="auth-invalidation-listener",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -5,7 +5,6 @@ from typing import List
 from uuid import UUID, uuid4
 
 import numpy as np
-import pandas as pd
 import requests
 from sqlalchemy.orm import Session
 
@@ -13,15 +12,9 @@ from ada_backend.database.models import CallType
 from ada_backend.repositories.credits_repository import get_organization_limit, get_organization_total_credits
 from ada_backend.schemas.chart_schema import Chart, ChartCategory, ChartData, ChartsResponse, ChartType, Dataset
 from ada_backend.services.metrics.rank_charts import get_ranks_distribution_charts
-from ada_backend.services.metrics.utils import (
-    calculate_calls_per_day,
-    count_conversations_per_day,
-    query_trace_duration,
-)
+from ada_backend.services.metrics.utils import TOKENS_DISTRIBUTION_BINS, ChartAggregates, query_chart_aggregates
 from settings import settings
 
-TOKENS_DISTRIBUTION_BINS = [0, 1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000, 9000, 10000]
-
 
 def calculate_prometheus_step(duration_days: int, target_points: int = 200) -> str:
     duration_seconds = duration_days * 24 * 60 * 60
@@ -95,44 +88,13 @@ def get_prometheus_agent_calls_chart(project_id: UUID, duration_days: int) -> Ch
 
 
 def get_agent_usage_chart(
-    project_ids: List[UUID], duration_days: int, call_type: CallType | None = None
+    project_ids: List[UUID],
+    duration_days: int,
+    call_type: CallType | None = None,
+    aggregates: ChartAggregates | None = None,
 ) -> list[Chart]:
-    current_date = datetime.now(tz=timezone.utc)
-    start_date = current_date - timedelta(days=duration_days)
-    all_dates_df = pd.DataFrame(
-        pd.date_range(start=start_date.date(), end=current_date.date(), freq="D", tz=timezone.utc), columns=["date"]
-    )
-
-    df = query_trace_duration(project_ids, duration_days, call_type)
-    df["date"] = pd.to_datetime(df["start_time"]).dt.normalize()
-    datasets = []
-
-    agent_usage = calculate_calls_per_day(df, all_dates_df)
-    datasets.append(Dataset(label="Number of calls per day", data=agent_usage["count"].tolist()))
-
-    conversation_id_usage = count_conversations_per_day(df, all_dates_df)
-    datasets.append(
-        Dataset(
-            label="Number of conversations per day", data=conversation_id_usage["unique_conversation_ids"].tolist()
-        )
-    )
-
-    # Calculate token usage
-    df[["llm_token_count_prompt", "llm_token_count_completion"]] = df[
-        ["llm_token_count_prompt", "llm_token_count_completion"]
-    ].fillna(0)
-    token_usage = (
-        df
-        .groupby("date")[["llm_token_count_prompt", "llm_token_count_completion"]]
-        .sum()
-        .reset_index()
-        .rename(columns={"llm_token_count_prompt": "input_tokens", "llm_token_count_completion": "output_tokens"})
-    )
-    token_usage = pd.merge(all_dates_df, token_usage, on="date", how="left").fillna(0)
-    token_usage[["input_tokens", "output_tokens"]] = token_usage[["input_tokens", "output_tokens"]].astype(int)
-    token_usage["date"] = pd.to_datetime(token_usage["date"]).dt.date
-    token_usage = token_usage.sort_values(by="date", ascending=True)
-    token_usage["date"] = token_usage["date"].astype(str)
+    if aggregates is None:
+        aggregates = query_chart_aggregates(project_ids, duration_days, call_type)
 
     chart_id = str(uuid4())
 
@@ -142,8 +104,11 @@ def get_agent_usage_chart(
             type=ChartType.LINE,
             title="Agent Usage",
             data=ChartData(
-                labels=agent_usage["date"].tolist(),
-                datasets=datasets,
+                labels=aggregates.days,
+                datasets=[
+                    Dataset(label="Number of calls per day", data=aggregates.calls_per_day),
+                    Dataset(label="Number of conversations per day", data=aggregates.conversations_per_day),
+                ],
             ),
             x_axis_type="datetime",
             category=ChartCategory.GENERAL,
@@ -153,16 +118,16 @@ def get_agent_usage_chart(
             type=ChartType.LINE,
             title="Token Usage",
             data=ChartData(
-                labels=agent_usage["date"].tolist(),
+                labels=aggregates.days,
                 datasets=[
                     Dataset(
                         label="Input tokens per day",
-                        data=token_usage["input_tokens"].tolist(),
+                        data=aggregates.input_tokens_per_day,
                         borderColor="#FF5733",
                     ),
                     Dataset(
                         label="Output tokens per day",
-                        data=token_usage["output_tokens"].tolist(),
+                        data=aggregates.output_tokens_per_day,
                         borderColor="#33FF57",
                     ),
                 ],
@@ -173,14 +138,15 @@ def get_agent_usage_chart(
     ]
 
 
-def get_latence_chart(project_ids: List[UUID], duration_days: int, call_type: CallType | None = None) -> Chart:
-    df = query_trace_duration(project_ids, duration_days, call_type)
-    df = df[df["parent_id"].isna()]
-    df["start_time"] = pd.to_datetime(df["start_time"])
-    df["end_time"] = pd.to_datetime(df["end_time"])
-    df["duration"] = (df["end_time"] - df["start_time"]).dt.total_seconds()
-
-    latency_hist, bins_edges = np.histogram(df["duration"], bins="fd")
+def get_latence_chart(
+    project_ids: List[UUID],
+    duration_days: int,
+    call_type: CallType | None = None,
+    aggregates: ChartAggregates | None = None,
+) -> Chart:
+    if aggregates is None:
+        aggregates = query_chart_aggregates(project_ids, duration_days, call_type)
+    bins_edges = aggregates.latency_bin_edges
     bin_centers = [np.round((bins_edges[i] + bins_edges[i + 1]) / 2, 1) for i in range(len(bins_edges) - 1)]
 
     chart_id_suffix = str(uuid4())
@@ -192,7 +158,7 @@ def get_latence_chart(project_ids: List[UUID], duration_days: int, call_type: Ca
         data=ChartData(
             labels=bin_centers,
             datasets=[
-                Dataset(label="Latency Distribution", data=latency_hist.tolist()),
+                Dataset(label="Latency Distribution", data=aggregates.latency_counts),
             ],
         ),
         category=ChartCategory.GENERAL,
@@ -200,14 +166,13 @@ def get_latence_chart(project_ids: List[UUID], duration_days: int, call_type: Ca
 
 
 def get_tokens_distribution_chart(
-    project_ids: List[UUID], duration_days: int, call_type: CallType | None = None
+    project_ids: List[UUID],
+    duration_days: int,
+    call_type: CallType | None = None,
+    aggregates: ChartAggregates | None = None,
 ) -> Chart:
-    df = query_trace_duration(project_ids, duration_days, call_type)
-    input_data = df[df["llm_token_count_prompt"].notna()]["llm_token_count_prompt"]
-    output_data = df[df["llm_token_count_completion"].notna()]["llm_token_count_completion"]
-
-    input_token_hist, _ = np.histogram(input_data, bins=TOKENS_DISTRIBUTION_BINS)
-    output_token_hist, _ = np.histogram(output_data, bins=TOKENS_DISTRIBUTION_BINS)
+    if aggregates is None:
+        aggregates = query_chart_aggregates(project_ids, duration_days, call_type)
     bin_centers = [
         (TOKENS_DISTRIBUTION_BINS[i] + TOKENS_DISTRIBUTION_BINS[i + 1]) / 2
         for i in range(len(TOKENS_DISTRIBUTION_BINS) - 1)
@@ -222,8 +187,8 @@ def get_tokens_distribution_chart(
         data=ChartData(
             labels=bin_centers,
             datasets=[
-                Dataset(label="Input Tokens Distribution", data=input_token_hist.tolist()),
-                Dataset(label="Output Tokens Distribution", data=output_token_hist.tolist()),
+                Dataset(label="Input Tokens Distribution", data=aggregates.input_tokens_counts),
+                Dataset(label="Output Tokens Distribution", data=aggregates.output_tokens_counts),
             ],
         ),
         category=ChartCategory.GENERAL,
@@ -279,13 +244,14 @@ async def get_charts_by_projects(
     duration_days: int,
     call_type: CallType | None = None,
 ) -> ChartsResponse:
-    charts = get_agent_usage_chart(project_ids, duration_days, call_type) + [
-        get_latence_chart(project_ids, duration_days, call_type),
+    aggregates = query_chart_aggregates(project_ids, duration_days, call_type)
+    charts = get_agent_usage_chart(project_ids, duration_days, call_type, aggregates=aggregates) + [
+        get_latence_chart(project_ids, duration_days, call_type, aggregates=aggregates),
         # get_prometheus_agent_calls_chart(project_id, duration_days),
-        get_tokens_distribution_chart(project_ids, duration_days, call_type),
+        get_tokens_distribution_chart(project_ids, duration_days, call_type, aggregates=aggregates),
     ]
 
-    charts.extend(get_ranks_distribution_charts(project_ids, duration_days, call_type))
+    charts.extend(get_ranks_distribution_charts(project_ids, duration_days, call_type, aggregates=aggregates))
 
     response = ChartsResponse(charts=charts)
     if len(response.charts) == 0:
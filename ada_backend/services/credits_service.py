@@ -20,6 +20,7 @@ from ada_backend.services.errors import (
     ComponentVersionCostNotFound,
     OrganizationLimitNotFound,
 )
+from engine.trace.credit_calculator import notify_cost_tables_changed
 
 
 def upsert_component_version_cost_service(
@@ -36,11 +37,13 @@ def upsert_component_version_cost_service(
     )
     if component_cost is None:
         raise ComponentVersionCostNotFound(component_version_id)
+    notify_cost_tables_changed()
     return ComponentVersionCostResponse.model_validate(component_cost, from_attributes=True)
 
 
 def delete_component_version_cost_service(session: Session, component_version_id: UUID) -> None:
-    return delete_component_version_cost(session, component_version_id)
+    delete_component_version_cost(session, component_version_id)
+    notify_cost_tables_changed()
 
 
 def create_organization_limit_service(
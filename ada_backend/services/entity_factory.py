@@ -29,6 +29,8 @@ from ada_backend.services.llm_models_service import (
 )
 from engine.components.rag.cohere_reranker import CohereReranker
 from engine.components.rag.formatter import Formatter
+from engine.components.rag.local_reranker import DEFAULT_LOCAL_RERANKER_MODEL, LocalCrossEncoderReranker
+from engine.components.rag.reranker import RerankerBackend
 from engine.components.rag.retriever import Retriever
 from engine.components.rag.vocabulary_search import VocabularySearch
 from engine.components.synthesizer import Synthesizer
@@ -40,6 +42,7 @@ from engine.qdrant_service import QdrantCollectionSchema, QdrantService
 from engine.secret_utils import unwrap_secret, unwrap_secrets
 from engine.storage_service.local_service import SQLLocalService
 from engine.trace.trace_context import get_trace_manager
+from settings import settings
 
 LOGGER = logging.getLogger(__name__)
 
@@ -1030,7 +1033,8 @@ def build_synthesizer_processor(target_name: str = "synthesizer") -> ParameterPr
 
 def build_reranker_processor(target_name: str = "reranker") -> ParameterProcessor:
     """
-    Creates a processor that builds a CohereReranker from reranker-specific parameters.
+    Creates a processor that builds a CohereReranker from reranker-specific parameters,
+    or a LocalCrossEncoderReranker when RERANKER_BACKEND is "local".
     Only creates the reranker if use_reranker is True.
 
     Args:
@@ -1063,11 +1067,20 @@ def build_reranker_processor(target_name: str = "reranker") -> ParameterProcesso
 
         reranker_params = {**validated_params}
 
-        reranker = CohereReranker(
-            trace_manager=get_trace_manager(),
-            component_attributes=None,
-            **reranker_params,
-        )
+        if RerankerBackend(settings.RERANKER_BACKEND) == RerankerBackend.LOCAL:
+            reranker_params.pop("cohere_model")
+            reranker = LocalCrossEncoderReranker(
+                trace_manager=get_trace_manager(),
+                component_attributes=None,
+                model_name=settings.LOCAL_RERANKER_MODEL or DEFAULT_LOCAL_RERANKER_MODEL,
+                **reranker_params,
+            )
+        else:
+            reranker = CohereReranker(
+                trace_manager=get_trace_manager(),
+                component_attributes=None,
+                **reranker_params,
+            )
 
         params[target_name] = reranker
         return params
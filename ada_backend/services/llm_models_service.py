@@ -22,6 +22,7 @@ from ada_backend.schemas.llm_models_schema import (
     ModelCapabilityOption,
 )
 from ada_backend.services.errors import LLMModelNotFound
+from engine.trace.credit_calculator import notify_cost_tables_changed
 
 
 def get_model_capabilities_service() -> ModelCapabilitiesResponse:
@@ -129,6 +130,7 @@ def create_llm_model_service(
         credits_per_input_token=llm_model_data.credits_per_input_token,
         credits_per_output_token=llm_model_data.credits_per_output_token,
     )
+    notify_cost_tables_changed()
 
     return LLMModelResponse.model_validate(created_llm_model)
 
@@ -136,6 +138,7 @@ def create_llm_model_service(
 def delete_llm_model_service(session: Session, llm_model_id: UUID) -> None:
     delete_llm_cost(session, llm_model_id)
     delete_llm_model(session, llm_model_id)
+    notify_cost_tables_changed()
 
 
 def update_llm_model_service(
@@ -161,6 +164,7 @@ def update_llm_model_service(
         credits_per_input_token=llm_model_data.credits_per_input_token,
         credits_per_output_token=llm_model_data.credits_per_output_token,
     )
+    notify_cost_tables_changed()
 
     return LLMModelResponse.model_validate(updated_llm_model)
 
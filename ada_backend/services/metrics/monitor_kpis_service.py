@@ -1,5 +1,5 @@
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 from uuid import UUID
 
@@ -8,6 +8,7 @@ from sqlalchemy import text
 
 from ada_backend.database.models import CallType
 from ada_backend.mixpanel_analytics import track_monitoring_loaded
+from ada_backend.repositories.trace_rollup_repository import rollup_bucket_start
 from ada_backend.schemas.monitor_schema import (
     KPI,
     CostKPI,
@@ -18,7 +19,7 @@ from ada_backend.schemas.monitor_schema import (
     OrgTokenUsageTotals,
     TraceKPIS,
 )
-from ada_backend.services.metrics.utils import QUERY_COSTS_BASIS, SQL_COST_KPIS_ROUNDED_TAIL
+from ada_backend.services.metrics.utils import SQL_COST_KPIS_ROUNDED_TAIL
 from engine.trace.sql_exporter import get_session_trace
 
 LOGGER = logging.getLogger(__name__)
@@ -26,6 +27,22 @@ LOGGER = logging.getLogger(__name__)
 SIGNIFICANT_FIGURES_CREDIT_FORMAT = 2
 
 
+def _month_range_filters(years: list[int], months: list[int] | None, params: dict[str, object]) -> str:
+    """Bucket ranges of the requested months, so that the rollup index on bucket_start is used."""
+    ranges = []
+    for year in years:
+        for month in months if months is not None else [None]:
+            index = len(ranges)
+            params[f"range_start_{index}"] = datetime(year, month or 1, 1, tzinfo=timezone.utc)
+            params[f"range_end_{index}"] = (
+                datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+                if month in (None, 12)
+                else datetime(year, month + 1, 1, tzinfo=timezone.utc)
+            )
+            ranges.append(f"(r.bucket_start >= :range_start_{index} AND r.bucket_start < :range_end_{index})")
+    return "(" + " OR ".join(ranges) + ")"
+
+
 def get_org_token_usage(
     organization_id: UUID,
     years: list[int] | None,
@@ -35,34 +52,35 @@ def get_org_token_usage(
     filters = ["p.organization_id = :organization_id"]
     params: dict[str, object] = {"organization_id": organization_id}
     if years is not None:
-        filters.append("EXTRACT(YEAR FROM s.start_time AT TIME ZONE 'UTC')::int = ANY(:years)")
-        params["years"] = years
-    if months is not None:
-        filters.append("EXTRACT(MONTH FROM s.start_time AT TIME ZONE 'UTC')::int = ANY(:months)")
+        if not years or months == []:
+            filters.append("FALSE")
+        else:
+            filters.append(_month_range_filters(years, months, params))
+    elif months is not None:
+        filters.append("EXTRACT(MONTH FROM r.bucket_start AT TIME ZONE 'UTC')::int = ANY(:months)")
         params["months"] = months
 
     query = text(
         f"""
         SELECT
-            EXTRACT(YEAR FROM s.start_time AT TIME ZONE 'UTC')::int AS year,
-            EXTRACT(MONTH FROM s.start_time AT TIME ZONE 'UTC')::int AS month,
-            s.model_id,
+            EXTRACT(YEAR FROM r.bucket_start AT TIME ZONE 'UTC')::int AS year,
+            EXTRACT(MONTH FROM r.bucket_start AT TIME ZONE 'UTC')::int AS month,
+            r.model_id,
             lm.provider,
             lm.model_name,
             lm.display_name,
-            COALESCE(SUM(COALESCE(s.llm_token_count_prompt, 0)), 0)::bigint AS input_tokens,
-            COALESCE(SUM(COALESCE(s.llm_token_count_completion, 0)), 0)::bigint AS output_tokens
-        FROM traces.spans s
-        JOIN projects p ON s.project_id = p.id::text
-        LEFT JOIN llm_models lm ON s.model_id = lm.id
+            COALESCE(SUM(r.input_tokens), 0)::bigint AS input_tokens,
+            COALESCE(SUM(r.output_tokens), 0)::bigint AS output_tokens
+        FROM traces.span_rollups r
+        JOIN projects p ON r.project_id = p.id
+        LEFT JOIN llm_models lm ON r.model_id = lm.id
         WHERE {" AND ".join(filters)}
-          AND (s.llm_token_count_prompt IS NOT NULL OR s.llm_token_count_completion IS NOT NULL)
-        GROUP BY year, month, s.model_id, lm.provider, lm.model_name, lm.display_name
+        GROUP BY year, month, r.model_id, lm.provider, lm.model_name, lm.display_name
+        HAVING SUM(r.llm_span_count) > 0
         ORDER BY
             year DESC,
             month DESC,
-            COALESCE(SUM(COALESCE(s.llm_token_count_prompt, 0)), 0) +
-            COALESCE(SUM(COALESCE(s.llm_token_count_completion, 0)), 0) DESC
+            COALESCE(SUM(r.input_tokens), 0) + COALESCE(SUM(r.output_tokens), 0) DESC
         """
     )
     session = get_session_trace()
@@ -147,26 +165,29 @@ def _run_trace_kpis_query(
 
 
 def get_trace_metrics(project_ids: List[UUID], duration_days: int, call_type: CallType | None = None) -> TraceKPIS:
-    """Get trace metrics with comparison between current and previous periods using SQL aggregation."""
-    now = datetime.now()
-    current_start = now - timedelta(days=duration_days)
-    previous_start = now - timedelta(days=2 * duration_days)
+    """
+    Get trace metrics with comparison between current and previous periods from the hourly span rollups.
+    Periods start at the beginning of the hour of their start.
+    """
+    now = datetime.now(tz=timezone.utc)
+    current_start = rollup_bucket_start(now - timedelta(days=duration_days))
+    previous_start = rollup_bucket_start(now - timedelta(days=2 * duration_days))
 
     query = """
     SELECT
         CASE
-            WHEN start_time >= %(current_start)s THEN 'current'
+            WHEN bucket_start >= %(current_start)s THEN 'current'
             ELSE 'previous'
         END as period,
-        COUNT(*) as request_count,
-        COALESCE(SUM(cumulative_llm_token_count_prompt + cumulative_llm_token_count_completion), 0) as total_tokens,
-        AVG(EXTRACT(EPOCH FROM (end_time - start_time))) as avg_latency_seconds
-    FROM traces.spans
-    WHERE start_time >= %(previous_start)s
-    AND parent_id IS NULL
+        SUM(root_span_count) as request_count,
+        SUM(input_tokens + output_tokens) as total_tokens,
+        SUM(root_duration_seconds) / SUM(root_span_count) as avg_latency_seconds
+    FROM traces.span_rollups
+    WHERE bucket_start >= %(previous_start)s
     AND project_id IN ({project_id_placeholders})
     {call_type_filter}
     GROUP BY period
+    HAVING SUM(root_span_count) > 0
     """
     df = _run_trace_kpis_query(
         query, project_ids, call_type, current_start=current_start, previous_start=previous_start
@@ -221,34 +242,30 @@ def get_trace_metrics(project_ids: List[UUID], duration_days: int, call_type: Ca
 
 
 def get_trace_cost_kpis(project_ids: List[UUID], duration_days: int, call_type: CallType | None = None) -> CostKPI:
-    """Get mean cost per run and per conversation over a given period."""
-    now = datetime.now()
-    start_time = now - timedelta(days=duration_days)
-    end_time = now
+    """
+    Get mean cost per run and per conversation over a given period from the hourly rollups.
+    The period starts at the beginning of the hour of its start.
+    """
+    start_time = rollup_bucket_start(datetime.now(tz=timezone.utc) - timedelta(days=duration_days))
 
     query = (
-        QUERY_COSTS_BASIS
-        + """
-         WHERE project_id IN ({project_id_placeholders})
-                AND s.start_time >= %(start_time)s
-                AND s.start_time < %(end_time)s
+        """
+        WITH run_totals AS (
+            SELECT SUM(credits) / NULLIF(SUM(root_span_count), 0) as total_cost_per_run
+            FROM traces.span_rollups
+            WHERE project_id IN ({project_id_placeholders})
+                AND bucket_start >= %(start_time)s
                 {call_type_filter}
-            GROUP BY
-                s.trace_rowid,
-                s.attributes->>'conversation_id'
         ),
         conversation_totals AS (
             SELECT
                 conversation_id,
-                SUM(cost_per_run) as total_cost_per_conversation
-            FROM trace_costs
-            WHERE conversation_id IS NOT NULL
+                SUM(credits) as total_cost_per_conversation
+            FROM traces.conversation_rollups
+            WHERE project_id IN ({project_id_placeholders})
+                AND bucket_start >= %(start_time)s
+                {call_type_filter}
             GROUP BY conversation_id
-        ),
-        run_totals AS (
-            SELECT SUM(cost_per_run) as total_cost_per_run
-            FROM trace_costs
-            GROUP BY trace_rowid
         """
         + SQL_COST_KPIS_ROUNDED_TAIL
     )
@@ -257,7 +274,6 @@ def get_trace_cost_kpis(project_ids: List[UUID], duration_days: int, call_type:
         project_ids,
         call_type,
         start_time=start_time,
-        end_time=end_time,
         significant_figures=SIGNIFICANT_FIGURES_CREDIT_FORMAT,
     )
     mean_cost_per_run = 0
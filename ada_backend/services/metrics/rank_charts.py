@@ -6,7 +6,7 @@ import numpy as np
 
 from ada_backend.database.models import CallType
 from ada_backend.schemas.chart_schema import Chart, ChartCategory, ChartData, ChartType, Dataset
-from ada_backend.services.metrics.utils import query_trace_duration
+from ada_backend.services.metrics.utils import ChartAggregates, query_chart_aggregates
 
 
 def compute_rank_bins(total: int) -> tuple[list[int], list[str]]:
@@ -25,18 +25,17 @@ def compute_rank_bins(total: int) -> tuple[list[int], list[str]]:
 
 
 def _build_rank_chart(
-    ranks: list,
+    rank_counts: dict[int, int],
     total_chunks: int,
     num_queries: int,
     title: str,
     subtitle: str,
     details: str,
 ) -> Chart | None:
-    if not ranks:
+    if not rank_counts:
         return None
-    ranks_array = np.array(ranks)
     bins, labels = compute_rank_bins(total_chunks)
-    hist, _ = np.histogram(ranks_array, bins=bins)
+    hist, _ = np.histogram(list(rank_counts), bins=bins, weights=list(rank_counts.values()))
     bin_widths = [bins[i + 1] - bins[i] for i in range(len(bins) - 1)]
     percentages = (
         [round(count / (width * num_queries) * 100, 1) for count, width in zip(hist, bin_widths)]
@@ -60,64 +59,35 @@ def _build_rank_chart(
     )
 
 
-def _parse_ranks_attribute(attributes: dict, key: str) -> list:
-    try:
-        ranks = attributes[key]
-        if isinstance(ranks, str):
-            ranks = eval(ranks)
-        if isinstance(ranks, list) and ranks:
-            return [r for r in ranks if r is not None]
-    except Exception:
-        pass
-    return []
-
-
 def get_ranks_distribution_charts(
-    project_ids: List[UUID], duration_days: int, call_type: CallType | None = None
+    project_ids: List[UUID],
+    duration_days: int,
+    call_type: CallType | None = None,
+    aggregates: ChartAggregates | None = None,
 ) -> list[Chart]:
-    df = query_trace_duration(project_ids, duration_days, call_type)
-
-    retrieval_ranks = []
-    reranker_ranks = []
-    max_total_retrieved = 0
-    max_total_reranked = 0
-    num_retrieval_queries = 0
-    num_reranker_queries = 0
-
-    for _, row in df.iterrows():
-        attributes = row.get("attributes", {})
-        if not attributes:
-            continue
-
-        if "original_retrieval_rank" in attributes:
-            parsed = _parse_ranks_attribute(attributes, "original_retrieval_rank")
-            if parsed:
-                retrieval_ranks.extend(parsed)
-                num_retrieval_queries += 1
-        if "original_reranker_rank" in attributes:
-            parsed = _parse_ranks_attribute(attributes, "original_reranker_rank")
-            if parsed:
-                reranker_ranks.extend(parsed)
-                num_reranker_queries += 1
-
-        total_retrieved = attributes.get("total_retrieved_chunks")
-        if total_retrieved is not None:
-            max_total_retrieved = max(max_total_retrieved, int(total_retrieved))
-        total_reranked = attributes.get("total_reranked_chunks")
-        if total_reranked is not None:
-            max_total_reranked = max(max_total_reranked, int(total_reranked))
-
-    if not max_total_retrieved and retrieval_ranks:
-        max_total_retrieved = int(np.array(retrieval_ranks).max())
-    if not max_total_reranked and reranker_ranks:
-        max_total_reranked = int(np.array(reranker_ranks).max())
+    if aggregates is None:
+        aggregates = query_chart_aggregates(project_ids, duration_days, call_type)
+
+    retrieval_rank_counts = aggregates.rank_counts.get("retrieval", {})
+    reranker_rank_counts = aggregates.rank_counts.get("reranker", {})
+    num_retrieval_queries = aggregates.rank_queries.get("retrieval", 0)
+    num_reranker_queries = aggregates.rank_queries.get("reranker", 0)
+    num_retrieved_chunks = sum(retrieval_rank_counts.values())
+    num_reranked_chunks = sum(reranker_rank_counts.values())
+    max_total_retrieved = aggregates.max_ranked_chunks.get("retrieval", 0)
+    max_total_reranked = aggregates.max_ranked_chunks.get("reranker", 0)
+
+    if not max_total_retrieved and retrieval_rank_counts:
+        max_total_retrieved = max(retrieval_rank_counts)
+    if not max_total_reranked and reranker_rank_counts:
+        max_total_reranked = max(reranker_rank_counts)
 
     charts = []
 
-    if retrieval_ranks and num_retrieval_queries > 0:
-        avg_chunks_per_query = round(len(retrieval_ranks) / num_retrieval_queries, 1)
+    if retrieval_rank_counts and num_retrieval_queries > 0:
+        avg_chunks_per_query = round(num_retrieved_chunks / num_retrieval_queries, 1)
         retrieval_chart = _build_rank_chart(
-            retrieval_ranks,
+            retrieval_rank_counts,
             max_total_retrieved,
             num_retrieval_queries,
             title="Chunk usage by retriever ranking",
@@ -136,10 +106,10 @@ def get_ranks_distribution_charts(
         if retrieval_chart:
             charts.append(retrieval_chart)
 
-    if reranker_ranks and num_reranker_queries > 0:
-        avg_chunks_per_query = round(len(reranker_ranks) / num_reranker_queries, 1)
+    if reranker_rank_counts and num_reranker_queries > 0:
+        avg_chunks_per_query = round(num_reranked_chunks / num_reranker_queries, 1)
         reranker_chart = _build_rank_chart(
-            reranker_ranks,
+            reranker_rank_counts,
             max_total_reranked,
             num_reranker_queries,
             title="Chunk usage by reranker ranking",
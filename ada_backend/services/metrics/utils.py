@@ -1,8 +1,11 @@
+import base64
+import binascii
 import json
 import logging
 import re
-from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 from uuid import UUID
 
 import numpy as np
@@ -14,24 +17,6 @@ from engine.trace.sql_exporter import get_session_trace
 
 LOGGER = logging.getLogger(__name__)
 
-QUERY_COSTS_BASIS = """
-WITH trace_costs AS (
-            SELECT
-                s.attributes->>'conversation_id' as conversation_id,
-                s.trace_rowid,
-                COALESCE(
-                        SUM(
-                            COALESCE(su.credits_input_token, 0) +
-                            COALESCE(su.credits_output_token, 0) +
-                            COALESCE(su.credits_per_call, 0)
-                        ),
-                        0
-                    ) as cost_per_run
-            FROM traces.spans s
-            LEFT JOIN credits.span_usages su ON su.span_id = s.span_id
-"""
-
-
 SQL_COST_KPIS_ROUNDED_TAIL = """
         ), raw AS (
             SELECT
@@ -56,46 +41,294 @@ SQL_COST_KPIS_ROUNDED_TAIL = """
 """
 
 
-def query_trace_duration(
-    project_ids: List[UUID], duration_days: int, call_type: CallType | None = None
-) -> pd.DataFrame:
-    start_time_offset_days = (datetime.now() - timedelta(days=duration_days)).isoformat()
-
-    # Build the call_type filter clause
-    call_type_filter = ""
-    if call_type is not None:
-        call_type_filter = f"AND call_type = '{call_type.value}'"
-
-    project_id_list = "', '".join(str(project_id) for project_id in project_ids)
-
-    query = f"""
-    WITH root_spans AS (
-        SELECT trace_rowid
+TOKENS_DISTRIBUTION_BINS = [0, 1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000, 9000, 10000]
+# Rank lists are stored as JSON strings, e.g. "[1, null, 3]"
+RANK_LIST_PATTERN = r"^\s*\[\s*((-?[0-9]+(\.[0-9]+)?|null)\s*(,\s*(-?[0-9]+(\.[0-9]+)?|null)\s*)*)?\]\s*$"
+NUMBER_PATTERN = r"^\s*-?[0-9]+(\.[0-9]+)?\s*$"
+RANKERS = {"retrieval": "original_retrieval_rank", "reranker": "original_reranker_rank"}
+
+
+@dataclass
+class ChartAggregates:
+    """Series of the monitoring dashboard charts, aggregated by one query over the spans of the window."""
+
+    days: list[str]
+    calls_per_day: list[int]
+    conversations_per_day: list[int]
+    input_tokens_per_day: list[int]
+    output_tokens_per_day: list[int]
+    # Freedman-Diaconis bins of the root span durations, like np.histogram(durations, bins="fd")
+    latency_bin_edges: list[float]
+    latency_counts: list[int]
+    input_tokens_counts: list[int]
+    output_tokens_counts: list[int]
+    # By ranker ("retrieval" or "reranker"): number of chunks used at each rank
+    rank_counts: dict[str, dict[int, int]] = field(default_factory=dict)
+    # By ranker: number of queries with at least one rank
+    rank_queries: dict[str, int] = field(default_factory=dict)
+    # By ranker: largest number of chunks ranked by a query, 0 when not traced
+    max_ranked_chunks: dict[str, int] = field(default_factory=dict)
+
+
+def _unwrapped_attributes(column: str) -> str:
+    """Span attributes as a JSON object, including attributes stored as a JSON string of the object."""
+    return f"""CASE
+                WHEN jsonb_typeof({column}) = 'string' THEN ({column} #>> '{{}}')::jsonb
+                ELSE {column}
+            END"""
+
+
+def _build_chart_aggregates_query(call_type: CallType | None) -> str:
+    call_type_filter = f"AND call_type = '{call_type.value}'" if call_type is not None else ""
+    rank_lists = "\n        UNION ALL\n".join(
+        f"""        SELECT '{ranker}' AS ranker, span_row, (attributes->>'{attribute}')::jsonb AS ranks
+        FROM window_spans
+        WHERE attributes->>'{attribute}' ~ :rank_list_pattern"""
+        for ranker, attribute in RANKERS.items()
+    )
+    return f"""
+    WITH root_spans AS MATERIALIZED (
+        SELECT
+            trace_rowid,
+            (start_time AT TIME ZONE 'UTC')::date AS day,
+            EXTRACT(EPOCH FROM end_time - start_time)::double precision AS duration_seconds,
+            ({_unwrapped_attributes("attributes")})->>'conversation_id' AS conversation_id
         FROM traces.spans
         WHERE parent_id IS NULL
-        AND project_id IN ('{project_id_list}')
-        AND start_time > '{start_time_offset_days}'
+        AND project_id = ANY(:project_ids)
+        AND start_time > :start_time
         {call_type_filter}
+    ),
+    window_spans AS MATERIALIZED (
+        SELECT
+            row_number() OVER () AS span_row,
+            (s.start_time AT TIME ZONE 'UTC')::date AS day,
+            s.llm_token_count_prompt,
+            s.llm_token_count_completion,
+            {_unwrapped_attributes("s.attributes")} AS attributes
+        FROM traces.spans s
+        WHERE s.trace_rowid IN (SELECT trace_rowid FROM root_spans)
+    ),
+    daily_calls AS (
+        SELECT
+            day,
+            COUNT(*) AS calls,
+            COUNT(DISTINCT conversation_id) AS conversation_ids,
+            COUNT(DISTINCT trace_rowid) AS traces
+        FROM root_spans
+        GROUP BY day
+    ),
+    daily_tokens AS (
+        SELECT
+            day,
+            SUM(COALESCE(llm_token_count_prompt, 0)) AS input_tokens,
+            SUM(COALESCE(llm_token_count_completion, 0)) AS output_tokens
+        FROM window_spans
+        GROUP BY day
+    ),
+    latency_stats AS (
+        SELECT
+            COUNT(duration_seconds) AS n,
+            MIN(duration_seconds) AS lo,
+            MAX(duration_seconds) AS hi,
+            percentile_cont(0.75) WITHIN GROUP (ORDER BY duration_seconds)
+                - percentile_cont(0.25) WITHIN GROUP (ORDER BY duration_seconds) AS iqr
+        FROM root_spans
+    ),
+    latency_edges AS (
+        SELECT
+            CASE WHEN n = 0 THEN 0 WHEN lo = hi THEN lo - 0.5 ELSE lo END AS first_edge,
+            CASE WHEN n = 0 THEN 1 WHEN lo = hi THEN hi + 0.5 ELSE hi END AS last_edge,
+            CASE WHEN n > 0 AND iqr > 0 THEN 2 * iqr * power(n, -1.0 / 3) END AS bin_width
+        FROM latency_stats
+    ),
+    latency_bins AS (
+        SELECT
+            first_edge,
+            last_edge,
+            CASE
+                WHEN bin_width IS NULL THEN 1
+                ELSE CEIL((last_edge - first_edge) / bin_width)::int
+            END AS bins
+        FROM latency_edges
+    ),
+    latency_histogram AS (
+        SELECT
+            LEAST(width_bucket(r.duration_seconds, b.first_edge, b.last_edge, b.bins), b.bins) AS bucket,
+            COUNT(*) AS count
+        FROM root_spans r
+        CROSS JOIN latency_bins b
+        GROUP BY 1
+    ),
+    token_histograms AS (
+        SELECT
+            'input' AS series,
+            CASE
+                WHEN llm_token_count_prompt = :last_token_edge THEN :token_bins
+                ELSE width_bucket(llm_token_count_prompt, :token_edges)
+            END AS bucket,
+            COUNT(*) AS count
+        FROM window_spans
+        WHERE llm_token_count_prompt IS NOT NULL
+        GROUP BY 1, 2
+        UNION ALL
+        SELECT
+            'output' AS series,
+            CASE
+                WHEN llm_token_count_completion = :last_token_edge THEN :token_bins
+                ELSE width_bucket(llm_token_count_completion, :token_edges)
+            END AS bucket,
+            COUNT(*) AS count
+        FROM window_spans
+        WHERE llm_token_count_completion IS NOT NULL
+        GROUP BY 1, 2
+    ),
+    rank_lists AS (
+{rank_lists}
+    ),
+    rank_values AS (
+        SELECT rank_lists.ranker, rank_lists.span_row, rank_value::numeric AS rank
+        FROM rank_lists
+        CROSS JOIN LATERAL jsonb_array_elements_text(rank_lists.ranks) AS rank_value
+        WHERE rank_value IS NOT NULL
+    ),
+    rank_counts AS (
+        SELECT ranker, rank, COUNT(*) AS count
+        FROM rank_values
+        GROUP BY ranker, rank
+    ),
+    rank_queries AS (
+        SELECT ranker, COUNT(DISTINCT span_row) AS queries
+        FROM rank_values
+        GROUP BY ranker
+    ),
+    ranked_chunks AS (
+        SELECT
+            MAX((attributes->>'total_retrieved_chunks')::numeric)
+                FILTER (WHERE attributes->>'total_retrieved_chunks' ~ :number_pattern) AS retrieval,
+            MAX((attributes->>'total_reranked_chunks')::numeric)
+                FILTER (WHERE attributes->>'total_reranked_chunks' ~ :number_pattern) AS reranker
+        FROM window_spans
     )
-    SELECT s.*
-    FROM traces.spans s
-    WHERE s.trace_rowid IN (SELECT trace_rowid FROM root_spans)
-    ORDER BY MAX(s.start_time) OVER (PARTITION BY s.trace_rowid) DESC,
-             s.trace_rowid, s.start_time ASC
+    SELECT
+        (SELECT COALESCE(jsonb_agg(to_jsonb(daily_calls)), '[]') FROM daily_calls) AS daily_calls,
+        (SELECT COALESCE(jsonb_agg(to_jsonb(daily_tokens)), '[]') FROM daily_tokens) AS daily_tokens,
+        (SELECT to_jsonb(latency_bins) FROM latency_bins) AS latency_bins,
+        (SELECT COALESCE(jsonb_agg(to_jsonb(latency_histogram)), '[]') FROM latency_histogram) AS latency_histogram,
+        (SELECT COALESCE(jsonb_agg(to_jsonb(token_histograms)), '[]') FROM token_histograms) AS token_histograms,
+        (SELECT COALESCE(jsonb_agg(to_jsonb(rank_counts)), '[]') FROM rank_counts) AS rank_counts,
+        (SELECT COALESCE(jsonb_agg(to_jsonb(rank_queries)), '[]') FROM rank_queries) AS rank_queries,
+        (SELECT to_jsonb(ranked_chunks) FROM ranked_chunks) AS ranked_chunks
     """
 
+
+def _histogram_counts(rows: list[dict], number_of_bins: int) -> list[int]:
+    """Counts of buckets 1 to number_of_bins, values outside of the bins being in bucket 0 or number_of_bins + 1."""
+    counts = [0] * number_of_bins
+    for row in rows:
+        if 1 <= row["bucket"] <= number_of_bins:
+            counts[row["bucket"] - 1] += int(row["count"])
+    return counts
+
+
+def query_chart_aggregates(
+    project_ids: List[UUID],
+    duration_days: int,
+    call_type: CallType | None = None,
+    token_bin_edges: list[int] = TOKENS_DISTRIBUTION_BINS,
+) -> ChartAggregates:
+    """
+    Aggregate the dashboard series of the traces started in the last duration_days, in a single query:
+    daily buckets, histograms and ranks are computed by PostgreSQL, so only the series leave the database.
+    """
+    current_date = datetime.now(tz=timezone.utc).date()
+    start_date = (datetime.now(tz=timezone.utc) - timedelta(days=duration_days)).date()
+    days = [str(start_date + timedelta(days=offset)) for offset in range((current_date - start_date).days + 1)]
+    params = {
+        "project_ids": [str(project_id) for project_id in project_ids],
+        "start_time": (datetime.now() - timedelta(days=duration_days)).isoformat(),
+        "token_edges": token_bin_edges,
+        "token_bins": len(token_bin_edges) - 1,
+        "last_token_edge": token_bin_edges[-1],
+        "rank_list_pattern": RANK_LIST_PATTERN,
+        "number_pattern": NUMBER_PATTERN,
+    }
     session = get_session_trace()
-    df = pd.read_sql_query(query, session.bind)
-    session.close()
-    df["attributes"] = df["attributes"].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
-    df = df.replace({np.nan: None})
-    return df
+    try:
+        row = session.execute(text(_build_chart_aggregates_query(call_type)), params).one()
+    finally:
+        session.close()
+
+    daily_calls = {day_row["day"]: day_row for day_row in row.daily_calls}
+    daily_tokens = {day_row["day"]: day_row for day_row in row.daily_tokens}
+    conversations_per_day = []
+    for day in days:
+        day_calls = daily_calls.get(day)
+        if day_calls is None:
+            conversations_per_day.append(0)
+        else:
+            # Traces without a conversation_id are only counted on days where no trace has one
+            conversations_per_day.append(day_calls["conversation_ids"] or day_calls["traces"])
+
+    latency_bins = row.latency_bins
+    token_histograms = {"input": [], "output": []}
+    for histogram_row in row.token_histograms:
+        token_histograms[histogram_row["series"]].append(histogram_row)
+
+    rank_counts: dict[str, dict[int, int]] = {}
+    for rank_row in row.rank_counts:
+        rank_counts.setdefault(rank_row["ranker"], {})[int(rank_row["rank"])] = int(rank_row["count"])
+    ranked_chunks = row.ranked_chunks or {}
+
+    return ChartAggregates(
+        days=days,
+        calls_per_day=[int(daily_calls[day]["calls"]) if day in daily_calls else 0 for day in days],
+        conversations_per_day=conversations_per_day,
+        input_tokens_per_day=[int(daily_tokens[day]["input_tokens"]) if day in daily_tokens else 0 for day in days],
+        output_tokens_per_day=[int(daily_tokens[day]["output_tokens"]) if day in daily_tokens else 0 for day in days],
+        latency_bin_edges=np.linspace(
+            latency_bins["first_edge"], latency_bins["last_edge"], latency_bins["bins"] + 1
+        ).tolist(),
+        latency_counts=_histogram_counts(row.latency_histogram, latency_bins["bins"]),
+        input_tokens_counts=_histogram_counts(token_histograms["input"], len(token_bin_edges) - 1),
+        output_tokens_counts=_histogram_counts(token_histograms["output"], len(token_bin_edges) - 1),
+        rank_counts=rank_counts,
+        rank_queries={query_row["ranker"]: int(query_row["queries"]) for query_row in row.rank_queries},
+        max_ranked_chunks={ranker: int(ranked_chunks.get(ranker) or 0) for ranker in RANKERS},
+    )
+
+
+ROOT_TRACES_COUNT_CAP = 10_000
+
+
+@dataclass
+class RootTracesPage:
+    rows: list[dict]
+    # Pages covering at most ROOT_TRACES_COUNT_CAP traces
+    total_pages: int
+    # Cursor of the next page, None on the last page
+    next_cursor: Optional[str] = None
+    # Whether more than ROOT_TRACES_COUNT_CAP traces match
+    total_capped: bool = False
 
 
 def _escape_ilike(value: str) -> str:
     return value.replace("!", "!!").replace("%", "!%").replace("_", "!_")
 
 
+def encode_trace_cursor(start_time: datetime, span_id: str) -> str:
+    payload = json.dumps({"start_time": start_time.isoformat(), "span_id": span_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_trace_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(payload["start_time"]), str(payload["span_id"])
+    except (binascii.Error, json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid trace cursor: {cursor}") from e
+
+
 def query_root_trace_duration(
     project_id: UUID,
     duration_days: Optional[int] = None,
@@ -107,16 +340,18 @@ def query_root_trace_duration(
     search: Optional[str] = None,
     start_time: Optional[datetime] = None,
     end_time: Optional[datetime] = None,
-) -> Tuple[List[dict], int]:
-    """Query root traces with server-side pagination.
+    cursor: Optional[str] = None,
+) -> RootTracesPage:
+    """Query root traces with server-side pagination, newest first.
 
-    Returns a tuple of (rows_as_dicts, total_pages).
+    A cursor (the next_cursor of the previous page) takes precedence over page and seeks on (start_time, span_id)
+    instead of skipping rows. The count stops at ROOT_TRACES_COUNT_CAP traces.
     Time filtering: explicit start_time/end_time take precedence over duration_days.
     """
     if start_time is None and end_time is None and duration_days is None:
         duration_days = 30
 
-    offset = (page - 1) * page_size
+    offset = (page - 1) * page_size if cursor is None else 0
 
     filters = f"""
         project_id = '{project_id}'
@@ -163,20 +398,32 @@ def query_root_trace_duration(
         )"""
         params["search"] = f"%{escaped}%"
 
+    keyset_filter = ""
+    if cursor is not None:
+        params["cursor_start_time"], params["cursor_span_id"] = decode_trace_cursor(cursor)
+        keyset_filter = """
+        AND start_time <= :cursor_start_time
+        AND (start_time < :cursor_start_time OR span_id < :cursor_span_id)"""
+    params["count_limit"] = ROOT_TRACES_COUNT_CAP + 1
+
     query = f"""
     WITH total AS (
       SELECT COUNT(*) as total_count
-      FROM traces.spans
-      WHERE {filters}
+      FROM (
+        SELECT 1
+        FROM traces.spans
+        WHERE {filters}
+        LIMIT :count_limit
+      ) capped
     ),
     paginated_roots AS (
       SELECT trace_rowid, span_id, name, span_kind, start_time, end_time,
              status_code, environment, call_type, graph_runner_id, tag_name,
              attributes->>'conversation_id' as conversation_id
       FROM traces.spans
-      WHERE {filters}
-      ORDER BY start_time DESC
-      LIMIT {page_size} OFFSET {offset}
+      WHERE {filters}{keyset_filter}
+      ORDER BY start_time DESC, span_id DESC
+      LIMIT {page_size + 1} OFFSET {offset}
     ),
     trace_total_credits AS (
       SELECT
@@ -197,7 +444,7 @@ def query_root_trace_duration(
     CROSS JOIN total
     LEFT JOIN traces.span_messages m ON m.span_id = roots.span_id
     LEFT JOIN trace_total_credits ttc ON ttc.trace_rowid = roots.trace_rowid
-    ORDER BY roots.start_time DESC
+    ORDER BY roots.start_time DESC, roots.span_id DESC
     """
 
     session = get_session_trace()
@@ -210,8 +457,18 @@ def query_root_trace_duration(
         row["output_preview"] = _extract_preview(row.pop("raw_output_content", None))
 
     total_count = int(rows[0]["total_count"]) if rows else 0
-    total_pages = max((total_count + page_size - 1) // page_size, 1)
-    return rows, total_pages
+    total_capped = total_count > ROOT_TRACES_COUNT_CAP
+    total_count = min(total_count, ROOT_TRACES_COUNT_CAP)
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_trace_cursor(rows[-1]["start_time"], rows[-1]["span_id"])
+    return RootTracesPage(
+        rows=rows,
+        total_pages=max((total_count + page_size - 1) // page_size, 1),
+        next_cursor=next_cursor,
+        total_capped=total_capped,
+    )
 
 
 _CONTENT_RE = re.compile(r'"content"\s*:\s*"((?:[^"\\]|\\.)*)"')
@@ -286,89 +543,6 @@ def query_trace_by_trace_id(trace_id: UUID) -> pd.DataFrame:
     return df
 
 
-def calculate_calls_per_day(df: pd.DataFrame, all_dates_df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Calculate the number of calls per day from root spans only.
-
-    Args:
-        df: DataFrame with trace data containing 'parent_id' and 'date' columns
-        all_dates_df: DataFrame with all dates in the range
-
-    Returns:
-        DataFrame with 'date' and 'count' columns, sorted by date
-    """
-    df_root = df[df["parent_id"].isna()].copy()
-    agent_usage = df_root.groupby("date").size().reset_index(name="count")
-    agent_usage = pd.merge(all_dates_df, agent_usage, on="date", how="left").fillna(0)
-    agent_usage["count"] = agent_usage["count"].astype(int)
-    agent_usage["date"] = pd.to_datetime(agent_usage["date"]).dt.date
-    agent_usage = agent_usage.sort_values(by="date", ascending=True)
-    agent_usage["date"] = agent_usage["date"].astype(str)
-    return agent_usage
-
-
-def count_conversations_per_day(df: pd.DataFrame, all_dates_df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Count unique conversations per day using conversation_id when available, otherwise trace_rowid.
-
-    For dates where conversation_id exists in attributes, use it to count unique conversations.
-    For dates without conversation_id, fall back to trace_rowid (each trace is a conversation).
-
-    Args:
-        df: DataFrame with trace data containing 'parent_id', 'date', 'attributes', and 'trace_rowid' columns
-        all_dates_df: DataFrame with all dates in the range
-
-    Returns:
-        DataFrame with 'date' and 'unique_conversation_ids' columns, sorted by date
-    """
-    df_root = df[df["parent_id"].isna()].copy()
-
-    df_with_conversation_id = df_root[
-        df_root["attributes"].apply(
-            lambda x: isinstance(x, dict) and "conversation_id" in x and x["conversation_id"] is not None
-        )
-    ].copy()
-
-    if not df_with_conversation_id.empty:
-        df_with_conversation_id["conversation_id"] = df_with_conversation_id["attributes"].apply(
-            lambda x: x.get("conversation_id")
-        )
-        conversation_id_usage_with_id = (
-            df_with_conversation_id
-            .groupby("date")["conversation_id"]
-            .nunique()
-            .reset_index(name="unique_conversation_ids")
-        )
-
-        dates_with_id = set(df_with_conversation_id["date"].unique())
-        df_without_conversation_id = df_root[~df_root["date"].isin(dates_with_id)].copy()
-
-        if not df_without_conversation_id.empty:
-            conversation_id_usage_without_id = (
-                df_without_conversation_id
-                .groupby("date")["trace_rowid"]
-                .nunique()
-                .reset_index(name="unique_conversation_ids")
-            )
-            conversation_id_usage = pd.concat([conversation_id_usage_with_id, conversation_id_usage_without_id])
-        else:
-            conversation_id_usage = conversation_id_usage_with_id
-    else:
-        if not df_root.empty:
-            conversation_id_usage = (
-                df_root.groupby("date")["trace_rowid"].nunique().reset_index(name="unique_conversation_ids")
-            )
-        else:
-            conversation_id_usage = pd.DataFrame(columns=["date", "unique_conversation_ids"])
-
-    conversation_id_usage = pd.merge(all_dates_df, conversation_id_usage, on="date", how="left").fillna(0)
-    conversation_id_usage["unique_conversation_ids"] = conversation_id_usage["unique_conversation_ids"].astype(int)
-    conversation_id_usage["date"] = conversation_id_usage["date"].dt.date.astype(str)
-    conversation_id_usage = conversation_id_usage.sort_values(by="date", ascending=True)
-
-    return conversation_id_usage
-
-
 def query_conversation_messages(trace_id: str) -> tuple[dict, dict]:
     """
     Query the most recent span with a specific trace_id and return messages.
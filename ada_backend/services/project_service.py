@@ -35,6 +35,7 @@ from ada_backend.schemas.project_schema import (
     ProjectWithGraphRunnersSchema,
 )
 from ada_backend.schemas.template_schema import InputTemplate
+from ada_backend.services.auth_cache_service import invalidate_project
 from ada_backend.services.cron.service import permanently_delete_cron_jobs_by_project_service
 from ada_backend.services.errors import ProjectNotFound
 from ada_backend.services.graph.delete_graph_service import delete_graph_runner_service
@@ -100,6 +101,7 @@ def delete_project_service(session: Session, project_id: UUID) -> ProjectDeleteR
         if graph_runner_exists(session, graph_runner.id):
             delete_graph_runner_service(session, graph_runner.id)
     delete_project(session, project_id)
+    invalidate_project(project_id)
     return ProjectDeleteResponse(
         project_id=project_id, graph_runner_ids=[graph_runner.id for graph_runner in graph_runners]
     )
@@ -5,13 +5,14 @@ from datetime import datetime, timezone
 from typing import Any, AsyncIterator, Awaitable, Dict, Optional
 from uuid import UUID
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ada_backend.database.models import CallType, EnvType, RunStatus
-from ada_backend.database.setup_db import get_db_session
+from ada_backend.database.models import CallType, EnvType, Run, RunStatus
+from ada_backend.database.setup_db import get_async_db_session
 from ada_backend.mixpanel_analytics import track_run_completed
 from ada_backend.repositories import run_repository
-from ada_backend.repositories.project_repository import get_project
+from ada_backend.repositories.project_repository import get_project, get_project_async
 from ada_backend.repositories.run_input_repository import get_run_input
 from ada_backend.schemas.project_schema import ChatResponse
 from ada_backend.schemas.run_schema import AsyncRunAcceptedSchema, OrgRunResponseSchema, RunResponseSchema
@@ -86,12 +87,12 @@ async def run_with_tracking(
     then set COMPLETED (with result) or FAILED (with error).
     When run_id is provided (e.g. after returning 202), the run row must already exist; no new run is created.
 
-    Each DB operation uses its own short-lived session so that no connection is held
-    during the (potentially long-running) runner coroutine.
+    Each DB operation uses its own short-lived async session so that no connection is held
+    during the (potentially long-running) runner coroutine, and the event loop is not blocked.
     """
-    with get_db_session() as session:
+    async with get_async_db_session() as session:
         if run_id is None:
-            run = create_run(
+            run = await create_run_async(
                 session,
                 project_id=project_id,
                 trigger=trigger,
@@ -103,7 +104,7 @@ async def run_with_tracking(
             run_id = run.id
         set_tracing_span(run_id=str(run_id))
         now = datetime.now(timezone.utc)
-        update_run_status(
+        await update_run_status_async(
             session,
             run_id=run_id,
             project_id=project_id,
@@ -115,8 +116,8 @@ async def run_with_tracking(
         finished_at = datetime.now(timezone.utc)
         duration_ms = int((finished_at - now).total_seconds() * 1000)
         result_id = _upload_result_to_s3(result, project_id=project_id, run_id=run_id)
-        with get_db_session() as session:
-            update_run_status(
+        async with get_async_db_session() as session:
+            await update_run_status_async(
                 session,
                 run_id=run_id,
                 project_id=project_id,
@@ -138,8 +139,8 @@ async def run_with_tracking(
         duration_ms = int((finished_at - now).total_seconds() * 1000)
         trace_id = getattr(e, "trace_id", None)
         try:
-            with get_db_session() as session:
-                update_run_status(
+            async with get_async_db_session() as session:
+                await update_run_status_async(
                     session,
                     run_id=run_id,
                     project_id=project_id,
@@ -262,6 +263,31 @@ def create_run(
     return RunResponseSchema.model_validate(run, from_attributes=True)
 
 
+async def create_run_async(
+    session: AsyncSession,
+    project_id: UUID,
+    trigger: CallType = CallType.API,
+    webhook_id: UUID | None = None,
+    integration_trigger_id: UUID | None = None,
+    event_id: str | None = None,
+    env: EnvType | None = None,
+) -> RunResponseSchema:
+    """create_run on the async session of the run hot path."""
+    project = await get_project_async(session, project_id)
+    if not project:
+        raise ProjectNotFound(project_id)
+    run = await run_repository.create_run_async(
+        session,
+        project_id=project_id,
+        trigger=trigger,
+        webhook_id=webhook_id,
+        integration_trigger_id=integration_trigger_id,
+        event_id=event_id,
+        env=env,
+    )
+    return RunResponseSchema.model_validate(run, from_attributes=True)
+
+
 def get_run(session: Session, run_id: UUID, project_id: UUID) -> RunResponseSchema:
     run = run_repository.get_run(session, run_id)
     if not run:
@@ -371,19 +397,15 @@ def fail_pending_run(
     return RunResponseSchema.model_validate(updated, from_attributes=True)
 
 
-def update_run_status(
-    session: Session,
+def _run_status_timestamps(
+    run: Optional[Run],
     run_id: UUID,
     project_id: UUID,
     status: RunStatus,
-    error: Optional[dict] = None,
-    trace_id: Optional[str] = None,
-    result_id: Optional[str] = None,
-    started_at: Optional[datetime] = None,
-    finished_at: Optional[datetime] = None,
-    graph_runner_id: Optional[UUID] = None,
-) -> RunResponseSchema:
-    run = run_repository.get_run(session, run_id)
+    started_at: Optional[datetime],
+    finished_at: Optional[datetime],
+) -> tuple[Optional[datetime], Optional[datetime]]:
+    """Check that the run belongs to the project and can move to the status, and default its timestamps."""
     if not run:
         raise RunNotFound(run_id)
     if run.project_id != project_id:
@@ -397,6 +419,23 @@ def update_run_status(
         started_at = now
     if finished_at is None and status in (RunStatus.COMPLETED, RunStatus.FAILED):
         finished_at = now
+    return started_at, finished_at
+
+
+def update_run_status(
+    session: Session,
+    run_id: UUID,
+    project_id: UUID,
+    status: RunStatus,
+    error: Optional[dict] = None,
+    trace_id: Optional[str] = None,
+    result_id: Optional[str] = None,
+    started_at: Optional[datetime] = None,
+    finished_at: Optional[datetime] = None,
+    graph_runner_id: Optional[UUID] = None,
+) -> RunResponseSchema:
+    run = run_repository.get_run(session, run_id)
+    started_at, finished_at = _run_status_timestamps(run, run_id, project_id, status, started_at, finished_at)
     updated = run_repository.update_run_status(
         session,
         run_id=run_id,
@@ -413,6 +452,35 @@ def update_run_status(
     return RunResponseSchema.model_validate(updated, from_attributes=True)
 
 
+async def update_run_status_async(
+    session: AsyncSession,
+    run_id: UUID,
+    project_id: UUID,
+    status: RunStatus,
+    error: Optional[dict] = None,
+    trace_id: Optional[str] = None,
+    result_id: Optional[str] = None,
+    started_at: Optional[datetime] = None,
+    finished_at: Optional[datetime] = None,
+) -> RunResponseSchema:
+    """update_run_status on the async session of the run hot path."""
+    run = await run_repository.get_run_async(session, run_id)
+    started_at, finished_at = _run_status_timestamps(run, run_id, project_id, status, started_at, finished_at)
+    updated = await run_repository.update_run_status_async(
+        session,
+        run_id=run_id,
+        status=status,
+        error=error,
+        trace_id=trace_id,
+        result_id=result_id,
+        started_at=started_at,
+        finished_at=finished_at,
+    )
+    if status == RunStatus.FAILED:
+        maybe_send_run_failure_alert(updated, project_id, error=error, finished_at=finished_at)
+    return RunResponseSchema.model_validate(updated, from_attributes=True)
+
+
 def retry_run(
     session: Session,
     run_id: UUID,
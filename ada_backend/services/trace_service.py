@@ -204,13 +204,14 @@ def get_root_traces_by_project(
     search: Optional[str] = None,
     start_time: Optional[datetime] = None,
     end_time: Optional[datetime] = None,
+    cursor: Optional[str] = None,
 ) -> PaginatedRootTracesResponse:
     if page_size <= 0:
         page_size = 20
     if page <= 0:
         page = 1
 
-    rows, total_pages = query_root_trace_duration(
+    traces_page = query_root_trace_duration(
         project_id,
         duration_days=duration,
         environment=environment,
@@ -221,6 +222,7 @@ def get_root_traces_by_project(
         search=search,
         start_time=start_time,
         end_time=end_time,
+        cursor=cursor,
     )
     track_monitoring_loaded(user_id, project_count=1, organization_id=organization_id)
     LOGGER.debug(
@@ -231,8 +233,14 @@ def get_root_traces_by_project(
         end_time,
     )
 
-    traces = build_root_spans(rows)
+    traces = build_root_spans(traces_page.rows)
     return PaginatedRootTracesResponse(
-        pagination=Pagination(page=page, size=page_size, total_pages=total_pages),
+        pagination=Pagination(
+            page=page,
+            size=page_size,
+            total_pages=traces_page.total_pages,
+            next_cursor=traces_page.next_cursor,
+            total_capped=traces_page.total_capped,
+        ),
         traces=traces,
     )
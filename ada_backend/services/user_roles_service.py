@@ -5,6 +5,12 @@ import httpx
 
 from ada_backend.mixpanel_analytics import identify_user
 from ada_backend.schemas.auth_schema import OrganizationAccess, SupabaseUser
+from ada_backend.services.auth_cache_service import (
+    cache_organization_access,
+    cache_super_admin,
+    get_cached_organization_access,
+    get_cached_super_admin,
+)
 from settings import settings
 
 
@@ -53,8 +59,12 @@ async def get_user_access_to_organization(
     organization_id: UUID,
 ) -> OrganizationAccess:
     """
-    Check if a user has access to an organization.
+    Check if a user has access to an organization. Granted accesses are reused for AUTH_CACHE_TTL_SECONDS.
     """
+    cached_access = get_cached_organization_access(user.id, organization_id)
+    if cached_access is not None:
+        return cached_access
+
     # Offline mode bypass - always grant access with fixed role
     if settings.OFFLINE_MODE:
         return OrganizationAccess(org_id=organization_id, role=settings.OFFLINE_DEFAULT_ROLE)
@@ -69,13 +79,20 @@ async def get_user_access_to_organization(
         raise ValueError("User does not have access to organization")
 
     identify_user(user.id, user.email, organization_id)
-    return OrganizationAccess(org_id=organization_id, role=result["role"])
+    access = OrganizationAccess(org_id=organization_id, role=result["role"])
+    cache_organization_access(user.id, access)
+    return access
 
 
 async def is_user_super_admin(user: SupabaseUser) -> bool:
     """
     Check global super admin status using the same Edge Function as the frontend.
+    The status is reused for AUTH_CACHE_TTL_SECONDS.
     """
+    cached_is_super_admin = get_cached_super_admin(user.id)
+    if cached_is_super_admin is not None:
+        return cached_is_super_admin
+
     # Offline mode bypass - always return True
     if settings.OFFLINE_MODE:
         return True
@@ -93,5 +110,7 @@ async def is_user_super_admin(user: SupabaseUser) -> bool:
         )
     if response.status_code == 200:
         data = response.json() if response.content else {}
-        return bool(data.get("is_super_admin", False))
+        is_super_admin = bool(data.get("is_super_admin", False))
+        cache_super_admin(user.id, is_super_admin)
+        return is_super_admin
     return False
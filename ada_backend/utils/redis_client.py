@@ -585,3 +585,61 @@ def notify_graph_changed(project_id: UUID, graph_runner_id: UUID, action: str) -
 
 def publish_qa_event(session_id: UUID, event: Dict[str, Any]) -> bool:
     return publish_event("qa", session_id, event)
+
+
+# Incremented whenever the LLM or component cost tables change, see engine/trace/credit_calculator.py
+COST_TABLES_VERSION_KEY = "credits:cost_tables_version"
+
+
+def bump_cost_tables_version() -> bool:
+    client = get_redis_client()
+    if not client:
+        LOGGER.debug("Redis client unavailable. Cannot bump the cost tables version.")
+        return False
+    try:
+        client.incr(COST_TABLES_VERSION_KEY)
+        return True
+    except _RECONNECT_ERRORS as e:
+        LOGGER.error("Redis connection error bumping the cost tables version: %s", e)
+        reset_redis_client()
+        return False
+    except Exception as e:
+        LOGGER.error("Failed to bump the cost tables version: %s", e)
+        return False
+
+
+def get_cost_tables_version() -> Optional[str]:
+    """Current version of the cost tables, None when Redis is unavailable or it never changed."""
+    client = get_redis_client()
+    if not client:
+        return None
+    try:
+        return client.get(COST_TABLES_VERSION_KEY)
+    except _RECONNECT_ERRORS as e:
+        LOGGER.error("Redis connection error reading the cost tables version: %s", e)
+        reset_redis_client()
+        return None
+    except Exception as e:
+        LOGGER.error("Failed to read the cost tables version: %s", e)
+        return None
+
+
+# Revocations dropped from the auth caches of every process, see ada_backend/services/auth_cache_service.py
+AUTH_INVALIDATION_CHANNEL = "auth:invalidation"
+
+
+def publish_auth_invalidation(event: Dict[str, Any]) -> bool:
+    client = get_redis_client()
+    if not client:
+        LOGGER.debug("Redis client unavailable. Cannot publish the auth invalidation %s", event)
+        return False
+    try:
+        client.publish(AUTH_INVALIDATION_CHANNEL, json.dumps(event))
+        return True
+    except _RECONNECT_ERRORS as e:
+        LOGGER.error("Redis connection error publishing the auth invalidation %s: %s", event, e)
+        reset_redis_client()
+        return False
+    except Exception as e:
+        LOGGER.error("Failed to publish the auth invalidation %s: %s", event, e)
+        return False
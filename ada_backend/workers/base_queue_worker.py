@@ -6,9 +6,12 @@ import time
 from abc import ABC, abstractmethod
 from uuid import uuid4
 
+from ada_backend.database.setup_db import dispose_async_db_engine, set_async_db_pool_size
 from ada_backend.utils.redis_client import get_redis_client
+from engine.prometheus_metric import queue_depth, worker_in_flight
 from engine.trace.trace_context import set_trace_manager
 from engine.trace.trace_manager import TraceManager
+from settings import settings
 
 LOGGER = logging.getLogger(__name__)
 
@@ -86,6 +89,12 @@ class BaseQueueWorker(ABC):
             except Exception as e:
                 LOGGER.warning("Failed to refresh worker heartbeat %s: %s", heartbeat_key, e)
 
+    def _sample_queue_depth(self, client) -> None:
+        try:
+            queue_depth.labels(queue=self.queue_name).set(client.llen(self.queue_name))
+        except Exception as e:
+            LOGGER.debug("[%s] Failed to sample the queue depth: %s", self.worker_label, e)
+
     def _recover_orphaned_processing_queues(self, client, own_processing_queue: str) -> None:
         prefix = f"{self.queue_name}:processing:"
         try:
@@ -149,6 +158,8 @@ class BaseQueueWorker(ABC):
     def _worker_loop(self) -> None:
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+        # Items are processed one at a time, so the loop needs only a small async database pool
+        set_async_db_pool_size(loop, settings.ADA_DB_ASYNC_WORKER_POOL_SIZE, settings.ADA_DB_ASYNC_WORKER_MAX_OVERFLOW)
 
         client = get_redis_client()
         if not client:
@@ -188,6 +199,7 @@ class BaseQueueWorker(ABC):
                     LOGGER.info("[%s] Drain requested, stopping worker", self.worker_label)
                     break
                 try:
+                    self._sample_queue_depth(client)
                     raw = client.brpoplpush(self.queue_name, processing_queue_name, timeout=timeout)
                     if self._drain_requested.is_set():
                         break
@@ -241,8 +253,10 @@ class BaseQueueWorker(ABC):
                             )
                         continue
 
+                    in_flight = worker_in_flight.labels(worker=self.worker_label)
                     try:
-                        self.process_payload(payload, loop)
+                        with in_flight.track_inprogress():
+                            self.process_payload(payload, loop)
                     finally:
                         try:
                             client.lrem(processing_queue_name, 1, data)
@@ -271,6 +285,10 @@ class BaseQueueWorker(ABC):
                     "[%s] Failed to return items from processing queue during shutdown: %s", self.worker_label, e,
                 )
             self._cleanup_worker_keys(client, self.queue_name, worker_id)
+            try:
+                loop.run_until_complete(dispose_async_db_engine())
+            except Exception as e:
+                LOGGER.warning("[%s] Failed to dispose of the async database engine: %s", self.worker_label, e)
             try:
                 loop.close()
             except Exception:
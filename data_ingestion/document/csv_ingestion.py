@@ -6,7 +6,7 @@ from typing import Callable, Optional
 import pandas as pd
 
 from data_ingestion.document.folder_management.folder_management import FileChunk, FileDocument
-from data_ingestion.utils import get_chunk_token_count, split_df_by_token_limit
+from data_ingestion.utils import split_df_to_markdown_by_token_limit
 
 LOGGER = logging.getLogger(__name__)
 
@@ -32,15 +32,9 @@ def ingest_csv_file(
         if not all(pd.api.types.is_numeric_dtype(type(cell)) for cell in first_row):
             df.columns = first_row
             df = df.iloc[1:]
-    total_token_count = get_chunk_token_count(chunk_df=df)
-    if total_token_count > chunk_size:
-        LOGGER.info(f"Splitting {document.file_name} into chunks")
-        df_chunks = split_df_by_token_limit(df=df, max_tokens=chunk_size)
-    else:
-        LOGGER.info(f"No need to split {document.file_name} into chunks")
-        df_chunks = [df]
-    for idx, chunk_df in enumerate(df_chunks):
-        markdown_content = chunk_df.to_markdown(index=False)
+    markdown_chunks = split_df_to_markdown_by_token_limit(df=df, max_tokens=chunk_size)
+    LOGGER.info(f"Split {document.file_name} into {len(markdown_chunks)} chunks")
+    for idx, markdown_content in enumerate(markdown_chunks):
         result_chunks.append(
             FileChunk(
                 chunk_id=str(uuid.uuid4()),
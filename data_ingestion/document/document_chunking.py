@@ -2,7 +2,7 @@ import inspect
 import json
 import logging
 from functools import partial
-from typing import Callable, Optional
+from typing import Any, Callable, Optional, Sequence
 
 import pandas as pd
 
@@ -20,13 +20,23 @@ from data_ingestion.document.markdown_ingestion import get_chunks_from_markdown
 from data_ingestion.document.mistral_ocr_ingestion import get_chunks_from_document_with_mistral_ocr
 from data_ingestion.document.pdf_ingestion import _parse_pdf_without_llm, create_chunks_from_pdf_document
 from data_ingestion.document.pdf_vision_ingestion import create_chunks_from_document
-from data_ingestion.utils import DocumentReadingMode
+from data_ingestion.utils import Chunk, DocumentReadingMode
 from engine.llm_services.llm_service import CompletionService, VisionService
 from ingestion_script.utils import ORDER_COLUMN_NAME
 
+try:
+    import pyarrow  # noqa: F401
+
+    # Arrow strings keep the chunk text in one buffer per column instead of one Python object per value
+    CHUNK_STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    CHUNK_STRING_DTYPE = object
+
 LOGGER = logging.getLogger(__name__)
 FileProcessor = Callable[[FileDocument], list[FileChunk]]
 
+JSON_TYPE_FIELDS = ["bounding_boxes", "metadata"]
+
 
 def document_chunking_mapping(
     vision_ingestion_service: Optional[VisionService] = None,
@@ -146,7 +156,7 @@ async def get_chunks_dataframe_from_doc(
     document: BaseDocument,
     document_chunk_mapping: dict[FileDocumentType, FileProcessor],
     llm_service: Optional[CompletionService] = None,
-    json_type_fields: list[str] = ["bounding_boxes", "metadata"],
+    json_type_fields: list[str] = JSON_TYPE_FIELDS,
     add_doc_description_to_chunks: bool = False,
     documents_summary_func: Optional[Callable] = None,
     add_summary_in_chunks_func: Optional[Callable] = None,
@@ -222,15 +232,39 @@ async def get_chunks_dataframe_from_doc(
     #         chunks=chunks,
     #     )
     all_chunks.extend(chunks)
-    chunks_df = pd.DataFrame([chunk.model_dump() for chunk in all_chunks])
-    chunks_df.columns = [col.lower() for col in chunks_df.columns]
-    if ORDER_COLUMN_NAME not in chunks_df.columns or chunks_df[ORDER_COLUMN_NAME].isna().all():
-        chunks_df[ORDER_COLUMN_NAME] = range(len(chunks_df))
-    for field in json_type_fields:
-        lower_field = field.lower()
-        if lower_field in chunks_df.columns:
-            chunks_df[lower_field] = chunks_df[lower_field].apply(json.dumps)
-    for col in chunks_df.columns:
-        if col != ORDER_COLUMN_NAME:
-            chunks_df[col] = chunks_df[col].astype(str)
-    return chunks_df
+    columns = _get_chunk_columns(all_chunks, json_type_fields)
+    return pd.DataFrame({
+        column_name: values if column_name == ORDER_COLUMN_NAME else pd.array(values, dtype=CHUNK_STRING_DTYPE)
+        for column_name, values in columns.items()
+    })
+
+
+def _missing_value(column_name: str) -> Optional[str]:
+    return None if column_name == ORDER_COLUMN_NAME else str(None)
+
+
+def _get_chunk_columns(chunks: Sequence[Chunk], json_type_fields: list[str]) -> dict[str, list[Any]]:
+    """
+    Build the chunk columns in a single pass over the chunks: fields listed in json_type_fields are dumped to JSON
+    once per chunk, the others are stored as strings, except the order.
+    """
+    json_fields = {field.lower() for field in json_type_fields}
+    columns: dict[str, list[Any]] = {}
+    for index, chunk in enumerate(chunks):
+        for key, value in chunk.model_dump().items():
+            column_name = key.lower()
+            if column_name not in columns:
+                # Earlier chunks without this field get a missing value, like a DataFrame built from records
+                columns[column_name] = [_missing_value(column_name)] * index
+            if column_name == ORDER_COLUMN_NAME:
+                columns[column_name].append(value)
+            elif column_name in json_fields:
+                columns[column_name].append(json.dumps(value))
+            else:
+                columns[column_name].append(str(value))
+        for column_name, column in columns.items():
+            if len(column) <= index:
+                column.append(_missing_value(column_name))
+    if ORDER_COLUMN_NAME not in columns or all(order is None for order in columns[ORDER_COLUMN_NAME]):
+        columns[ORDER_COLUMN_NAME] = list(range(len(chunks)))
+    return columns
@@ -73,6 +73,9 @@ class FileDocument(BaseDocument):
     """Document model for file-based sources."""
 
     last_edited_ts: str  # Required for files
+    # Optional change markers from the storage listing, used to skip unchanged files on re-ingestion
+    size: Optional[int] = None
+    etag: Optional[str] = None
 
 
 class WebsiteDocument(BaseDocument):
@@ -66,7 +66,9 @@ class GoogleDriveFolderManager(FolderManager):
         file = (
             self._service.files()
             .get(
-                fileId=file_id, fields="id, name, mimeType, webViewLink, parents, modifiedTime", supportsAllDrives=True
+                fileId=file_id,
+                fields="id, name, mimeType, webViewLink, parents, modifiedTime, size, md5Checksum",
+                supportsAllDrives=True,
             )
             .execute()
         )
@@ -139,6 +141,9 @@ class GoogleDriveFolderManager(FolderManager):
         return FileDocument(
             id=file["id"],
             last_edited_ts=file.get("modifiedTime", None),
+            # Google-native files (e.g. sheets) have neither a size nor a checksum
+            size=int(file["size"]) if file.get("size") else None,
+            etag=file.get("md5Checksum", None),
             type=file_type,
             file_name=file["name"],
             folder_name="/".join(reversed(folder_names)),
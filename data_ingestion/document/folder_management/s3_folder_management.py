@@ -39,6 +39,8 @@ class S3FolderManager(FolderManager):
                 "last_edited_ts": f.get("last_edited_ts", None),
                 "s3_path": f.get("s3_path", None),
                 "metadata": f.get("metadata", {}),
+                "size": f.get("size", None),
+                "etag": f.get("etag", None),
             }
             for f in folder_payload
         }
@@ -66,6 +68,8 @@ class S3FolderManager(FolderManager):
         return FileDocument(
             id=file_path,
             last_edited_ts=file_data["last_edited_ts"],
+            size=file_data["size"],
+            etag=file_data["etag"],
             type=file_type,
             file_name=file_name,
             folder_name=str(Path(file_path).parent),
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import pandas as pd
+
+from data_ingestion.document.document_chunking import document_chunking_mapping, get_chunks_dataframe_from_doc
+from data_ingestion.document.folder_management.folder_management import FileDocument, FileDocumentType
+from data_ingestion.utils import DocumentReadingMode
+from settings import settings
+from shared.resource_limits import set_cpu_time_limit, set_memory_limit
+
+LOGGER = logging.getLogger(__name__)
+
+# Local, CPU-bound parsers of the standard reading mode. The other modes (vision, LlamaParse, Mistral OCR) mostly
+# wait on remote services and keep running in the ingestion process.
+POOL_PARSED_FILE_TYPES = {
+    FileDocumentType.PDF,
+    FileDocumentType.DOCX,
+    FileDocumentType.DOC,
+    FileDocumentType.MARKDOWN,
+    FileDocumentType.CSV,
+}
+# A parser process is replaced after this many files, so memory held by native libraries does not pile up
+MAX_FILES_PER_PARSER_PROCESS = 50
+# Extra time before the CPU time limit kills a parser stuck in native code that never returns to Python
+CPU_TIME_LIMIT_GRACE_SECONDS = 10
+# Default number of parser processes at most, each one reserving up to memory_limit_mb of address space
+MAX_DEFAULT_PARSER_PROCESSES = 4
+
+
+def get_default_parser_processes() -> int:
+    """CPUs this process may run on (affinity, e.g. a container cpuset), capped at MAX_DEFAULT_PARSER_PROCESSES."""
+    if hasattr(os, "sched_getaffinity"):
+        available_cpus = len(os.sched_getaffinity(0))
+    else:
+        available_cpus = os.cpu_count() or 1
+    return max(1, min(available_cpus, MAX_DEFAULT_PARSER_PROCESSES))
+
+
+def _raise_parse_timeout(signum, frame) -> None:
+    raise TimeoutError("Parsing timed out")
+
+
+def _init_parser_process(memory_limit_mb: int) -> None:
+    set_memory_limit(memory_limit_mb)
+    signal.signal(signal.SIGALRM, _raise_parse_timeout)
+
+
+def _parse_file(
+    document: FileDocument,
+    content: bytes | str,
+    chunk_size: Optional[int],
+    chunk_overlap: int,
+    timeout_seconds: int,
+) -> pd.DataFrame:
+    """Parse and chunk one file. Runs in a parser process, one file at a time."""
+    set_cpu_time_limit(timeout_seconds + CPU_TIME_LIMIT_GRACE_SECONDS)
+    signal.alarm(timeout_seconds)
+    try:
+        document_chunk_mapping = document_chunking_mapping(
+            get_file_content_func=lambda file_id: content,
+            chunk_size=chunk_size,
+            overlapping_size=chunk_overlap,
+            document_reading_mode=DocumentReadingMode.STANDARD,
+        )
+        return asyncio.run(
+            get_chunks_dataframe_from_doc(
+                document,
+                document_chunk_mapping=document_chunk_mapping,
+                default_chunk_size=chunk_size,
+            )
+        )
+    finally:
+        signal.alarm(0)
+
+
+class ParserPool:
+    """
+    Parses and chunks files of the standard reading mode in a pool of processes, so folder ingestion uses every
+    core instead of parsing one file at a time on the event loop.
+
+    Each parser process has its address space capped at memory_limit_mb, like the ingestion subprocesses started by
+    the worker, and each file gets timeout_seconds to be parsed. A file that exceeds a limit fails on its own;
+    a parser process killed by the kernel fails the files it was running alongside, and the pool is restarted.
+    """
+
+    def __init__(
+        self,
+        chunk_size: Optional[int],
+        chunk_overlap: int,
+        max_workers: Optional[int] = None,
+        memory_limit_mb: int = settings.INGESTION_PARSER_MEMORY_LIMIT_MB,
+        timeout_seconds: int = settings.INGESTION_PARSER_TIMEOUT_SECONDS,
+    ):
+        self.max_workers = max_workers or get_default_parser_processes()
+        self._chunk_size = chunk_size
+        self._chunk_overlap = chunk_overlap
+        self._memory_limit_mb = memory_limit_mb
+        self._timeout_seconds = timeout_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @staticmethod
+    def supports(document: FileDocument) -> bool:
+        return document.type in POOL_PARSED_FILE_TYPES
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process running an event loop and threads can deadlock the child, start fresh interpreters
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_parser_process,
+                initargs=(self._memory_limit_mb,),
+                max_tasks_per_child=MAX_FILES_PER_PARSER_PROCESS,
+            )
+        return self._executor
+
+    async def parse(self, document: FileDocument, content: bytes | str) -> pd.DataFrame:
+        executor = self._get_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor,
+                _parse_file,
+                document,
+                content,
+                self._chunk_size,
+                self._chunk_overlap,
+                self._timeout_seconds,
+            )
+        except BrokenProcessPool as e:
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            raise RuntimeError(
+                f"Parser process crashed while parsing {document.file_name}, "
+                f"it may have exceeded {self._memory_limit_mb} MB or {self._timeout_seconds} seconds"
+            ) from e
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import fitz
+
+from settings import settings
+
+LOGGER = logging.getLogger(__name__)
+
+PDF_POINTS_PER_INCH = 72
+# Share of unreadable characters above which a text layer is considered broken (bad font encoding, OCR noise)
+MAX_UNREADABLE_CHARACTERS_RATIO = 0.05
+
+_render_executor: Optional[ProcessPoolExecutor] = None
+
+
+@dataclass
+class RenderedPage:
+    """A PDF page as sent to the vision model, or its text when the text layer is good enough to skip vision."""
+
+    page_index: int
+    image: Optional[bytes] = None
+    text: Optional[str] = None
+
+
+def get_zoom(zoom: float, dpi: Optional[int] = None) -> float:
+    """The DPI, when set, takes precedence over the zoom factor."""
+    if dpi:
+        return dpi / PDF_POINTS_PER_INCH
+    return zoom
+
+
+def get_usable_text_layer(page: fitz.Page, min_characters: int) -> Optional[str]:
+    """
+    Text density heuristic: the text layer of a page replaces its vision extraction when it has at least
+    min_characters visible characters, almost all of them readable, and the page holds no image
+    (charts, scans or diagrams still need the vision model).
+    """
+    text = page.get_text()
+    visible_characters = [character for character in text if not character.isspace()]
+    if len(visible_characters) < min_characters:
+        return None
+    unreadable_characters = sum(
+        1 for character in visible_characters if character == "\ufffd" or not character.isprintable()
+    )
+    if unreadable_characters > MAX_UNREADABLE_CHARACTERS_RATIO * len(visible_characters):
+        return None
+    if page.get_images():
+        return None
+    return text.strip()
+
+
+def render_page(
+    pdf_path: str,
+    page_index: int,
+    zoom: float,
+    text_layer_min_characters: Optional[int] = None,
+) -> RenderedPage:
+    """Renders one page to PNG. Runs in the rendering processes, so it only takes and returns picklable values."""
+    with fitz.open(pdf_path) as pdf_document:
+        page = pdf_document[page_index]
+        if text_layer_min_characters is not None:
+            text = get_usable_text_layer(page, text_layer_min_characters)
+            if text is not None:
+                return RenderedPage(page_index=page_index, text=text)
+        pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+        return RenderedPage(page_index=page_index, image=pixmap.tobytes("png"))
+
+
+def _get_render_executor() -> Optional[ProcessPoolExecutor]:
+    global _render_executor
+    if settings.PDF_RENDER_PROCESSES <= 0:
+        return None
+    if _render_executor is None:
+        # Forking a process running an event loop and threads can deadlock the child, start fresh interpreters
+        _render_executor = ProcessPoolExecutor(
+            max_workers=settings.PDF_RENDER_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _render_executor
+
+
+async def render_page_async(
+    pdf_path: str,
+    page_index: int,
+    zoom: float,
+    text_layer_min_characters: Optional[int] = None,
+) -> RenderedPage:
+    """Renders a page outside of the event loop: in the rendering processes, or in a thread when they are disabled."""
+    global _render_executor
+    executor = _get_render_executor()
+    if executor is None:
+        return await asyncio.to_thread(render_page, pdf_path, page_index, zoom, text_layer_min_characters)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, render_page, pdf_path, page_index, zoom, text_layer_min_characters
+        )
+    except BrokenProcessPool:
+        # A rendering process died (e.g. killed for memory): start a new pool for the next pages
+        LOGGER.error(f"PDF rendering process crashed while rendering page {page_index + 1}")
+        if _render_executor is executor:
+            _render_executor = None
+        raise
+
+
+@contextmanager
+def temporary_pdf_file(pdf_content: bytes) -> Iterator[str]:
+    """Rendering processes open the PDF from disk instead of receiving its whole content for every page."""
+    pdf_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+    try:
+        with pdf_file:
+            pdf_file.write(pdf_content)
+        yield pdf_file.name
+    finally:
+        os.remove(pdf_file.name)
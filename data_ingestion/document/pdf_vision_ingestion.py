@@ -1,13 +1,15 @@
-import io
+import asyncio
 import logging
 import uuid
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import fitz
 from pydantic import BaseModel
 
 from data_ingestion.document.folder_management.folder_management import FileChunk, FileDocument
+from data_ingestion.document.pdf_rendering import get_zoom, render_page_async, temporary_pdf_file
 from data_ingestion.document.prompts_vision_ingestion import (
     PDF_CONTENT_EXTRACTION_PROMPT,
     PDF_STRUCTURED_CONTENT_EXTRACTION_PROMPT,
@@ -71,20 +73,31 @@ def _get_pdf_orientation_from_content(pdf_content) -> PDFType:
             raise ValueError("PDF orientation is mixed or cannot be determined.")
 
 
-def _pdf_to_images(pdf_content, zoom: float = 3.0):
-    pdf_document = fitz.Document(stream=pdf_content)
-    try:
-        for page_number in range(len(pdf_document)):
-            page = pdf_document[page_number]
+async def _render_pages_as_images(pdf_path: str, page_indexes: List[int], zoom: float) -> List[bytes]:
+    """Renders pages in the rendering processes, in parallel, and returns their images in page order."""
+    rendered_pages = await asyncio.gather(
+        *(render_page_async(pdf_path=pdf_path, page_index=page_index, zoom=zoom) for page_index in page_indexes)
+    )
+    return [rendered_page.image for rendered_page in rendered_pages]
+
+
+async def _run_bounded(calls: List[Callable[[], Awaitable[Any]]], max_concurrency: int) -> List[Any]:
+    """
+    Runs the calls with at most max_concurrency at once and returns their results in order.
+    The first failure cancels the other calls and is raised.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
 
-            matrix = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=matrix)
-            img_byte_arr = io.BytesIO(pix.tobytes("png"))
-            img_byte_arr.seek(0)
+    async def run(call: Callable[[], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            return await call()
 
-            yield img_byte_arr.getvalue()
-    finally:
-        pdf_document.close()
+    try:
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [task_group.create_task(run(call)) for call in calls]
+    except ExceptionGroup as exception_group:
+        raise exception_group.exceptions[0] from exception_group
+    return [task.result() for task in tasks]
 
 
 async def _extract_text_from_pages_as_images(
@@ -174,8 +187,9 @@ async def _get_markdown_from_sections(
     google_llm_service: VisionService,
     openai_llm_service: VisionService,
     images_content_list: List[bytes],
+    max_concurrency: int = settings.PDF_VISION_MAX_CONCURRENCY,
 ) -> str:
-    markdown_output = ""
+    extractions = []
     for i, section in enumerate(sections_tree):
         section_end = sections_tree[i + 1].start_page if i + 1 < len(sections_tree) else len(images_content_list)
         start_page = max(0, section.start_page - 1)
@@ -183,18 +197,20 @@ async def _get_markdown_from_sections(
 
         section_images = images_content_list[start_page:end_page]
 
-        extracted_text = await _extract_text_from_pages_as_images(
-            prompt=PDF_STRUCTURED_CONTENT_EXTRACTION_PROMPT.format(
-                section_toc=section.string_toc,
-                section_pages_info=f"Pages {start_page} to {end_page}",
-            ),
-            google_llm_service=google_llm_service,
-            openai_llm_service=openai_llm_service,
-            image_content_list=section_images,
+        extractions.append(
+            partial(
+                _extract_text_from_pages_as_images,
+                prompt=PDF_STRUCTURED_CONTENT_EXTRACTION_PROMPT.format(
+                    section_toc=section.string_toc,
+                    section_pages_info=f"Pages {start_page} to {end_page}",
+                ),
+                google_llm_service=google_llm_service,
+                openai_llm_service=openai_llm_service,
+                image_content_list=section_images,
+            )
         )
-        markdown_output += extracted_text
-        markdown_output += "\n\n"
-    return markdown_output
+    extracted_texts = await _run_bounded(extractions, max_concurrency=max_concurrency)
+    return "".join(f"{extracted_text}\n\n" for extracted_text in extracted_texts)
 
 
 def _create_chunks_from_markdown(
@@ -248,24 +264,44 @@ def _create_chunk_from_text(
 
 async def _process_pdf_page_by_page(
     document: FileDocument,
-    content_to_process: bytes,
+    pdf_path: str,
+    total_pages: int,
     google_llm_service: VisionService,
     openai_llm_service: VisionService,
     prompt: str,
     zoom: float,
+    text_layer_min_characters: Optional[int] = settings.PDF_TEXT_LAYER_MIN_CHARACTERS,
+    max_concurrency: int = settings.PDF_VISION_MAX_CONCURRENCY,
 ) -> list[FileChunk]:
-    """Process PDF pages individually and return chunks."""
-    chunks = []
-    for i, img_base64 in enumerate(_pdf_to_images(pdf_content=content_to_process, zoom=zoom)):
-        extracted_text = await _extract_text_from_pages_as_images(
+    """
+    Process PDF pages individually and return chunks, in page order.
+    A page is only rendered once a vision slot is free, so at most max_concurrency page images are in memory.
+    """
+
+    async def extract_page_text(page_index: int) -> str:
+        rendered_page = await render_page_async(
+            pdf_path=pdf_path,
+            page_index=page_index,
+            zoom=zoom,
+            text_layer_min_characters=text_layer_min_characters,
+        )
+        if rendered_page.text is not None:
+            LOGGER.debug(f"Using the text layer of page {page_index + 1} of {document.file_name}")
+            return rendered_page.text
+        return await _extract_text_from_pages_as_images(
             prompt=prompt,
             google_llm_service=google_llm_service,
             openai_llm_service=openai_llm_service,
-            image_content_list=[img_base64],
+            image_content_list=[rendered_page.image],
         )
-        chunk = _create_chunk_from_text(document, extracted_text, page_number=i + 1, order=i)
-        chunks.append(chunk)
-    return chunks
+
+    extracted_texts = await _run_bounded(
+        [partial(extract_page_text, page_index) for page_index in range(total_pages)], max_concurrency=max_concurrency
+    )
+    return [
+        _create_chunk_from_text(document, extracted_text, page_number=i + 1, order=i)
+        for i, extracted_text in enumerate(extracted_texts)
+    ]
 
 
 async def _process_pdf_with_table_of_contents(
@@ -301,17 +337,44 @@ async def create_chunks_from_document(
     # TODO: Fix when we handle via frontend
     number_of_pages_to_detect_document_type: int = settings.NUMBER_OF_PAGES_TO_DETECT_DOCUMENT_TYPE,
     zoom: float = settings.PAGE_RESOLUTION_ZOOM,
+    dpi: Optional[int] = settings.PAGE_RESOLUTION_DPI,
     **kwargs,
 ) -> list[FileChunk]:
     content_to_process = get_file_content(document.id)
     pdf_type, total_pages = _get_pdf_orientation_from_content(content_to_process)
-    images_content_list = [img_base64 for img_base64 in _pdf_to_images(pdf_content=content_to_process, zoom=zoom)]
+    zoom = get_zoom(zoom, dpi)
+    with temporary_pdf_file(content_to_process) as pdf_path:
+        return await _create_chunks_from_pdf_file(
+            document=document,
+            pdf_path=pdf_path,
+            pdf_type=pdf_type,
+            total_pages=total_pages,
+            google_llm_service=google_llm_service,
+            openai_llm_service=openai_llm_service,
+            number_of_pages_to_detect_document_type=number_of_pages_to_detect_document_type,
+            zoom=zoom,
+        )
+
+
+async def _create_chunks_from_pdf_file(
+    document: FileDocument,
+    pdf_path: str,
+    pdf_type: PDFType,
+    total_pages: int,
+    google_llm_service: VisionService,
+    openai_llm_service: VisionService,
+    number_of_pages_to_detect_document_type: int,
+    zoom: float,
+) -> list[FileChunk]:
+    all_page_indexes = list(range(total_pages))
     file_type = await _extract_text_from_pages_as_images(
         prompt=PROMPT_DETERMINE_FILE_TYPE,
         google_llm_service=google_llm_service,
         openai_llm_service=openai_llm_service,
         response_format=FileType,
-        image_content_list=images_content_list[:number_of_pages_to_detect_document_type],
+        image_content_list=await _render_pages_as_images(
+            pdf_path, all_page_indexes[:number_of_pages_to_detect_document_type], zoom
+        ),
     )
 
     # Handle landscape PDFs or PowerPoint conversions
@@ -319,7 +382,8 @@ async def create_chunks_from_document(
         LOGGER.info("Processing PDF in landscape mode...")
         return await _process_pdf_page_by_page(
             document=document,
-            content_to_process=content_to_process,
+            pdf_path=pdf_path,
+            total_pages=total_pages,
             google_llm_service=google_llm_service,
             openai_llm_service=openai_llm_service,
             prompt=PPTX_CONTENT_EXTRACTION_PROMPT,
@@ -335,13 +399,17 @@ async def create_chunks_from_document(
             LOGGER.info("Using custom models - skipping TOC processing, using page-by-page processing instead.")
             return await _process_pdf_page_by_page(
                 document=document,
-                content_to_process=content_to_process,
+                pdf_path=pdf_path,
+                total_pages=total_pages,
                 google_llm_service=google_llm_service,
                 openai_llm_service=openai_llm_service,
                 prompt=PDF_CONTENT_EXTRACTION_PROMPT,
                 zoom=zoom,
             )
 
+        # The table of contents is extracted from all pages at once, so this path needs every image
+        images_content_list = await _render_pages_as_images(pdf_path, all_page_indexes, zoom)
+
         # Try to extract table of contents (only for non-custom models)
         try:
             extracted_table_of_content = await _extract_text_from_pages_as_images(
@@ -369,11 +437,13 @@ async def create_chunks_from_document(
                 LOGGER.error(f"Error processing with table of contents: {e}. Falling back to page-by-page processing.")
         else:
             LOGGER.info("Table of contents is empty. Falling back to page-by-page processing.")
+        del images_content_list
 
         # Fallback to page-by-page processing
         return await _process_pdf_page_by_page(
             document=document,
-            content_to_process=content_to_process,
+            pdf_path=pdf_path,
+            total_pages=total_pages,
             google_llm_service=google_llm_service,
             openai_llm_service=openai_llm_service,
             prompt=PDF_CONTENT_EXTRACTION_PROMPT,
@@ -387,7 +457,8 @@ async def create_chunks_from_document(
     )
     return await _process_pdf_page_by_page(
         document=document,
-        content_to_process=content_to_process,
+        pdf_path=pdf_path,
+        total_pages=total_pages,
         google_llm_service=google_llm_service,
         openai_llm_service=openai_llm_service,
         prompt=PDF_CONTENT_EXTRACTION_PROMPT,
@@ -15,18 +15,52 @@ LOGGER = logging.getLogger(__name__)
 
 
 class TreeChunk:
-    def __init__(self, content: str, level: MarkdownLevel, ancestors: list["TreeChunk"] = None):
+    def __init__(
+        self,
+        content: str,
+        level: MarkdownLevel,
+        ancestors: list["TreeChunk"] = None,
+        token_count: Optional[int] = None,
+    ):
         self.content = content
         self.level = level
         self.ancestors = ancestors if ancestors else []
+        # Token count of content, filled in by the TreeChunker that produced or measured the chunk
+        self.token_count = token_count
 
     @property
     def formatted_path(self) -> str:
-        path = [ancestor.content for ancestor in self.ancestors]
-        return "\n".join(path)
+        return self.formatted_path_from(0)
+
+    def formatted_path_from(self, start: int) -> str:
+        return "\n".join(ancestor.content for ancestor in self.ancestors[start:])
+
+    def common_ancestor_count(self, other: "TreeChunk") -> int:
+        count = 0
+        for own_ancestor, other_ancestor in zip(self.ancestors, other.ancestors):
+            if own_ancestor is not other_ancestor:
+                break
+            count += 1
+        return count
+
+    def merge_parts(self, other: "TreeChunk") -> tuple[int, list[tuple[str, Optional["TreeChunk"]]]]:
+        """
+        Number of ancestors shared with other, and the non-empty texts joined by a merge: the ancestor
+        paths below the shared ones and both contents. Content texts come with the chunk they belong to.
+        """
+        common_ancestors = self.common_ancestor_count(other)
+        parts = [
+            (self.formatted_path_from(common_ancestors).strip(), None),
+            (self.content.strip(), self),
+            (other.formatted_path_from(common_ancestors).strip(), None),
+            (other.content.strip(), other),
+        ]
+        return common_ancestors, [(text, chunk) for text, chunk in parts if text]
 
     def copy(self):
-        return TreeChunk(content=self.content, level=self.level, ancestors=self.ancestors)
+        return TreeChunk(
+            content=self.content, level=self.level, ancestors=self.ancestors, token_count=self.token_count
+        )
 
     def __str__(self):
         return self.content
@@ -34,33 +68,12 @@ class TreeChunk:
     def __add__(self, other: "TreeChunk") -> "TreeChunk":
         if not isinstance(other, TreeChunk):
             return NotImplemented
-        if len(self.ancestors) > 0 and len(other.ancestors) > 0 and self.ancestors[0] == other.ancestors[0]:
-            new_self = self.copy()
-            new_self.ancestors = self.ancestors[1:]
-            new_other = other.copy()
-            new_other.ancestors = other.ancestors[1:]
-            added_chunk = new_self + new_other
-            added_chunk.ancestors = [self.ancestors[0]] + added_chunk.ancestors
-            return added_chunk
-
-        else:
-            new_content = "\n\n".join(
-                filter(
-                    None,
-                    [
-                        self.formatted_path.strip(),
-                        self.content.strip(),
-                        other.formatted_path.strip(),
-                        other.content.strip(),
-                    ],
-                )
-            )
-
-            return TreeChunk(
-                content=new_content,
-                level=min(self.level, other.level, key=lambda x: x.value),
-                ancestors=[],
-            )
+        common_ancestors, parts = self.merge_parts(other)
+        return TreeChunk(
+            content="\n\n".join(text for text, _ in parts),
+            level=min(self.level, other.level, key=lambda x: x.value),
+            ancestors=self.ancestors[:common_ancestors],
+        )
 
 
 class TreeChunker:
@@ -71,10 +84,24 @@ class TreeChunker:
         self._chunk_size = chunk_size
         self._chunk_overlap = chunk_overlap
         self._encoding = tiktoken.encoding_for_model(model_name)
+        # Node contents and ancestor paths are measured many times while merging, count them once
+        self._token_count_cache: dict[str, int] = {}
 
     def _count_tokens(self, text: str) -> int:
         return len(self._encoding.encode(text))
 
+    def _count_tokens_cached(self, text: str) -> int:
+        token_count = self._token_count_cache.get(text)
+        if token_count is None:
+            token_count = self._count_tokens(text)
+            self._token_count_cache[text] = token_count
+        return token_count
+
+    def _chunk_token_count(self, chunk: TreeChunk) -> int:
+        if chunk.token_count is None:
+            chunk.token_count = self._count_tokens_cached(chunk.content)
+        return chunk.token_count
+
     def _split_text(self, chunk: TreeChunk) -> list[TreeChunk]:
         splitter = SentenceSplitter(
             chunk_size=self._chunk_size,
@@ -88,33 +115,47 @@ class TreeChunker:
         ]
         return split_chunks
 
-    def _combine_chunks(self, chunks: list):
-        if len(chunks) == 0:
-            return []
-        elif len(chunks) == 1:
-            if self._count_tokens(chunks[0].content) > self._chunk_size:
-                return self._split_text(chunks[0])
-            return chunks
-        else:
-            first_chunks = self._combine_chunks(chunks[:-1])
-            current_chunk = first_chunks[-1]
-            last_chunk = chunks[-1]
-            if self._count_tokens(last_chunk.content) > self._chunk_size:
-                first_chunks += self._split_text(last_chunk)
-            elif self._count_tokens(current_chunk.content) + self._count_tokens(last_chunk.content) > self._chunk_size:
-                first_chunks.append(last_chunk)
+    def _merge_chunks(self, first: TreeChunk, second: TreeChunk) -> TreeChunk:
+        """first + second, with the token count of the result summed from its parts instead of re-encoded."""
+        common_ancestors, parts = first.merge_parts(second)
+        token_count = sum(
+            self._chunk_token_count(chunk) if chunk is not None else self._count_tokens_cached(text)
+            for text, chunk in parts
+        )
+        token_count += (len(parts) - 1) * self._count_tokens_cached("\n\n")
+        return TreeChunk(
+            content="\n\n".join(text for text, _ in parts),
+            level=min(first.level, second.level, key=lambda x: x.value),
+            ancestors=first.ancestors[:common_ancestors],
+            token_count=token_count,
+        )
+
+    def _combine_chunks(self, chunks: list[TreeChunk]) -> list[TreeChunk]:
+        """
+        Merge consecutive chunks while the merged content stays within the chunk size,
+        in a single pass carrying the token count of the chunk being built.
+        """
+        combined_chunks: list[TreeChunk] = []
+        for chunk in chunks:
+            chunk_token_count = self._chunk_token_count(chunk)
+            if chunk_token_count > self._chunk_size:
+                combined_chunks.extend(self._split_text(chunk))
+            elif combined_chunks and (
+                self._chunk_token_count(combined_chunks[-1]) + chunk_token_count <= self._chunk_size
+            ):
+                combined_chunks[-1] = self._merge_chunks(combined_chunks[-1], chunk)
             else:
-                current_chunk += last_chunk
-                first_chunks[-1] = current_chunk
-            return first_chunks
+                combined_chunks.append(chunk)
+        return combined_chunks
 
     def _fetch_ancestors_to_level(self, ancestors: list[TreeChunk], level: MarkdownLevel) -> list[TreeChunk]:
-        if len(ancestors) == 0:
+        """Drop the trailing ancestors at or below level. The list is returned as is when nothing is dropped."""
+        end = len(ancestors)
+        while end > 0 and level.value <= ancestors[end - 1].level.value:
+            end -= 1
+        if end == len(ancestors):
             return ancestors
-        if level.value > ancestors[-1].level.value:
-            return ancestors
-        else:
-            return self._fetch_ancestors_to_level(ancestors[:-1], level)
+        return ancestors[:end]
 
     def chunk_tree(self, node: MarkdownNode, ancestors: Optional[list[TreeChunk]] = None) -> list[TreeChunk]:
         """Combines nodes into larger chunks without exceeding max token size."""
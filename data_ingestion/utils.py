@@ -6,9 +6,11 @@ import unicodedata
 from contextlib import contextmanager
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 import tiktoken
 from pydantic import BaseModel, Field
@@ -115,36 +117,94 @@ def get_image_description_prompt(
     return prompt_template
 
 
+DEFAULT_TOKEN_COUNT_MODEL = "gpt-4o-mini"
+
+
+@lru_cache(maxsize=8)
+def get_token_encoding(model_name: str = DEFAULT_TOKEN_COUNT_MODEL) -> tiktoken.Encoding:
+    """Encodings are expensive to build, so each one is loaded once per process."""
+    return tiktoken.encoding_for_model(model_name)
+
+
 def get_chunk_token_count(
-    model_name: str = "gpt-4o-mini",
+    model_name: str = DEFAULT_TOKEN_COUNT_MODEL,
     chunk_df: pd.DataFrame = None,
 ) -> int:
-    encoding = tiktoken.encoding_for_model(model_name)
+    encoding = get_token_encoding(model_name)
     markdown_str = chunk_df.to_markdown(index=False)
-    return len(encoding.encode(markdown_str))
+    return len(encoding.encode(markdown_str, disallowed_special=()))
+
+
+def _estimate_row_token_counts(df: pd.DataFrame, encoding: tiktoken.Encoding) -> np.ndarray:
+    """
+    Token count of each row rendered as an unpadded markdown table line (plus its newline),
+    built column by column and tokenized in one batch.
+    """
+    cells = df.astype(str)
+    row_lines = pd.Series("|", index=df.index, dtype=object)
+    for column_index in range(cells.shape[1]):
+        row_lines = row_lines + " " + cells.iloc[:, column_index] + " |"
+    token_lists = encoding.encode_batch(row_lines.tolist(), disallowed_special=())
+    return np.fromiter((len(tokens) + 1 for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+
+
+def _iter_token_bounded_chunks(df: pd.DataFrame, max_tokens: int) -> Iterator[tuple[pd.DataFrame, str]]:
+    """
+    Yield (chunk DataFrame, chunk markdown) pairs whose markdown fits in max_tokens, in row order.
+
+    Chunk boundaries come from a cumulative sum of per-row token estimates, corrected by the
+    rendered/estimated ratio of the previous chunk since column padding depends on the widest cell of
+    each chunk. Each chunk is rendered once to check its real size; a chunk above the budget is cut
+    at the last row that fits according to the token count of each rendered line, then re-checked.
+    A single row above the budget becomes its own chunk. Rows are rendered and tokenized a bounded
+    number of times, so the cost is linear in the number of rows.
+    """
+    if df.empty:
+        return
+    encoding = get_token_encoding()
+    header_tokens = len(encoding.encode(df.iloc[:0].to_markdown(index=False), disallowed_special=())) + 1
+    cumulative_tokens = np.cumsum(_estimate_row_token_counts(df, encoding))
+    number_of_rows = len(df)
+    padding_ratio = 1.0
+
+    start = 0
+    while start < number_of_rows:
+        tokens_before_start = cumulative_tokens[start - 1] if start > 0 else 0
+        budget = tokens_before_start + (max_tokens - header_tokens) / padding_ratio
+        end = max(int(np.searchsorted(cumulative_tokens, budget, side="right")), start + 1)
+        while True:
+            chunk_df = df.iloc[start:end].reset_index(drop=True)
+            markdown = chunk_df.to_markdown(index=False)
+            token_count = len(encoding.encode(markdown, disallowed_special=()))
+            if token_count <= max_tokens or end - start == 1:
+                break
+            # Header and separator lines come first, then one line per row
+            line_token_counts = [
+                len(tokens) + 1 for tokens in encoding.encode_batch(markdown.split("\n"), disallowed_special=())
+            ]
+            rows_tokens = np.cumsum(line_token_counts[2:]) + sum(line_token_counts[:2])
+            rows_that_fit = int(np.searchsorted(rows_tokens, max_tokens, side="right"))
+            end = start + max(1, min(end - start - 1, rows_that_fit))
+        estimated_tokens = cumulative_tokens[end - 1] - tokens_before_start
+        if estimated_tokens > 0:
+            padding_ratio = min(max((token_count - header_tokens) / estimated_tokens, 0.5), 4.0)
+        yield chunk_df, markdown
+        start = end
 
 
 def split_df_by_token_limit(
     df: pd.DataFrame,
     max_tokens: int,
 ) -> list[pd.DataFrame]:
-    chunks = []
-    current_chunk = []
-
-    for _, row in df.iterrows():
-        current_chunk.append(row)
-        temp_df = pd.DataFrame(current_chunk, columns=df.columns).reset_index(drop=True)
-        if get_chunk_token_count(chunk_df=temp_df) > max_tokens:
-            current_chunk.pop()
-            chunk_df = pd.DataFrame(current_chunk, columns=df.columns).reset_index(drop=True)
-            chunks.append(chunk_df)
-            current_chunk = [row]
-
-    if current_chunk:
-        chunk_df = pd.DataFrame(current_chunk, columns=df.columns).reset_index(drop=True)
-        chunks.append(chunk_df)
-
-    return chunks
+    return [chunk_df for chunk_df, _ in _iter_token_bounded_chunks(df, max_tokens)]
+
+
+def split_df_to_markdown_by_token_limit(
+    df: pd.DataFrame,
+    max_tokens: int,
+) -> list[str]:
+    """Same split as split_df_by_token_limit, returning the markdown tables already rendered for the check."""
+    return [markdown for _, markdown in _iter_token_bounded_chunks(df, max_tokens)]
 
 
 class DocumentReadingMode(str, Enum):
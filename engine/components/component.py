@@ -21,8 +21,8 @@ from engine.components.types import (
 from engine.prometheus_metric import track_calls
 from engine.secret_utils import unwrap_secrets
 from engine.trace.credit_calculator import calculate_and_set_component_credits
-from engine.trace.serializer import serialize_to_json
 from engine.trace.trace_manager import TraceManager
+from engine.trace.trace_policy import set_payload_attributes
 
 LOGGER = logging.getLogger(__name__)
 
@@ -164,9 +164,9 @@ class Component(ABC):
                     # TODO(security): serialize_to_json masks SecretStr but not plaintext
                     # secrets produced by prior concat/unwrap. Richer redaction requires
                     # catalog-level "sensitive port" metadata.
+                    set_payload_attributes(span, {SpanAttributes.INPUT_VALUE: input_node_data.data})
                     span.set_attributes({
                         SpanAttributes.OPENINFERENCE_SPAN_KIND: self.TRACE_SPAN_KIND,
-                        SpanAttributes.INPUT_VALUE: serialize_to_json(input_node_data.data, shorten_string=True),
                         "component_instance_id": (
                             str(self.component_attributes.component_instance_id)
                             if self.component_attributes.component_instance_id is not None
@@ -177,10 +177,8 @@ class Component(ABC):
                         span.set_attributes({
                             SpanAttributes.TOOL_NAME: self.tool_description.name,
                             SpanAttributes.TOOL_DESCRIPTION: self.tool_description.description,
-                            SpanAttributes.TOOL_PARAMETERS: serialize_to_json(
-                                input_node_data.data, shorten_string=True
-                            ),
                         })
+                        set_payload_attributes(span, {SpanAttributes.TOOL_PARAMETERS: input_node_data.data})
 
                     if self.migrated:
                         InputModel = self.get_inputs_schema()
@@ -200,9 +198,7 @@ class Component(ABC):
                             ctx=input_node_data.ctx,
                             directive=directive,
                         )
-                        span.set_attributes({
-                            SpanAttributes.OUTPUT_VALUE: serialize_to_json(output_node_data.data, shorten_string=True)
-                        })
+                        set_payload_attributes(span, {SpanAttributes.OUTPUT_VALUE: output_node_data.data})
                         self._set_trace_data(span)
                         self.credit_calculator(span)
                         span.set_status(trace_api.StatusCode.OK)
@@ -223,9 +219,7 @@ class Component(ABC):
                         output_node_data = legacy_compatibility.convert_legacy_to_node_data(
                             legacy_output, input_node_data.ctx
                         )
-                        span.set_attributes({
-                            SpanAttributes.OUTPUT_VALUE: serialize_to_json(output_node_data.data, shorten_string=True)
-                        })
+                        set_payload_attributes(span, {SpanAttributes.OUTPUT_VALUE: output_node_data.data})
                         self._set_trace_data(span)
                         self.credit_calculator(span)
                         span.set_status(trace_api.StatusCode.OK)
@@ -237,9 +231,9 @@ class Component(ABC):
                     legacy_input_preview = args[0]
                 elif kwargs:
                     legacy_input_preview = kwargs
+                set_payload_attributes(span, {SpanAttributes.INPUT_VALUE: legacy_input_preview})
                 span.set_attributes({
                     SpanAttributes.OPENINFERENCE_SPAN_KIND: self.TRACE_SPAN_KIND,
-                    SpanAttributes.INPUT_VALUE: serialize_to_json(legacy_input_preview, shorten_string=True),
                     "component_instance_id": (
                         str(self.component_attributes.component_instance_id)
                         if self.component_attributes.component_instance_id is not None
@@ -302,9 +296,7 @@ class Component(ABC):
                 else:
                     legacy_output = await self._run_without_io_trace(*args, **kwargs)
 
-                span.set_attributes({
-                    SpanAttributes.OUTPUT_VALUE: serialize_to_json(legacy_output, shorten_string=True)
-                })
+                set_payload_attributes(span, {SpanAttributes.OUTPUT_VALUE: legacy_output})
                 self._set_trace_data(span)
                 self.credit_calculator(span)
                 span.set_status(trace_api.StatusCode.OK)
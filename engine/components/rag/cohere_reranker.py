@@ -1,15 +1,12 @@
-import logging
 from typing import Optional
 
 import cohere
 
-from engine.components.rag.reranker import Reranker
-from engine.components.types import ComponentAttributes, SourceChunk
+from engine.components.rag.reranker import DEFAULT_MAX_TOKENS_PER_DOCUMENT, Reranker
+from engine.components.types import ComponentAttributes
 from engine.trace.trace_manager import TraceManager
 from settings import settings
 
-LOGGER = logging.getLogger(__name__)
-
 
 class CohereReranker(Reranker):
     def __init__(
@@ -20,32 +17,27 @@ class CohereReranker(Reranker):
         num_doc_reranked: int = 5,
         score_threshold: float = 0.0,
         component_attributes: Optional[ComponentAttributes] = None,
+        max_tokens_per_document: Optional[int] = DEFAULT_MAX_TOKENS_PER_DOCUMENT,
+        enable_cache: bool = True,
     ):
         super().__init__(
             trace_manager,
             model=cohere_model,
             component_attributes=component_attributes,
+            num_doc_reranked=num_doc_reranked,
+            score_threshold=score_threshold,
+            max_tokens_per_document=max_tokens_per_document,
+            enable_cache=enable_cache,
         )
         if cohere_api_key is None:
             cohere_api_key = settings.COHERE_API_KEY
         self._async_cohere_client = cohere.AsyncClientV2(cohere_api_key)
-        self._num_doc_reranked = num_doc_reranked
-        self._score_threshold = score_threshold
 
-    async def _rerank_without_trace(self, query, chunks: list[SourceChunk]) -> list[SourceChunk]:
-        if not chunks:
-            LOGGER.warning("No documents to rerank. The chunks list is empty.")
-            return []
+    async def _score_documents(self, query: str, documents: list[str], top_n: int) -> list[tuple[int, float]]:
         response = await self._async_cohere_client.rerank(
             model=self._model,
             query=query,
-            documents=[chunk.content for chunk in chunks],
-            top_n=self._num_doc_reranked,
+            documents=documents,
+            top_n=top_n,
         )
-        reranked_chunks = [
-            chunks[result.index] for result in response.results if result.relevance_score >= self._score_threshold
-        ]
-        for chunk, result in zip(reranked_chunks, response.results, strict=False):
-            chunk.metadata["reranked_score"] = result.relevance_score
-        LOGGER.info(f"Reranked {len(reranked_chunks)} chunks")
-        return reranked_chunks
+        return [(result.index, result.relevance_score) for result in response.results]
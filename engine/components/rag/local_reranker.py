@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import math
+from functools import lru_cache
+from typing import Optional
+
+from engine.components.rag.reranker import DEFAULT_MAX_TOKENS_PER_DOCUMENT, Reranker
+from engine.components.types import ComponentAttributes
+from engine.trace.trace_manager import TraceManager
+
+try:
+    from fastembed.rerank.cross_encoder import TextCrossEncoder
+except ImportError:
+    TextCrossEncoder = None
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_LOCAL_RERANKER_MODEL = "Xenova/ms-marco-MiniLM-L-6-v2"
+CROSS_ENCODER_BATCH_SIZE = 32
+
+
+@lru_cache(maxsize=4)
+def _load_cross_encoder(model_name: str) -> "TextCrossEncoder":
+    # Loading the ONNX model takes seconds, so it is shared by every reranker built in the process
+    LOGGER.info(f"Loading local cross-encoder model {model_name}")
+    return TextCrossEncoder(model_name=model_name)
+
+
+class LocalCrossEncoderReranker(Reranker):
+    """
+    Reranker scoring (query, document) pairs with a cross-encoder running on CPU (ONNX, through fastembed).
+    Used for offline benchmarks and deployments without Cohere access.
+    Raw cross-encoder logits go through a sigmoid so score_threshold keeps the Cohere [0, 1] scale.
+    """
+
+    def __init__(
+        self,
+        trace_manager: TraceManager,
+        model_name: str = DEFAULT_LOCAL_RERANKER_MODEL,
+        num_doc_reranked: int = 5,
+        score_threshold: float = 0.0,
+        component_attributes: Optional[ComponentAttributes] = None,
+        max_tokens_per_document: Optional[int] = DEFAULT_MAX_TOKENS_PER_DOCUMENT,
+        enable_cache: bool = True,
+    ):
+        if TextCrossEncoder is None:
+            raise ImportError(
+                "fastembed is required for the local reranker. Install it with `uv sync --group local_reranker`."
+            )
+        super().__init__(
+            trace_manager,
+            model=model_name,
+            component_attributes=component_attributes,
+            num_doc_reranked=num_doc_reranked,
+            score_threshold=score_threshold,
+            max_tokens_per_document=max_tokens_per_document,
+            enable_cache=enable_cache,
+        )
+
+    def _score_documents_sync(self, query: str, documents: list[str], top_n: int) -> list[tuple[int, float]]:
+        cross_encoder = _load_cross_encoder(self._model)
+        logits = cross_encoder.rerank(query, documents, batch_size=CROSS_ENCODER_BATCH_SIZE)
+        scores = [1 / (1 + math.exp(-float(logit))) for logit in logits]
+        ranked_indices = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:top_n]
+        return [(index, scores[index]) for index in ranked_indices]
+
+    async def _score_documents(self, query: str, documents: list[str], top_n: int) -> list[tuple[int, float]]:
+        # Inference is CPU bound: keep it off the event loop
+        return await asyncio.to_thread(self._score_documents_sync, query, documents, top_n)
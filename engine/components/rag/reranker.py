@@ -1,7 +1,14 @@
+import asyncio
+import hashlib
 import json
+import logging
 from abc import ABC, abstractmethod
+from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
+import tiktoken
+from cachetools import TTLCache
 from openinference.semconv.trace import OpenInferenceSpanKindValues, RerankerAttributes, SpanAttributes
 from opentelemetry import trace as trace_api
 
@@ -10,6 +17,55 @@ from engine.components.types import ComponentAttributes, SourceChunk
 from engine.trace.serializer import serialize_to_json
 from engine.trace.trace_manager import TraceManager
 
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_TOKENS_PER_DOCUMENT = 512
+DEFAULT_MAX_CONCURRENT_RERANKS = 4
+TOKEN_ENCODING_NAME = "cl100k_base"
+APPROXIMATE_CHARACTERS_PER_TOKEN = 4
+
+
+class RerankerBackend(str, Enum):
+    COHERE = "cohere"
+    LOCAL = "local"
+
+
+# Rankings keyed by (model, query hash, chunk ID set, top_n), shared by all reranker instances
+# because rerankers are rebuilt for every run
+_rerank_cache: TTLCache[tuple, list[tuple[str, float]]] = TTLCache(maxsize=1000, ttl=300)
+
+
+@lru_cache(maxsize=1)
+def _get_token_encoding() -> Optional[tiktoken.Encoding]:
+    try:
+        return tiktoken.get_encoding(TOKEN_ENCODING_NAME)
+    except Exception as e:
+        LOGGER.warning(f"Could not load the {TOKEN_ENCODING_NAME} encoding, truncating on characters instead: {e}")
+        return None
+
+
+def truncate_to_token_budget(text: str, max_tokens: Optional[int]) -> str:
+    """Cut text down to at most max_tokens tokens. None disables truncation."""
+    # A token always spans at least one character, so short texts never need encoding
+    if max_tokens is None or len(text) <= max_tokens:
+        return text
+    encoding = _get_token_encoding()
+    if encoding is None:
+        return text[: max_tokens * APPROXIMATE_CHARACTERS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def build_rerank_cache_key(model: str, query: str, chunks: list[SourceChunk], top_n: int) -> Optional[tuple]:
+    """Return None when chunks cannot be identified unambiguously by their ID."""
+    chunk_ids = [chunk.name for chunk in chunks]
+    if not all(chunk_ids) or len(set(chunk_ids)) != len(chunk_ids):
+        return None
+    query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    return model, query_hash, frozenset(chunk_ids), top_n
+
 
 class Reranker(CloseMixin, ABC):
     def __init__(
@@ -17,6 +73,10 @@ class Reranker(CloseMixin, ABC):
         trace_manager: TraceManager,
         model: str,
         component_attributes: Optional[ComponentAttributes] = None,
+        num_doc_reranked: int = 5,
+        score_threshold: float = 0.0,
+        max_tokens_per_document: Optional[int] = DEFAULT_MAX_TOKENS_PER_DOCUMENT,
+        enable_cache: bool = True,
     ):
         self.trace_manager = trace_manager
         self._model = model
@@ -24,11 +84,64 @@ class Reranker(CloseMixin, ABC):
             component_instance_name=self.__class__.__name__,
             component_instance_id=None,
         )
+        self._num_doc_reranked = num_doc_reranked
+        self._score_threshold = score_threshold
+        self._max_tokens_per_document = max_tokens_per_document
+        self._enable_cache = enable_cache
 
     @abstractmethod
-    async def _rerank_without_trace(self, query, chunks: list[SourceChunk]) -> list[SourceChunk]:
+    async def _score_documents(self, query: str, documents: list[str], top_n: int) -> list[tuple[int, float]]:
+        """Return (document index, relevance score) pairs of the top_n documents, best first."""
         pass
 
+    async def _rerank_without_trace(self, query, chunks: list[SourceChunk]) -> list[SourceChunk]:
+        if not chunks:
+            LOGGER.warning("No documents to rerank. The chunks list is empty.")
+            return []
+
+        cache_key = (
+            build_rerank_cache_key(self._model, query, chunks, self._num_doc_reranked) if self._enable_cache else None
+        )
+        cached_ranking = _rerank_cache.get(cache_key) if cache_key is not None else None
+        if cached_ranking is None:
+            documents = [truncate_to_token_budget(chunk.content, self._max_tokens_per_document) for chunk in chunks]
+            ranking = await self._score_documents(query, documents, self._num_doc_reranked)
+            if cache_key is not None:
+                # Cached by chunk ID: the same chunks may come back in another order
+                _rerank_cache[cache_key] = [(chunks[index].name, score) for index, score in ranking]
+        else:
+            LOGGER.debug(f"Reranking cache hit for {len(chunks)} chunks")
+            # Chunk IDs are unique whenever the ranking is cached
+            index_by_id = {chunk.name: index for index, chunk in enumerate(chunks)}
+            ranking = [(index_by_id[chunk_id], score) for chunk_id, score in cached_ranking]
+
+        reranked_chunks = []
+        for index, score in ranking:
+            if score < self._score_threshold:
+                continue
+            chunk = chunks[index]
+            chunk.metadata["reranked_score"] = score
+            reranked_chunks.append(chunk)
+        LOGGER.info(f"Reranked {len(reranked_chunks)} chunks")
+        return reranked_chunks
+
+    async def rerank_many(
+        self,
+        queries: list[str],
+        chunk_lists: list[list[SourceChunk]],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_RERANKS,
+    ) -> list[list[SourceChunk]]:
+        """Rerank the chunks of several queries concurrently, returning one reranked list per query."""
+        if len(queries) != len(chunk_lists):
+            raise ValueError("queries and chunk_lists must have the same length.")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def rerank_one(query: str, chunks: list[SourceChunk]) -> list[SourceChunk]:
+            async with semaphore:
+                return await self.rerank(query, chunks)
+
+        return list(await asyncio.gather(*(rerank_one(q, c) for q, c in zip(queries, chunk_lists, strict=True))))
+
     async def rerank(self, query, chunks: list[SourceChunk]):
         with self.trace_manager.start_span(self.component_attributes.component_instance_name) as span:
             input_documents = [{"content": chunk.content, "id": chunk.name} for chunk in chunks]
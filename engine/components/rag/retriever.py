@@ -13,7 +13,7 @@ from engine.components.component import Component
 from engine.components.synthesizer_prompts import DEFAULT_INSTRUCTIONS_FEW_SHOT_LEARNING
 from engine.components.types import ComponentAttributes, SourceChunk, ToolDescription
 from engine.components.utils import merge_qdrant_filters_with_and_conditions
-from engine.qdrant_service import SOURCE_ID_COLUMN_NAME, QdrantCollectionSchema, QdrantService, SearchMode
+from engine.qdrant_service import RRF_K, SOURCE_ID_COLUMN_NAME, QdrantCollectionSchema, QdrantService, SearchMode
 from engine.trace.serializer import serialize_to_json
 from engine.trace.trace_manager import TraceManager
 
@@ -88,6 +88,26 @@ def cast_string_to_list(string: Optional[str]) -> list[str]:
     return [s.strip() for s in string.split(",") if s.strip()]
 
 
+def fuse_chunk_rankings(rankings: list[list[SourceChunk]], limit: int) -> list[SourceChunk]:
+    """
+    Merge the chunk lists retrieved for several queries with reciprocal-rank fusion.
+    Chunks are deduplicated by chunk ID, a chunk found by several queries ranks higher.
+    """
+    fused_scores: dict[str, float] = {}
+    chunks_by_id: dict[str, SourceChunk] = {}
+    for ranking in rankings:
+        seen_in_ranking: set[str] = set()
+        for rank, chunk in enumerate(ranking):
+            chunk_id = chunk.name or chunk.content
+            if chunk_id in seen_in_ranking:
+                continue
+            seen_in_ranking.add(chunk_id)
+            fused_scores[chunk_id] = fused_scores.get(chunk_id, 0.0) + 1 / (RRF_K + rank)
+            chunks_by_id.setdefault(chunk_id, chunk)
+    ranked_ids = sorted(fused_scores, key=fused_scores.get, reverse=True)[:limit]
+    return [chunks_by_id[chunk_id] for chunk_id in ranked_ids]
+
+
 class RetrieverInputs(BaseModel):
     query: str = Field(
         description="The search query to retrieve relevant chunks from the knowledge base.",
@@ -98,6 +118,20 @@ class RetrieverInputs(BaseModel):
         description="Optional filters to apply to the retrieval (e.g., metadata filters).",
         json_schema_extra={"is_tool_input": True, "default_tool_json_schema": QDRANT_FILTERS_TOOL_JSON_SCHEMA},
     )
+    queries: Optional[list[str]] = Field(
+        default=None,
+        description="Optional additional queries (rephrasings or sub-questions) retrieved together with the query.",
+        json_schema_extra={
+            "is_tool_input": True,
+            "default_tool_json_schema": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": (
+                    "Optional additional queries (rephrasings or sub-questions) retrieved together with the query."
+                ),
+            },
+        },
+    )
     model_config = {"extra": "allow"}
 
 
@@ -168,11 +202,7 @@ class Retriever(Component):
             f"search_mode={self.search_mode.value}"
         )
 
-    async def _get_chunks_without_trace(
-        self,
-        query_text: str,
-        filters: Optional[dict] = None,
-    ) -> list[SourceChunk]:
+    def _build_filter(self, filters: Optional[dict] = None) -> Optional[dict]:
         source_id_filter = None
         if self.source_ids:
             if len(self.source_ids) == 1:
@@ -189,6 +219,14 @@ class Retriever(Component):
             if (source_id_filter and filters)
             else (source_id_filter or filters)
         )
+        return final_filter
+
+    async def _get_chunks_without_trace(
+        self,
+        query_text: str,
+        filters: Optional[dict] = None,
+    ) -> list[SourceChunk]:
+        final_filter = self._build_filter(filters)
         LOGGER.info(
             f"Retriever querying collection '{self.collection_name}' with source_ids={self.source_ids}, "
             f"filter: {json.dumps(final_filter)}"
@@ -217,6 +255,93 @@ class Retriever(Component):
 
         return chunks
 
+    async def _get_chunks_for_queries_without_trace(
+        self,
+        query_texts: list[str],
+        filters: Optional[dict] = None,
+    ) -> list[SourceChunk]:
+        """
+        Retrieve chunks for several queries with one embedding call and one Qdrant batch search,
+        then merge the per-query results with reciprocal-rank fusion.
+        """
+        unique_queries = list(dict.fromkeys(query.strip() for query in query_texts if query and query.strip()))
+        if not unique_queries:
+            return []
+        if len(unique_queries) == 1:
+            return await self._get_chunks_without_trace(unique_queries[0], filters)
+
+        final_filter = self._build_filter(filters)
+        LOGGER.info(
+            f"Retriever querying collection '{self.collection_name}' with {len(unique_queries)} queries, "
+            f"source_ids={self.source_ids}, filter: {json.dumps(final_filter)}"
+        )
+        rankings = await self._vectorestore_service.retrieve_similar_chunks_batch_async(
+            query_texts=unique_queries,
+            collection_name=self.collection_name,
+            limit=self._max_retrieved_chunks,
+            filter=final_filter,
+            enable_date_penalty_for_chunks=self.enable_chunk_penalization,
+            chunk_age_penalty_rate=self.chunk_age_penalty_rate,
+            default_penalty_rate=self.default_penalty_rate,
+            metadata_date_key=cast_string_to_list(self.metadata_date_key),
+            max_retrieved_chunks_after_penalty=self.max_retrieved_chunks_after_penalty,
+            source_schemas=self.source_schemas,
+            search_mode=self.search_mode,
+        )
+        limit = (
+            self.max_retrieved_chunks_after_penalty
+            if self.enable_chunk_penalization and self.max_retrieved_chunks_after_penalty
+            else self._max_retrieved_chunks
+        )
+        chunks = fuse_chunk_rankings(rankings, limit)
+        LOGGER.info(
+            f"Retriever retrieved {len(chunks)} chunks for {len(unique_queries)} queries from collection "
+            f"'{self.collection_name}' with source_ids={self.source_ids}"
+        )
+
+        for i, chunk in enumerate(chunks):
+            chunk.metadata["_retrieval_rank"] = i + 1
+            chunk.metadata["_total_retrieved_chunks"] = len(chunks)
+
+        return chunks
+
+    def _set_retrieval_span_attributes(self, span, input_data: dict, chunks: list[SourceChunk]) -> None:
+        span.set_attributes({
+            SpanAttributes.OPENINFERENCE_SPAN_KIND: OpenInferenceSpanKindValues.RETRIEVER.value,
+            SpanAttributes.EMBEDDING_MODEL_NAME: self._vectorestore_service._embedding_service._model_name,
+            SpanAttributes.INPUT_VALUE: serialize_to_json(input_data, shorten_string=False),
+            "component_instance_id": (
+                str(self.component_attributes.component_instance_id)
+                if self.component_attributes.component_instance_id is not None
+                else None
+            ),
+            "source_ids": str(self.source_ids),
+        })
+
+        if len(chunks) > 30:
+            for i, chunk in enumerate(chunks):
+                metadata_str = json.dumps(chunk.metadata)
+                span.add_event(
+                    f"Retrieved Document {i}",
+                    {
+                        "content": chunk.content,
+                        "id": chunk.name,
+                        "metadata": metadata_str,
+                        "retrieval_rank": i + 1,
+                    },
+                )
+        else:
+            # TODO: delete this block when we refactor the trace manager
+            for i, chunk in enumerate(chunks):
+                metadata_str = json.dumps(chunk.metadata)
+                span.set_attributes({
+                    f"{SpanAttributes.RETRIEVAL_DOCUMENTS}.{i}.document.content": chunk.content,
+                    f"{SpanAttributes.RETRIEVAL_DOCUMENTS}.{i}.document.id": chunk.name,
+                    f"{SpanAttributes.RETRIEVAL_DOCUMENTS}.{i}.document.metadata": metadata_str,
+                    f"{SpanAttributes.RETRIEVAL_DOCUMENTS}.{i}.document.metadata.retrieval_rank": i + 1,
+                })
+        span.set_status(trace_api.StatusCode.OK)
+
     async def get_chunks(
         self,
         query_text: str,
@@ -227,42 +352,19 @@ class Retriever(Component):
                 query_text,
                 filters,
             )
-            input_data = {"Query": query_text, "Filter": filters}
-            span.set_attributes({
-                SpanAttributes.OPENINFERENCE_SPAN_KIND: OpenInferenceSpanKindValues.RETRIEVER.value,
-                SpanAttributes.EMBEDDING_MODEL_NAME: self._vectorestore_service._embedding_service._model_name,
-                SpanAttributes.INPUT_VALUE: serialize_to_json(input_data, shorten_string=False),
-                "component_instance_id": (
-                    str(self.component_attributes.component_instance_id)
-                    if self.component_attributes.component_instance_id is not None
-                    else None
-                ),
-                "source_ids": str(self.source_ids),
-            })
+            self._set_retrieval_span_attributes(span, {"Query": query_text, "Filter": filters}, chunks)
 
-            if len(chunks) > 30:
-                for i, chunk in enumerate(chunks):
-                    metadata_str = json.dumps(chunk.metadata)
-                    span.add_event(
-                        f"Retrieved Document {i}",
-                        {
-                            "content": chunk.content,
-                            "id": chunk.name,
-                            "metadata": metadata_str,
-                            "retrieval_rank": i + 1,
-                        },
-                    )
-            else:
-                # TODO: delete this block when we refactor the trace manager
-                for i, chunk in enumerate(chunks):
-                    metadata_str = json.dumps(chunk.metadata)
-                    span.set_attributes({
-                        f"{SpanAttributes.RETRIEVAL_DOCUMENTS}.{i}.document.content": chunk.content,
-                        f"{SpanAttributes.RETRIEVAL_DOCUMENTS}.{i}.document.id": chunk.name,
-                        f"{SpanAttributes.RETRIEVAL_DOCUMENTS}.{i}.document.metadata": metadata_str,
-                        f"{SpanAttributes.RETRIEVAL_DOCUMENTS}.{i}.document.metadata.retrieval_rank": i + 1,
-                    })
-            span.set_status(trace_api.StatusCode.OK)
+        return chunks
+
+    async def get_chunks_for_queries(
+        self,
+        query_texts: list[str],
+        filters: Optional[dict] = None,
+    ) -> list[SourceChunk]:
+        """Retrieve and merge chunks for several queries (e.g. sub-questions) in a single batch."""
+        with self.trace_manager.start_span(self.component_attributes.component_instance_name) as span:
+            chunks = await self._get_chunks_for_queries_without_trace(query_texts, filters)
+            self._set_retrieval_span_attributes(span, {"Queries": query_texts, "Filter": filters}, chunks)
 
         return chunks
 
@@ -278,15 +380,23 @@ class Retriever(Component):
 
         span = get_current_span()
         trace_input = {"query": query_str, "filters": inputs.filters}
+        if inputs.queries:
+            trace_input["queries"] = inputs.queries
         span.set_attributes({
             SpanAttributes.OPENINFERENCE_SPAN_KIND: self.TRACE_SPAN_KIND,
             SpanAttributes.INPUT_VALUE: serialize_to_json(trace_input, shorten_string=False),
         })
 
-        chunks = await self._get_chunks_without_trace(
-            query_text=query_str,
-            filters=inputs.filters,
-        )
+        if inputs.queries:
+            chunks = await self._get_chunks_for_queries_without_trace(
+                query_texts=[query_str, *inputs.queries],
+                filters=inputs.filters,
+            )
+        else:
+            chunks = await self._get_chunks_without_trace(
+                query_text=query_str,
+                filters=inputs.filters,
+            )
         tool_name = (
             self.component_attributes.component_instance_name
             if self.component_attributes and self.component_attributes.component_instance_name
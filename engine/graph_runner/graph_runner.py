@@ -17,9 +17,10 @@ from engine.graph_runner.field_expression_management import evaluate_expression
 from engine.graph_runner.port_management import get_target_field_type
 from engine.graph_runner.runnable import Runnable
 from engine.graph_runner.types import Task, TaskState
-from engine.trace.serializer import serialize_to_json
+from engine.prometheus_metric import graph_run_duration, track_duration
 from engine.trace.span_context import get_tracing_span, set_tracing_span
 from engine.trace.trace_manager import TraceManager
+from engine.trace.trace_policy import set_payload_attributes
 
 LOGGER = logging.getLogger(__name__)
 
@@ -105,7 +106,10 @@ class GraphRunner:
         # Isolate trace if this is a root execution
         is_root_execution = kwargs.pop("is_root_execution", False)
 
-        with self.trace_manager.start_span("Workflow", isolate_context=is_root_execution) as span:
+        with (
+            track_duration(graph_run_duration, "graph_run", root=str(is_root_execution).lower()),
+            self.trace_manager.start_span("Workflow", isolate_context=is_root_execution) as span,
+        ):
             params = get_tracing_span()
             if params:
                 span_json = json.loads(span.to_json())
@@ -116,11 +120,8 @@ class GraphRunner:
             # TODO(security): `input_data` is the raw run payload (ctx + user inputs).
             # `serialize_to_json` applies heuristic redaction, but plaintext secrets
             # under non-sensitive keys still require catalog-level sensitive metadata.
-            trace_input = serialize_to_json(input_data, shorten_string=True)
-            span.set_attributes({
-                SpanAttributes.OPENINFERENCE_SPAN_KIND: self.TRACE_SPAN_KIND,
-                SpanAttributes.INPUT_VALUE: trace_input,
-            })
+            set_payload_attributes(span, {SpanAttributes.INPUT_VALUE: input_data})
+            span.set_attributes({SpanAttributes.OPENINFERENCE_SPAN_KIND: self.TRACE_SPAN_KIND})
             # Legacy compatibility shim: accept AgentPayload or dict and normalize to dict for internal runner.
             # Long-term target: GraphRunner.run should accept NodeData only; remove when callers stop
             # passing AgentPayload/dict and provide NodeData instead.
@@ -130,10 +131,7 @@ class GraphRunner:
                 normalized_input = input_data  # type: ignore[assignment]
             final_output = await self._run_without_io_trace(normalized_input)
 
-            trace_output = serialize_to_json(final_output, shorten_string=True)
-            span.set_attributes({
-                SpanAttributes.OUTPUT_VALUE: trace_output,
-            })
+            set_payload_attributes(span, {SpanAttributes.OUTPUT_VALUE: final_output})
             span.set_status(trace_api.StatusCode.OK)
 
             return final_output
@@ -14,6 +14,7 @@ from engine.components.types import ToolDescription
 from engine.components.utils import load_str_to_json
 from engine.llm_services.constrained_output_models import OutputFormatModel
 from engine.llm_services.providers import create_provider
+from engine.prometheus_metric import embedding_batch_duration, llm_call_duration, llm_tokens, track_duration
 from engine.trace.credit_calculator import calculate_llm_credits
 from engine.trace.trace_manager import TraceManager
 
@@ -52,6 +53,16 @@ class LLMService(ABC):
         if completion_tokens is not None:
             attributes[SpanAttributes.LLM_TOKEN_COUNT_COMPLETION] = completion_tokens
         span.set_attributes(attributes)
+        llm_tokens.labels(provider=self._provider, model=self._model_name, token_type="input").inc(prompt_tokens or 0)
+        llm_tokens.labels(provider=self._provider, model=self._model_name, token_type="output").inc(
+            completion_tokens or 0
+        )
+
+    def _track_call(self, operation: str):
+        """Time a provider call in llm_call_duration_seconds."""
+        return track_duration(
+            llm_call_duration, "llm_call", provider=self._provider, model=self._model_name, operation=operation
+        )
 
 
 class EmbeddingService(LLMService):
@@ -87,7 +98,8 @@ class EmbeddingService(LLMService):
         """Returns embedding objects with .embedding attribute for qdrant compatibility."""
         span = get_current_span()
 
-        embeddings, prompt_tokens, completion_tokens, total_tokens = await self._provider_instance.embed(text=text)
+        with track_duration(embedding_batch_duration, "embedding", provider=self._provider, model=self._model_name):
+            embeddings, prompt_tokens, completion_tokens, total_tokens = await self._provider_instance.embed(text=text)
 
         self._set_span_token_counts(span, prompt_tokens, None, total_tokens)
 
@@ -157,11 +169,12 @@ class CompletionService(LLMService):
         span = get_current_span()
         self._set_span_invocation_parameters(span)
 
-        result, prompt_tokens, completion_tokens, total_tokens = await self._provider_instance.complete(
-            messages=messages,
-            temperature=self._invocation_parameters.get("temperature"),
-            stream=stream,
-        )
+        with self._track_call("complete"):
+            result, prompt_tokens, completion_tokens, total_tokens = await self._provider_instance.complete(
+                messages=messages,
+                temperature=self._invocation_parameters.get("temperature"),
+                stream=stream,
+            )
 
         self._set_span_token_counts(span, prompt_tokens, completion_tokens, total_tokens)
 
@@ -184,17 +197,18 @@ class CompletionService(LLMService):
         span = get_current_span()
         self._set_span_invocation_parameters(span)
 
-        (
-            result,
-            prompt_tokens,
-            completion_tokens,
-            total_tokens,
-        ) = await self._provider_instance.constrained_complete_with_pydantic(
-            messages=messages,
-            response_format=response_format,
-            temperature=self._invocation_parameters.get("temperature"),
-            stream=stream,
-        )
+        with self._track_call("constrained_complete"):
+            (
+                result,
+                prompt_tokens,
+                completion_tokens,
+                total_tokens,
+            ) = await self._provider_instance.constrained_complete_with_pydantic(
+                messages=messages,
+                response_format=response_format,
+                temperature=self._invocation_parameters.get("temperature"),
+                stream=stream,
+            )
 
         self._set_span_token_counts(span, prompt_tokens, completion_tokens, total_tokens)
 
@@ -226,17 +240,18 @@ class CompletionService(LLMService):
         span = get_current_span()
         self._set_span_invocation_parameters(span)
 
-        (
-            result,
-            prompt_tokens,
-            completion_tokens,
-            total_tokens,
-        ) = await self._provider_instance.constrained_complete_with_json_schema(
-            messages=messages,
-            response_format=response_format_dict,
-            temperature=self._invocation_parameters.get("temperature"),
-            stream=stream,
-        )
+        with self._track_call("constrained_complete"):
+            (
+                result,
+                prompt_tokens,
+                completion_tokens,
+                total_tokens,
+            ) = await self._provider_instance.constrained_complete_with_json_schema(
+                messages=messages,
+                response_format=response_format_dict,
+                temperature=self._invocation_parameters.get("temperature"),
+                stream=stream,
+            )
 
         self._set_span_token_counts(span, prompt_tokens, completion_tokens, total_tokens)
 
@@ -270,34 +285,35 @@ class CompletionService(LLMService):
         span = get_current_span()
         self._set_span_invocation_parameters(span)
 
-        # Delegate to provider based on whether structured output is needed
-        if structured_output_tool is not None:
-            (
-                result,
-                prompt_tokens,
-                completion_tokens,
-                total_tokens,
-            ) = await self._provider_instance.function_call_with_structured_output(
-                messages=messages,
-                tools=tools_openai,
-                tool_choice=tool_choice,
-                structured_output_tool=structured_openai,
-                temperature=self._invocation_parameters.get("temperature"),
-                stream=stream,
-            )
-        else:
-            (
-                result,
-                prompt_tokens,
-                completion_tokens,
-                total_tokens,
-            ) = await self._provider_instance.function_call_without_structured_output(
-                messages=messages,
-                tools=tools_openai,
-                tool_choice=tool_choice,
-                temperature=self._invocation_parameters.get("temperature"),
-                stream=stream,
-            )
+        with self._track_call("function_call"):
+            # Delegate to provider based on whether structured output is needed
+            if structured_output_tool is not None:
+                (
+                    result,
+                    prompt_tokens,
+                    completion_tokens,
+                    total_tokens,
+                ) = await self._provider_instance.function_call_with_structured_output(
+                    messages=messages,
+                    tools=tools_openai,
+                    tool_choice=tool_choice,
+                    structured_output_tool=structured_openai,
+                    temperature=self._invocation_parameters.get("temperature"),
+                    stream=stream,
+                )
+            else:
+                (
+                    result,
+                    prompt_tokens,
+                    completion_tokens,
+                    total_tokens,
+                ) = await self._provider_instance.function_call_without_structured_output(
+                    messages=messages,
+                    tools=tools_openai,
+                    tool_choice=tool_choice,
+                    temperature=self._invocation_parameters.get("temperature"),
+                    stream=stream,
+                )
 
         self._set_span_token_counts(span, prompt_tokens, completion_tokens, total_tokens)
 
@@ -335,10 +351,11 @@ class WebSearchService(LLMService):
     async def web_search_async(self, query: str, allowed_domains: Optional[list[str]] = None) -> str:
         span = get_current_span()
 
-        result, prompt_tokens, completion_tokens, total_tokens = await self._provider_instance.web_search(
-            query=query,
-            allowed_domains=allowed_domains,
-        )
+        with self._track_call("web_search"):
+            result, prompt_tokens, completion_tokens, total_tokens = await self._provider_instance.web_search(
+                query=query,
+                allowed_domains=allowed_domains,
+            )
 
         self._set_span_token_counts(span, prompt_tokens, completion_tokens, total_tokens)
 
@@ -393,12 +410,13 @@ class VisionService(LLMService):
         span = get_current_span()
         self._set_span_invocation_parameters(span)
 
-        result, prompt_tokens, completion_tokens, total_tokens = await self._provider_instance.vision(
-            image_content_list=image_content_list,
-            text_prompt=text_prompt,
-            response_format=response_format,
-            temperature=self._temperature,
-        )
+        with self._track_call("vision"):
+            result, prompt_tokens, completion_tokens, total_tokens = await self._provider_instance.vision(
+                image_content_list=image_content_list,
+                text_prompt=text_prompt,
+                response_format=response_format,
+                temperature=self._temperature,
+            )
 
         self._set_span_token_counts(span, prompt_tokens, completion_tokens, total_tokens)
 
@@ -436,6 +454,9 @@ class OCRService(LLMService):
 
     async def get_ocr_text_async(self, messages: list[dict]) -> str:
         # Delegate to provider
-        result, prompt_tokens, completion_tokens, total_tokens = await self._provider_instance.ocr(messages=messages)
+        with self._track_call("ocr"):
+            result, prompt_tokens, completion_tokens, total_tokens = await self._provider_instance.ocr(
+                messages=messages
+            )
 
         return result
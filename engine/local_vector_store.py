@@ -0,0 +1,665 @@
+"""
+In-process vector store that speaks the subset of the Qdrant REST API used by QdrantService.
+
+LocalQdrantService reuses every QdrantService method unchanged and only swaps the HTTP transport
+for an in-memory store: numpy brute-force (or an optional hnswlib HNSW index) for dense vectors,
+a BM25 inverted index for the "Qdrant/bm25" sparse vectors, and Qdrant-style payload filters.
+Everything lives in process memory and nothing is persisted, so it is meant for benchmarks, tests and
+local development only: points are lost when the process exits and are not shared between processes.
+"""
+
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Optional, Union
+
+import httpx
+import numpy as np
+
+from engine.datetime_utils import make_naive_utc, parse_datetime
+from engine.llm_services.llm_service import EmbeddingService
+from engine.qdrant_service import (
+    DEFAULT_MAX_CHUNKS,
+    DEFAULT_TIMEOUT,
+    MAX_BATCH_SIZE_FOR_CHUNK_UPLOAD,
+    HybridFusion,
+    QdrantCollectionSchema,
+    QdrantService,
+    fuse_ranked_results,
+)
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+LOGGER = logging.getLogger(__name__)
+
+# Version reported on GET /, chosen so QdrantService uses its server-side fusion code path
+LOCAL_STORE_QDRANT_VERSION = "1.12.0"
+LOCAL_STORE_URL = "local://vector-store"
+UNNAMED_VECTOR = ""
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+_TOKEN_PATTERN = re.compile(r"\w+", flags=re.UNICODE)
+
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 128
+_INITIAL_CAPACITY = 1024
+# Below this fraction of the stored rows, candidate vectors are gathered instead of scoring every row
+_GATHER_CANDIDATES_FRACTION = 0.25
+# Payload index types answered from a value -> rows map, like Qdrant's keyword/integer/bool/uuid indexes
+_EXACT_MATCH_INDEX_TYPES = {"keyword", "integer", "bool", "uuid"}
+
+
+def tokenize_for_bm25(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class LocalVectorStoreError(Exception):
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        self.message = message
+        super().__init__(message)
+
+
+def _to_comparable(value: Any) -> Optional[Union[float, datetime]]:
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return make_naive_utc(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            parsed = parse_datetime(value)
+            return make_naive_utc(parsed) if parsed is not None else None
+    return None
+
+
+def _as_list(value: Any) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+def _match_condition(payload_value: Any, match: dict) -> bool:
+    if payload_value is None:
+        return False
+    values = _as_list(payload_value)
+    if "value" in match:
+        return match["value"] in values
+    if "any" in match:
+        return any(value in match["any"] for value in values)
+    if "except" in match:
+        return all(value not in match["except"] for value in values)
+    if "text" in match:
+        needle_tokens = tokenize_for_bm25(str(match["text"]))
+        return any(all(token in tokenize_for_bm25(str(value)) for token in needle_tokens) for value in values)
+    raise LocalVectorStoreError(400, f"Unsupported match condition: {match}")
+
+
+def _range_condition(payload_value: Any, range_condition: dict) -> bool:
+    if payload_value is None:
+        return False
+    for value in _as_list(payload_value):
+        comparable_value = _to_comparable(value)
+        if comparable_value is None:
+            continue
+        matched = True
+        for operator, bound in range_condition.items():
+            if bound is None:
+                continue
+            comparable_bound = _to_comparable(bound)
+            if comparable_bound is None or type(comparable_bound) is not type(comparable_value):
+                matched = False
+                break
+            if operator == "gt" and not comparable_value > comparable_bound:
+                matched = False
+            elif operator == "gte" and not comparable_value >= comparable_bound:
+                matched = False
+            elif operator == "lt" and not comparable_value < comparable_bound:
+                matched = False
+            elif operator == "lte" and not comparable_value <= comparable_bound:
+                matched = False
+        if matched:
+            return True
+    return False
+
+
+def _condition_matches(point_id: str, payload: dict, condition: dict) -> bool:
+    if any(clause in condition for clause in ("must", "should", "must_not")):
+        return payload_matches_filter(point_id, payload, condition)
+    if "has_id" in condition:
+        return point_id in {str(has_id) for has_id in condition["has_id"]}
+    if "is_empty" in condition:
+        value = payload.get(condition["is_empty"]["key"])
+        return value is None or value == []
+    if "is_null" in condition:
+        key = condition["is_null"]["key"]
+        return key in payload and payload[key] is None
+    key = condition.get("key")
+    if key is None:
+        raise LocalVectorStoreError(400, f"Unsupported filter condition: {condition}")
+    if "match" in condition:
+        return _match_condition(payload.get(key), condition["match"])
+    if "range" in condition:
+        return _range_condition(payload.get(key), condition["range"])
+    raise LocalVectorStoreError(400, f"Unsupported filter condition: {condition}")
+
+
+def payload_matches_filter(point_id: str, payload: dict, filter: Optional[dict]) -> bool:
+    """Evaluate a Qdrant filter (must / should / must_not, possibly nested) against one point."""
+    if not filter:
+        return True
+    must = filter.get("must") or []
+    should = filter.get("should") or []
+    must_not = filter.get("must_not") or []
+    if isinstance(must, dict):
+        must = [must]
+    if isinstance(should, dict):
+        should = [should]
+    if isinstance(must_not, dict):
+        must_not = [must_not]
+    if not all(_condition_matches(point_id, payload, condition) for condition in must):
+        return False
+    if should and not any(_condition_matches(point_id, payload, condition) for condition in should):
+        return False
+    return not any(_condition_matches(point_id, payload, condition) for condition in must_not)
+
+
+def _select_payload(payload: dict, with_payload: Union[bool, list, dict, None]) -> Optional[dict]:
+    if with_payload is None or with_payload is False:
+        return None
+    if with_payload is True:
+        return dict(payload)
+    if isinstance(with_payload, list):
+        return {key: value for key, value in payload.items() if key in with_payload}
+    if "include" in with_payload:
+        return {key: value for key, value in payload.items() if key in with_payload["include"]}
+    if "exclude" in with_payload:
+        return {key: value for key, value in payload.items() if key not in with_payload["exclude"]}
+    return dict(payload)
+
+
+class _DenseIndex:
+    """Growable float32 matrix of one named dense vector, with an optional HNSW index on top."""
+
+    def __init__(self, size: int, distance: str, use_hnsw: bool):
+        self.size = size
+        self.distance = distance
+        self._matrix = np.zeros((_INITIAL_CAPACITY, size), dtype=np.float32)
+        self._hnsw = None
+        if use_hnsw:
+            if hnswlib is None:
+                LOGGER.warning("hnswlib is not installed, falling back to brute-force dense search")
+            else:
+                space = {"Cosine": "cosine", "Dot": "ip", "Euclid": "l2"}[distance]
+                self._hnsw = hnswlib.Index(space=space, dim=size)
+                self._hnsw.init_index(max_elements=_INITIAL_CAPACITY, ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+                self._hnsw.set_ef(HNSW_EF_SEARCH)
+
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        if self.distance == "Cosine":
+            norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+            return vectors / np.where(norms == 0, 1.0, norms)
+        return vectors
+
+    def set_many(self, rows: list[int], vectors: list[list[float]]) -> None:
+        prepared = self._prepare(np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1))
+        if prepared.shape[1] != self.size:
+            raise LocalVectorStoreError(400, f"Wrong vector dimension: expected {self.size}, got {prepared.shape[1]}")
+        required_capacity = max(rows) + 1
+        if required_capacity > self._matrix.shape[0]:
+            new_capacity = max(required_capacity, self._matrix.shape[0] * 2)
+            grown = np.zeros((new_capacity, self.size), dtype=np.float32)
+            grown[: self._matrix.shape[0]] = self._matrix
+            self._matrix = grown
+            if self._hnsw is not None:
+                self._hnsw.resize_index(new_capacity)
+        self._matrix[rows] = prepared
+        if self._hnsw is not None:
+            self._hnsw.add_items(prepared, np.asarray(rows))
+
+    def mark_deleted(self, row: int) -> None:
+        if self._hnsw is not None:
+            self._hnsw.mark_deleted(row)
+
+    def _score_matrix(self, matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+        if self.distance == "Euclid":
+            squared_distances = np.einsum("ij,ij->i", matrix, matrix) - 2 * (matrix @ query) + query @ query
+            return np.sqrt(np.maximum(squared_distances, 0))
+        return matrix @ query
+
+    def scores(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Scores of the given sorted rows. Large candidate sets score a view of the matrix, then pick their rows."""
+        row_count = int(rows[-1]) + 1
+        if len(rows) < row_count * _GATHER_CANDIDATES_FRACTION:
+            return self._score_matrix(self._matrix[rows], query)
+        scores = self._score_matrix(self._matrix[:row_count], query)
+        return scores if len(rows) == row_count else scores[rows]
+
+    def search(
+        self, vector: list[float], candidate_rows: np.ndarray, limit: int, is_filtered: bool
+    ) -> tuple[np.ndarray, np.ndarray]:
+        query = self._prepare(np.asarray(vector, dtype=np.float32))
+        k = min(limit, len(candidate_rows))
+        if k == 0:
+            return candidate_rows[:0], np.array([], dtype=np.float32)
+        if self._hnsw is not None and len(candidate_rows) > limit:
+            # HNSW pays off only when the candidate set is large; small filtered sets stay exact
+            allowed = set(candidate_rows.tolist()) if is_filtered else None
+            labels, distances = self._hnsw.knn_query(
+                query,
+                k=k,
+                filter=(lambda label: label in allowed) if allowed is not None else None,
+            )
+            if self.distance == "Euclid":
+                return labels[0].astype(np.int64), np.sqrt(distances[0])
+            return labels[0].astype(np.int64), 1.0 - distances[0]
+        scores = self.scores(query, candidate_rows)
+        # Qdrant ranks Euclid by ascending distance and the other metrics by descending similarity
+        ranking_keys = scores if self.distance == "Euclid" else -scores
+        top = np.argpartition(ranking_keys, k - 1)[:k] if k < len(candidate_rows) else np.arange(len(scores))
+        top = top[np.argsort(ranking_keys[top], kind="stable")]
+        return candidate_rows[top], scores[top]
+
+
+class _BM25Index:
+    """Inverted index scoring "Qdrant/bm25" text documents with Okapi BM25 and an IDF modifier."""
+
+    def __init__(self):
+        self._postings: dict[str, dict[int, int]] = {}
+        self._row_terms: dict[int, tuple[int, list[str]]] = {}
+        self._total_length = 0
+
+    def add_document(self, row: int, text: str) -> None:
+        tokens = tokenize_for_bm25(text)
+        term_frequencies = Counter(tokens)
+        for token, term_frequency in term_frequencies.items():
+            self._postings.setdefault(token, {})[row] = term_frequency
+        self._row_terms[row] = (len(tokens), list(term_frequencies))
+        self._total_length += len(tokens)
+
+    def remove(self, row: int) -> None:
+        row_terms = self._row_terms.pop(row, None)
+        if row_terms is None:
+            return
+        length, terms = row_terms
+        self._total_length -= length
+        for token in terms:
+            self._postings[token].pop(row, None)
+
+    def search(self, text: str, candidate_rows: Optional[set[int]], limit: int) -> list[tuple[int, float]]:
+        document_count = len(self._row_terms)
+        if document_count == 0:
+            return []
+        average_length = self._total_length / document_count or 1.0
+        scores: dict[int, float] = {}
+        for token in set(tokenize_for_bm25(text)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log((document_count - len(postings) + 0.5) / (len(postings) + 0.5) + 1.0)
+            for row, term_frequency in postings.items():
+                if candidate_rows is not None and row not in candidate_rows:
+                    continue
+                length_norm = 1 - BM25_B + BM25_B * self._row_terms[row][0] / average_length
+                scores[row] = scores.get(row, 0.0) + idf * term_frequency * (BM25_K1 + 1) / (
+                    term_frequency + BM25_K1 * length_norm
+                )
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+
+class _LocalCollection:
+    def __init__(self, config: dict, use_hnsw: bool):
+        self.config = config
+        self.payload_schema: dict[str, dict] = {}
+        self.ids: list[Optional[str]] = []
+        self.payloads: list[Optional[dict]] = []
+        self.row_by_id: dict[str, int] = {}
+        self._live_rows: Optional[np.ndarray] = None
+        self._field_indexes: dict[str, dict[Any, set[int]]] = {}
+        vectors_config = config.get("vectors") or {}
+        if "size" in vectors_config:
+            vectors_config = {UNNAMED_VECTOR: vectors_config}
+        self.dense: dict[str, _DenseIndex] = {
+            name: _DenseIndex(params["size"], params.get("distance", "Cosine"), use_hnsw)
+            for name, params in vectors_config.items()
+        }
+        self.sparse: dict[str, _BM25Index] = {name: _BM25Index() for name in config.get("sparse_vectors") or {}}
+
+    @property
+    def points_count(self) -> int:
+        return len(self.row_by_id)
+
+    def create_field_index(self, field_name: str, data_type: str) -> None:
+        self.payload_schema[field_name] = {"data_type": data_type}
+        self._field_indexes.pop(field_name, None)
+        if data_type not in _EXACT_MATCH_INDEX_TYPES:
+            return
+        self._field_indexes[field_name] = {}
+        for row in self.row_by_id.values():
+            self._index_payload_field(field_name, row)
+
+    def delete_field_index(self, field_name: str) -> None:
+        self.payload_schema.pop(field_name, None)
+        self._field_indexes.pop(field_name, None)
+
+    def _index_payload_field(self, field_name: str, row: int) -> None:
+        value = self.payloads[row].get(field_name)
+        if value is None:
+            return
+        for item in _as_list(value):
+            if not isinstance(item, (dict, list)):
+                self._field_indexes[field_name].setdefault(item, set()).add(row)
+
+    def _unindex_payload(self, row: int) -> None:
+        for field_name, field_index in self._field_indexes.items():
+            value = self.payloads[row].get(field_name)
+            if value is None:
+                continue
+            for item in _as_list(value):
+                if not isinstance(item, (dict, list)):
+                    rows = field_index.get(item)
+                    if rows is not None:
+                        rows.discard(row)
+                        if not rows:
+                            del field_index[item]
+
+    def upsert_many(self, points: list[dict]) -> None:
+        dense_batches: dict[str, tuple[list[int], list[list[float]]]] = {}
+        for point in points:
+            point_id = str(point["id"])
+            self.delete(point_id)
+            row = len(self.ids)
+            self.ids.append(point_id)
+            self.payloads.append(dict(point.get("payload") or {}))
+            self.row_by_id[point_id] = row
+            self._live_rows = None
+            for field_name in self._field_indexes:
+                self._index_payload_field(field_name, row)
+            vectors = point.get("vector") or {}
+            if not isinstance(vectors, dict):
+                vectors = {UNNAMED_VECTOR: vectors}
+            for name, vector in vectors.items():
+                if name in self.dense:
+                    batch_rows, batch_vectors = dense_batches.setdefault(name, ([], []))
+                    batch_rows.append(row)
+                    batch_vectors.append(vector)
+                elif name in self.sparse:
+                    if not isinstance(vector, dict) or "text" not in vector:
+                        raise LocalVectorStoreError(400, f"Sparse vector '{name}' must be a text document")
+                    self.sparse[name].add_document(row, vector["text"])
+                else:
+                    raise LocalVectorStoreError(400, f"Unknown vector name '{name}'")
+        for name, (batch_rows, batch_vectors) in dense_batches.items():
+            self.dense[name].set_many(batch_rows, batch_vectors)
+
+    def delete(self, point_id: str) -> None:
+        row = self.row_by_id.pop(point_id, None)
+        if row is None:
+            return
+        self._live_rows = None
+        self._unindex_payload(row)
+        self.ids[row] = None
+        self.payloads[row] = None
+        for index in self.dense.values():
+            index.mark_deleted(row)
+        for index in self.sparse.values():
+            index.remove(row)
+
+    def live_rows(self) -> np.ndarray:
+        """Sorted rows of the stored points, cached until the next upsert or delete."""
+        if self._live_rows is None:
+            self._live_rows = np.fromiter(sorted(self.row_by_id.values()), dtype=np.int64, count=len(self.row_by_id))
+            self._live_rows.flags.writeable = False
+        return self._live_rows
+
+    def _indexed_candidate_rows(self, filter: dict) -> Optional[set[int]]:
+        """
+        Rows allowed by the "must" match conditions on indexed fields, nested "must" clauses included,
+        or None when no condition uses an index. The full filter is still evaluated on these rows.
+        """
+        must = filter.get("must") or []
+        candidates: Optional[set[int]] = None
+        for condition in [must] if isinstance(must, dict) else must:
+            if "must" in condition:
+                matching_rows = self._indexed_candidate_rows(condition)
+                if matching_rows is None:
+                    continue
+            else:
+                field_index = self._field_indexes.get(condition.get("key"))
+                match = condition.get("match") or {}
+                if field_index is None or not ("value" in match or "any" in match):
+                    continue
+                values = [match["value"]] if "value" in match else match["any"]
+                if any(isinstance(value, (dict, list)) for value in values):
+                    continue
+                matching_rows = set().union(*(field_index.get(value, ()) for value in values))
+            candidates = matching_rows if candidates is None else candidates & matching_rows
+        return candidates
+
+    def filtered_rows(self, filter: Optional[dict]) -> np.ndarray:
+        if not filter:
+            return self.live_rows()
+        candidates = self._indexed_candidate_rows(filter)
+        rows = self.live_rows().tolist() if candidates is None else sorted(candidates)
+        rows = [row for row in rows if payload_matches_filter(self.ids[row], self.payloads[row], filter)]
+        return np.asarray(rows, dtype=np.int64)
+
+    def to_point(self, row: int, score: Optional[float], with_payload: Any) -> dict:
+        point: dict[str, Any] = {"id": self.ids[row], "version": 0}
+        if score is not None:
+            point["score"] = float(score)
+        selected_payload = _select_payload(self.payloads[row], with_payload)
+        if selected_payload is not None:
+            point["payload"] = selected_payload
+        return point
+
+
+class LocalVectorStore:
+    """
+    Thread-safe in-memory store holding named collections.
+    `handle` takes the same (method, endpoint, payload) triple QdrantService sends over HTTP.
+    """
+
+    def __init__(self, use_hnsw: bool = False):
+        self._use_hnsw = use_hnsw
+        self._collections: dict[str, _LocalCollection] = {}
+        self._lock = threading.RLock()
+
+    def _get_collection(self, collection_name: str) -> _LocalCollection:
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            raise LocalVectorStoreError(404, f"Collection `{collection_name}` doesn't exist!")
+        return collection
+
+    def handle(self, method: str, endpoint: str, payload: Optional[dict] = None) -> dict:
+        path = endpoint.split("?", 1)[0].strip("/")
+        parts = path.split("/") if path else []
+        payload = payload or {}
+        with self._lock:
+            if not parts:
+                return {"title": "draftnrun local vector store", "version": LOCAL_STORE_QDRANT_VERSION}
+            if parts == ["collections"]:
+                return {"result": {"collections": [{"name": name} for name in self._collections]}}
+            if parts[0] != "collections":
+                raise LocalVectorStoreError(404, f"Unsupported endpoint: {endpoint}")
+            collection_name = parts[1]
+            route = (method.upper(), "/".join(parts[2:]))
+            if route == ("GET", "exists"):
+                return {"result": {"exists": collection_name in self._collections}}
+            if route == ("PUT", ""):
+                return self._create_collection(collection_name, payload)
+            if route == ("DELETE", ""):
+                return {"result": self._collections.pop(collection_name, None) is not None}
+
+            collection = self._get_collection(collection_name)
+            if route == ("GET", ""):
+                return {"result": self._collection_info(collection)}
+            if route == ("PUT", "index"):
+                field_schema = payload["field_schema"]
+                data_type = field_schema["type"] if isinstance(field_schema, dict) else field_schema
+                collection.create_field_index(payload["field_name"], data_type)
+                return {"result": {"status": "acknowledged"}}
+            if method.upper() == "DELETE" and len(parts) == 4 and parts[2] == "index":
+                collection.delete_field_index(parts[3])
+                return {"result": {"status": "acknowledged"}}
+            if route == ("PUT", "points"):
+                collection.upsert_many(payload.get("points", []))
+                return {"result": {"operation_id": 0, "status": "completed"}}
+            if route == ("POST", "points"):
+                rows = [collection.row_by_id.get(str(point_id)) for point_id in payload.get("ids", [])]
+                with_payload = payload.get("with_payload", True)
+                return {"result": [collection.to_point(row, None, with_payload) for row in rows if row is not None]}
+            if route == ("POST", "points/query"):
+                return {"result": {"points": self._query(collection, payload)}}
+            if route == ("POST", "points/query/batch"):
+                return {"result": [{"points": self._query(collection, search)} for search in payload["searches"]]}
+            if route == ("POST", "points/scroll"):
+                return {"result": self._scroll(collection, payload)}
+            if route == ("POST", "points/count"):
+                return {"result": {"count": len(collection.filtered_rows(payload.get("filter")))}}
+            if route == ("POST", "points/delete"):
+                if "points" in payload:
+                    point_ids = [str(point_id) for point_id in payload["points"]]
+                else:
+                    point_ids = [collection.ids[row] for row in collection.filtered_rows(payload.get("filter"))]
+                for point_id in point_ids:
+                    collection.delete(point_id)
+                return {"result": {"operation_id": 0, "status": "completed"}}
+        raise LocalVectorStoreError(404, f"Unsupported endpoint: {method} {endpoint}")
+
+    def _create_collection(self, collection_name: str, config: dict) -> dict:
+        if collection_name in self._collections:
+            raise LocalVectorStoreError(409, f"Collection `{collection_name}` already exists!")
+        self._collections[collection_name] = _LocalCollection(config, self._use_hnsw)
+        return {"result": True}
+
+    @staticmethod
+    def _collection_info(collection: _LocalCollection) -> dict:
+        return {
+            "status": "green",
+            "points_count": collection.points_count,
+            "config": {
+                "params": {
+                    "vectors": collection.config.get("vectors") or {},
+                    "sparse_vectors": collection.config.get("sparse_vectors") or {},
+                }
+            },
+            "payload_schema": dict(collection.payload_schema),
+        }
+
+    def _search(self, collection: _LocalCollection, request: dict) -> list[tuple[int, float]]:
+        limit = request.get("limit", DEFAULT_MAX_CHUNKS)
+        query = request.get("query")
+        filter = request.get("filter")
+        using = request.get("using", UNNAMED_VECTOR)
+
+        if isinstance(query, dict) and "fusion" in query:
+            prefetch = request.get("prefetch") or []
+            if isinstance(prefetch, dict):
+                prefetch = [prefetch]
+            ranked_lists = []
+            for sub_request in prefetch:
+                sub_filters = [f for f in (filter, sub_request.get("filter")) if f]
+                sub_request = dict(sub_request, filter={"must": sub_filters} if sub_filters else None)
+                ranked_lists.append([(row, score, {}) for row, score in self._search(collection, sub_request)])
+            fused = fuse_ranked_results(ranked_lists, HybridFusion(query["fusion"]), limit)
+            return [(row, score) for row, score, _ in fused]
+        if isinstance(query, dict) and "text" in query:
+            if using not in collection.sparse:
+                raise LocalVectorStoreError(400, f"Unknown sparse vector '{using}'")
+            candidates = set(collection.filtered_rows(filter).tolist()) if filter else None
+            return collection.sparse[using].search(query["text"], candidates, limit)
+        if isinstance(query, dict) and "nearest" in query:
+            query = query["nearest"]
+        if isinstance(query, list):
+            if using not in collection.dense:
+                raise LocalVectorStoreError(400, f"Unknown dense vector '{using}'")
+            rows = collection.filtered_rows(filter)
+            found_rows, scores = collection.dense[using].search(query, rows, limit, is_filtered=bool(filter))
+            return list(zip(found_rows.tolist(), scores.tolist(), strict=True))
+        raise LocalVectorStoreError(400, f"Unsupported query: {query}")
+
+    def _query(self, collection: _LocalCollection, request: dict) -> list[dict]:
+        with_payload = request.get("with_payload", False)
+        score_threshold = request.get("score_threshold")
+        offset = request.get("offset", 0)
+        request = dict(request, limit=request.get("limit", DEFAULT_MAX_CHUNKS) + offset)
+        results = self._search(collection, request)[offset:]
+        if score_threshold is not None:
+            results = [(row, score) for row, score in results if score >= score_threshold]
+        return [collection.to_point(row, score, with_payload) for row, score in results]
+
+    @staticmethod
+    def _scroll(collection: _LocalCollection, request: dict) -> dict:
+        rows = collection.filtered_rows(request.get("filter")).tolist()
+        offset = request.get("offset")
+        if offset is not None:
+            offset_row = collection.row_by_id.get(str(offset))
+            rows = [row for row in rows if offset_row is not None and row >= offset_row]
+        limit = request.get("limit", 10)
+        page, remaining = rows[:limit], rows[limit:]
+        with_payload = request.get("with_payload", True)
+        return {
+            "points": [collection.to_point(row, None, with_payload) for row in page],
+            "next_page_offset": collection.ids[remaining[0]] if remaining else None,
+        }
+
+
+_DEFAULT_STORES: dict[bool, LocalVectorStore] = {}
+_DEFAULT_STORES_LOCK = threading.Lock()
+
+
+def get_default_local_vector_store(use_hnsw: bool = False) -> LocalVectorStore:
+    """Process-wide store, so ingestion and retrieval running in the same process see the same data."""
+    with _DEFAULT_STORES_LOCK:
+        if use_hnsw not in _DEFAULT_STORES:
+            _DEFAULT_STORES[use_hnsw] = LocalVectorStore(use_hnsw=use_hnsw)
+        return _DEFAULT_STORES[use_hnsw]
+
+
+class LocalQdrantService(QdrantService):
+    """QdrantService backed by a LocalVectorStore instead of a Qdrant cluster."""
+
+    def __init__(
+        self,
+        default_schema: QdrantCollectionSchema,
+        embedding_service: Optional[EmbeddingService] = None,
+        max_chunks_to_add: int = MAX_BATCH_SIZE_FOR_CHUNK_UPLOAD,
+        timeout: float = DEFAULT_TIMEOUT,
+        store: Optional[LocalVectorStore] = None,
+        use_hnsw: bool = False,
+    ):
+        super().__init__(
+            qdrant_api_key="",
+            qdrant_cluster_url=LOCAL_STORE_URL,
+            default_schema=default_schema,
+            embedding_service=embedding_service,
+            max_chunks_to_add=max_chunks_to_add,
+            timeout=timeout,
+        )
+        self._store = store or get_default_local_vector_store(use_hnsw=use_hnsw)
+
+    async def _send_request_async(
+        self,
+        method: str,
+        endpoint: str,
+        payload: Optional[dict] = None,
+    ) -> dict:
+        try:
+            return self._store.handle(method, endpoint, payload)
+        except LocalVectorStoreError as err:
+            # Surface errors the same way the HTTP transport does so callers' error handling still applies
+            request = httpx.Request(method, f"{self._base_url}/{endpoint.lstrip('/')}")
+            response = httpx.Response(err.status_code, json={"status": {"error": err.message}}, request=request)
+            LOGGER.error(f"HTTP error occurred: {err.message}")
+            raise httpx.HTTPStatusError(err.message, request=request, response=response) from err
@@ -1,22 +1,106 @@
+import time
+from contextlib import contextmanager
 from functools import wraps
+from typing import Iterator
 
-from prometheus_client import Counter
+from prometheus_client import Counter, Gauge, Histogram
 
 from engine.trace.span_context import get_tracing_span
 
+# Labels must stay bounded: component types, providers, models, endpoints. Project ids are only on agent_calls_total.
+RUN_DURATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20)
+
 agent_calls = Counter(
     "agent_calls_total",
     "Number of times an agent is called",
     ["class_name", "project_id"],
 )
 
+component_run_duration = Histogram(
+    "component_run_duration_seconds",
+    "Execution time of a component run",
+    ["class_name", "status"],
+    buckets=RUN_DURATION_BUCKETS,
+)
+graph_run_duration = Histogram(
+    "graph_run_duration_seconds",
+    "Execution time of a GraphRunner run, root runs apart from nested graphs",
+    ["root", "status"],
+    buckets=RUN_DURATION_BUCKETS,
+)
+llm_call_duration = Histogram(
+    "llm_call_duration_seconds",
+    "Latency of an LLM provider call",
+    ["provider", "model", "operation", "status"],
+    buckets=RUN_DURATION_BUCKETS,
+)
+embedding_batch_duration = Histogram(
+    "embedding_batch_duration_seconds",
+    "Latency of an embedding request, for a single text or a batch",
+    ["provider", "model", "status"],
+    buckets=REQUEST_DURATION_BUCKETS,
+)
+qdrant_request_duration = Histogram(
+    "qdrant_request_duration_seconds",
+    "Latency of a Qdrant HTTP request",
+    ["method", "endpoint", "status"],
+    buckets=REQUEST_DURATION_BUCKETS,
+)
+llm_tokens = Counter(
+    "llm_tokens_total",
+    "Tokens reported by LLM providers",
+    ["provider", "model", "token_type"],
+)
+operation_errors = Counter(
+    "operation_errors_total",
+    "Errors raised by the timed operations",
+    ["operation", "error_type"],
+)
+queue_depth = Gauge(
+    "worker_queue_depth",
+    "Items waiting in a worker queue, sampled by the worker",
+    ["queue"],
+)
+worker_in_flight = Gauge(
+    "worker_in_flight_items",
+    "Items a worker is processing",
+    ["worker"],
+)
+
+
+@contextmanager
+def track_duration(histogram: Histogram, operation: str, /, **labels: str) -> Iterator[None]:
+    """Observe the duration of the block with a status label, and count its errors under operation."""
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException as e:
+        status = "error"
+        operation_errors.labels(operation=operation, error_type=type(e).__name__).inc()
+        raise
+    finally:
+        histogram.labels(**labels, status=status).observe(time.perf_counter() - start)
+
+
+def qdrant_endpoint_label(endpoint: str) -> str:
+    """Endpoint without its query string and names, e.g. collections/{collection}/points/query."""
+    parts = endpoint.split("?", 1)[0].strip("/").split("/")
+    if len(parts) > 1 and parts[0] == "collections":
+        parts[1] = "{collection}"
+        if len(parts) > 3 and parts[2] == "index":
+            parts[3] = "{field_name}"
+    return "/".join(parts)
+
 
 def track_calls(func):
     @wraps(func)
-    def wrapper(self, *args, **kwargs):
+    async def wrapper(self, *args, **kwargs):
         class_name = self.__class__.__name__
         params = get_tracing_span()
         agent_calls.labels(class_name=class_name, project_id=str(params.project_id)).inc()
-        return func(self, *args, **kwargs)
+        with track_duration(component_run_duration, "component_run", class_name=class_name):
+            return await func(self, *args, **kwargs)
 
     return wrapper
@@ -12,6 +12,7 @@ import httpx
 from engine.components.types import SourceChunk
 from engine.datetime_utils import make_naive_utc, parse_datetime
 from engine.llm_services.llm_service import EmbeddingService
+from engine.prometheus_metric import qdrant_endpoint_label, qdrant_request_duration, track_duration
 from settings import settings
 
 LOGGER = logging.getLogger(__name__)
@@ -21,6 +22,8 @@ MAX_BATCH_SIZE_FOR_CHUNK_UPLOAD = 50
 DEFAULT_TIMEOUT = 20.0
 SOURCE_ID_COLUMN_NAME = "source_id"
 BM25_MODEL = "Qdrant/bm25"
+# Qdrant's own default `k` for Reciprocal Rank Fusion, reused for client-side fusion so both paths rank alike
+RRF_K = 2
 
 
 class FieldSchema(Enum):
@@ -75,6 +78,67 @@ class SearchMode(str, Enum):
     HYBRID = "hybrid"
 
 
+class VectorStoreBackend(str, Enum):
+    QDRANT = "qdrant"
+    LOCAL = "local"
+
+
+class HybridFusion(str, Enum):
+    RRF = "rrf"
+    DBSF = "dbsf"
+
+
+# Minimum Qdrant server version able to run each fusion inside a /points/query prefetch request
+SERVER_SIDE_FUSION_MIN_VERSION: dict[HybridFusion, tuple[int, int, int]] = {
+    HybridFusion.RRF: (1, 10, 0),
+    HybridFusion.DBSF: (1, 11, 0),
+}
+
+
+def parse_server_version(version: Optional[str]) -> Optional[tuple[int, int, int]]:
+    """Parse a Qdrant version string such as '1.12.4' or 'v1.10.0-rc1' into a comparable tuple."""
+    if not version:
+        return None
+    match = re.match(r"v?(\d+)\.(\d+)(?:\.(\d+))?", version.strip())
+    if not match:
+        return None
+    major, minor, patch = match.groups()
+    return int(major), int(minor), int(patch or 0)
+
+
+def fuse_ranked_results(
+    result_lists: list[list[tuple[str, float, dict]]],
+    fusion: HybridFusion,
+    limit: int,
+) -> list[tuple[str, float, dict]]:
+    """
+    Client-side equivalent of the Qdrant Query API fusion, used when the server cannot fuse prefetches.
+
+    - RRF scores each point by the sum of 1 / (RRF_K + rank) over the lists it appears in.
+    - DBSF normalizes each list with mean +/- 3 standard deviations, then sums the normalized scores.
+    """
+    fused_scores: dict[str, float] = {}
+    payloads: dict[str, dict] = {}
+    for results in result_lists:
+        if not results:
+            continue
+        if fusion == HybridFusion.DBSF:
+            scores = [score for _, score, _ in results]
+            mean = sum(scores) / len(scores)
+            std = (sum((score - mean) ** 2 for score in scores) / len(scores)) ** 0.5
+            low, high = mean - 3 * std, mean + 3 * std
+            for point_id, score, payload in results:
+                normalized = 0.5 if high == low else (min(max(score, low), high) - low) / (high - low)
+                fused_scores[point_id] = fused_scores.get(point_id, 0.0) + normalized
+                payloads.setdefault(point_id, payload)
+        else:
+            for rank, (point_id, _, payload) in enumerate(results):
+                fused_scores[point_id] = fused_scores.get(point_id, 0.0) + 1 / (RRF_K + rank)
+                payloads.setdefault(point_id, payload)
+    ranked_ids = sorted(fused_scores, key=fused_scores.get, reverse=True)[:limit]
+    return [(point_id, fused_scores[point_id], payloads[point_id]) for point_id in ranked_ids]
+
+
 def map_internal_type_to_qdrant_field_schema(internal_type: str) -> FieldSchema:
     """Map internal DBDefinition types to Qdrant FieldSchema types."""
     type_mapping = {
@@ -204,6 +268,8 @@ class QdrantService:
 
         self.default_schema = default_schema
         self._schemas: dict[str, QdrantCollectionSchema] = {}
+        self._server_version: Optional[tuple[int, int, int]] = None
+        self._server_version_checked = False
 
     def register_schema(self, collection_name: str, schema: QdrantCollectionSchema):
         """
@@ -241,6 +307,7 @@ class QdrantService:
     ) -> "QdrantService":
         """
         Initialize the Qdrant service using the default settings from the environment variables.
+        With VECTOR_STORE_BACKEND=local, an in-process LocalQdrantService is returned instead.
         """
         if not default_collection_schema:
             default_collection_schema = QdrantCollectionSchema(
@@ -250,6 +317,16 @@ class QdrantService:
                 url_id_field="url",
                 last_edited_ts_field="last_edited_ts",
             )
+        if VectorStoreBackend(settings.VECTOR_STORE_BACKEND) == VectorStoreBackend.LOCAL:
+            # Imported here because the local store module subclasses QdrantService
+            from engine.local_vector_store import LocalQdrantService
+
+            return LocalQdrantService(
+                default_schema=default_collection_schema,
+                embedding_service=embedding_service,
+                timeout=timeout,
+                use_hnsw=settings.LOCAL_VECTOR_STORE_USE_HNSW,
+            )
         if not settings.QDRANT_API_KEY:
             raise ValueError("QDRANT_API_KEY environment variable is not set.")
         if not settings.QDRANT_CLUSTER_URL:
@@ -281,12 +358,15 @@ class QdrantService:
             dict: The JSON response from the API.
         """
         try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                response = await client.request(
-                    method=method, url=f"{self._base_url}/{endpoint}", json=payload, headers=self._headers
-                )
-                response.raise_for_status()
-                return response.json()
+            with track_duration(
+                qdrant_request_duration, "qdrant_request", method=method, endpoint=qdrant_endpoint_label(endpoint)
+            ):
+                async with httpx.AsyncClient(timeout=self._timeout) as client:
+                    response = await client.request(
+                        method=method, url=f"{self._base_url}/{endpoint}", json=payload, headers=self._headers
+                    )
+                    response.raise_for_status()
+                    return response.json()
         except httpx.HTTPStatusError as http_err:
             LOGGER.error(f"HTTP error occurred: {http_err}")
             raise
@@ -348,6 +428,46 @@ class QdrantService:
         points = response.get("result", {}).get("points", [])
         return [(point["id"], point["score"], point.get("payload", {})) for point in points]
 
+    async def _query_points_batch_async(
+        self,
+        collection_name: str,
+        query_payloads: list[dict],
+    ) -> list[list[tuple[str, float, dict]]]:
+        """Run several /points/query requests in one /points/query/batch call, one result list per request."""
+        if not query_payloads:
+            return []
+        response = await self._send_request_async(
+            method="POST",
+            endpoint=f"collections/{collection_name}/points/query/batch",
+            payload={"searches": query_payloads},
+        )
+        return [
+            [(point["id"], point["score"], point.get("payload", {})) for point in result.get("points", [])]
+            for result in response.get("result", [])
+        ]
+
+    async def get_server_version_async(self) -> Optional[tuple[int, int, int]]:
+        """
+        Return the Qdrant server version, fetched once per service instance.
+        Returns None when the version cannot be determined.
+        """
+        if not self._server_version_checked:
+            try:
+                response = await self._send_request_async(method="GET", endpoint="")
+                self._server_version = parse_server_version(response.get("version"))
+            except Exception as err:
+                LOGGER.warning(f"Could not determine Qdrant server version: {err}")
+                self._server_version = None
+            self._server_version_checked = True
+        return self._server_version
+
+    async def _supports_server_side_fusion(self, fusion: HybridFusion) -> bool:
+        server_version = await self.get_server_version_async()
+        if server_version is None:
+            # Unknown version: assume a recent server, as every other search already relies on the Query API
+            return True
+        return server_version >= SERVER_SIDE_FUSION_MIN_VERSION[fusion]
+
     async def _search_hybrid_async(
         self,
         query_text: str,
@@ -355,9 +475,35 @@ class QdrantService:
         collection_name: str,
         filter: Optional[dict] = None,
         limit: int = DEFAULT_MAX_CHUNKS,
+        fusion: HybridFusion = HybridFusion.RRF,
     ) -> list[tuple[str, float, dict]]:
+        """
+        Hybrid dense + sparse search fused server-side in a single /points/query call with prefetches.
+        Falls back to two concurrent searches fused client-side when the server is too old for the
+        requested fusion.
+        """
+        fusion = HybridFusion(fusion)
+        if not await self._supports_server_side_fusion(fusion):
+            LOGGER.info(f"Qdrant server does not support server-side {fusion.value} fusion, fusing client-side")
+            prefetch_limit = limit * 2
+            sparse_results, dense_results = await asyncio.gather(
+                self._search_sparse_async(query_text, collection_name, filter, prefetch_limit),
+                self._search_dense_named_async(query_vector, collection_name, filter, prefetch_limit),
+            )
+            return fuse_ranked_results([sparse_results, dense_results], fusion, limit)
+        return await self._query_points_async(
+            collection_name, self._build_hybrid_query_payload(query_text, query_vector, filter, limit, fusion)
+        )
+
+    @staticmethod
+    def _build_hybrid_query_payload(
+        query_text: str,
+        query_vector: list[float],
+        filter: Optional[dict],
+        limit: int,
+        fusion: HybridFusion,
+    ) -> dict[str, Any]:
         prefetch_limit = limit * 2
-        dense_prefetch: dict[str, Any] = {"query": query_vector, "using": "dense", "limit": prefetch_limit}
         payload: dict[str, Any] = {
             "prefetch": [
                 {
@@ -365,16 +511,16 @@ class QdrantService:
                     "using": "sparse",
                     "limit": prefetch_limit,
                 },
-                dense_prefetch,
+                {"query": query_vector, "using": "dense", "limit": prefetch_limit},
             ],
-            "query": {"fusion": "rrf"},
+            "query": {"fusion": fusion.value},
             "limit": limit,
             "with_payload": True,
         }
         if filter:
             payload["prefetch"][0]["filter"] = filter
             payload["prefetch"][1]["filter"] = filter
-        return await self._query_points_async(collection_name, payload)
+        return payload
 
     async def _search_dense_named_async(
         self,
@@ -383,6 +529,12 @@ class QdrantService:
         filter: Optional[dict] = None,
         limit: int = DEFAULT_MAX_CHUNKS,
     ) -> list[tuple[str, float, dict]]:
+        return await self._query_points_async(
+            collection_name, self._build_dense_query_payload(query_vector, filter, limit)
+        )
+
+    @staticmethod
+    def _build_dense_query_payload(query_vector: list[float], filter: Optional[dict], limit: int) -> dict[str, Any]:
         payload: dict[str, Any] = {
             "query": query_vector,
             "using": "dense",
@@ -391,7 +543,7 @@ class QdrantService:
         }
         if filter:
             payload["filter"] = filter
-        return await self._query_points_async(collection_name, payload)
+        return payload
 
     async def _search_sparse_async(
         self,
@@ -400,6 +552,12 @@ class QdrantService:
         filter: Optional[dict] = None,
         limit: int = DEFAULT_MAX_CHUNKS,
     ) -> list[tuple[str, float, dict]]:
+        return await self._query_points_async(
+            collection_name, self._build_sparse_query_payload(query_text, filter, limit)
+        )
+
+    @staticmethod
+    def _build_sparse_query_payload(query_text: str, filter: Optional[dict], limit: int) -> dict[str, Any]:
         payload: dict[str, Any] = {
             "query": {"text": query_text, "model": BM25_MODEL},
             "using": "sparse",
@@ -408,7 +566,7 @@ class QdrantService:
         }
         if filter:
             payload["filter"] = filter
-        return await self._query_points_async(collection_name, payload)
+        return payload
 
     def get_chunk_data_by_id(
         self,
@@ -507,6 +665,7 @@ class QdrantService:
         max_retrieved_chunks_after_penalty: Optional[int] = None,
         source_schemas: Optional[dict[str, "QdrantCollectionSchema"]] = None,
         search_mode: SearchMode = SearchMode.SEMANTIC,
+        hybrid_fusion: HybridFusion = HybridFusion.RRF,
         **search_params,
     ) -> list[SourceChunk]:
         """
@@ -526,6 +685,7 @@ class QdrantService:
                 max_retrieved_chunks_after_penalty,
                 source_schemas=source_schemas,
                 search_mode=search_mode,
+                hybrid_fusion=hybrid_fusion,
                 **search_params,
             )
         )
@@ -543,11 +703,13 @@ class QdrantService:
         max_retrieved_chunks_after_penalty: Optional[int] = None,
         source_schemas: Optional[dict[str, "QdrantCollectionSchema"]] = None,
         search_mode: SearchMode = SearchMode.SEMANTIC,
+        hybrid_fusion: HybridFusion = HybridFusion.RRF,
         **search_params,
     ) -> list[SourceChunk]:
         """
         Async version of retrieve_similar_chunks.
         Search for chunks similar to the given text.
+        Chunk payloads are taken from the search response itself, so no second lookup by ID is needed.
         """
         schema = self._get_schema(collection_name)
 
@@ -566,6 +728,7 @@ class QdrantService:
                 collection_name=collection_name,
                 filter=filter,
                 limit=limit,
+                fusion=hybrid_fusion,
             )
         else:
             query_vector = (await self._build_vectors_async(query_text))[0]
@@ -576,6 +739,137 @@ class QdrantService:
                 limit=limit,
             )
 
+        return self._build_chunks_from_results(
+            vector_results=vector_results,
+            query_text=query_text,
+            filter=filter,
+            schema=schema,
+            source_schemas=source_schemas,
+            enable_date_penalty_for_chunks=enable_date_penalty_for_chunks,
+            chunk_age_penalty_rate=chunk_age_penalty_rate,
+            default_penalty_rate=default_penalty_rate,
+            metadata_date_key=metadata_date_key,
+            max_retrieved_chunks_after_penalty=max_retrieved_chunks_after_penalty,
+        )
+
+    def retrieve_similar_chunks_batch(
+        self,
+        query_texts: list[str],
+        collection_name: str,
+        limit: int = DEFAULT_MAX_CHUNKS,
+        filter: dict = None,
+        enable_date_penalty_for_chunks: bool = False,
+        chunk_age_penalty_rate: Optional[float] = None,
+        default_penalty_rate: Optional[float] = None,
+        metadata_date_key: Optional[list[str]] = None,
+        max_retrieved_chunks_after_penalty: Optional[int] = None,
+        source_schemas: Optional[dict[str, "QdrantCollectionSchema"]] = None,
+        search_mode: SearchMode = SearchMode.SEMANTIC,
+        hybrid_fusion: HybridFusion = HybridFusion.RRF,
+    ) -> list[list[SourceChunk]]:
+        """Search for chunks similar to each of the given texts, returning one chunk list per text."""
+        return asyncio.run(
+            self.retrieve_similar_chunks_batch_async(
+                query_texts,
+                collection_name,
+                limit,
+                filter,
+                enable_date_penalty_for_chunks,
+                chunk_age_penalty_rate,
+                default_penalty_rate,
+                metadata_date_key,
+                max_retrieved_chunks_after_penalty,
+                source_schemas=source_schemas,
+                search_mode=search_mode,
+                hybrid_fusion=hybrid_fusion,
+            )
+        )
+
+    async def retrieve_similar_chunks_batch_async(
+        self,
+        query_texts: list[str],
+        collection_name: str,
+        limit: int = DEFAULT_MAX_CHUNKS,
+        filter: dict = None,
+        enable_date_penalty_for_chunks: bool = False,
+        chunk_age_penalty_rate: Optional[float] = None,
+        default_penalty_rate: Optional[float] = None,
+        metadata_date_key: Optional[list[str]] = None,
+        max_retrieved_chunks_after_penalty: Optional[int] = None,
+        source_schemas: Optional[dict[str, "QdrantCollectionSchema"]] = None,
+        search_mode: SearchMode = SearchMode.SEMANTIC,
+        hybrid_fusion: HybridFusion = HybridFusion.RRF,
+    ) -> list[list[SourceChunk]]:
+        """
+        Async version of retrieve_similar_chunks_batch.
+        All texts are embedded in a single embedding call and searched in a single /points/query/batch
+        request, instead of one embedding call and one or two searches per text.
+        """
+        if not query_texts:
+            return []
+        schema = self._get_schema(collection_name)
+        search_mode = SearchMode(search_mode)
+        hybrid_fusion = HybridFusion(hybrid_fusion)
+
+        query_vectors: list[list[float]] = []
+        if search_mode != SearchMode.KEYWORD:
+            query_vectors = await self._build_vectors_async(query_texts)
+
+        fuse_client_side = False
+        if search_mode == SearchMode.KEYWORD:
+            query_payloads = [self._build_sparse_query_payload(text, filter, limit) for text in query_texts]
+        elif search_mode == SearchMode.SEMANTIC:
+            query_payloads = [self._build_dense_query_payload(vector, filter, limit) for vector in query_vectors]
+        elif await self._supports_server_side_fusion(hybrid_fusion):
+            query_payloads = [
+                self._build_hybrid_query_payload(text, vector, filter, limit, hybrid_fusion)
+                for text, vector in zip(query_texts, query_vectors, strict=True)
+            ]
+        else:
+            LOGGER.info(f"Qdrant server does not support server-side {hybrid_fusion.value} fusion, fusing client-side")
+            fuse_client_side = True
+            query_payloads = []
+            for text, vector in zip(query_texts, query_vectors, strict=True):
+                query_payloads.append(self._build_sparse_query_payload(text, filter, limit * 2))
+                query_payloads.append(self._build_dense_query_payload(vector, filter, limit * 2))
+
+        batch_results = await self._query_points_batch_async(collection_name, query_payloads)
+        if fuse_client_side:
+            batch_results = [
+                fuse_ranked_results([sparse_results, dense_results], hybrid_fusion, limit)
+                for sparse_results, dense_results in zip(batch_results[::2], batch_results[1::2], strict=True)
+            ]
+
+        return [
+            self._build_chunks_from_results(
+                vector_results=vector_results,
+                query_text=query_text,
+                filter=filter,
+                schema=schema,
+                source_schemas=source_schemas,
+                enable_date_penalty_for_chunks=enable_date_penalty_for_chunks,
+                chunk_age_penalty_rate=chunk_age_penalty_rate,
+                default_penalty_rate=default_penalty_rate,
+                metadata_date_key=metadata_date_key,
+                max_retrieved_chunks_after_penalty=max_retrieved_chunks_after_penalty,
+            )
+            for query_text, vector_results in zip(query_texts, batch_results, strict=True)
+        ]
+
+    def _build_chunks_from_results(
+        self,
+        vector_results: list[tuple[str, float, dict]],
+        query_text: str,
+        filter: Optional[dict],
+        schema: QdrantCollectionSchema,
+        source_schemas: Optional[dict[str, "QdrantCollectionSchema"]],
+        enable_date_penalty_for_chunks: bool,
+        chunk_age_penalty_rate: Optional[float],
+        default_penalty_rate: Optional[float],
+        metadata_date_key: Optional[list[str]],
+        max_retrieved_chunks_after_penalty: Optional[int],
+    ) -> list[SourceChunk]:
+        """Turn search results into SourceChunks, applying the optional date penalty first."""
         if not vector_results:
             LOGGER.warning(f"No similar vectors found for query: {query_text}")
             return []
@@ -595,11 +889,9 @@ class QdrantService:
                 max_retrieved_chunks_after_penalty,
             )
 
-        results = await self.get_chunk_data_by_id_async(collection_name=collection_name, vector_ids=vector_ids)
-
         chunks: list[SourceChunk] = []
-        for result in results:
-            if not (chunk_data := result.get("payload")):
+        for chunk_data in payloads:
+            if not chunk_data:
                 continue
 
             chunk_schema = schema
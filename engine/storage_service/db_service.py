@@ -114,6 +114,24 @@ class DBService(CloseMixin, ABC):
         """Insert rows or update them on primary key conflict."""
         pass
 
+    def get_bulk_write_batch_size(self, batch_size: int) -> int:
+        """Rows written per statement by bulk_upsert_rows. Backends with a bulk load path use larger batches."""
+        return batch_size
+
+    def bulk_upsert_rows(
+        self,
+        table_name: str,
+        rows: list[dict],
+        schema_name: Optional[str] = None,
+        id_column_names: Optional[list[str]] = None,
+        batch_size: int = 50,
+    ) -> None:
+        """Upsert many rows, with one upsert_rows statement per batch of batch_size rows."""
+        for start in range(0, len(rows), batch_size):
+            self.upsert_rows(
+                table_name, rows[start : start + batch_size], schema_name=schema_name, id_column_names=id_column_names
+            )
+
     def insert_df_to_table(self, df, table_name: str, schema_name: Optional[str] = None) -> None:
         """Convenience method that accepts a pandas DataFrame. Prefer insert_rows."""
         if hasattr(df, "empty") and df.empty:
@@ -168,9 +186,13 @@ class DBService(CloseMixin, ABC):
         Uses upsert (ON CONFLICT DO UPDATE) instead of plain insert to be idempotent:
         if the process crashes mid-batch and retries, already-inserted rows are updated
         rather than causing a UniqueViolation.
+        Fetched rows are buffered up to the bulk write batch size of the backend, so backends
+        with a bulk load path write them in a few large batches.
         """
+        write_batch_size = self.get_bulk_write_batch_size(batch_size)
         id_list = list(ids)
         total_batches = (len(id_list) + batch_size - 1) // batch_size
+        pending_rows: list[dict] = []
         for i in range(0, len(id_list), batch_size):
             batch_num = i // batch_size + 1
             batch_ids = set(id_list[i : i + batch_size])
@@ -179,15 +201,20 @@ class DBService(CloseMixin, ABC):
             )
             rows = fetch_rows_fn(batch_ids)
             if rows:
-                total_upsert_batches = (len(rows) + batch_size - 1) // batch_size
-                LOGGER.debug(f"Batch {batch_num}: {len(rows)} rows to upsert in {total_upsert_batches} sub-batches")
-                for j in range(0, len(rows), batch_size):
-                    upsert_batch = rows[j : j + batch_size]
-                    self.upsert_rows(
-                        table_name, upsert_batch, schema_name=schema_name, id_column_names=id_column_names
-                    )
+                pending_rows.extend(rows)
             del rows
-            gc.collect()
+            if len(pending_rows) >= write_batch_size or i + batch_size >= len(id_list):
+                if pending_rows:
+                    LOGGER.debug(f"Batch {batch_num}: upserting {len(pending_rows)} rows")
+                    self.bulk_upsert_rows(
+                        table_name,
+                        pending_rows,
+                        schema_name=schema_name,
+                        id_column_names=id_column_names,
+                        batch_size=batch_size,
+                    )
+                pending_rows = []
+                gc.collect()
 
     def update_table(
         self,
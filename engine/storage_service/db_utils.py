@@ -17,6 +17,7 @@ PYTHON_TYPE_CAST: dict[str, type] = {
     "VARCHAR": str,
     "TEXT": str,
     "INTEGER": int,
+    "BIGINT": int,
     "FLOAT": float,
     "BOOLEAN": bool,
     "UUID": str,
@@ -1,6 +1,8 @@
+import io
 import json
 import logging
 from contextlib import contextmanager
+from datetime import date, datetime
 from pathlib import Path
 from threading import Lock
 from typing import Any, Dict, Iterator, Optional, Type
@@ -9,7 +11,7 @@ import pandas as pd
 import sqlalchemy
 from func_timeout import FunctionTimedOut, func_timeout
 from sqlalchemy import MetaData, create_engine, text
-from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql.type_api import TypeEngine
@@ -23,6 +25,7 @@ from engine.storage_service.db_utils import (
     check_columns_matching_between_data_and_database_table,
 )
 from engine.storage_service.errors import RowNotFoundError
+from settings import settings
 
 LOGGER = logging.getLogger(__name__)
 
@@ -35,6 +38,7 @@ TYPE_MAPPING: dict[str, Type[TypeEngine]] = {
     "TIMESTAMP": sqlalchemy.TIMESTAMP,
     "DATETIME": sqlalchemy.DateTime,
     "INTEGER": sqlalchemy.Integer,
+    "BIGINT": sqlalchemy.BigInteger,
     "FLOAT": sqlalchemy.Float,
     "BOOLEAN": sqlalchemy.Boolean,
     "ARRAY": sqlalchemy.JSON,
@@ -44,6 +48,89 @@ TYPE_MAPPING: dict[str, Type[TypeEngine]] = {
     "UUID": PostgresUUID,
 }
 DEFAULT_MAPPING = {"CURRENT_TIMESTAMP": sqlalchemy.func.current_timestamp()}
+# Rows per batch when streaming query results
+STREAM_BATCH_SIZE = 1000
+# Temporary table the rows of a bulk upsert are copied into, dropped when its transaction commits
+COPY_STAGING_TABLE = "bulk_upsert_staging"
+# Escapes of the COPY text format
+COPY_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _to_postgres_text(value: Any) -> str:
+    """Text input form of a non-null value: t/f booleans, ISO dates, \\x hex bytea and {...} array literals."""
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, (list, tuple)):
+        return _to_postgres_array_literal(value)
+    return str(value)
+
+
+def _to_postgres_array_literal(values: list | tuple) -> str:
+    """Array literal with every element double-quoted, so commas, braces and spaces in elements are kept."""
+    elements = []
+    for value in values:
+        if value is None:
+            elements.append("NULL")
+        elif isinstance(value, (list, tuple)):
+            elements.append(_to_postgres_array_literal(value))
+        else:
+            element = _to_postgres_text(value).replace("\\", "\\\\").replace('"', '\\"')
+            elements.append(f'"{element}"')
+    return "{" + ",".join(elements) + "}"
+
+
+def _to_copy_text_value(value: Any, is_json: bool = False) -> str:
+    """Format a value as a field of the COPY text format, NULL being \\N."""
+    if value is None:
+        return "\\N"
+    value = json.dumps(value) if is_json else _to_postgres_text(value)
+    return value.translate(COPY_TEXT_ESCAPES)
+
+
+def _build_copy_upsert_statements(
+    table: sqlalchemy.Table,
+    column_names: list[str],
+    id_column_names: list[str],
+    preparer: sqlalchemy.sql.compiler.IdentifierPreparer,
+) -> tuple[str, str, str]:
+    """
+    Statements creating the staging table, copying rows into it and merging it into the table.
+    The merge only updates rows whose values changed, so rewriting unchanged chunks leaves them untouched.
+    """
+    target = preparer.format_table(table)
+    staging = preparer.quote(COPY_STAGING_TABLE)
+    columns = ", ".join(preparer.quote(column_name) for column_name in column_names)
+    conflict_columns = ", ".join(preparer.quote(column_name) for column_name in id_column_names)
+    create_statement = f"CREATE TEMPORARY TABLE {staging} (LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP"
+    copy_statement = f"COPY {staging} ({columns}) FROM STDIN"
+
+    updatable_columns = [column_name for column_name in column_names if column_name not in id_column_names]
+    merge_statement = (
+        f"INSERT INTO {target} AS existing ({columns}) SELECT {columns} FROM {staging} "
+        f"ON CONFLICT ({conflict_columns})"
+    )
+    if not updatable_columns:
+        return create_statement, copy_statement, f"{merge_statement} DO NOTHING"
+
+    def comparable(prefix: str, column_name: str) -> str:
+        column = f"{prefix}.{preparer.quote(column_name)}"
+        column_type = table.c[column_name].type
+        # json has no equality operator, unlike jsonb
+        if isinstance(column_type, sqlalchemy.JSON) and not isinstance(column_type, JSONB):
+            return f"{column}::jsonb"
+        return column
+
+    assignments = ", ".join(
+        f"{preparer.quote(column_name)} = EXCLUDED.{preparer.quote(column_name)}" for column_name in updatable_columns
+    )
+    current_values = ", ".join(comparable("existing", column_name) for column_name in updatable_columns)
+    new_values = ", ".join(comparable("EXCLUDED", column_name) for column_name in updatable_columns)
+    merge_statement += f" DO UPDATE SET {assignments} WHERE ({current_values}) IS DISTINCT FROM ({new_values})"
+    return create_statement, copy_statement, merge_statement
 
 
 class SQLLocalService(DBService):
@@ -241,23 +328,45 @@ class SQLLocalService(DBService):
             result = session.execute(stmt)
             return pd.DataFrame(result.fetchall(), columns=result.keys())
 
+    def _iter_statement_rows(self, stmt, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[list[dict]]:
+        """
+        Yield the rows of a select as list[dict] batches of at most batch_size rows.
+        Results are streamed through a server-side cursor on drivers that support it (e.g. psycopg2),
+        so only one batch is held in memory.
+        """
+        with self.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+            keys = list(result.keys())
+            for rows in result.partitions():
+                yield [dict(zip(keys, row)) for row in rows]
+
     def iter_table_rows(
         self,
         table_name: str,
         schema_name: Optional[str] = None,
         sql_query_filter: Optional[str] = None,
     ) -> Iterator[list[dict]]:
-        """Yield table rows as list[dict] in a single chunk."""
+        """Yield table rows as list[dict] batches, streamed from the database."""
         table = self.get_table(table_name, schema_name)
-        with self.Session() as session:
-            stmt = sqlalchemy.select(table)
-            if sql_query_filter:
-                stmt = stmt.where(text(sql_query_filter))
-            result = session.execute(stmt)
-            keys = list(result.keys())
-            rows = result.fetchall()
-            if rows:
-                yield [dict(zip(keys, row)) for row in rows]
+        stmt = sqlalchemy.select(table)
+        if sql_query_filter:
+            stmt = stmt.where(text(sql_query_filter))
+        yield from self._iter_statement_rows(stmt)
+
+    def iter_selected_columns(
+        self,
+        table_name: str,
+        columns: list[str],
+        schema_name: Optional[str] = None,
+        sql_query_filter: Optional[str] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[list[dict]]:
+        """Yield rows containing only the specified columns as list[dict] batches, streamed from the database."""
+        table = self.get_table(table_name, schema_name)
+        stmt = sqlalchemy.select(*[table.c[col] for col in columns])
+        if sql_query_filter:
+            stmt = stmt.where(text(sql_query_filter))
+        yield from self._iter_statement_rows(stmt, batch_size=batch_size)
 
     def fetch_selected_columns(
         self,
@@ -635,6 +744,21 @@ class SQLLocalService(DBService):
 
             return row_dict
 
+    def _ids_condition(self, column: sqlalchemy.Column, ids: list) -> sqlalchemy.ColumnElement[bool]:
+        """
+        Match a column against a list of IDs passed as bound parameters.
+        On Postgres the IDs are sent as one array parameter, so the statement is the same whatever their number.
+        """
+        if self.engine.dialect.name != "postgresql":
+            return column.in_(ids)
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = None
+        if python_type is not None:
+            ids = [value if isinstance(value, python_type) else python_type(value) for value in ids]
+        return column == sqlalchemy.any_(sqlalchemy.bindparam(None, ids, type_=ARRAY(column.type)))
+
     def get_rows_by_ids(
         self,
         table_name: str,
@@ -649,7 +773,7 @@ class SQLLocalService(DBService):
 
         table = self.get_table(table_name, schema_name)
         with self.Session() as session:
-            stmt = sqlalchemy.select(table).where(table.c[id_column_name].in_(chunk_ids))
+            stmt = sqlalchemy.select(table).where(self._ids_condition(table.c[id_column_name], chunk_ids))
             if sql_query_filter:
                 stmt = stmt.where(text(sql_query_filter))
             results = session.execute(stmt).fetchall()
@@ -703,3 +827,84 @@ class SQLLocalService(DBService):
                 )
                 session.execute(stmt)
             LOGGER.info(f"Successfully upserted {len(rows)} rows in table {table_name}")
+
+    def _uses_copy(self) -> bool:
+        """COPY needs the psycopg2 driver of PostgreSQL, other backends use the INSERT ... ON CONFLICT statements."""
+        return (
+            settings.DB_COPY_BATCH_SIZE > 0
+            and self.engine.dialect.name == "postgresql"
+            and self.engine.dialect.driver == "psycopg2"
+        )
+
+    def get_bulk_write_batch_size(self, batch_size: int) -> int:
+        return settings.DB_COPY_BATCH_SIZE if self._uses_copy() else batch_size
+
+    def bulk_upsert_rows(
+        self,
+        table_name: str,
+        rows: list[dict],
+        schema_name: Optional[str] = None,
+        id_column_names: Optional[list[str]] = None,
+        batch_size: int = 50,
+    ) -> None:
+        """
+        On PostgreSQL, COPY each batch of DB_COPY_BATCH_SIZE rows into a temporary staging table and merge it with a
+        single INSERT ... ON CONFLICT DO UPDATE. Other backends upsert batches of batch_size rows with upsert_rows.
+        """
+        if not self._uses_copy():
+            super().bulk_upsert_rows(
+                table_name, rows, schema_name=schema_name, id_column_names=id_column_names, batch_size=batch_size
+            )
+            return
+        copy_batch_size = settings.DB_COPY_BATCH_SIZE
+        for start in range(0, len(rows), copy_batch_size):
+            self._copy_upsert_rows(
+                table_name, rows[start : start + copy_batch_size], schema_name, id_column_names or [CHUNK_ID_COLUMN]
+            )
+
+    def _copy_upsert_rows(
+        self,
+        table_name: str,
+        rows: list[dict],
+        schema_name: Optional[str],
+        id_column_names: list[str],
+    ) -> None:
+        table = self.get_table(table_name, schema_name)
+        for id_column_name in id_column_names:
+            if id_column_name not in table.c:
+                raise ValueError(f"Column '{id_column_name}' not found in table '{table_name}'.")
+
+        # A merge cannot update a row twice: keep the last version of rows repeated in the batch
+        rows = list({tuple(row.get(column_name) for column_name in id_column_names): row for row in rows}.values())
+        row_keys: set[str] = set().union(*(row.keys() for row in rows))
+        unknown_columns = row_keys.difference(table.c.keys())
+        if unknown_columns:
+            raise ValueError(f"Columns {sorted(unknown_columns)} not found in table '{table_name}'.")
+        columns = [column for column in table.columns if column.name in row_keys]
+        json_columns = {column.name for column in columns if isinstance(column.type, sqlalchemy.JSON)}
+        jsonb_columns = {column.name for column in columns if isinstance(column.type, JSONB)}
+        buffer = io.StringIO()
+        for row in rows:
+            values = []
+            for column in columns:
+                value = row.get(column.name)
+                if column.name in jsonb_columns:
+                    value = self._parse_jsonb_value(value)
+                values.append(_to_copy_text_value(value, is_json=column.name in json_columns))
+            buffer.write("\t".join(values))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        create_statement, copy_statement, merge_statement = _build_copy_upsert_statements(
+            table, [column.name for column in columns], id_column_names, self.engine.dialect.identifier_preparer
+        )
+        with self.engine.begin() as connection:
+            cursor = connection.connection.cursor()
+            try:
+                cursor.execute(create_statement)
+                cursor.copy_expert(copy_statement, buffer)
+                cursor.execute(merge_statement)
+                written_rows = cursor.rowcount
+            finally:
+                cursor.close()
+        LOGGER.info(f"Copied {len(rows)} rows into table {table_name}, {written_rows} of them new or changed")
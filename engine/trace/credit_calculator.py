@@ -1,69 +1,125 @@
 import logging
+import threading
+import time
+from dataclasses import dataclass
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Callable, Optional
 from uuid import UUID
 
-from cachetools import TTLCache, cached
+from cachetools import LRUCache
 from opentelemetry.trace import Span
 
-from ada_backend.context import get_execution_id
 from ada_backend.database.setup_db import get_db_session
-from ada_backend.repositories.credits_repository import get_component_cost_per_call, get_llm_cost
+from ada_backend.repositories.credits_repository import get_component_version_id, get_cost_tables
 
 LOGGER = logging.getLogger(__name__)
 
-_llm_cost_cache: TTLCache[tuple[UUID, UUID], tuple[Optional[float], Optional[float]]] = TTLCache(maxsize=1000, ttl=300)
+# The version of the cost tables in Redis is read at most this often
+_VERSION_CHECK_INTERVAL_SECONDS = 30
+# The snapshot is reloaded at least this often, for the changes that do not bump the version (seeds, SQL)
+_MAX_SNAPSHOT_AGE_SECONDS = 300
 
-_component_cost_cache: TTLCache[tuple[UUID, UUID], Optional[float]] = TTLCache(maxsize=1000, ttl=300)
 
+@dataclass
+class CostSnapshot:
+    """Process-wide copy of the cost tables, keyed by stringified ids."""
 
-def _fetch_from_db_with_managed_session(repository_func: Callable, *args, resource_name: str, **kwargs) -> Any:
-    try:
-        execution_id = get_execution_id()
-        LOGGER.info(f"Fetching {resource_name} in execution_id {execution_id}")
-    except (ValueError, LookupError):
-        LOGGER.info(f"No execution context available, fetching {resource_name} without caching")
+    llm_costs: dict[str, tuple[Optional[float], Optional[float]]]
+    component_costs_per_call: dict[str, Optional[float]]
+    version: Optional[str]
+    loaded_at: float
+    checked_at: float
 
-    with get_db_session() as session:
-        return repository_func(session, *args, **kwargs)
 
+_snapshot: Optional[CostSnapshot] = None
+_snapshot_lock = threading.Lock()
+# Component version of the component instances, registered when their graph is built
+_component_instance_versions: LRUCache[str, Optional[str]] = LRUCache(maxsize=100_000)
 
-def _llm_cost_cache_key(model_id: UUID) -> tuple[UUID, UUID]:
-    try:
-        return (get_execution_id(), model_id)
-    except (ValueError, LookupError):
-        LOGGER.warning("No execution context for LLM cost cache, skipping cache")
-        return (object(), model_id)
 
+def _get_cost_tables_version() -> Optional[str]:
+    # Imported here: redis_client imports the ingestion schemas, which import the engine components
+    from ada_backend.utils.redis_client import get_cost_tables_version
 
-def _component_cost_cache_key(component_instance_id: UUID) -> tuple[UUID, UUID]:
-    try:
-        return (get_execution_id(), component_instance_id)
-    except (ValueError, LookupError):
-        LOGGER.warning("No execution context for component cost cache, skipping cache")
-        return (object(), component_instance_id)
+    return get_cost_tables_version()
 
 
-# TODO: Optimize LLM cost fetching to reduce DB calls
-@cached(cache=_llm_cost_cache, key=_llm_cost_cache_key)
-def get_cached_llm_cost(model_id: UUID) -> tuple[Optional[float], Optional[float]]:
-    return _fetch_from_db_with_managed_session(
-        get_llm_cost, model_id, resource_name=f"LLM cost for model_id {model_id}"
+def _load_cost_snapshot(version: Optional[str], now: float) -> CostSnapshot:
+    with get_db_session() as session:
+        cost_tables = get_cost_tables(session)
+    LOGGER.info(
+        f"Loaded the cost tables: {len(cost_tables.llm_costs)} LLM costs, "
+        f"{len(cost_tables.component_costs_per_call)} component costs (version {version})"
+    )
+    return CostSnapshot(
+        llm_costs={str(model_id): costs for model_id, costs in cost_tables.llm_costs.items()},
+        component_costs_per_call={
+            str(component_version_id): credits_per_call
+            for component_version_id, credits_per_call in cost_tables.component_costs_per_call.items()
+        },
+        version=version,
+        loaded_at=now,
+        checked_at=now,
     )
 
 
-# TODO: Optimize component cost fetching to reduce DB calls
-# Current implementation: 1 DB call per request per component (cached per request)
-# Potential optimizations:
-#   1. Fetch all component costs for the current workflow
-#   2. Fetch all component definitions with grouping
-@cached(cache=_component_cost_cache, key=_component_cost_cache_key)
+def get_cost_snapshot() -> CostSnapshot:
+    """
+    Return the snapshot of the cost tables, reloaded when their version in Redis changed or when it is older
+    than _MAX_SNAPSHOT_AGE_SECONDS. Between version checks, no query is made.
+    """
+    global _snapshot
+    now = time.monotonic()
+    snapshot = _snapshot
+    if snapshot is not None and now - snapshot.checked_at < _VERSION_CHECK_INTERVAL_SECONDS:
+        return snapshot
+    with _snapshot_lock:
+        snapshot = _snapshot
+        if snapshot is not None and now - snapshot.checked_at < _VERSION_CHECK_INTERVAL_SECONDS:
+            return snapshot
+        version = _get_cost_tables_version()
+        if snapshot is None or version != snapshot.version or now - snapshot.loaded_at >= _MAX_SNAPSHOT_AGE_SECONDS:
+            snapshot = _load_cost_snapshot(version, now)
+            _snapshot = snapshot
+        else:
+            snapshot.checked_at = now
+        return snapshot
+
+
+def notify_cost_tables_changed() -> None:
+    """Reload the snapshot of this process, and of the other processes at their next version check."""
+    from ada_backend.utils.redis_client import bump_cost_tables_version
+
+    global _snapshot
+    _snapshot = None
+    bump_cost_tables_version()
+
+
+def register_component_instance_version(component_instance_id: UUID, component_version_id: UUID) -> None:
+    """Record the version of a component instance, so that its cost needs no query."""
+    _component_instance_versions[str(component_instance_id)] = str(component_version_id)
+
+
+def _get_component_instance_version(component_instance_id: str) -> Optional[str]:
+    if component_instance_id not in _component_instance_versions:
+        # Components built outside of the agent builder: one query per instance and process
+        with get_db_session() as session:
+            component_version_id = get_component_version_id(session, UUID(component_instance_id))
+        _component_instance_versions[component_instance_id] = (
+            str(component_version_id) if component_version_id is not None else None
+        )
+    return _component_instance_versions[component_instance_id]
+
+
+def get_cached_llm_cost(model_id: UUID) -> tuple[Optional[float], Optional[float]]:
+    return get_cost_snapshot().llm_costs.get(str(model_id), (None, None))
+
+
 def get_cached_component_cost(component_instance_id: UUID) -> Optional[float]:
-    return _fetch_from_db_with_managed_session(
-        get_component_cost_per_call,
-        component_instance_id,
-        resource_name=f"component cost for component_instance_id {component_instance_id}",
-    )
+    component_version_id = _get_component_instance_version(str(component_instance_id))
+    if component_version_id is None:
+        return None
+    return get_cost_snapshot().component_costs_per_call.get(component_version_id)
 
 
 def calculate_llm_credits(func: Callable) -> Callable:
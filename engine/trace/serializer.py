@@ -1,88 +1,224 @@
 import json
+from itertools import islice
 from typing import Any, Optional
 
 from pydantic import SecretStr
 
 from engine.components.utils import shorten_base64_string
-from shared.log_redaction import redact_sensitive
+from shared.log_redaction import REDACTED_PLACEHOLDER, is_sensitive_key, redact_bearer_tokens
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters charged to the budget of a payload for a number, boolean or null, and for the brackets of a container
+_SCALAR_CHARS = 8
+_CONTAINER_CHARS = 2
 
 
 # TODO : when observability will handle json display, change the default indent to 0
-def serialize_to_json(obj: Any, indent: int = 2, shorten_string: bool = False) -> str:
+def serialize_to_json(
+    obj: Any,
+    indent: Optional[int] = 2,
+    shorten_string: bool = False,
+) -> str:
     """
-    Recursively serialize an object to JSON string.
+    Recursively serialize an object to JSON string, redacting sensitive values.
     Handles nested objects, lists, sets, Pydantic models, and primitive types.
     Protects against circular references.
 
     Args:
         obj: The object to serialize
-        indent: JSON indentation level
+        indent: JSON indentation level, None for compact JSON
 
     Returns:
         JSON string representation of the object
     """
-    serialized_obj = _serialize_object(obj, shorten_string=shorten_string)
-    serialized_obj = redact_sensitive(serialized_obj)
+    serialized_obj = _JsonValueBuilder(shorten_string=shorten_string).build(obj)
     return json.dumps(serialized_obj, indent=indent)
 
 
-def _serialize_object(obj: Any, visited: Optional[set] = None, shorten_string: bool = False) -> Any:
+def truncate_string(value: str, max_chars: int) -> str:
+    if len(value) <= max_chars:
+        return value
+    return f"{value[:max_chars]}... [truncated {len(value) - max_chars} chars]"
+
+
+def serialize_to_json_bytes(
+    obj: Any,
+    shorten_string: bool = False,
+    max_string_chars: Optional[int] = None,
+    max_items: Optional[int] = None,
+    max_total_chars: Optional[int] = None,
+) -> bytes:
     """
-    Recursively serialize an object to make it JSON-compatible.
-    Handles nested objects, lists, sets, Pydantic models, and primitive types.
-    Protects against circular references.
+    Serialize an object to compact UTF-8 JSON, encoded with orjson when it is installed (the json module
+    otherwise, about twice as slow). Redaction and caps are applied while the object is walked, in a single pass.
 
     Args:
         obj: The object to serialize
-        visited: Set of visited object IDs to prevent circular references
+        max_string_chars: Cap on the length of each string, with a truncation marker
+        max_items: Cap on the number of items of each list and dict, with a marker item
+        max_total_chars: Approximate cap on the length of the whole JSON: once the strings, keys and values
+            walked so far reach it, strings are truncated and the remaining items replaced by a marker item
 
     Returns:
-        JSON-serializable representation of the object
+        JSON bytes of the object
     """
-    if visited is None:
-        visited = set()
-
-    if obj is None:
-        return None
-    elif isinstance(obj, SecretStr):
-        return str(obj)
-    elif isinstance(obj, str):
-        if shorten_string:
-            return shorten_base64_string(obj)
-        else:
+    serialized_obj = _JsonValueBuilder(shorten_string, max_string_chars, max_items, max_total_chars).build(obj)
+    if orjson is not None:
+        try:
+            return orjson.dumps(serialized_obj)
+        except orjson.JSONEncodeError:
+            # e.g. integers over 64 bits, left to the json module
+            pass
+    return json.dumps(serialized_obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class _JsonValueBuilder:
+    """
+    Converts an object to JSON-compatible values in one walk: SecretStr values are masked, sensitive keys and
+    bearer tokens are redacted and the caps are applied on the way. Containers returned by model_dump(mode="json")
+    belong to the builder and are updated in place instead of being copied.
+    """
+
+    def __init__(
+        self,
+        shorten_string: bool = False,
+        max_string_chars: Optional[int] = None,
+        max_items: Optional[int] = None,
+        max_total_chars: Optional[int] = None,
+    ):
+        self._shorten_string = shorten_string
+        self._max_string_chars = max_string_chars
+        self._max_items = max_items
+        # Characters left before the total cap, None without one
+        self._remaining_chars = max_total_chars
+        self._visited: set[int] = set()
+
+    def build(self, obj: Any, owned: bool = False) -> Any:
+        # Exact type checks first, they cover most of the values of a payload
+        obj_type = type(obj)
+        if obj_type is str:
+            return self._build_string(obj)
+        if obj is None or obj_type is int or obj_type is float or obj_type is bool:
+            if self._remaining_chars is not None:
+                self._remaining_chars -= _SCALAR_CHARS
             return obj
-    elif isinstance(obj, (int, float, bool)):
-        return obj
-    elif isinstance(obj, (list, tuple, set)):
-        return [_serialize_object(item, visited, shorten_string) for item in obj]
-    elif isinstance(obj, dict):
-        # Check for circular references
+        if isinstance(obj, SecretStr):
+            return str(obj)
+        if isinstance(obj, str):
+            return self._build_string(obj)
+        if isinstance(obj, (int, float)):
+            if self._remaining_chars is not None:
+                self._remaining_chars -= _SCALAR_CHARS
+            return obj
+        if isinstance(obj, dict):
+            return self._build_dict(obj, owned)
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            return self._build_list(obj, owned)
+        if hasattr(obj, "model_dump"):
+            return self._build_model(obj)
+        # For any other type, try to convert to string
+        try:
+            return self._build_string(str(obj))
+        except Exception:
+            return f"<{obj_type.__name__} object>"
+
+    def _budget_exhausted(self) -> bool:
+        return self._remaining_chars is not None and self._remaining_chars <= 0
+
+    def _build_string(self, value: str) -> str:
+        if self._shorten_string:
+            value = shorten_base64_string(value)
+        if self._max_string_chars is not None:
+            value = truncate_string(value, self._max_string_chars)
+        if self._remaining_chars is not None:
+            value = truncate_string(value, max(self._remaining_chars, 0))
+            self._remaining_chars -= len(value) + 2
+        return redact_bearer_tokens(value)
+
+    def _build_dict(self, obj: dict, owned: bool) -> Any:
         obj_id = id(obj)
-        if obj_id in visited:
+        if obj_id in self._visited:
             return f"<Circular reference to {type(obj).__name__}>"
-        visited.add(obj_id)
+        self._visited.add(obj_id)
         try:
-            return {k: _serialize_object(v, visited, shorten_string) for k, v in obj.items()}
+            if self._remaining_chars is not None:
+                self._remaining_chars -= _CONTAINER_CHARS
+            size = len(obj)
+            if self._max_items is not None and size > self._max_items:
+                result: dict = {}
+                self._build_items(islice(obj.items(), self._max_items), result, owned)
+            else:
+                result = obj if owned else {}
+                built_items = self._build_items(obj.items(), result, owned)
+                if built_items < len(result):
+                    # The total cap was reached in an owned dict: drop the keys left as they were
+                    for key in list(islice(result, built_items, None)):
+                        del result[key]
+            if len(result) < size:
+                result["..."] = f"[{size - len(result)} more keys]"
+            return result
         finally:
-            visited.remove(obj_id)
-    elif hasattr(obj, "model_dump"):
-        # Handle Pydantic BaseModel objects
-        # Track the Pydantic object itself to avoid reprocessing the same model instance
+            self._visited.discard(obj_id)
+
+    def _build_items(self, items, result: dict, owned: bool) -> int:
+        """Build the items into result until the total cap is reached, returning how many were built."""
+        # Assigning the existing keys of an owned dict does not change its size, so it can be iterated meanwhile
+        built_items = 0
+        for key, value in items:
+            if self._remaining_chars is not None:
+                if self._remaining_chars <= 0:
+                    break
+                self._remaining_chars -= len(key) + 3 if type(key) is str else _SCALAR_CHARS
+            key = key if type(key) is str else str(key)
+            result[key] = REDACTED_PLACEHOLDER if is_sensitive_key(key) else self.build(value, owned)
+            built_items += 1
+        return built_items
+
+    def _build_list(self, obj: list | tuple | set | frozenset, owned: bool) -> list:
         obj_id = id(obj)
-        if obj_id in visited:
+        if obj_id in self._visited:
             return f"<Circular reference to {type(obj).__name__}>"
-        visited.add(obj_id)
+        self._visited.add(obj_id)
         try:
-            dumped = obj.model_dump()
-            result = _serialize_object(dumped, visited, shorten_string)
+            if self._remaining_chars is not None:
+                self._remaining_chars -= _CONTAINER_CHARS
+            size = len(obj)
+            if owned and (self._max_items is None or size <= self._max_items):
+                result = obj
+                for index, item in enumerate(obj):
+                    if self._budget_exhausted():
+                        del obj[index:]
+                        break
+                    obj[index] = self.build(item, owned)
+            else:
+                result = []
+                for item in islice(obj, self._max_items):
+                    if self._budget_exhausted():
+                        break
+                    result.append(self.build(item, owned))
+            if len(result) < size:
+                result.append(f"... [{size - len(result)} more items]")
             return result
-        except Exception:
-            return f"<{type(obj).__name__} object>"
         finally:
-            visited.remove(obj_id)
-    else:
-        # For any other type, try to convert to string
+            self._visited.discard(obj_id)
+
+    def _build_model(self, obj: Any) -> Any:
+        # Track the Pydantic object itself to avoid reprocessing the same model instance
+        obj_id = id(obj)
+        if obj_id in self._visited:
+            return f"<Circular reference to {type(obj).__name__}>"
+        self._visited.add(obj_id)
         try:
-            return str(obj)
+            try:
+                return self.build(obj.model_dump(mode="json"), owned=True)
+            except Exception:
+                # Fields without a JSON serialization, e.g. arbitrary types
+                return self.build(obj.model_dump())
         except Exception:
             return f"<{type(obj).__name__} object>"
+        finally:
+            self._visited.discard(obj_id)
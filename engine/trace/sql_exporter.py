@@ -2,7 +2,8 @@ import ast
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Any, cast
+from typing import Any, Optional, cast
+from uuid import UUID
 
 from openinference.semconv.trace import SpanAttributes
 from opentelemetry.sdk.trace import BoundedAttributes, Event, ReadableSpan
@@ -14,7 +15,9 @@ from sqlalchemy.orm import Session, sessionmaker
 from ada_backend.database.models import SpanUsage, Usage
 from ada_backend.database.setup_db import engine as _trace_engine
 from ada_backend.database.trace_models import Span, SpanMessage
+from ada_backend.repositories.trace_rollup_repository import SpanRollupEntry, TraceRollups, upsert_trace_rollups
 from engine.trace.nested_utils import split_nested_keys
+from engine.trace.trace_policy import resolve_payload_attributes
 
 LOGGER = logging.getLogger(__name__)
 
@@ -88,6 +91,22 @@ def extract_messages_from_attributes(attributes: dict) -> tuple[list[dict], list
         return [], [], attributes
 
 
+def _message_content(messages: list | None, payload: Optional[bytes]) -> Optional[str]:
+    """
+    Content of a messages column, a JSON list. LLM messages take precedence over the payload, which is stored
+    as serialized, without being parsed: a list is kept, a dict is wrapped in a list and any other JSON value
+    is kept as a string item, as extract_messages_from_attributes does with the parsed attribute.
+    """
+    if payload is not None and not messages:
+        if payload.startswith((b"{", b"[")):
+            content = b"[" + payload + b"]" if payload.startswith(b"{") else payload
+            return sanitize_json_string(content.decode())
+        messages = [sanitize_json_string(payload.decode())]
+    if messages is None:
+        return None
+    return sanitize_json_string(json.dumps(messages, ensure_ascii=False))
+
+
 def convert_to_list(obj: Any) -> list[str] | None:
     """Convert object to list of strings if possible."""
     if isinstance(obj, list):
@@ -106,6 +125,15 @@ def convert_to_list(obj: Any) -> list[str] | None:
     return None
 
 
+def parse_uuid(value: Any) -> UUID | None:
+    if value is None:
+        return None
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
 class SQLSpanExporter(SpanExporter):
     @staticmethod
     def _should_count_as_usage(
@@ -163,12 +191,14 @@ class SQLSpanExporter(SpanExporter):
                 return SpanExportResult.FAILURE
             return SpanExportResult.SUCCESS
 
+        rollups = TraceRollups()
         for span, json_span in valid_spans:
-            self._export_span(session, span, json_span)
+            rollups.add(self._export_span(session, span, json_span))
+        upsert_trace_rollups(session, rollups)
         session.commit()
         return SpanExportResult.SUCCESS
 
-    def _export_span(self, session: Session, span: ReadableSpan, json_span: dict) -> None:
+    def _export_span(self, session: Session, span: ReadableSpan, json_span: dict) -> Optional[SpanRollupEntry]:
         cumulative_error_count = int(span.status.status_code is StatusCode.ERROR)
         cumulative_llm_token_count_prompt = int(span.attributes.get(SpanAttributes.LLM_TOKEN_COUNT_PROMPT, 0))
         cumulative_llm_token_count_completion = int(span.attributes.get(SpanAttributes.LLM_TOKEN_COUNT_COMPLETION, 0))
@@ -186,6 +216,15 @@ class SQLSpanExporter(SpanExporter):
             cumulative_llm_token_count_prompt += cast(int, accumulation[1] or 0)
             cumulative_llm_token_count_completion += cast(int, accumulation[2] or 0)
 
+        payloads = resolve_payload_attributes(span)
+        input_payload = payloads.pop(SpanAttributes.INPUT_VALUE, None)
+        output_payload = payloads.pop(SpanAttributes.OUTPUT_VALUE, None)
+        if isinstance(json_span["attributes"], dict):
+            if input_payload is not None:
+                json_span["attributes"].pop(SpanAttributes.INPUT_VALUE, None)
+            if output_payload is not None:
+                json_span["attributes"].pop(SpanAttributes.OUTPUT_VALUE, None)
+            json_span["attributes"].update({key: payload.decode() for key, payload in payloads.items()})
         formatted_attributes = (
             split_nested_keys(json_span["attributes"]) if isinstance(json_span["attributes"], dict) else {}
         )
@@ -204,6 +243,7 @@ class SQLSpanExporter(SpanExporter):
         component_instance_id = formatted_attributes.pop("component_instance_id", None)
         model_id = formatted_attributes.pop("model_id", None)
         provider = formatted_attributes.get("provider", None)
+        conversation_id = formatted_attributes.get("conversation_id", None)
         organization_llm_providers = formatted_attributes.get("organization_llm_providers", None)
         input, output, formatted_attributes = extract_messages_from_attributes(formatted_attributes)
 
@@ -259,6 +299,7 @@ class SQLSpanExporter(SpanExporter):
             or credits_per_call is not None
             or credits_per is not None
         )
+        total_span_credits = (credits_input_token or 0) + (credits_output_token or 0) + (credits_per_call or 0)
 
         if has_credits:
             span_usage = SpanUsage(
@@ -272,8 +313,6 @@ class SQLSpanExporter(SpanExporter):
 
             count_as_usage = self._should_count_as_usage(component_instance_id, organization_llm_providers, provider)
             if project_id and count_as_usage:
-                total_span_credits = (credits_input_token or 0) + (credits_output_token or 0) + (credits_per_call or 0)
-
                 if total_span_credits > 0:
                     current_date = datetime.now(tz=timezone.utc)
                     year = current_date.year
@@ -297,11 +336,23 @@ class SQLSpanExporter(SpanExporter):
         session.add(
             SpanMessage(
                 span_id=span_row.span_id,
-                input_content=sanitize_json_string(json.dumps(input, ensure_ascii=False))
-                if input is not None
-                else None,
-                output_content=sanitize_json_string(json.dumps(output, ensure_ascii=False))
-                if output is not None
-                else None,
+                input_content=_message_content(input, input_payload),
+                output_content=_message_content(output, output_payload),
             )
         )
+
+        rollup_project_id = parse_uuid(project_id)
+        if rollup_project_id is None:
+            return None
+        return SpanRollupEntry(
+            start_time=span_row.start_time,
+            project_id=rollup_project_id,
+            call_type=call_type,
+            model_id=parse_uuid(model_id),
+            conversation_id=str(conversation_id) if conversation_id is not None else None,
+            is_root=span_row.parent_id is None,
+            duration_seconds=(span_row.end_time - span_row.start_time).total_seconds(),
+            input_tokens=span_row.llm_token_count_prompt,
+            output_tokens=span_row.llm_token_count_completion,
+            credits=total_span_credits,
+        )
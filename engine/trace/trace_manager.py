@@ -9,6 +9,7 @@ from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcess
 
 from engine.trace.span_context import get_tracing_span
 from engine.trace.sql_exporter import SQLSpanExporter
+from engine.trace.trace_policy import DeferredPayloadSpanProcessor
 
 LOGGER = logging.getLogger(__name__)
 
@@ -27,6 +28,7 @@ def setup_tracer(
 
     tracer_provider = trace_sdk.TracerProvider(resource=resource)
     sql_exporter = SQLSpanExporter()
+    tracer_provider.add_span_processor(DeferredPayloadSpanProcessor())
     if use_simple_processor:
         tracer_provider.add_span_processor(SimpleSpanProcessor(sql_exporter))
     else:
@@ -0,0 +1,177 @@
+import json
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from opentelemetry import trace as trace_api
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor
+
+from ada_backend.database.models import CallType
+from engine.trace.serializer import serialize_to_json_bytes
+from engine.trace.span_context import get_tracing_span
+from settings import settings
+
+LOGGER = logging.getLogger(__name__)
+
+# Attribute of the span in progress, then of the ended span, holding the payloads serialized by the exporter
+_DEFERRED_PAYLOADS = "_deferred_payload_attributes"
+# Spans in progress holding payloads, by span id, for DeferredPayloadSpanProcessor to find them when they end.
+# The references are weak: without that processor, the payloads go away with their span.
+_spans_with_payloads: "weakref.WeakValueDictionary[int, trace_api.Span]" = weakref.WeakValueDictionary()
+# Runs started from the UI are always recorded in full
+_ALWAYS_RECORDED_CALL_TYPES = (CallType.SANDBOX, CallType.QA)
+_SAMPLING_RESOLUTION = 10_000
+# Settings are read at most this often, not for every span
+_SETTINGS_TTL_SECONDS = 60
+
+
+@dataclass
+class _PayloadSettings:
+    sample_rate: float
+    sample_rates_by_project: dict[str, float]
+    max_chars: int
+    max_items: int
+    max_total_chars: int
+    read_at: float
+
+
+@dataclass
+class _DeferredPayload:
+    value: Any
+    shorten_string: bool
+    # Whether the span already had the attribute: a value set directly on the span afterwards takes precedence
+    overrides_span_attribute: bool
+
+
+_payload_settings: Optional[_PayloadSettings] = None
+
+
+def _get_payload_settings() -> _PayloadSettings:
+    global _payload_settings
+    now = time.monotonic()
+    if _payload_settings is None or now - _payload_settings.read_at > _SETTINGS_TTL_SECONDS:
+        sample_rates_by_project = settings.TRACE_PAYLOAD_SAMPLE_RATES_BY_PROJECT or {}
+        if isinstance(sample_rates_by_project, str):
+            # Global secrets are stored as strings
+            sample_rates_by_project = json.loads(sample_rates_by_project)
+        _payload_settings = _PayloadSettings(
+            sample_rate=float(settings.TRACE_PAYLOAD_SAMPLE_RATE),
+            sample_rates_by_project={str(key): float(value) for key, value in sample_rates_by_project.items()},
+            max_chars=int(settings.TRACE_PAYLOAD_MAX_CHARS),
+            max_items=int(settings.TRACE_PAYLOAD_MAX_ITEMS),
+            max_total_chars=int(settings.TRACE_PAYLOAD_MAX_TOTAL_CHARS),
+            read_at=now,
+        )
+    return _payload_settings
+
+
+def should_record_payloads(span: trace_api.Span) -> bool:
+    """
+    Head sampling of the payloads (component inputs/outputs) of a run, decided by its trace id so that all the
+    spans of a run agree. Spans of unsampled runs are still exported, with their tokens and credits.
+    """
+    if not span.is_recording():
+        return False
+    params = get_tracing_span()
+    if params is None or params.call_type is None or params.call_type in _ALWAYS_RECORDED_CALL_TYPES:
+        return True
+    payload_settings = _get_payload_settings()
+    sample_rate = payload_settings.sample_rates_by_project.get(str(params.project_id), payload_settings.sample_rate)
+    if sample_rate >= 1:
+        return True
+    trace_id = span.get_span_context().trace_id
+    return trace_id % _SAMPLING_RESOLUTION < sample_rate * _SAMPLING_RESOLUTION
+
+
+def _copy_containers(value: Any, copies: dict[int, Any]) -> Any:
+    """Copy the dicts, lists, tuples and sets of a payload, keeping the other values (strings, models) as they are."""
+    if isinstance(value, dict):
+        copy = copies.get(id(value))
+        if copy is None:
+            copy = copies[id(value)] = {}
+            for key, item in value.items():
+                copy[key] = _copy_containers(item, copies)
+        return copy
+    if isinstance(value, (list, tuple)):
+        copy = copies.get(id(value))
+        if copy is None:
+            copy = copies[id(value)] = []
+            copy.extend(_copy_containers(item, copies) for item in value)
+        return copy
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def set_payload_attributes(span: trace_api.Span, payloads: dict[str, Any], shorten_string: bool = True) -> None:
+    """
+    Attach payload attributes to a span without serializing them: the exporter serializes them, on its own
+    thread, with serialize_payload. Their containers are copied, so that the component can keep changing them;
+    other objects (e.g. Pydantic models) are serialized as they are when the span is exported.
+    """
+    if not should_record_payloads(span):
+        return
+    if not isinstance(span, ReadableSpan):
+        # Not an SDK span, nothing would hand the payloads over to the exporter
+        span.set_attributes({
+            key: serialize_payload(value, shorten_string=shorten_string).decode() for key, value in payloads.items()
+        })
+        return
+    deferred = getattr(span, _DEFERRED_PAYLOADS, None)
+    if deferred is None:
+        deferred = {}
+        setattr(span, _DEFERRED_PAYLOADS, deferred)
+        _spans_with_payloads[span.get_span_context().span_id] = span
+    for key, value in payloads.items():
+        deferred[key] = _DeferredPayload(
+            value=_copy_containers(value, {}),
+            shorten_string=shorten_string,
+            overrides_span_attribute=key in span.attributes,
+        )
+
+
+class DeferredPayloadSpanProcessor(SpanProcessor):
+    """
+    Hands the payloads of a span over to the ended span that the next processors queue for export.
+    Must be added to the tracer provider before the exporting processor.
+    """
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.context is None:
+            return
+        # The span in progress is still referenced while it ends
+        ending_span = _spans_with_payloads.pop(span.context.span_id, None)
+        payloads = getattr(ending_span, _DEFERRED_PAYLOADS, None)
+        if payloads:
+            setattr(span, _DEFERRED_PAYLOADS, payloads)
+
+
+def serialize_payload(value: Any, shorten_string: bool = True) -> bytes:
+    """Compact JSON of a payload, redacted, with its strings, its collections and its total length capped."""
+    payload_settings = _get_payload_settings()
+    return serialize_to_json_bytes(
+        value,
+        shorten_string=shorten_string,
+        max_string_chars=payload_settings.max_chars,
+        max_items=payload_settings.max_items,
+        max_total_chars=payload_settings.max_total_chars,
+    )
+
+
+def resolve_payload_attributes(span: ReadableSpan) -> dict[str, bytes]:
+    """
+    Serialize the payload attributes attached to a span with set_payload_attributes, except those the span
+    itself set afterwards.
+    """
+    attributes = {}
+    for key, payload in getattr(span, _DEFERRED_PAYLOADS, {}).items():
+        if key in span.attributes and not payload.overrides_span_attribute:
+            continue
+        try:
+            attributes[key] = serialize_payload(payload.value, shorten_string=payload.shorten_string)
+        except Exception as e:
+            LOGGER.warning("Failed to serialize the %s attribute of span %s: %s", key, span.name, e)
+            attributes[key] = json.dumps(f"<unserializable {type(payload.value).__name__}>").encode()
+    return attributes
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import logging
+from typing import Any, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from engine.storage_service.db_service import DBService
+from engine.storage_service.db_utils import PROCESSED_DATETIME_FIELD, UPDATED_AT_COLUMN, DBColumn, DBDefinition
+from ingestion_script.utils import SOURCE_ID_COLUMN_NAME, SYNC_ID_COLUMN_NAME, TIMESTAMP_COLUMN_NAME
+
+LOGGER = logging.getLogger(__name__)
+
+CONTENT_SHA256_COLUMN_NAME = "content_sha256"
+
+ROW_HASHES_TABLE_DEFINITION = DBDefinition(
+    columns=[
+        DBColumn(name=PROCESSED_DATETIME_FIELD, type="DATETIME", default="CURRENT_TIMESTAMP"),
+        DBColumn(name=SOURCE_ID_COLUMN_NAME, type="UUID", is_primary=True),
+        DBColumn(name=SYNC_ID_COLUMN_NAME, type="VARCHAR", is_primary=True),
+        DBColumn(name=CONTENT_SHA256_COLUMN_NAME, type="VARCHAR"),
+        DBColumn(name=TIMESTAMP_COLUMN_NAME, type="VARCHAR", is_nullable=True),
+        DBColumn(name=UPDATED_AT_COLUMN, type="TIMESTAMP_TZ", default="CURRENT_TIMESTAMP"),
+    ]
+)
+
+
+class SourceRowHash(BaseModel):
+    """Hash of what a database source row was chunked from, used to skip rows whose content has not changed."""
+
+    sync_id: str
+    content_sha256: str
+    # Timestamp of the source row when it was last seen, to only hash rows whose timestamp moved
+    last_edited_ts: Optional[str] = None
+
+
+def get_row_hashes_table_name(chunks_table_name: str) -> str:
+    return f"{chunks_table_name.removesuffix('_chunks')}_row_hashes"
+
+
+def compute_source_row_sha256(
+    text: str,
+    metadata: dict[str, Any],
+    url: Optional[str],
+    chunk_size: int,
+    chunk_overlap: int,
+) -> str:
+    """Everything a row's chunks are built from, except its timestamp, which changes for unrelated columns."""
+    payload = json.dumps([text, metadata, url, chunk_size, chunk_overlap], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_row_hashes(
+    db_service: DBService,
+    table_name: str,
+    source_id: UUID | str,
+    schema_name: Optional[str] = None,
+) -> dict[str, SourceRowHash]:
+    if not db_service.table_exists(table_name, schema_name=schema_name):
+        return {}
+    rows = db_service.fetch_selected_columns(
+        table_name,
+        columns=[SYNC_ID_COLUMN_NAME, CONTENT_SHA256_COLUMN_NAME, TIMESTAMP_COLUMN_NAME],
+        schema_name=schema_name,
+        sql_query_filter=f"{SOURCE_ID_COLUMN_NAME} = '{source_id}'",
+    )
+    return {row[SYNC_ID_COLUMN_NAME]: SourceRowHash(**row) for row in rows}
+
+
+def save_row_hashes(
+    db_service: DBService,
+    table_name: str,
+    source_id: UUID | str,
+    row_hashes: list[SourceRowHash],
+    schema_name: Optional[str] = None,
+) -> None:
+    if not row_hashes:
+        return
+    if not db_service.table_exists(table_name, schema_name=schema_name):
+        db_service.create_table(
+            table_name=table_name, table_definition=ROW_HASHES_TABLE_DEFINITION, schema_name=schema_name
+        )
+    db_service.upsert_rows(
+        table_name=table_name,
+        rows=[{**row_hash.model_dump(), SOURCE_ID_COLUMN_NAME: str(source_id)} for row_hash in row_hashes],
+        schema_name=schema_name,
+        id_column_names=[SOURCE_ID_COLUMN_NAME, SYNC_ID_COLUMN_NAME],
+    )
+
+
+def delete_row_hashes(
+    db_service: DBService,
+    table_name: str,
+    source_id: UUID | str,
+    sync_ids: list[str],
+    schema_name: Optional[str] = None,
+) -> None:
+    if not sync_ids or not db_service.table_exists(table_name, schema_name=schema_name):
+        return
+    db_service.delete_rows_from_table(
+        table_name=table_name,
+        ids=sync_ids,
+        id_column_name=SYNC_ID_COLUMN_NAME,
+        schema_name=schema_name,
+        sql_query_filter=f"{SOURCE_ID_COLUMN_NAME} = '{source_id}'",
+    )
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import logging
+from typing import Callable, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from data_ingestion.document.folder_management.folder_management import FileDocument
+from data_ingestion.utils import DocumentReadingMode
+from engine.storage_service.db_service import DBService
+from engine.storage_service.db_utils import PROCESSED_DATETIME_FIELD, UPDATED_AT_COLUMN, DBColumn, DBDefinition
+from ingestion_script.utils import FILE_ID_COLUMN_NAME, SOURCE_ID_COLUMN_NAME, TIMESTAMP_COLUMN_NAME
+
+LOGGER = logging.getLogger(__name__)
+
+# Bump when parsers or chunkers change their output: every folder source is then rebuilt on its next ingestion
+FOLDER_INGESTION_PIPELINE_VERSION = "1"
+
+FILE_NAME_COLUMN_NAME = "file_name"
+FILE_SIZE_COLUMN_NAME = "file_size"
+ETAG_COLUMN_NAME = "etag"
+CONTENT_SHA256_COLUMN_NAME = "content_sha256"
+CHUNK_IDS_COLUMN_NAME = "chunk_ids"
+PARSER_VERSION_COLUMN_NAME = "parser_version"
+EMBEDDING_MODEL_COLUMN_NAME = "embedding_model_reference"
+
+MANIFEST_TABLE_DEFINITION = DBDefinition(
+    columns=[
+        DBColumn(name=PROCESSED_DATETIME_FIELD, type="DATETIME", default="CURRENT_TIMESTAMP"),
+        DBColumn(name=SOURCE_ID_COLUMN_NAME, type="UUID", is_primary=True),
+        DBColumn(name=FILE_ID_COLUMN_NAME, type="VARCHAR", is_primary=True),
+        DBColumn(name=FILE_NAME_COLUMN_NAME, type="VARCHAR"),
+        DBColumn(name=FILE_SIZE_COLUMN_NAME, type="BIGINT", is_nullable=True),
+        DBColumn(name=ETAG_COLUMN_NAME, type="VARCHAR", is_nullable=True),
+        DBColumn(name=TIMESTAMP_COLUMN_NAME, type="VARCHAR", is_nullable=True),
+        DBColumn(name=CONTENT_SHA256_COLUMN_NAME, type="VARCHAR"),
+        DBColumn(name=CHUNK_IDS_COLUMN_NAME, type="JSONB"),
+        DBColumn(name=PARSER_VERSION_COLUMN_NAME, type="VARCHAR"),
+        DBColumn(name=EMBEDDING_MODEL_COLUMN_NAME, type="VARCHAR"),
+        DBColumn(name=UPDATED_AT_COLUMN, type="TIMESTAMP_TZ", default="CURRENT_TIMESTAMP"),
+    ]
+)
+
+
+class FileManifestEntry(BaseModel):
+    """What was ingested for one file of a folder source, used to skip it when it has not changed."""
+
+    file_id: str
+    file_name: str
+    file_size: Optional[int] = None
+    etag: Optional[str] = None
+    last_edited_ts: Optional[str] = None
+    content_sha256: str
+    chunk_ids: list[str] = Field(default_factory=list)
+    parser_version: str
+    embedding_model_reference: str
+
+
+def get_manifest_table_name(chunks_table_name: str) -> str:
+    return f"{chunks_table_name.removesuffix('_chunks')}_file_manifest"
+
+
+def build_parser_version(
+    chunk_size: Optional[int],
+    chunk_overlap: Optional[int],
+    document_reading_mode: DocumentReadingMode,
+) -> str:
+    """Everything besides the file content that changes the chunks of a file."""
+    reading_mode = getattr(document_reading_mode, "value", document_reading_mode)
+    return f"{FOLDER_INGESTION_PIPELINE_VERSION}:{reading_mode}:{chunk_size}:{chunk_overlap}"
+
+
+def compute_content_sha256(content: bytes | str) -> str:
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def is_entry_current(entry: FileManifestEntry, parser_version: str, embedding_model_reference: str) -> bool:
+    return entry.parser_version == parser_version and entry.embedding_model_reference == embedding_model_reference
+
+
+def is_file_unchanged(entry: FileManifestEntry, document: FileDocument) -> bool:
+    """
+    Cheap check on listing metadata, before downloading anything.
+    Size and etag are only compared when both sides know them.
+    """
+    if entry.last_edited_ts is None or entry.last_edited_ts != document.last_edited_ts:
+        return False
+    if entry.file_size is not None and document.size is not None and entry.file_size != document.size:
+        return False
+    if entry.etag is not None and document.etag is not None and entry.etag != document.etag:
+        return False
+    return True
+
+
+def load_manifest(
+    db_service: DBService,
+    table_name: str,
+    source_id: UUID | str,
+    schema_name: Optional[str] = None,
+) -> dict[str, FileManifestEntry]:
+    if not db_service.table_exists(table_name, schema_name=schema_name):
+        return {}
+    rows = db_service.fetch_selected_columns(
+        table_name,
+        columns=[
+            FILE_ID_COLUMN_NAME,
+            FILE_NAME_COLUMN_NAME,
+            FILE_SIZE_COLUMN_NAME,
+            ETAG_COLUMN_NAME,
+            TIMESTAMP_COLUMN_NAME,
+            CONTENT_SHA256_COLUMN_NAME,
+            CHUNK_IDS_COLUMN_NAME,
+            PARSER_VERSION_COLUMN_NAME,
+            EMBEDDING_MODEL_COLUMN_NAME,
+        ],
+        schema_name=schema_name,
+        sql_query_filter=f"{SOURCE_ID_COLUMN_NAME} = '{source_id}'",
+    )
+    entries = {}
+    for row in rows:
+        if isinstance(row[CHUNK_IDS_COLUMN_NAME], str):
+            row[CHUNK_IDS_COLUMN_NAME] = json.loads(row[CHUNK_IDS_COLUMN_NAME])
+        entry = FileManifestEntry(**row)
+        entries[entry.file_id] = entry
+    return entries
+
+
+def save_manifest(
+    db_service: DBService,
+    table_name: str,
+    source_id: UUID | str,
+    entries: list[FileManifestEntry],
+    removed_file_ids: list[str],
+    schema_name: Optional[str] = None,
+) -> None:
+    if not db_service.table_exists(table_name, schema_name=schema_name):
+        db_service.create_table(
+            table_name=table_name, table_definition=MANIFEST_TABLE_DEFINITION, schema_name=schema_name
+        )
+    source_id_filter = f"{SOURCE_ID_COLUMN_NAME} = '{source_id}'"
+    if removed_file_ids:
+        db_service.delete_rows_from_table(
+            table_name=table_name,
+            ids=removed_file_ids,
+            id_column_name=FILE_ID_COLUMN_NAME,
+            schema_name=schema_name,
+            sql_query_filter=source_id_filter,
+        )
+    if entries:
+        db_service.upsert_rows(
+            table_name=table_name,
+            rows=[{**entry.model_dump(), SOURCE_ID_COLUMN_NAME: str(source_id)} for entry in entries],
+            schema_name=schema_name,
+            id_column_names=[SOURCE_ID_COLUMN_NAME, FILE_ID_COLUMN_NAME],
+        )
+    LOGGER.info(
+        f"Saved folder manifest for source {source_id}: {len(entries)} files updated, {len(removed_file_ids)} removed"
+    )
+
+
+class FileContentCache:
+    """
+    Contents of the files being ingested, so a file is downloaded once to be hashed and then parsed.
+    Parsers read through get_file_content, files not downloaded beforehand are fetched directly.
+    """
+
+    def __init__(self, get_file_content_func: Callable[[str], bytes | str]):
+        self._get_file_content_func = get_file_content_func
+        self._contents: dict[str, bytes | str] = {}
+
+    def download(self, file_id: str) -> bytes | str:
+        content = self._get_file_content_func(file_id)
+        self._contents[file_id] = content
+        return content
+
+    def get_file_content(self, file_id: str) -> bytes | str:
+        content = self._contents.get(file_id)
+        if content is None:
+            return self._get_file_content_func(file_id)
+        return content
+
+    def release(self, file_id: str) -> None:
+        self._contents.pop(file_id, None)
+
+    def __len__(self) -> int:
+        return len(self._contents)
@@ -0,0 +1,280 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import AsyncIterable, Awaitable, Callable, Iterable, Optional
+from uuid import UUID
+
+import pandas as pd
+
+from data_ingestion.document.folder_management.folder_management import BaseDocument, FileDocument
+from ingestion_script.folder_manifest import (
+    FileContentCache,
+    FileManifestEntry,
+    compute_content_sha256,
+    is_file_unchanged,
+)
+from ingestion_script.folder_utils import sanitize_for_json
+from ingestion_script.utils import (
+    CHUNK_COLUMN_NAME,
+    CHUNK_ID_COLUMN_NAME,
+    DOCUMENT_TITLE_COLUMN_NAME,
+    METADATA_COLUMN_NAME,
+    URL_COLUMN_NAME,
+    transform_chunks_for_unified_table,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 4
+DEFAULT_DOWNLOAD_CONCURRENCY = 4
+DEFAULT_PARSE_CONCURRENCY = 2
+DEFAULT_INDEX_CONCURRENCY = 2
+
+_END_OF_STREAM = object()
+
+
+@dataclass
+class FolderPipelineResult:
+    manifest_entries: list[FileManifestEntry] = field(default_factory=list)
+    # Chunks of unchanged files, which stay as they are
+    kept_chunk_ids: set[str] = field(default_factory=set)
+    new_chunk_ids: set[str] = field(default_factory=set)
+    unchanged_files_count: int = 0
+    successful_files: list[dict] = field(default_factory=list)
+    failed_files: list[dict] = field(default_factory=list)
+
+
+@dataclass
+class _DownloadedFile:
+    document: BaseDocument
+    entry: Optional[FileManifestEntry]
+    content_sha256: str
+
+
+async def _iterate(documents: Iterable[BaseDocument] | AsyncIterable[BaseDocument]):
+    if isinstance(documents, AsyncIterable):
+        async for document in documents:
+            yield document
+    else:
+        for document in documents:
+            yield document
+
+
+def _get_file_size(document: BaseDocument) -> Optional[int]:
+    # Only files listed from a storage have a size and an etag
+    return document.size if isinstance(document, FileDocument) else None
+
+
+def _get_etag(document: BaseDocument) -> Optional[str]:
+    return document.etag if isinstance(document, FileDocument) else None
+
+
+def chunks_df_to_rows(chunks_df: pd.DataFrame, source_id: UUID) -> list[dict]:
+    """
+    Drop chunks without content and shape the others as rows of the unified chunks table.
+    Each column is read once and rows are built directly, without copying the DataFrame.
+    """
+    columns = {column: chunks_df[column].tolist() for column in chunks_df.columns}
+    sanitized_columns = [
+        column for column in (DOCUMENT_TITLE_COLUMN_NAME, METADATA_COLUMN_NAME, URL_COLUMN_NAME) if column in columns
+    ]
+    chunks = []
+    for values in zip(*columns.values()):
+        chunk = dict(zip(columns, values))
+        content = chunk[CHUNK_COLUMN_NAME]
+        if pd.isna(content) or (isinstance(content, str) and not content.strip()):
+            continue
+        for column in sanitized_columns:
+            chunk[column] = sanitize_for_json(chunk[column])
+        chunks.append(chunk)
+    return transform_chunks_for_unified_table(chunks, source_id)
+
+
+class FolderIngestionPipeline:
+    """
+    Streams the files of a folder source through bounded stages:
+    download -> parse and chunk -> write to the chunks table -> embed and upsert to Qdrant.
+
+    Stages are connected by queues of at most queue_size items (files, then batches of batch_size chunks),
+    so peak memory depends on the queue sizes and concurrencies, not on the size of the folder.
+    Each chunk batch goes through every stage once, nothing is read back from the database.
+
+    Documents can also be an async iterable, e.g. the pages of a website as they are crawled: they are then
+    processed as they arrive, and the listing is read no faster than the files are downloaded.
+
+    A file that fails to download or parse is reported in failed_files and the others go on.
+    A failure to list the documents, or to write or index a batch, stops the pipeline and is raised.
+    """
+
+    def __init__(
+        self,
+        content_cache: FileContentCache,
+        parse_file: Callable[[BaseDocument], Awaitable[pd.DataFrame]],
+        write_rows: Callable[[list[dict]], None],
+        index_rows: Callable[[list[dict]], Awaitable[None]],
+        source_id: UUID,
+        parser_version: str,
+        embedding_model_reference: str,
+        batch_size: int = 50,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        download_concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
+        parse_concurrency: int = DEFAULT_PARSE_CONCURRENCY,
+        index_concurrency: int = DEFAULT_INDEX_CONCURRENCY,
+    ):
+        self._content_cache = content_cache
+        self._parse_file = parse_file
+        self._write_rows = write_rows
+        self._index_rows = index_rows
+        self._source_id = source_id
+        self._parser_version = parser_version
+        self._embedding_model_reference = embedding_model_reference
+        self._batch_size = batch_size
+        self._queue_size = queue_size
+        self._download_concurrency = download_concurrency
+        self._parse_concurrency = parse_concurrency
+        self._index_concurrency = index_concurrency
+
+    async def run(
+        self,
+        documents: Iterable[BaseDocument] | AsyncIterable[BaseDocument],
+        manifest: dict[str, FileManifestEntry],
+    ) -> FolderPipelineResult:
+        result = FolderPipelineResult()
+        parse_queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        index_queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        parse_workers_left = [self._parse_concurrency]
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(self._download_stage(documents, manifest, parse_queue, result))
+                for _ in range(self._parse_concurrency):
+                    task_group.create_task(self._parse_worker(parse_queue, write_queue, result, parse_workers_left))
+                task_group.create_task(self._write_stage(write_queue, index_queue))
+                for _ in range(self._index_concurrency):
+                    task_group.create_task(self._index_worker(index_queue))
+        except ExceptionGroup as exception_group:
+            # Surface the failure itself rather than the task group wrapping it
+            raise exception_group.exceptions[0] from exception_group
+
+        LOGGER.info(
+            f"Folder pipeline done: {result.unchanged_files_count} unchanged files skipped, "
+            f"{len(result.successful_files)} files processed into {len(result.new_chunk_ids)} chunks, "
+            f"{len(result.failed_files)} failed"
+        )
+        return result
+
+    @staticmethod
+    def _keep_unchanged(result: FolderPipelineResult, entry: FileManifestEntry) -> None:
+        result.kept_chunk_ids.update(entry.chunk_ids)
+        result.unchanged_files_count += 1
+
+    @staticmethod
+    def _record_failure(result: FolderPipelineResult, document: BaseDocument, error: Exception) -> None:
+        LOGGER.error(f"Failed to process {document.file_name}: {str(error)}")
+        result.failed_files.append({"file_id": document.id, "file_name": document.file_name, "reason": str(error)})
+
+    async def _download_stage(
+        self,
+        documents: Iterable[BaseDocument] | AsyncIterable[BaseDocument],
+        manifest: dict[str, FileManifestEntry],
+        parse_queue: asyncio.Queue,
+        result: FolderPipelineResult,
+    ) -> None:
+        semaphore = asyncio.Semaphore(self._download_concurrency)
+
+        async def download(document: BaseDocument, entry: Optional[FileManifestEntry]) -> None:
+            # The slot is held until the file is queued, which bounds the downloaded files waiting for a parser
+            try:
+                try:
+                    content = await asyncio.to_thread(self._content_cache.download, document.id)
+                except Exception as e:
+                    self._record_failure(result, document, e)
+                    return
+                content_sha256 = compute_content_sha256(content)
+                if entry is not None and entry.content_sha256 == content_sha256:
+                    LOGGER.info(f"Content of {document.file_name} is unchanged - skipping")
+                    self._content_cache.release(document.id)
+                    self._keep_unchanged(result, entry)
+                    result.manifest_entries.append(
+                        entry.model_copy(
+                            update={
+                                "last_edited_ts": document.last_edited_ts,
+                                "file_size": _get_file_size(document),
+                                "etag": _get_etag(document),
+                            }
+                        )
+                    )
+                    return
+                await parse_queue.put(_DownloadedFile(document=document, entry=entry, content_sha256=content_sha256))
+            finally:
+                semaphore.release()
+
+        async with asyncio.TaskGroup() as downloads:
+            async for document in _iterate(documents):
+                entry = manifest.get(document.id)
+                # Documents without listing metadata, like website pages, are always compared on their content
+                if entry is not None and isinstance(document, FileDocument) and is_file_unchanged(entry, document):
+                    self._keep_unchanged(result, entry)
+                    continue
+                # Acquired before starting the download, so a streamed listing waits for a free slot
+                await semaphore.acquire()
+                downloads.create_task(download(document, entry))
+        for _ in range(self._parse_concurrency):
+            await parse_queue.put(_END_OF_STREAM)
+
+    async def _parse_worker(
+        self,
+        parse_queue: asyncio.Queue,
+        write_queue: asyncio.Queue,
+        result: FolderPipelineResult,
+        parse_workers_left: list[int],
+    ) -> None:
+        while (downloaded_file := await parse_queue.get()) is not _END_OF_STREAM:
+            document = downloaded_file.document
+            try:
+                chunks_df = await self._parse_file(document)
+                rows = [] if chunks_df.empty else chunks_df_to_rows(chunks_df, self._source_id)
+            except Exception as e:
+                self._record_failure(result, document, e)
+                continue
+            finally:
+                self._content_cache.release(document.id)
+
+            chunk_ids = [row[CHUNK_ID_COLUMN_NAME] for row in rows]
+            result.manifest_entries.append(
+                FileManifestEntry(
+                    file_id=document.id,
+                    file_name=document.file_name,
+                    file_size=_get_file_size(document),
+                    etag=_get_etag(document),
+                    last_edited_ts=document.last_edited_ts,
+                    content_sha256=downloaded_file.content_sha256,
+                    chunk_ids=chunk_ids,
+                    parser_version=self._parser_version,
+                    embedding_model_reference=self._embedding_model_reference,
+                )
+            )
+            if not rows:
+                LOGGER.warning(f"No chunks created for {document.file_name} - skipping")
+                continue
+            LOGGER.info(f"Created {len(rows)} chunks for {document.file_name}")
+            result.successful_files.append({"file_name": document.file_name, "chunks_count": len(rows)})
+            result.new_chunk_ids.update(chunk_ids)
+            for start in range(0, len(rows), self._batch_size):
+                await write_queue.put(rows[start : start + self._batch_size])
+
+        parse_workers_left[0] -= 1
+        if parse_workers_left[0] == 0:
+            await write_queue.put(_END_OF_STREAM)
+
+    async def _write_stage(self, write_queue: asyncio.Queue, index_queue: asyncio.Queue) -> None:
+        while (rows := await write_queue.get()) is not _END_OF_STREAM:
+            # Database drivers are synchronous: keep the event loop free for the other stages
+            await asyncio.to_thread(self._write_rows, rows)
+            await index_queue.put(rows)
+        for _ in range(self._index_concurrency):
+            await index_queue.put(_END_OF_STREAM)
+
+    async def _index_worker(self, index_queue: asyncio.Queue) -> None:
+        while (rows := await index_queue.get()) is not _END_OF_STREAM:
+            await self._index_rows(rows)
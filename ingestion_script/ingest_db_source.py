@@ -1,9 +1,10 @@
 import json
 import logging
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal
 from functools import partial
-from typing import Optional
+from typing import Any, Callable, Optional
 from uuid import UUID
 
 from llama_index.core.node_parser import SentenceSplitter
@@ -14,6 +15,14 @@ from engine.qdrant_service import QdrantService
 from engine.storage_service.db_service import DBService
 from engine.storage_service.db_utils import DBDefinition
 from engine.storage_service.local_service import SQLLocalService
+from ingestion_script.db_source_hashes import (
+    SourceRowHash,
+    compute_source_row_sha256,
+    delete_row_hashes,
+    get_row_hashes_table_name,
+    load_row_hashes,
+    save_row_hashes,
+)
 from ingestion_script.ingest_folder_source import TIMESTAMP_COLUMN_NAME, sync_chunks_to_qdrant
 from ingestion_script.utils import (
     CHUNK_COLUMN_NAME,
@@ -75,6 +84,11 @@ def _validate_source_columns(
     return column_info
 
 
+def _serialize_timestamp(value) -> Optional[str]:
+    serialized_value = _serialize_value(value)
+    return None if serialized_value is None else str(serialized_value)
+
+
 def get_db_source_ids(
     sql_local_service: SQLLocalService,
     table_name: str,
@@ -95,16 +109,42 @@ def get_db_source_ids(
     if timestamp_column_name:
         columns.append(timestamp_column_name)
 
-    id_timestamp_data = sql_local_service.fetch_selected_columns(
+    ids_with_timestamp = {}
+    for id_timestamp_data in sql_local_service.iter_selected_columns(
         table_name=table_name,
         columns=columns,
         schema_name=source_schema_name,
         sql_query_filter=sql_query_filter,
-    )
-    return {
-        str(row[id_column_name]): _serialize_value(row.get(timestamp_column_name)) if timestamp_column_name else None
-        for row in id_timestamp_data
-    }
+    ):
+        for row in id_timestamp_data:
+            ids_with_timestamp[str(row[id_column_name])] = (
+                _serialize_value(row.get(timestamp_column_name)) if timestamp_column_name else None
+            )
+    return ids_with_timestamp
+
+
+def _build_row_metadata(
+    source_row: dict,
+    metadata_column_names: Optional[list[str]],
+    timestamp_column_name: Optional[str],
+) -> dict:
+    metadata: dict = {}
+    if metadata_column_names:
+        for metadata_col_name in metadata_column_names:
+            if metadata_col_name != timestamp_column_name:
+                metadata_value = source_row.get(metadata_col_name)
+                if metadata_value is not None:
+                    metadata[metadata_col_name] = _serialize_value(metadata_value)
+    return metadata
+
+
+@dataclass
+class DBSourceRowsUpdate:
+    """Chunks of the fetched rows whose content changed, and the hashes of every fetched row."""
+
+    chunks: list[dict] = field(default_factory=list)
+    changed_sync_ids: set[str] = field(default_factory=set)
+    row_hashes: list[SourceRowHash] = field(default_factory=list)
 
 
 def fetch_db_source_chunks(
@@ -120,50 +160,61 @@ def fetch_db_source_chunks(
     url_pattern: Optional[str] = None,
     chunk_size: int = 1024,
     chunk_overlap: int = 0,
-) -> list[dict]:
+    known_row_hashes: Optional[dict[str, SourceRowHash]] = None,
+) -> DBSourceRowsUpdate:
+    """
+    Fetch source rows by ID and chunk the ones whose content hash is not in known_row_hashes.
+    Rows with an unchanged content are only hashed, their chunks and embeddings stay as they are.
+    """
+    rows_update = DBSourceRowsUpdate()
     if not sync_ids:
-        return []
+        return rows_update
+    known_row_hashes = known_row_hashes or {}
 
-    id_filter = f"{id_column_name} IN ({','.join(repr(str(sync_id)) for sync_id in sync_ids)})"
-
-    source_rows = sql_local_service.get_table_rows(
+    source_rows = sql_local_service.get_rows_by_ids(
         table_name=table_name,
+        chunk_ids=list(sync_ids),
         schema_name=source_schema_name,
-        sql_query_filter=id_filter,
+        id_column_name=id_column_name,
     )
 
     splitter = SentenceSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-    all_chunks: list[dict] = []
 
     for source_row in source_rows:
         row_id = source_row[id_column_name]
         sync_id = str(row_id)
         combined_text = " ".join(str(source_row.get(col) or "") for col in text_column_names)
-        chunks = splitter.split_text(combined_text)
         file_id = f"{table_name}_{row_id}"
         timestamp_value = source_row.get(timestamp_column_name) if timestamp_column_name else None
-
-        for chunk_index, chunk_text in enumerate(chunks, start=1):
-            chunk_id = f"{row_id}_{chunk_index}"
-
-            if url_pattern:
-                null_safe_row = {k: ("" if v is None else v) for k, v in source_row.items()}
-                url_value = url_pattern.format_map(null_safe_row)
-            else:
-                url_value = None
-
-            metadata: dict = {}
-            if timestamp_column_name and timestamp_value is not None:
-                metadata[timestamp_column_name] = _serialize_value(timestamp_value)
-            if metadata_column_names:
-                for metadata_col_name in metadata_column_names:
-                    if metadata_col_name != timestamp_column_name:
-                        metadata_value = source_row.get(metadata_col_name)
-                        if metadata_value is not None:
-                            metadata[metadata_col_name] = _serialize_value(metadata_value)
-
-            all_chunks.append({
-                CHUNK_ID_COLUMN_NAME: chunk_id,
+        row_metadata = _build_row_metadata(source_row, metadata_column_names, timestamp_column_name)
+
+        if url_pattern:
+            null_safe_row = {k: ("" if v is None else v) for k, v in source_row.items()}
+            url_value = url_pattern.format_map(null_safe_row)
+        else:
+            url_value = None
+
+        content_sha256 = compute_source_row_sha256(combined_text, row_metadata, url_value, chunk_size, chunk_overlap)
+        rows_update.row_hashes.append(
+            SourceRowHash(
+                sync_id=sync_id,
+                content_sha256=content_sha256,
+                last_edited_ts=_serialize_timestamp(timestamp_value),
+            )
+        )
+        known_row_hash = known_row_hashes.get(sync_id)
+        if known_row_hash is not None and known_row_hash.content_sha256 == content_sha256:
+            continue
+        rows_update.changed_sync_ids.add(sync_id)
+
+        metadata: dict = {}
+        if timestamp_column_name and timestamp_value is not None:
+            metadata[timestamp_column_name] = _serialize_value(timestamp_value)
+        metadata.update(row_metadata)
+
+        for chunk_index, chunk_text in enumerate(splitter.split_text(combined_text), start=1):
+            rows_update.chunks.append({
+                CHUNK_ID_COLUMN_NAME: f"{row_id}_{chunk_index}",
                 CHUNK_COLUMN_NAME: chunk_text,
                 FILE_ID_COLUMN_NAME: file_id,
                 SYNC_ID_COLUMN_NAME: sync_id,
@@ -171,11 +222,125 @@ def fetch_db_source_chunks(
                 DOCUMENT_TITLE_COLUMN_NAME: file_id,
                 TIMESTAMP_COLUMN_NAME: _serialize_value(timestamp_value),
                 URL_COLUMN_NAME: url_value,
-                METADATA_COLUMN_NAME: json.dumps(metadata) if metadata else json.dumps({}),
+                METADATA_COLUMN_NAME: json.dumps(metadata),
                 **(({SOURCE_ID_COLUMN_NAME: source_id}) if source_id else {}),
             })
 
-    return all_chunks
+    return rows_update
+
+
+async def update_db_source_chunks(
+    db_service: DBService,
+    qdrant_service: QdrantService,
+    incoming_ids_with_timestamp: dict[str, Any],
+    fetch_chunks_fn: Callable[..., DBSourceRowsUpdate],
+    source_table_name: str,
+    storage_table_name: str,
+    storage_schema_name: str,
+    table_definition: DBDefinition,
+    qdrant_collection_name: str,
+    source_id: str,
+    has_timestamp_column: bool,
+    append_mode: bool = False,
+    sql_query_filter: Optional[str] = None,
+    batch_size: int = 50,
+) -> None:
+    """
+    Update the chunks table with the source rows whose content changed since the last ingestion.
+
+    Rows whose timestamp did not move are not fetched. The others are fetched by ID and hashed: a row with the same
+    hash keeps its chunks and embeddings, only its stored timestamp is refreshed. Changed rows get their chunks
+    replaced and their points removed from Qdrant, so that the Qdrant sync that follows embeds them again.
+    """
+    primary_key_columns = [col.name for col in table_definition.columns if col.is_primary]
+    if not db_service.table_exists(storage_table_name, schema_name=storage_schema_name):
+        db_service.create_table(
+            table_name=storage_table_name, table_definition=table_definition, schema_name=storage_schema_name
+        )
+
+    source_id_filter = f"{SOURCE_ID_COLUMN_NAME} = '{source_id}'"
+    existing_sync_ids = {
+        row[SYNC_ID_COLUMN_NAME]
+        for row in db_service.fetch_selected_columns(
+            storage_table_name,
+            columns=[SYNC_ID_COLUMN_NAME],
+            schema_name=storage_schema_name,
+            sql_query_filter=f"{source_id_filter} AND ({sql_query_filter})" if sql_query_filter else source_id_filter,
+        )
+    }
+    row_hashes_table_name = get_row_hashes_table_name(storage_table_name)
+    # Hashes of rows without chunks are ignored, so those rows are chunked again
+    known_row_hashes = {
+        sync_id: row_hash
+        for sync_id, row_hash in load_row_hashes(
+            db_service, row_hashes_table_name, source_id, schema_name=storage_schema_name
+        ).items()
+        if sync_id in existing_sync_ids
+    }
+
+    ids_to_fetch = [
+        sync_id
+        for sync_id, timestamp in incoming_ids_with_timestamp.items()
+        if sync_id not in known_row_hashes
+        or not has_timestamp_column
+        or known_row_hashes[sync_id].last_edited_ts != _serialize_timestamp(timestamp)
+    ]
+    ids_to_delete = list(existing_sync_ids - incoming_ids_with_timestamp.keys()) if not append_mode else []
+    LOGGER.info(
+        f"Diff: {len(ids_to_fetch)} new or modified rows to hash, "
+        f"{len(incoming_ids_with_timestamp) - len(ids_to_fetch)} unchanged, {len(ids_to_delete)} to delete"
+    )
+
+    if ids_to_delete:
+        # Their points are removed from Qdrant by the sync that follows
+        db_service.delete_rows_from_table(
+            table_name=storage_table_name,
+            ids=ids_to_delete,
+            id_column_name=SYNC_ID_COLUMN_NAME,
+            schema_name=storage_schema_name,
+            sql_query_filter=source_id_filter,
+        )
+        delete_row_hashes(db_service, row_hashes_table_name, source_id, ids_to_delete, schema_name=storage_schema_name)
+
+    collection_exists = await qdrant_service.collection_exists_async(qdrant_collection_name)
+    qdrant_source_filter = {"must": [{"key": SOURCE_ID_COLUMN_NAME, "match": {"value": source_id}}]}
+    changed_rows_count = 0
+    for start in range(0, len(ids_to_fetch), batch_size):
+        rows_update = fetch_chunks_fn(set(ids_to_fetch[start : start + batch_size]), known_row_hashes=known_row_hashes)
+        changed_sync_ids = list(rows_update.changed_sync_ids)
+        if changed_sync_ids:
+            # Chunk IDs and timestamps may be the same as before, drop the points so they are embedded again
+            if collection_exists and not await qdrant_service.delete_chunks_async(
+                point_ids=[f"{source_table_name}_{sync_id}" for sync_id in changed_sync_ids],
+                id_field=FILE_ID_COLUMN_NAME,
+                collection_name=qdrant_collection_name,
+                filter=qdrant_source_filter,
+            ):
+                raise RuntimeError(f"Failed to delete modified rows of source {source_id} from Qdrant")
+            db_service.delete_rows_from_table(
+                table_name=storage_table_name,
+                ids=changed_sync_ids,
+                id_column_name=SYNC_ID_COLUMN_NAME,
+                schema_name=storage_schema_name,
+                sql_query_filter=source_id_filter,
+            )
+            db_service.bulk_upsert_rows(
+                storage_table_name,
+                rows_update.chunks,
+                schema_name=storage_schema_name,
+                id_column_names=primary_key_columns,
+                batch_size=batch_size,
+            )
+        # Saved once the chunks are written, a crash before then fetches these rows again on the next sync
+        save_row_hashes(
+            db_service, row_hashes_table_name, source_id, rows_update.row_hashes, schema_name=storage_schema_name
+        )
+        changed_rows_count += len(changed_sync_ids)
+
+    LOGGER.info(
+        f"{changed_rows_count} rows re-chunked, {len(ids_to_fetch) - changed_rows_count} rows had a new timestamp "
+        "but the same content"
+    )
 
 
 async def upload_db_source(
@@ -250,9 +415,11 @@ async def upload_db_source(
 
         LOGGER.info(f"Found {len(ids_with_ts)} source rows from table {source_table_name}")
 
-        db_service.update_table(
+        await update_db_source_chunks(
+            db_service=db_service,
+            qdrant_service=qdrant_service,
             incoming_ids_with_timestamp=ids_with_ts,
-            fetch_rows_fn=partial(
+            fetch_chunks_fn=partial(
                 fetch_db_source_chunks,
                 sql_local_service=sql_local_service,
                 table_name=source_table_name,
@@ -266,13 +433,14 @@ async def upload_db_source(
                 chunk_size=chunk_size,
                 chunk_overlap=chunk_overlap,
             ),
-            table_name=storage_table_name,
+            source_table_name=source_table_name,
+            storage_table_name=storage_table_name,
+            storage_schema_name=storage_schema_name,
             table_definition=db_definition,
-            id_column_name=SYNC_ID_COLUMN_NAME,
-            timestamp_column_name=TIMESTAMP_COLUMN_NAME,
-            append_mode=update_existing,
-            schema_name=storage_schema_name,
+            qdrant_collection_name=qdrant_collection_name,
             source_id=source_id_str,
+            has_timestamp_column=timestamp_column_name is not None,
+            append_mode=update_existing,
             sql_query_filter=combined_filter_sql_unified,
             batch_size=batch_size,
         )
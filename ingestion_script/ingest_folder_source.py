@@ -1,5 +1,6 @@
 import logging
 import uuid
+from functools import partial
 from typing import Callable, Optional
 from uuid import UUID
 
@@ -9,9 +10,10 @@ from ada_backend.database import models as db
 from ada_backend.schemas.ingestion_task_schema import IngestionTaskUpdate, ResultType, TaskResultMetadata
 from ada_backend.schemas.source_schema import DataSourceSchema
 from data_ingestion.document.document_chunking import document_chunking_mapping, get_chunks_dataframe_from_doc
-from data_ingestion.document.folder_management.folder_management import FolderManager
+from data_ingestion.document.folder_management.folder_management import FileDocument, FolderManager
 from data_ingestion.document.folder_management.google_drive_folder_management import GoogleDriveFolderManager
 from data_ingestion.document.folder_management.s3_folder_management import S3FolderManager
+from data_ingestion.document.parser_pool import ParserPool
 from data_ingestion.utils import DocumentReadingMode
 from engine.llm_services.llm_service import EmbeddingService, VisionService
 from engine.qdrant_service import (
@@ -24,9 +26,19 @@ from engine.storage_service.db_service import DBService
 from engine.storage_service.db_utils import create_db_if_not_exists
 from engine.storage_service.local_service import SQLLocalService
 from engine.trace.trace_manager import TraceManager
-from ingestion_script.folder_utils import prepare_rows_for_qdrant, sanitize_for_json
+from ingestion_script.folder_manifest import (
+    FileContentCache,
+    build_parser_version,
+    get_manifest_table_name,
+    is_entry_current,
+    load_manifest,
+    save_manifest,
+)
+from ingestion_script.folder_pipeline import DEFAULT_PARSE_CONCURRENCY, FolderIngestionPipeline
+from ingestion_script.folder_utils import prepare_rows_for_qdrant
 from ingestion_script.utils import (
     CHUNK_ID_COLUMN_NAME,
+    FILE_ID_COLUMN_NAME,
     SOURCE_ID_COLUMN_NAME,
     TIMESTAMP_COLUMN_NAME,
     UNIFIED_QDRANT_SCHEMA,
@@ -35,7 +47,6 @@ from ingestion_script.utils import (
     get_first_available_embeddings_custom_llm,
     get_first_available_multimodal_custom_llm,
     get_sanitize_names,
-    transform_chunks_df_for_unified_table,
     update_ingestion_task,
 )
 from settings import settings
@@ -84,7 +95,7 @@ def _resolve_presigned_url_getter(folder_manager: FolderManager) -> Optional[Cal
     return None
 
 
-async def _ensure_qdrant_indexes(
+async def ensure_qdrant_indexes(
     qdrant_service: QdrantService,
     collection_name: str,
     column_info: Optional[dict] = None,
@@ -167,7 +178,7 @@ async def sync_chunks_to_qdrant(
     if not await qdrant_service.collection_exists_async(collection_name):
         await qdrant_service.create_collection_async(collection_name)
 
-    await _ensure_qdrant_indexes(
+    await ensure_qdrant_indexes(
         qdrant_service,
         collection_name,
         column_info=column_info,
@@ -192,6 +203,60 @@ async def sync_chunks_to_qdrant(
         raise RuntimeError(f"Qdrant sync failed for collection '{collection_name}': point count mismatch after sync")
 
 
+async def delete_stale_chunks(
+    db_service: DBService,
+    qdrant_service: QdrantService,
+    table_name: str,
+    table_schema: str,
+    collection_name: str,
+    source_id: str,
+    chunk_ids_to_keep: set[str],
+    file_ids_to_keep: set[str],
+    batch_size: int = 1000,
+) -> set[str]:
+    """
+    Delete, from the chunks table and from Qdrant, the chunks of a source that are neither in chunk_ids_to_keep
+    nor belong to file_ids_to_keep, i.e. the previous chunks of modified files and the chunks of removed files.
+    Returns the deleted chunk IDs.
+    """
+    if not db_service.table_exists(table_name, schema_name=table_schema):
+        return set()
+    source_id_filter = f"{SOURCE_ID_COLUMN_NAME} = '{source_id}'"
+    rows = db_service.fetch_selected_columns(
+        table_name,
+        columns=[CHUNK_ID_COLUMN_NAME, FILE_ID_COLUMN_NAME],
+        schema_name=table_schema,
+        sql_query_filter=source_id_filter,
+    )
+    stale_chunk_ids = {
+        row[CHUNK_ID_COLUMN_NAME]
+        for row in rows
+        if row[CHUNK_ID_COLUMN_NAME] not in chunk_ids_to_keep and row[FILE_ID_COLUMN_NAME] not in file_ids_to_keep
+    }
+    if not stale_chunk_ids:
+        return stale_chunk_ids
+    stale_chunk_ids_list = list(stale_chunk_ids)
+    qdrant_source_filter = {"must": [{"key": SOURCE_ID_COLUMN_NAME, "match": {"value": source_id}}]}
+    for start in range(0, len(stale_chunk_ids_list), batch_size):
+        batch_ids = stale_chunk_ids_list[start : start + batch_size]
+        db_service.delete_rows_from_table(
+            table_name=table_name,
+            ids=batch_ids,
+            id_column_name=CHUNK_ID_COLUMN_NAME,
+            schema_name=table_schema,
+            sql_query_filter=source_id_filter,
+        )
+        if not await qdrant_service.delete_chunks_async(
+            point_ids=batch_ids,
+            id_field=CHUNK_ID_COLUMN_NAME,
+            collection_name=collection_name,
+            filter=qdrant_source_filter,
+        ):
+            raise RuntimeError(f"Failed to delete stale chunks of source {source_id} from Qdrant")
+    LOGGER.info(f"Deleted {len(stale_chunk_ids)} stale chunks of source {source_id}")
+    return stale_chunk_ids
+
+
 async def ingest_google_drive_source(
     folder_id: str,
     organization_id: str,
@@ -211,9 +276,7 @@ async def ingest_google_drive_source(
         f"[INGESTION_SOURCE] Starting GOOGLE DRIVE ingestion - Source: '{source_name}', "
         f"Folder ID: '{folder_id}', Organization: '{organization_id}', Task: '{task_id}'"
     )
-    LOGGER.info(
-        f"[INGESTION_CONFIG] Add descriptions: {add_doc_description_to_chunks}, Chunk size: {chunk_size}"
-    )
+    LOGGER.info(f"[INGESTION_CONFIG] Add descriptions: {add_doc_description_to_chunks}, Chunk size: {chunk_size}")
 
     # TODO: see how we can change whole code to use id instead of path
     path = "https://drive.google.com/drive/folders/" + folder_id
@@ -364,11 +427,13 @@ async def _ingest_folder_source(
 
         LOGGER.info("Starting ingestion process")
         files_info = folder_manager.list_all_files_info()
+        # Files are downloaded once by the pipeline to be hashed, the parsers then read them from this cache
+        file_content_cache = FileContentCache(folder_manager.get_file_content)
         try:
             document_chunk_mapping = document_chunking_mapping(
                 vision_ingestion_service=vision_completion_service,
                 llm_service=fallback_vision_llm_service,
-                get_file_content_func=folder_manager.get_file_content,
+                get_file_content_func=file_content_cache.get_file_content,
                 chunk_size=chunk_size,
                 document_reading_mode=document_reading_mode,
                 overlapping_size=chunk_overlap,
@@ -401,8 +466,40 @@ async def _ingest_folder_source(
         #     add_summary_in_chunks_func = add_summary_in_chunks
         db_service.create_schema(db_table_schema)
         LOGGER.info(f"Found {len(files_info)} files to ingest")
+
+        manifest_table_name = get_manifest_table_name(db_table_name)
+        parser_version = build_parser_version(chunk_size, chunk_overlap, document_reading_mode)
+        previous_manifest = load_manifest(db_service, manifest_table_name, source_id, schema_name=db_table_schema)
+        listed_file_ids = {document.id for document in files_info}
+        removed_file_ids = [file_id for file_id in previous_manifest if file_id not in listed_file_ids]
+        # Entries written with another parser version or embedding model are ignored, which rebuilds their files
+        manifest = {
+            file_id: entry
+            for file_id, entry in previous_manifest.items()
+            if is_entry_current(entry, parser_version, embedding_model_ref)
+        }
+        if len(manifest) < len(previous_manifest):
+            LOGGER.info(
+                f"{len(previous_manifest) - len(manifest)} files were ingested with another parser version "
+                "or embedding model - they will be rebuilt"
+            )
         try:
             if len(files_info) == 0:
+                if previous_manifest:
+                    LOGGER.info(f"All files were removed from source '{source_name}' - deleting their chunks")
+                    await delete_stale_chunks(
+                        db_service,
+                        qdrant_service,
+                        db_table_name,
+                        db_table_schema,
+                        qdrant_collection_name,
+                        str(source_id),
+                        chunk_ids_to_keep=set(),
+                        file_ids_to_keep=set(),
+                    )
+                    save_manifest(
+                        db_service, manifest_table_name, source_id, [], removed_file_ids, schema_name=db_table_schema
+                    )
                 LOGGER.warning(f"No files found to ingest in source '{source_name}' - marking as completed")
                 LOGGER.info("[EMPTY_FOLDER] Calling create_source for empty folder")
                 create_source(
@@ -424,36 +521,82 @@ async def _ingest_folder_source(
                 LOGGER.info("[EMPTY_FOLDER] Task status updated - returning")
                 return
 
-            file_chunks_dfs = []
-            failed_files = []
-            successful_files = []
-
-            for document in files_info:
-                try:
-                    chunks_df = await get_chunks_dataframe_from_doc(
-                        document,
-                        document_chunk_mapping,
-                        llm_service=fallback_vision_llm_service,
-                        add_doc_description_to_chunks=add_doc_description_to_chunks,
-                        documents_summary_func=document_summary_func,
-                        add_summary_in_chunks_func=add_summary_in_chunks_func,
-                        default_chunk_size=chunk_size,
-                    )
-
-                    if chunks_df.empty:
-                        LOGGER.warning(f"No chunks created for {document.file_name} - skipping")
-                        continue
+            if not db_service.table_exists(db_table_name, schema_name=db_table_schema):
+                db_service.create_table(
+                    table_name=db_table_name,
+                    table_definition=UNIFIED_TABLE_DEFINITION,
+                    schema_name=db_table_schema,
+                )
+            if not await qdrant_service.collection_exists_async(qdrant_collection_name):
+                await qdrant_service.create_collection_async(qdrant_collection_name)
+            await ensure_qdrant_indexes(qdrant_service, qdrant_collection_name)
+
+            primary_key_columns = [column.name for column in UNIFIED_TABLE_DEFINITION.columns if column.is_primary]
+
+            def write_rows(rows: list[dict]) -> None:
+                db_service.upsert_rows(
+                    table_name=db_table_name,
+                    rows=rows,
+                    schema_name=db_table_schema,
+                    id_column_names=primary_key_columns,
+                )
 
-                    file_chunks_dfs.append(chunks_df)
-                    successful_files.append({"file_name": document.file_name, "chunks_count": len(chunks_df)})
-                    LOGGER.info(f"Created {len(chunks_df)} chunks for {document.file_name}")
-                except Exception as e:
-                    error_msg = f"Failed to process {document.file_name}: {str(e)}"
-                    LOGGER.error(error_msg)
-                    failed_files.append({"file_name": document.file_name, "reason": str(e)})
-                    continue
+            async def index_rows(rows: list[dict]) -> None:
+                if not await qdrant_service.add_chunks_async(prepare_rows_for_qdrant(rows), qdrant_collection_name):
+                    raise RuntimeError(
+                        f"Failed to add {len(rows)} chunks to Qdrant collection '{qdrant_collection_name}'"
+                    )
 
-            if not file_chunks_dfs:
+            parse_file_in_process = partial(
+                get_chunks_dataframe_from_doc,
+                document_chunk_mapping=document_chunk_mapping,
+                llm_service=fallback_vision_llm_service,
+                add_doc_description_to_chunks=add_doc_description_to_chunks,
+                documents_summary_func=document_summary_func,
+                add_summary_in_chunks_func=add_summary_in_chunks_func,
+                default_chunk_size=chunk_size,
+            )
+            parser_pool = None
+            parse_concurrency = DEFAULT_PARSE_CONCURRENCY
+            if document_reading_mode == DocumentReadingMode.STANDARD and settings.INGESTION_PARSER_PROCESSES != 0:
+                parser_pool = ParserPool(
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    max_workers=settings.INGESTION_PARSER_PROCESSES,
+                )
+                parse_concurrency = parser_pool.max_workers
+                LOGGER.info(f"Parsing files in {parser_pool.max_workers} parser processes")
+
+            async def parse_file(document: FileDocument) -> pd.DataFrame:
+                if parser_pool is not None and parser_pool.supports(document):
+                    return await parser_pool.parse(document, file_content_cache.get_file_content(document.id))
+                return await parse_file_in_process(document)
+
+            pipeline = FolderIngestionPipeline(
+                content_cache=file_content_cache,
+                parse_file=parse_file,
+                write_rows=write_rows,
+                index_rows=index_rows,
+                source_id=source_id,
+                parser_version=parser_version,
+                embedding_model_reference=embedding_model_ref,
+                batch_size=batch_size,
+                parse_concurrency=parse_concurrency,
+            )
+            try:
+                pipeline_result = await pipeline.run(files_info, manifest)
+            finally:
+                if parser_pool is not None:
+                    parser_pool.shutdown()
+            failed_files = pipeline_result.failed_files
+            successful_files = pipeline_result.successful_files
+            LOGGER.info(f"{len(removed_file_ids)} files removed since the last ingestion")
+
+            if (
+                not pipeline_result.new_chunk_ids
+                and not pipeline_result.kept_chunk_ids
+                and pipeline_result.unchanged_files_count == 0
+            ):
                 LOGGER.warning("No chunks created from any file - marking task as FAILED")
                 if failed_files:
                     error_messages = []
@@ -483,54 +626,27 @@ async def _ingest_folder_source(
                 LOGGER.error("[NO_CHUNKS] Task marked as FAILED - no source created")
                 return
 
-            all_chunks_df = pd.concat(file_chunks_dfs, ignore_index=True)
-
-            initial_count = len(all_chunks_df)
-            all_chunks_df = all_chunks_df[
-                all_chunks_df["content"].notna() & (all_chunks_df["content"].str.strip() != "")
-            ]
-            filtered_count = initial_count - len(all_chunks_df)
-            if filtered_count > 0:
-                LOGGER.info(f"Filtered out {filtered_count} chunks with empty content")
-
-            if all_chunks_df.empty:
-                LOGGER.warning("No valid chunks remaining after filtering - nothing to sync")
-                return
-
-            if "document_title" in all_chunks_df.columns:
-                all_chunks_df["document_title"] = all_chunks_df["document_title"].apply(sanitize_for_json)
-            if "metadata" in all_chunks_df.columns:
-                all_chunks_df["metadata"] = all_chunks_df["metadata"].apply(sanitize_for_json)
-            if "url" in all_chunks_df.columns:
-                all_chunks_df["url"] = all_chunks_df["url"].apply(sanitize_for_json)
-
-            all_chunks_df_for_db = transform_chunks_df_for_unified_table(all_chunks_df, source_id)
-            all_rows = all_chunks_df_for_db.to_dict(orient="records")
-            rows_by_id = {row[CHUNK_ID_COLUMN_NAME]: row for row in all_rows}
-            ids_with_ts = {row[CHUNK_ID_COLUMN_NAME]: row.get(TIMESTAMP_COLUMN_NAME) for row in all_rows}
-
-            LOGGER.info(f"Syncing {len(all_rows)} total chunks to db table {db_table_name}")
-            db_service.update_table(
-                incoming_ids_with_timestamp=ids_with_ts,
-                fetch_rows_fn=lambda ids: [rows_by_id[id_] for id_ in ids if id_ in rows_by_id],
-                table_name=db_table_name,
-                table_definition=UNIFIED_TABLE_DEFINITION,
-                id_column_name=CHUNK_ID_COLUMN_NAME,
-                timestamp_column_name=TIMESTAMP_COLUMN_NAME,
-                append_mode=True,
-                schema_name=db_table_schema,
-                source_id=str(source_id),
-                batch_size=batch_size,
+            # Previous chunks of modified files and chunks of removed files.
+            # Files that failed this time keep their previous chunks.
+            await delete_stale_chunks(
+                db_service,
+                qdrant_service,
+                db_table_name,
+                db_table_schema,
+                qdrant_collection_name,
+                str(source_id),
+                chunk_ids_to_keep=pipeline_result.kept_chunk_ids | pipeline_result.new_chunk_ids,
+                file_ids_to_keep={failed_file["file_id"] for failed_file in failed_files},
             )
 
-            await sync_chunks_to_qdrant(
-                table_schema=db_table_schema,
-                table_name=db_table_name,
-                collection_name=qdrant_collection_name,
-                db_service=db_service,
-                qdrant_service=qdrant_service,
-                source_id=str(source_id),
-                batch_size=batch_size,
+            # Written last: a run failing before this point is retried in full on the next ingestion
+            save_manifest(
+                db_service,
+                manifest_table_name,
+                source_id,
+                pipeline_result.manifest_entries,
+                removed_file_ids,
+                schema_name=db_table_schema,
             )
         except Exception as e:
             error_msg = f"Failed to ingest folder source: {str(e)}, PDF reading mode: {document_reading_mode}"
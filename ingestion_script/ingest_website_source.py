@@ -1,31 +1,44 @@
+import asyncio
 import hashlib
 import logging
 from functools import partial
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 import pandas as pd
 from firecrawl import AsyncFirecrawl
+from firecrawl.v2.types import Document, PaginationConfig, ScrapeOptions
 from pydantic import BaseModel
 
 from ada_backend.database import models as db
 from data_ingestion.document.document_chunking import document_chunking_mapping, get_chunks_dataframe_from_doc
-from data_ingestion.document.folder_management.folder_management import WebsiteDocument
+from data_ingestion.document.folder_management.folder_management import BaseDocument, WebsiteDocument
 from data_ingestion.utils import DocumentReadingMode
 from engine.qdrant_service import QdrantService
 from engine.storage_service.db_service import DBService
-from ingestion_script.ingest_folder_source import TIMESTAMP_COLUMN_NAME, sync_chunks_to_qdrant
+from ingestion_script.folder_manifest import (
+    FileContentCache,
+    build_parser_version,
+    get_manifest_table_name,
+    is_entry_current,
+    load_manifest,
+    save_manifest,
+)
+from ingestion_script.folder_pipeline import FolderIngestionPipeline
+from ingestion_script.folder_utils import prepare_rows_for_qdrant
+from ingestion_script.ingest_folder_source import delete_stale_chunks, ensure_qdrant_indexes
 from ingestion_script.utils import (
-    CHUNK_ID_COLUMN_NAME,
     UNIFIED_QDRANT_SCHEMA,
     UNIFIED_TABLE_DEFINITION,
-    transform_chunks_df_for_unified_table,
     upload_source,
 )
 from settings import settings
 
 LOGGER = logging.getLogger(__name__)
 
+CRAWL_POLL_INTERVAL_SECONDS = 2
+CRAWL_FAILED_STATUSES = {"failed", "cancelled"}
+
 
 class ScrapedPage(BaseModel):
     url: str
@@ -33,7 +46,24 @@ class ScrapedPage(BaseModel):
     content: str
 
 
-async def scrape_website(
+def _get_firecrawl_client() -> AsyncFirecrawl:
+    if not settings.FIRECRAWL_API_KEY:
+        raise ValueError("Firecrawl API key is required. Set FIRECRAWL_API_KEY in settings.")
+    if settings.FIRECRAWL_API_URL:
+        return AsyncFirecrawl(api_key=settings.FIRECRAWL_API_KEY, api_url=settings.FIRECRAWL_API_URL)
+    return AsyncFirecrawl(api_key=settings.FIRECRAWL_API_KEY)
+
+
+def _to_scraped_page(page: Document, crawl_url: str) -> Optional[ScrapedPage]:
+    page_url = (page.metadata.url if page.metadata else None) or crawl_url
+    page_title = (page.metadata.title if page.metadata else None) or page_url
+    if not page.markdown:
+        LOGGER.warning(f"No content found for page: {page_url}")
+        return None
+    return ScrapedPage(url=page_url, title=page_title, content=page.markdown)
+
+
+async def iter_crawled_pages(
     url: str,
     follow_links: bool = False,
     max_depth: int = 1,
@@ -42,92 +72,133 @@ async def scrape_website(
     exclude_paths: Optional[list[str]] = None,
     include_tags: Optional[list[str]] = None,
     exclude_tags: Optional[list[str]] = None,
-) -> list[ScrapedPage]:
+    poll_interval_seconds: float = CRAWL_POLL_INTERVAL_SECONDS,
+) -> AsyncIterator[ScrapedPage]:
     """
-    Scrape a website using Firecrawl API.
+    Crawl a website with Firecrawl and yield its pages while the crawl is running.
+
+    The crawl status is read page by page through its `next` cursors, so each page of results is yielded as soon as
+    Firecrawl has scraped it and only one page of results is held at a time.
+    A page returned twice by Firecrawl is only yielded once.
 
     Args:
         url: Starting URL to crawl
-        follow_links: Whether to follow links (maps to crawlEntireDomain)
-        max_depth: Maximum depth for link following (maps to maxDepth)
+        follow_links: Whether to follow links (maps to crawl_entire_domain)
+        max_depth: Maximum depth for link following (maps to max_discovery_depth)
         limit: Maximum number of pages to crawl (default: 100).
                Recommended: 10-100 for small sites, 100-500 for medium sites, 500+ for large sites.
         include_paths: URL pathname regex patterns that include matching URLs
         exclude_paths: URL pathname regex patterns that exclude matching URLs
         include_tags: HTML tags to include in content extraction
         exclude_tags: HTML tags to exclude from content extraction
-
-    Returns:
-        List of scraped page data with 'url', 'title', 'content'
+        poll_interval_seconds: Wait between two status reads when no new page is available
     """
     LOGGER.info(
-        f"Starting Firecrawl scrape for URL: {url} (follow_links={follow_links}, max_depth={max_depth}, "
+        f"Starting Firecrawl crawl for URL: {url} (follow_links={follow_links}, max_depth={max_depth}, "
         f"limit={limit}, include_paths={include_paths}, exclude_paths={exclude_paths})"
     )
+    firecrawl = _get_firecrawl_client()
+
+    crawl_options = {
+        "limit": limit,
+        "scrape_options": ScrapeOptions(
+            formats=["markdown"],
+            only_main_content=True,
+            include_tags=include_tags or None,
+            exclude_tags=exclude_tags or None,
+        ),
+    }
+    if include_paths:
+        crawl_options["include_paths"] = include_paths
+    if exclude_paths:
+        crawl_options["exclude_paths"] = exclude_paths
+    if follow_links:
+        crawl_options["crawl_entire_domain"] = True
+        if max_depth > 0:
+            crawl_options["max_discovery_depth"] = max_depth
+
+    crawl = await firecrawl.start_crawl(url=url, **crawl_options)
+    LOGGER.info(f"Firecrawl crawl {crawl.id} started")
+
+    seen_urls: set[str] = set()
+    next_url: Optional[str] = None
+    while True:
+        if next_url is None:
+            crawl_job = await firecrawl.get_crawl_status(
+                crawl.id, pagination_config=PaginationConfig(auto_paginate=False)
+            )
+        else:
+            crawl_job = await firecrawl.get_crawl_status_page(next_url)
+        if crawl_job.status in CRAWL_FAILED_STATUSES:
+            raise RuntimeError(f"Firecrawl crawl {crawl.id} {crawl_job.status} after {len(seen_urls)} pages")
+
+        for page in crawl_job.data:
+            scraped_page = _to_scraped_page(page, url)
+            if scraped_page is None or scraped_page.url in seen_urls:
+                continue
+            seen_urls.add(scraped_page.url)
+            yield scraped_page
 
-    try:
-        if not settings.FIRECRAWL_API_KEY:
-            raise ValueError("Firecrawl API key is required. Set FIRECRAWL_API_KEY in settings.")
-
-        firecrawl = AsyncFirecrawl(api_key=settings.FIRECRAWL_API_KEY)
-
-        scrape_options = {
-            "formats": ["markdown"],
-            "onlyMainContent": True,
-        }
-
-        if include_tags:
-            scrape_options["includeTags"] = include_tags
-        if exclude_tags:
-            scrape_options["excludeTags"] = exclude_tags
-
-        crawl_options = {
-            "limit": limit,
-            "scrapeOptions": scrape_options,
-        }
-
-        if include_paths:
-            crawl_options["includePaths"] = include_paths
-        if exclude_paths:
-            crawl_options["excludePaths"] = exclude_paths
-
-        if follow_links:
-            crawl_options["crawlEntireDomain"] = True
-            if max_depth > 0:
-                crawl_options["maxDepth"] = max_depth
-
-        LOGGER.info(f"Starting Firecrawl crawl with options: {crawl_options}")
-        crawl_result = await firecrawl.crawl(url=url, **crawl_options)
-
-        if not crawl_result or not crawl_result.data:
-            raise ValueError(f"Failed to crawl: {crawl_result}")
+        if crawl_job.next:
+            # The cursor points after the pages read so far, and stays the same until more pages are scraped
+            next_url = crawl_job.next
+            if crawl_job.data:
+                continue
+        elif crawl_job.status == "completed":
+            break
+        await asyncio.sleep(poll_interval_seconds)
 
-        pages = crawl_result.data
-        LOGGER.info(f"Firecrawl crawl completed. Found {len(pages)} pages")
+    LOGGER.info(f"Firecrawl crawl {crawl.id} completed. Found {len(seen_urls)} pages")
 
-        scraped_pages: list[ScrapedPage] = []
-        for page in pages:
-            page_url = (page.metadata.url if page.metadata else None) or url
-            page_title = (page.metadata.title if page.metadata else None) or page_url
-            markdown_content = page.markdown or ""
 
-            if not markdown_content:
-                LOGGER.warning(f"No content found for page: {page_url}")
-                continue
+async def scrape_website(
+    url: str,
+    follow_links: bool = False,
+    max_depth: int = 1,
+    limit: Optional[int] = 100,
+    include_paths: Optional[list[str]] = None,
+    exclude_paths: Optional[list[str]] = None,
+    include_tags: Optional[list[str]] = None,
+    exclude_tags: Optional[list[str]] = None,
+) -> list[ScrapedPage]:
+    """
+    Scrape a website using Firecrawl API, see iter_crawled_pages.
 
-            scraped_pages.append(
-                ScrapedPage(
-                    url=page_url,
-                    title=page_title,
-                    content=markdown_content,
-                )
+    Returns:
+        List of scraped page data with 'url', 'title', 'content'
+    """
+    try:
+        scraped_pages = [
+            page
+            async for page in iter_crawled_pages(
+                url=url,
+                follow_links=follow_links,
+                max_depth=max_depth,
+                limit=limit,
+                include_paths=include_paths,
+                exclude_paths=exclude_paths,
+                include_tags=include_tags,
+                exclude_tags=exclude_tags,
             )
-
-        return scraped_pages
-
+        ]
     except Exception as e:
         LOGGER.error(f"Error scraping website {url} with Firecrawl: {str(e)}")
         raise
+    if not scraped_pages:
+        raise ValueError(f"Failed to crawl: no page with content found for {url}")
+    return scraped_pages
+
+
+def build_page_document(page: ScrapedPage) -> WebsiteDocument:
+    return WebsiteDocument(
+        id=hashlib.md5(page.url.encode()).hexdigest(),
+        file_name=page.title if page.title else page.url,
+        folder_name=page.url,
+        metadata={
+            "title": page.title,
+            "source_url": page.url,
+        },
+    )
 
 
 async def upload_website_source(
@@ -149,66 +220,77 @@ async def upload_website_source(
     chunk_overlap: int = 0,
     update_existing: bool = False,
     batch_size: int = 50,
+    crawl_poll_interval_seconds: float = CRAWL_POLL_INTERVAL_SECONDS,
 ) -> None:
-    LOGGER.info(f"Starting to scrape URL: {url} using Firecrawl")
-
-    scraped_pages = await scrape_website(
-        url=url,
-        follow_links=follow_links,
-        max_depth=max_depth,
-        limit=limit,
-        include_paths=include_paths,
-        exclude_paths=exclude_paths,
-        include_tags=include_tags,
-        exclude_tags=exclude_tags,
-    )
-
-    if not scraped_pages:
-        LOGGER.warning("No content scraped from URLs")
-        return
+    """
+    Crawl a website and chunk, store and embed its pages while the crawl is running.
 
-    LOGGER.info(f"Scraped {len(scraped_pages)} pages")
+    Pages go through the folder ingestion pipeline and manifest, with the md5 of their URL as file ID: on a recrawl,
+    pages whose content is unchanged keep their chunks, and the chunks of pages no longer crawled are deleted.
+    """
+    LOGGER.info(f"Starting to scrape URL: {url} using Firecrawl")
 
     # Firecrawl content is already Markdown, so no LLM/vision processing is required.
     vision_completion_service = None
     fallback_vision_llm_service = None
 
-    content_storage = {}
-
-    def get_file_content_func(file_id: str) -> bytes:
-        return content_storage.get(file_id, b"")
+    # Pages wait here between the crawl and the pipeline, which releases them once chunked
+    page_contents: dict[str, bytes] = {}
+    content_cache = FileContentCache(get_file_content_func=page_contents.pop)
 
     document_chunk_mapping = document_chunking_mapping(
         vision_ingestion_service=vision_completion_service,
         llm_service=fallback_vision_llm_service,
-        get_file_content_func=get_file_content_func,
+        get_file_content_func=content_cache.get_file_content,
         chunk_size=chunk_size,
         overlapping_size=chunk_overlap,
         document_reading_mode=DocumentReadingMode.STANDARD,
     )
 
     db_service.create_schema(storage_schema_name)
-
-    page_chunks_dfs = []
-
-    for page_data in scraped_pages:
-        if not page_data.content or not page_data.content.strip():
-            LOGGER.warning(f"Skipping page {page_data.url} - no content extracted")
-            continue
-
-        file_id = hashlib.md5(page_data.url.encode()).hexdigest()
-        content_storage[file_id] = page_data.content.encode("utf-8")
-
-        document = WebsiteDocument(
-            id=file_id,
-            file_name=page_data.title if page_data.title else page_data.url,
-            folder_name=page_data.url,
-            metadata={
-                "title": page_data.title,
-                "source_url": page_data.url,
-            },
+    if not db_service.table_exists(storage_table_name, schema_name=storage_schema_name):
+        db_service.create_table(
+            table_name=storage_table_name,
+            table_definition=UNIFIED_TABLE_DEFINITION,
+            schema_name=storage_schema_name,
         )
+    if not await qdrant_service.collection_exists_async(qdrant_collection_name):
+        await qdrant_service.create_collection_async(qdrant_collection_name)
+    await ensure_qdrant_indexes(qdrant_service, qdrant_collection_name)
+
+    manifest_table_name = get_manifest_table_name(storage_table_name)
+    parser_version = build_parser_version(chunk_size, chunk_overlap, DocumentReadingMode.STANDARD)
+    # The collection name includes the embedding model, so a new model gets a new collection and rebuilds every page
+    previous_manifest = load_manifest(db_service, manifest_table_name, source_id, schema_name=storage_schema_name)
+    manifest = {
+        file_id: entry
+        for file_id, entry in previous_manifest.items()
+        if is_entry_current(entry, parser_version, qdrant_collection_name)
+    }
+
+    crawled_file_ids: set[str] = set()
+
+    async def iter_page_documents() -> AsyncIterator[BaseDocument]:
+        async for page in iter_crawled_pages(
+            url=url,
+            follow_links=follow_links,
+            max_depth=max_depth,
+            limit=limit,
+            include_paths=include_paths,
+            exclude_paths=exclude_paths,
+            include_tags=include_tags,
+            exclude_tags=exclude_tags,
+            poll_interval_seconds=crawl_poll_interval_seconds,
+        ):
+            if not page.content.strip():
+                LOGGER.warning(f"Skipping page {page.url} - no content extracted")
+                continue
+            document = build_page_document(page)
+            crawled_file_ids.add(document.id)
+            page_contents[document.id] = page.content.encode("utf-8")
+            yield document
 
+    async def parse_page(document: BaseDocument) -> pd.DataFrame:
         chunks_df = await get_chunks_dataframe_from_doc(
             document,
             document_chunk_mapping=document_chunk_mapping,
@@ -217,59 +299,66 @@ async def upload_website_source(
             add_summary_in_chunks_func=None,
             default_chunk_size=chunk_size,
         )
+        if not chunks_df.empty:
+            chunks_df["url"] = document.url
+        return chunks_df
+
+    primary_key_columns = [column.name for column in UNIFIED_TABLE_DEFINITION.columns if column.is_primary]
+
+    def write_rows(rows: list[dict]) -> None:
+        db_service.upsert_rows(
+            table_name=storage_table_name,
+            rows=rows,
+            schema_name=storage_schema_name,
+            id_column_names=primary_key_columns,
+        )
 
-        if chunks_df.empty:
-            LOGGER.warning(f"No chunks created for {page_data.url} - skipping")
-            continue
-
-        chunks_df["url"] = page_data.url
-        page_chunks_dfs.append(chunks_df)
-        LOGGER.info(f"Created {len(chunks_df)} chunks for {page_data.url}")
-
-    if not page_chunks_dfs:
-        LOGGER.warning("No chunks created from any page - nothing to sync")
-        return
-
-    all_chunks_df = pd.concat(page_chunks_dfs, ignore_index=True)
-
-    initial_count = len(all_chunks_df)
-    all_chunks_df = all_chunks_df[all_chunks_df["content"].notna() & (all_chunks_df["content"].str.strip() != "")]
-    filtered_count = initial_count - len(all_chunks_df)
-    if filtered_count > 0:
-        LOGGER.info(f"Filtered out {filtered_count} chunks with empty content")
-
-    if all_chunks_df.empty:
-        LOGGER.warning("No valid chunks remaining after filtering - nothing to sync")
-        return
-
-    LOGGER.info(f"Syncing {len(all_chunks_df)} total chunks to db table {storage_table_name}")
-
-    all_chunks_df_for_db = transform_chunks_df_for_unified_table(all_chunks_df, source_id)
-    all_rows = all_chunks_df_for_db.to_dict(orient="records")
-    rows_by_id = {row[CHUNK_ID_COLUMN_NAME]: row for row in all_rows}
-    ids_with_ts = {row[CHUNK_ID_COLUMN_NAME]: row.get(TIMESTAMP_COLUMN_NAME) for row in all_rows}
-
-    db_service.update_table(
-        incoming_ids_with_timestamp=ids_with_ts,
-        fetch_rows_fn=lambda ids: [rows_by_id[id_] for id_ in ids if id_ in rows_by_id],
-        table_name=storage_table_name,
-        table_definition=UNIFIED_TABLE_DEFINITION,
-        id_column_name=CHUNK_ID_COLUMN_NAME,
-        timestamp_column_name=TIMESTAMP_COLUMN_NAME,
-        append_mode=True,
-        schema_name=storage_schema_name,
-        source_id=str(source_id),
+    async def index_rows(rows: list[dict]) -> None:
+        if not await qdrant_service.add_chunks_async(prepare_rows_for_qdrant(rows), qdrant_collection_name):
+            raise RuntimeError(f"Failed to add {len(rows)} chunks to Qdrant collection '{qdrant_collection_name}'")
+
+    pipeline = FolderIngestionPipeline(
+        content_cache=content_cache,
+        parse_file=parse_page,
+        write_rows=write_rows,
+        index_rows=index_rows,
+        source_id=source_id,
+        parser_version=parser_version,
+        embedding_model_reference=qdrant_collection_name,
         batch_size=batch_size,
     )
+    pipeline_result = await pipeline.run(iter_page_documents(), manifest)
 
-    await sync_chunks_to_qdrant(
-        storage_schema_name,
+    if not crawled_file_ids:
+        # The chunks of the previous crawl are kept rather than emptying the source
+        raise ValueError(f"Failed to crawl: no page with content found for {url}")
+
+    removed_file_ids = [file_id for file_id in previous_manifest if file_id not in crawled_file_ids]
+    LOGGER.info(
+        f"Crawled {len(crawled_file_ids)} pages: {pipeline_result.unchanged_files_count} unchanged, "
+        f"{len(pipeline_result.successful_files)} chunked into {len(pipeline_result.new_chunk_ids)} chunks, "
+        f"{len(pipeline_result.failed_files)} failed, {len(removed_file_ids)} no longer crawled"
+    )
+
+    # Previous chunks of modified pages and chunks of pages no longer crawled.
+    # Pages that failed this time keep their previous chunks.
+    await delete_stale_chunks(
+        db_service,
+        qdrant_service,
         storage_table_name,
+        storage_schema_name,
         qdrant_collection_name,
+        str(source_id),
+        chunk_ids_to_keep=pipeline_result.kept_chunk_ids | pipeline_result.new_chunk_ids,
+        file_ids_to_keep={failed_file["file_id"] for failed_file in pipeline_result.failed_files},
+    )
+    save_manifest(
         db_service,
-        qdrant_service,
-        source_id=str(source_id),
-        batch_size=batch_size,
+        manifest_table_name,
+        source_id,
+        pipeline_result.manifest_entries,
+        removed_file_ids,
+        schema_name=storage_schema_name,
     )
 
 
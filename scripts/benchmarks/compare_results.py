@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compare a benchmark JSON result file against a baseline and fail on regressions.
+
+Results are matched by their "name" field. Latency and memory regressions are relative to the
+baseline, recall drops are absolute.
+
+    uv run python -m scripts.benchmarks.compare_results baseline.json current.json
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any
+
+from scripts.benchmarks.utils import load_results
+
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+MEMORY_METRICS = ("peak_rss_mb",)
+RECALL_METRICS = ("recall_at_k",)
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    max_latency_regression: float,
+    max_memory_regression: float,
+    max_recall_drop: float,
+) -> list[str]:
+    """Return one human readable line per regression found (empty when everything is within bounds)."""
+    regressions = []
+    baseline_by_name = {result["name"]: result for result in baseline["results"]}
+    for result in current["results"]:
+        reference = baseline_by_name.get(result["name"])
+        if reference is None:
+            continue
+        for metric in LATENCY_METRICS + MEMORY_METRICS:
+            if metric not in result or not reference.get(metric):
+                continue
+            allowed = max_latency_regression if metric in LATENCY_METRICS else max_memory_regression
+            ratio = result[metric] / reference[metric] - 1
+            if ratio > allowed:
+                regressions.append(
+                    f"{result['name']}: {metric} {reference[metric]} -> {result[metric]} (+{ratio:.0%}, allowed "
+                    f"+{allowed:.0%})"
+                )
+        for metric in RECALL_METRICS:
+            if metric not in result or metric not in reference:
+                continue
+            drop = reference[metric] - result[metric]
+            if drop > max_recall_drop:
+                regressions.append(
+                    f"{result['name']}: {metric} {reference[metric]} -> {result[metric]} (-{drop:.3f}, allowed "
+                    f"-{max_recall_drop:.3f})"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare benchmark results against a baseline")
+    parser.add_argument("baseline", type=Path, help="Baseline JSON results")
+    parser.add_argument("current", type=Path, help="JSON results to check")
+    parser.add_argument("--max-latency-regression", type=float, default=0.25, help="Relative (default: 0.25)")
+    parser.add_argument("--max-memory-regression", type=float, default=0.25, help="Relative (default: 0.25)")
+    parser.add_argument("--max-recall-drop", type=float, default=0.02, help="Absolute (default: 0.02)")
+    args = parser.parse_args()
+
+    regressions = compare_results(
+        baseline=load_results(args.baseline),
+        current=load_results(args.current),
+        max_latency_regression=args.max_latency_regression,
+        max_memory_regression=args.max_memory_regression,
+        max_recall_drop=args.max_recall_drop,
+    )
+    if regressions:
+        print("❌ Benchmark regressions found:")
+        for regression in regressions:
+            print(f"   {regression}")
+        sys.exit(1)
+    print("✅ No benchmark regression")
+
+
+if __name__ == "__main__":
+    main()
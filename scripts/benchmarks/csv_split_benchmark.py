@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+CSV splitting benchmark: time to cut synthetic long and wide tables into token-bounded markdown chunks,
+as done by data_ingestion/document/csv_ingestion.py.
+
+    uv run python -m scripts.benchmarks.csv_split_benchmark --output results.json
+    uv run python -m scripts.benchmarks.csv_split_benchmark --legacy-max-rows 2000
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from data_ingestion.utils import get_chunk_token_count, split_df_by_token_limit
+from scripts.benchmarks.utils import peak_rss_mb, summarize_latencies, timer, write_results
+
+LOGGER = logging.getLogger(__name__)
+
+WORDS = ["alpha", "beta", "gamma", "delta", "invoice", "contract", "Paris", "Berlin", "total", "pending"]
+
+
+def generate_table(number_of_rows: int, number_of_columns: int, seed: int) -> pd.DataFrame:
+    """Mixed text, integer, float and date columns with variable cell widths."""
+    rng = np.random.default_rng(seed)
+    columns: dict[str, Any] = {}
+    for column_index in range(number_of_columns):
+        kind = column_index % 4
+        name = f"column_{column_index}"
+        if kind == 0:
+            lengths = rng.integers(1, 8, size=number_of_rows)
+            words = rng.choice(WORDS, size=(number_of_rows, 8))
+            columns[name] = [" ".join(row[:length]) for row, length in zip(words, lengths, strict=True)]
+        elif kind == 1:
+            columns[name] = rng.integers(0, 1_000_000, size=number_of_rows)
+        elif kind == 2:
+            columns[name] = np.round(rng.normal(1000, 250, size=number_of_rows), 2)
+        else:
+            columns[name] = pd.Timestamp("2020-01-01") + pd.to_timedelta(
+                rng.integers(0, 2000, size=number_of_rows), unit="D"
+            )
+    return pd.DataFrame(columns)
+
+
+def legacy_split_df_by_token_limit(df: pd.DataFrame, max_tokens: int) -> list[pd.DataFrame]:
+    """Previous row-by-row implementation, which re-renders the whole pending chunk for each row."""
+    chunks = []
+    current_chunk = []
+    for _, row in df.iterrows():
+        current_chunk.append(row)
+        temp_df = pd.DataFrame(current_chunk, columns=df.columns).reset_index(drop=True)
+        if get_chunk_token_count(chunk_df=temp_df) > max_tokens:
+            current_chunk.pop()
+            chunks.append(pd.DataFrame(current_chunk, columns=df.columns).reset_index(drop=True))
+            current_chunk = [row]
+    if current_chunk:
+        chunks.append(pd.DataFrame(current_chunk, columns=df.columns).reset_index(drop=True))
+    return chunks
+
+
+def benchmark_split(name: str, df: pd.DataFrame, split_function, max_tokens: int, repeats: int) -> dict[str, Any]:
+    durations = []
+    for _ in range(repeats):
+        with timer() as elapsed:
+            chunks = split_function(df, max_tokens)
+        durations.append(elapsed["seconds"])
+    summary = summarize_latencies(durations)
+    chunk_token_counts = [get_chunk_token_count(chunk_df=chunk) for chunk in chunks]
+    return {
+        "name": name,
+        "rows": len(df),
+        "columns": df.shape[1],
+        "max_tokens": max_tokens,
+        "repeats": repeats,
+        "p50_ms": summary["p50_ms"],
+        "p95_ms": summary["p95_ms"],
+        "p99_ms": summary["p99_ms"],
+        "rows_per_second": round(len(df) / (summary["p50_ms"] / 1000), 1) if summary["p50_ms"] else 0.0,
+        "chunks": len(chunks),
+        "max_chunk_tokens": max(chunk_token_counts),
+        "mean_chunk_tokens": round(float(np.mean(chunk_token_counts)), 1),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark token-bounded CSV splitting")
+    parser.add_argument("--long-shape", type=int, nargs=2, default=[50_000, 8], metavar=("ROWS", "COLUMNS"))
+    parser.add_argument("--wide-shape", type=int, nargs=2, default=[10_000, 40], metavar=("ROWS", "COLUMNS"))
+    parser.add_argument("--max-tokens", type=int, default=1024, help="Chunk size in tokens (default: 1024)")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per table (default: 3)")
+    parser.add_argument(
+        "--legacy-max-rows",
+        type=int,
+        default=0,
+        help="Also time the previous quadratic implementation on the first N rows of each table (default: off)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results/csv_split.json"))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    tables = {
+        "long": generate_table(*args.long_shape, seed=args.seed),
+        "wide": generate_table(*args.wide_shape, seed=args.seed + 1),
+    }
+    results = []
+    for shape, df in tables.items():
+        runs = [(f"csv_split/{shape}/{len(df)}x{df.shape[1]}", df, split_df_by_token_limit, args.repeats)]
+        if args.legacy_max_rows:
+            legacy_df = df.head(args.legacy_max_rows)
+            runs.append((
+                f"csv_split_legacy/{shape}/{len(legacy_df)}x{df.shape[1]}",
+                legacy_df,
+                legacy_split_df_by_token_limit,
+                1,
+            ))
+        for name, table, split_function, repeats in runs:
+            result = benchmark_split(name, table, split_function, args.max_tokens, repeats)
+            results.append(result)
+            LOGGER.info(
+                f"{name}: p50={result['p50_ms']}ms rows/s={result['rows_per_second']} chunks={result['chunks']} "
+                f"max_chunk_tokens={result['max_chunk_tokens']}"
+            )
+
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    write_results("csv_split", config, results, args.output)
+    print(f"✅ Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Fake Firecrawl server: the crawl endpoints of the Firecrawl v2 API, serving an in-memory website on a local port,
+for tests and for the website ingestion benchmark.
+
+Pages are scraped at a configurable rate after a crawl starts, and crawl status responses hold a few pages each
+with a `next` cursor, like the real API, so clients can be tested on crawls that are still running.
+
+    uv run python -m scripts.benchmarks.fake_firecrawl_server --pages 1000 --pages-per-second 50 --port 3002
+    FIRECRAWL_API_URL=http://127.0.0.1:3002 FIRECRAWL_API_KEY=fc-fake ...
+"""
+
+import argparse
+import random
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+
+WORDS = ["alpha", "beta", "gamma", "delta", "invoice", "contract", "Paris", "Berlin", "total", "pending", "the", "of"]
+
+
+def generate_website(number_of_pages: int, seed: int = 0, base_url: str = "https://example.com") -> dict[str, str]:
+    """Markdown pages of a website, by URL, with a few sections of random words each."""
+    rng = random.Random(seed)
+    pages = {}
+    for page_index in range(number_of_pages):
+        sections = []
+        for section_index in range(rng.randint(2, 6)):
+            paragraph = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 200)))
+            sections.append(f"## Section {section_index}\n\n{paragraph}.")
+        pages[f"{base_url}/page-{page_index}"] = f"# Page {page_index}\n\n" + "\n\n".join(sections)
+    return pages
+
+
+@dataclass
+class _Crawl:
+    started_at: float
+    urls: list[str]
+    request: dict[str, Any]
+    cancelled: bool = False
+    status_requests: int = 0
+
+
+@dataclass
+class FakeFirecrawlServer:
+    """
+    pages: markdown content by URL, read when a page is served, so tests can edit the site between two crawls.
+    pages_per_second: rate at which the pages of a crawl become available, None for all at once.
+    documents_per_response: pages per crawl status response, before a `next` cursor.
+    """
+
+    pages: dict[str, str]
+    pages_per_second: Optional[float] = None
+    documents_per_response: int = 10
+    host: str = "127.0.0.1"
+    port: int = 0
+    crawls: dict[str, _Crawl] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.app = self._create_app()
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _available_pages(self, crawl: _Crawl) -> int:
+        if self.pages_per_second is None:
+            return len(crawl.urls)
+        return min(len(crawl.urls), int((time.monotonic() - crawl.started_at) * self.pages_per_second))
+
+    def is_completed(self, crawl_id: str) -> bool:
+        crawl = self.crawls[crawl_id]
+        return self._available_pages(crawl) == len(crawl.urls)
+
+    def _create_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.post("/v2/crawl")
+        async def start_crawl(request: Request) -> dict:
+            body = await request.json()
+            urls = list(self.pages)[: body.get("limit") or len(self.pages)]
+            crawl_id = str(uuid.uuid4())
+            self.crawls[crawl_id] = _Crawl(started_at=time.monotonic(), urls=urls, request=body)
+            return {"success": True, "id": crawl_id, "url": f"{self.url}/v2/crawl/{crawl_id}"}
+
+        @app.get("/v2/crawl/{crawl_id}")
+        async def get_crawl_status(crawl_id: str, skip: int = 0) -> dict:
+            crawl = self.crawls.get(crawl_id)
+            if crawl is None:
+                raise HTTPException(status_code=404, detail="Crawl not found")
+            crawl.status_requests += 1
+            available = self._available_pages(crawl)
+            if crawl.cancelled:
+                status = "cancelled"
+            elif available == len(crawl.urls):
+                status = "completed"
+            else:
+                status = "scraping"
+            end = min(available, skip + self.documents_per_response)
+            data = [
+                {
+                    "markdown": self.pages[page_url],
+                    "metadata": {"url": page_url, "sourceURL": page_url, "title": page_url, "statusCode": 200},
+                }
+                for page_url in crawl.urls[skip:end]
+            ]
+            has_more = status == "scraping" or end < len(crawl.urls)
+            return {
+                "success": True,
+                "status": status,
+                "completed": available,
+                "total": len(crawl.urls),
+                "creditsUsed": available,
+                "expiresAt": (datetime.now(timezone.utc) + timedelta(days=1)).isoformat(),
+                "next": f"{self.url}/v2/crawl/{crawl_id}?skip={max(end, skip)}" if has_more else None,
+                "data": data,
+            }
+
+        @app.delete("/v2/crawl/{crawl_id}")
+        async def cancel_crawl(crawl_id: str) -> dict:
+            if crawl_id not in self.crawls:
+                raise HTTPException(status_code=404, detail="Crawl not found")
+            self.crawls[crawl_id].cancelled = True
+            return {"status": "cancelled"}
+
+        return app
+
+    def start(self) -> str:
+        """Serve in a background thread and return the base URL, to use as FIRECRAWL_API_URL."""
+        if self.port == 0:
+            with socket.socket() as free_socket:
+                free_socket.bind((self.host, 0))
+                self.port = free_socket.getsockname()[1]
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=self.host, port=self.port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self) -> "FakeFirecrawlServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=1000, help="Number of pages of the website")
+    parser.add_argument(
+        "--pages-per-second", type=float, default=None, help="Scraping rate, all pages at once if unset"
+    )
+    parser.add_argument("--documents-per-response", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3002)
+    args = parser.parse_args()
+
+    server = FakeFirecrawlServer(
+        pages=generate_website(args.pages, seed=args.seed),
+        pages_per_second=args.pages_per_second,
+        documents_per_response=args.documents_per_response,
+        host=args.host,
+        port=args.port,
+    )
+    uvicorn.run(server.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Markdown chunking benchmark: time to parse and chunk generated deep and wide markdown documents,
+as done by data_ingestion/markdown/tree_chunker.py for markdown and PDF ingestion.
+
+    uv run python -m scripts.benchmarks.markdown_chunker_benchmark --output results.json
+    uv run python -m scripts.benchmarks.markdown_chunker_benchmark --legacy
+"""
+
+import argparse
+import logging
+import random
+from pathlib import Path
+from typing import Any
+
+from data_ingestion.markdown.markdown_parser import MarkdownLevel, parse_markdown_to_tree
+from data_ingestion.markdown.tree_chunker import TreeChunk, TreeChunker, add_header_content_to_first_markdown_node
+from scripts.benchmarks.utils import peak_rss_mb, summarize_latencies, timer, write_results
+
+LOGGER = logging.getLogger(__name__)
+
+WORDS = ["alpha", "beta", "gamma", "delta", "invoice", "contract", "Paris", "Berlin", "total", "pending", "the", "of"]
+
+
+def _paragraph(rng: random.Random, number_of_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(number_of_words)) + "."
+
+
+def generate_deep_markdown(number_of_sections: int, seed: int) -> str:
+    """Repeated H1 > H2 > ... > H6 chains with a paragraph under every header."""
+    rng = random.Random(seed)
+    lines = []
+    for section_index in range(number_of_sections):
+        for depth in range(1, 7):
+            lines.append(f"{'#' * depth} Section {section_index} level {depth}")
+            lines.append(_paragraph(rng, rng.randint(10, 80)))
+    return "\n".join(lines)
+
+
+def generate_wide_markdown(number_of_sections: int, seed: int) -> str:
+    """A single H1 with many short H2 sections, i.e. thousands of siblings to combine."""
+    rng = random.Random(seed)
+    lines = ["# Document"]
+    for section_index in range(number_of_sections):
+        lines.append(f"## Item {section_index}")
+        lines.append(_paragraph(rng, rng.randint(5, 30)))
+    return "\n".join(lines)
+
+
+class LegacyTreeChunker(TreeChunker):
+    """Previous implementation: one recursion level per sibling, every merged chunk re-tokenized."""
+
+    def _combine_chunks(self, chunks: list[TreeChunk]) -> list[TreeChunk]:
+        if len(chunks) == 0:
+            return []
+        elif len(chunks) == 1:
+            if self._count_tokens(chunks[0].content) > self._chunk_size:
+                return self._split_text(chunks[0])
+            return chunks
+        else:
+            first_chunks = self._combine_chunks(chunks[:-1])
+            current_chunk = first_chunks[-1]
+            last_chunk = chunks[-1]
+            if self._count_tokens(last_chunk.content) > self._chunk_size:
+                first_chunks += self._split_text(last_chunk)
+            elif self._count_tokens(current_chunk.content) + self._count_tokens(last_chunk.content) > self._chunk_size:
+                first_chunks.append(last_chunk)
+            else:
+                current_chunk += last_chunk
+                first_chunks[-1] = current_chunk
+            return first_chunks
+
+    def _fetch_ancestors_to_level(self, ancestors: list[TreeChunk], level: MarkdownLevel) -> list[TreeChunk]:
+        if len(ancestors) == 0:
+            return ancestors
+        if level.value > ancestors[-1].level.value:
+            return ancestors
+        else:
+            return self._fetch_ancestors_to_level(ancestors[:-1], level)
+
+
+def benchmark_chunker(
+    name: str, markdown: str, chunker_class: type[TreeChunker], chunk_size: int, repeats: int
+) -> dict[str, Any]:
+    durations = []
+    chunks: list[TreeChunk] = []
+    error = None
+    for _ in range(repeats):
+        # Fresh chunker per run so the token-count cache does not carry over between runs
+        chunker = chunker_class(chunk_size=chunk_size)
+        with timer() as elapsed:
+            try:
+                tree = add_header_content_to_first_markdown_node(parse_markdown_to_tree(markdown, "benchmark"))
+                chunks = chunker.chunk_tree(tree)
+            except RecursionError:
+                error = "RecursionError"
+        durations.append(elapsed["seconds"])
+        if error:
+            break
+    summary = summarize_latencies(durations)
+    result = {
+        "name": name,
+        "characters": len(markdown),
+        "chunk_size": chunk_size,
+        "repeats": len(durations),
+        "p50_ms": summary["p50_ms"],
+        "p95_ms": summary["p95_ms"],
+        "p99_ms": summary["p99_ms"],
+        "chunks": len(chunks),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark markdown tree chunking")
+    parser.add_argument("--deep-sections", type=int, default=500, help="H1..H6 chains in the deep document")
+    parser.add_argument("--wide-sections", type=int, default=5000, help="H2 sections in the wide document")
+    parser.add_argument("--chunk-size", type=int, default=2048, help="Chunk size in tokens (default: 2048)")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per document (default: 3)")
+    parser.add_argument(
+        "--legacy", action="store_true", help="Also time the previous recursive implementation (single run)"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results/markdown_chunker.json"))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    documents = {
+        f"deep/{args.deep_sections}": generate_deep_markdown(args.deep_sections, seed=args.seed),
+        f"wide/{args.wide_sections}": generate_wide_markdown(args.wide_sections, seed=args.seed + 1),
+    }
+    results = []
+    for shape, markdown in documents.items():
+        runs = [(f"markdown_chunker/{shape}", TreeChunker, args.repeats)]
+        if args.legacy:
+            runs.append((f"markdown_chunker_legacy/{shape}", LegacyTreeChunker, 1))
+        for name, chunker_class, repeats in runs:
+            result = benchmark_chunker(name, markdown, chunker_class, args.chunk_size, repeats)
+            results.append(result)
+            LOGGER.info(
+                f"{name}: p50={result['p50_ms']}ms chunks={result['chunks']} error={result.get('error', 'none')}"
+            )
+
+    write_results(
+        "markdown_chunker", {key: value for key, value in vars(args).items() if key != "output"}, results, args.output
+    )
+    print(f"✅ Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Retrieval benchmark: latency, throughput, recall@k and peak memory of the retrieval stack.
+
+A deterministic synthetic corpus is embedded with a mock embedder, loaded into the in-process
+vector store (engine/local_vector_store.py) through QdrantService.add_chunks_async, then queried
+through QdrantService.retrieve_similar_chunks_async and through the Retriever component (the
+retrieval stage of RAG and HybridRAG) in every search mode, with and without a source filter.
+Recall@k is measured against exact brute-force results computed outside the store.
+
+    uv run python -m scripts.benchmarks.retrieval_benchmark --corpus-sizes 10000 100000 --output results.json
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID
+
+import numpy as np
+from opentelemetry import trace as trace_api
+
+from engine.components.rag.retriever import Retriever
+from engine.local_vector_store import BM25_K1, LocalQdrantService, LocalVectorStore
+from engine.qdrant_service import (
+    SOURCE_ID_COLUMN_NAME,
+    HybridFusion,
+    QdrantCollectionSchema,
+    SearchMode,
+    fuse_ranked_results,
+)
+from scripts.benchmarks.utils import peak_rss_mb, summarize_latencies, timer, write_results
+
+LOGGER = logging.getLogger(__name__)
+
+COLLECTION_NAME = "retrieval_benchmark"
+VOCABULARY_SIZE = 20_000
+NUMBER_OF_TOPICS = 200
+NUMBER_OF_SOURCES = 20
+WORDS_PER_CHUNK = 60
+WORDS_PER_QUERY = 5
+TOPIC_WORD_SHARE = 0.6
+INGESTION_BATCH_SIZE = 1_000
+# Chunks generated and embedded at once: the word vectors of a batch take batch x words x embedding size floats
+GENERATION_BATCH_SIZE = 2_000
+
+
+class MockEmbeddingService:
+    """
+    Deterministic stand-in for EmbeddingService: a text embeds to the normalized mean of fixed
+    random word vectors, so texts sharing words are close without any network call.
+    """
+
+    def __init__(self, embedding_size: int, seed: int):
+        self.embedding_size = embedding_size
+        self._model_name = "mock-embedding"
+        self._word_vectors = (
+            np.random.default_rng(seed).standard_normal((VOCABULARY_SIZE, embedding_size)).astype(np.float32)
+        )
+
+    @staticmethod
+    def word_index(token: str) -> int:
+        if token.startswith("w") and token[1:].isdigit():
+            return int(token[1:]) % VOCABULARY_SIZE
+        return zlib.crc32(token.encode()) % VOCABULARY_SIZE
+
+    def embed_indices(self, word_indices: np.ndarray) -> np.ndarray:
+        vector = self._word_vectors[word_indices].mean(axis=0)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_indices(np.array([self.word_index(token) for token in text.split()], dtype=np.int64))
+
+    async def embed_text_async(self, texts: list[str]) -> list[SimpleNamespace]:
+        return [SimpleNamespace(embedding=self.embed(text).tolist()) for text in texts]
+
+
+class NoopTraceManager:
+    """TraceManager replacement whose spans are non-recording, so tracing export costs nothing."""
+
+    def __init__(self):
+        self._tracer = trace_api.NoOpTracer()
+
+    def start_span(self, name: str, **kwargs):
+        return self._tracer.start_as_current_span(name)
+
+
+@dataclass
+class SyntheticCorpus:
+    chunk_ids: list[str]
+    texts: list[str]
+    word_indices: np.ndarray
+    source_ids: list[str]
+    embeddings: np.ndarray
+
+
+def generate_corpus(size: int, embedder: MockEmbeddingService, seed: int) -> SyntheticCorpus:
+    """Topic-clustered chunks with Zipf-distributed words, fully determined by the seed."""
+    rng = np.random.default_rng(seed)
+    topic_words = rng.integers(0, VOCABULARY_SIZE, size=(NUMBER_OF_TOPICS, 50))
+    zipf_weights = 1 / np.arange(1, VOCABULARY_SIZE + 1)
+    zipf_weights /= zipf_weights.sum()
+    source_uuids = [str(UUID(int=int(value))) for value in rng.integers(1, 2**63, size=NUMBER_OF_SOURCES)]
+    sources = rng.integers(0, NUMBER_OF_SOURCES, size=size)
+
+    word_indices = np.empty((size, WORDS_PER_CHUNK), dtype=np.int32)
+    embeddings = np.empty((size, embedder.embedding_size), dtype=np.float32)
+    for start in range(0, size, GENERATION_BATCH_SIZE):
+        batch_size = min(GENERATION_BATCH_SIZE, size - start)
+        topics = rng.integers(0, NUMBER_OF_TOPICS, size=batch_size)
+        background = rng.choice(VOCABULARY_SIZE, size=(batch_size, WORDS_PER_CHUNK), p=zipf_weights)
+        from_topic = rng.random((batch_size, WORDS_PER_CHUNK)) < TOPIC_WORD_SHARE
+        topic_picks = topic_words[topics[:, None], rng.integers(0, 50, size=(batch_size, WORDS_PER_CHUNK))]
+        batch_words = np.where(from_topic, topic_picks, background)
+        batch_embeddings = embedder._word_vectors[batch_words].mean(axis=1)
+        word_indices[start : start + batch_size] = batch_words
+        embeddings[start : start + batch_size] = batch_embeddings / np.linalg.norm(
+            batch_embeddings, axis=1, keepdims=True
+        )
+
+    return SyntheticCorpus(
+        chunk_ids=[f"chunk-{i}" for i in range(size)],
+        texts=[" ".join(f"w{index}" for index in row) for row in word_indices],
+        word_indices=word_indices,
+        source_ids=[source_uuids[source] for source in sources],
+        embeddings=embeddings,
+    )
+
+
+class ExactBM25:
+    """
+    Okapi BM25 (same k1 and IDF as the store) computed by scanning the word indices of the whole corpus,
+    independently of the inverted index of the store. Every chunk has WORDS_PER_CHUNK words, so the length
+    normalization is 1 and b plays no part.
+    """
+
+    def __init__(self, corpus: SyntheticCorpus):
+        self._word_indices = corpus.word_indices
+        self._source_ids = np.asarray(corpus.source_ids)
+        document_frequencies = np.zeros(VOCABULARY_SIZE, dtype=np.int64)
+        for start in range(0, len(corpus.word_indices), GENERATION_BATCH_SIZE):
+            rows = np.sort(corpus.word_indices[start : start + GENERATION_BATCH_SIZE], axis=1)
+            first_occurrences = np.ones(rows.shape, dtype=bool)
+            first_occurrences[:, 1:] = rows[:, 1:] != rows[:, :-1]
+            document_frequencies += np.bincount(rows[first_occurrences], minlength=VOCABULARY_SIZE)
+        self._document_frequencies = document_frequencies
+
+    def scores(self, query_text: str, source_id: Optional[str]) -> np.ndarray:
+        """BM25 score of every chunk, -inf for the chunks matching no query word or outside the source."""
+        document_count = len(self._word_indices)
+        scores = np.zeros(document_count)
+        for word in {MockEmbeddingService.word_index(token) for token in query_text.split()}:
+            document_frequency = self._document_frequencies[word]
+            if document_frequency == 0:
+                continue
+            idf = np.log((document_count - document_frequency + 0.5) / (document_frequency + 0.5) + 1.0)
+            term_frequencies = (self._word_indices == word).sum(axis=1)
+            scores += idf * term_frequencies * (BM25_K1 + 1) / (term_frequencies + BM25_K1)
+        matches = scores > 0
+        if source_id is not None:
+            matches &= self._source_ids == source_id
+        return np.where(matches, scores, -np.inf)
+
+
+def generate_queries(corpus: SyntheticCorpus, count: int, seed: int) -> list[tuple[str, str]]:
+    """(query text, source id of the chunk it was drawn from) pairs."""
+    rng = np.random.default_rng(seed + 1)
+    queries = []
+    for chunk_index in rng.integers(0, len(corpus.chunk_ids), size=count):
+        words = rng.choice(corpus.word_indices[chunk_index], size=WORDS_PER_QUERY, replace=False)
+        queries.append((" ".join(f"w{index}" for index in words), corpus.source_ids[chunk_index]))
+    return queries
+
+
+async def ingest_corpus(service: LocalQdrantService, corpus: SyntheticCorpus) -> float:
+    await service.create_collection_async(COLLECTION_NAME)
+    with timer() as elapsed:
+        for start in range(0, len(corpus.chunk_ids), INGESTION_BATCH_SIZE):
+            end = start + INGESTION_BATCH_SIZE
+            chunks = [
+                {
+                    "chunk_id": chunk_id,
+                    "content": text,
+                    "file_id": f"file-{index // 10}",
+                    "url": f"https://example.com/{index // 10}",
+                    SOURCE_ID_COLUMN_NAME: source_id,
+                }
+                for index, chunk_id, text, source_id in zip(
+                    range(start, end),
+                    corpus.chunk_ids[start:end],
+                    corpus.texts[start:end],
+                    corpus.source_ids[start:end],
+                    strict=False,
+                )
+            ]
+            await service.add_chunks_async(chunks, COLLECTION_NAME)
+    return elapsed["seconds"]
+
+
+def _source_filter(source_id: Optional[str]) -> Optional[dict]:
+    if source_id is None:
+        return None
+    return {"must": [{"key": SOURCE_ID_COLUMN_NAME, "match": {"value": source_id}}]}
+
+
+def exact_results(
+    corpus: SyntheticCorpus,
+    embedder: MockEmbeddingService,
+    bm25: ExactBM25,
+    query_text: str,
+    source_id: Optional[str],
+    search_mode: SearchMode,
+    top_k: int,
+) -> list[str]:
+    """
+    Brute-force ground truth: exhaustive dense scan and BM25 scan in numpy, and fusion of the two.
+    BM25 scores tie often; keyword results include every chunk tied with the k-th one.
+    """
+    depth = top_k * 2 if search_mode == SearchMode.HYBRID else top_k
+    dense: list[tuple[str, float, dict]] = []
+    if search_mode != SearchMode.KEYWORD:
+        scores = corpus.embeddings @ embedder.embed(query_text)
+        if source_id is not None:
+            scores = np.where(np.asarray(corpus.source_ids) == source_id, scores, -np.inf)
+        top = np.argsort(-scores)[:depth]
+        dense = [(corpus.chunk_ids[i], float(scores[i]), {}) for i in top if np.isfinite(scores[i])]
+    if search_mode == SearchMode.SEMANTIC:
+        return [chunk_id for chunk_id, _, _ in dense]
+
+    scores = bm25.scores(query_text, source_id)
+    # Ties are broken by corpus order, which is also the order in which the store indexed the chunks
+    ranked = [i for i in np.argsort(-scores, kind="stable") if np.isfinite(scores[i])]
+    if search_mode == SearchMode.KEYWORD:
+        cutoff = scores[ranked[top_k - 1]] if len(ranked) >= top_k else -np.inf
+        return [corpus.chunk_ids[i] for i in ranked if scores[i] >= cutoff]
+    sparse = [(corpus.chunk_ids[i], float(scores[i]), {}) for i in ranked[:depth]]
+    return [chunk_id for chunk_id, _, _ in fuse_ranked_results([sparse, dense], HybridFusion.RRF, top_k)]
+
+
+async def run_queries(
+    search: Callable[[str, Optional[str]], Awaitable[list[str]]],
+    queries: list[tuple[str, Optional[str]]],
+    concurrency: int,
+) -> tuple[list[float], list[list[str]], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = [0.0] * len(queries)
+    found: list[list[str]] = [[] for _ in queries]
+
+    async def run_one(index: int, query_text: str, source_id: Optional[str]) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            found[index] = await search(query_text, source_id)
+            latencies[index] = time.perf_counter() - start
+
+    with timer() as elapsed:
+        await asyncio.gather(*(run_one(i, text, source) for i, (text, source) in enumerate(queries)))
+    return latencies, found, elapsed["seconds"]
+
+
+def _make_search(
+    entrypoint: str, service: LocalQdrantService, search_mode: SearchMode, top_k: int
+) -> Callable[[str, Optional[str]], Awaitable[list[str]]]:
+    if entrypoint == "qdrant_service":
+
+        async def search(query_text: str, source_id: Optional[str]) -> list[str]:
+            chunks = await service.retrieve_similar_chunks_async(
+                query_text=query_text,
+                collection_name=COLLECTION_NAME,
+                limit=top_k,
+                filter=_source_filter(source_id),
+                search_mode=search_mode,
+            )
+            return [chunk.name for chunk in chunks]
+
+        return search
+
+    retrievers: dict[Optional[str], Retriever] = {}
+
+    async def search(query_text: str, source_id: Optional[str]) -> list[str]:
+        if source_id not in retrievers:
+            retrievers[source_id] = Retriever(
+                trace_manager=NoopTraceManager(),
+                qdrant_service=service,
+                collection_name=COLLECTION_NAME,
+                max_retrieved_chunks=top_k,
+                source_ids=[UUID(source_id)] if source_id else None,
+                search_mode=search_mode,
+            )
+        chunks = await retrievers[source_id].get_chunks(query_text=query_text)
+        return [chunk.name for chunk in chunks]
+
+    return search
+
+
+def recall_at_k(found: list[list[str]], expected: list[list[str]], top_k: int) -> float:
+    """Any chunk of the expected results counts as a hit: they can hold more than top_k chunks when scores tie."""
+    recalls = [
+        len(set(hits[:top_k]) & set(truth)) / min(len(truth), top_k)
+        for hits, truth in zip(found, expected, strict=True)
+        if truth
+    ]
+    return round(float(np.mean(recalls)), 4) if recalls else 0.0
+
+
+async def benchmark_corpus_size(
+    corpus_size: int,
+    number_of_queries: int,
+    top_k: int,
+    embedding_size: int,
+    use_hnsw: bool,
+    concurrency: int,
+    entrypoints: list[str],
+    search_modes: list[SearchMode],
+    seed: int,
+) -> list[dict[str, Any]]:
+    embedder = MockEmbeddingService(embedding_size=embedding_size, seed=seed)
+    corpus = generate_corpus(corpus_size, embedder, seed)
+    bm25 = ExactBM25(corpus)
+    service = LocalQdrantService(
+        default_schema=QdrantCollectionSchema(
+            chunk_id_field="chunk_id",
+            content_field="content",
+            file_id_field="file_id",
+            url_id_field="url",
+            source_id_field=SOURCE_ID_COLUMN_NAME,
+        ),
+        embedding_service=embedder,
+        max_chunks_to_add=INGESTION_BATCH_SIZE,
+        store=LocalVectorStore(use_hnsw=use_hnsw),
+    )
+    ingestion_seconds = await ingest_corpus(service, corpus)
+    LOGGER.info(f"Ingested {corpus_size} chunks in {ingestion_seconds:.1f}s")
+
+    sampled_queries = generate_queries(corpus, number_of_queries, seed)
+    query_sets = {
+        "unfiltered": [(text, None) for text, _ in sampled_queries],
+        "filtered": sampled_queries,
+    }
+    results = []
+    for search_mode in search_modes:
+        for filter_name, queries in query_sets.items():
+            expected = [
+                exact_results(corpus, embedder, bm25, text, source_id, search_mode, top_k)
+                for text, source_id in queries
+            ]
+            for entrypoint in entrypoints:
+                search = _make_search(entrypoint, service, search_mode, top_k)
+                latencies, found, wall_time = await run_queries(search, queries, concurrency)
+                name = f"{entrypoint}/{search_mode.value}/{filter_name}/{corpus_size}"
+                results.append({
+                    "name": name,
+                    "entrypoint": entrypoint,
+                    "search_mode": search_mode.value,
+                    "filtered": filter_name == "filtered",
+                    "corpus_size": corpus_size,
+                    "top_k": top_k,
+                    **summarize_latencies(latencies, wall_time),
+                    "recall_at_k": recall_at_k(found, expected, top_k),
+                    "ingestion_seconds": round(ingestion_seconds, 2),
+                    "peak_rss_mb": peak_rss_mb(),
+                })
+                LOGGER.info(
+                    f"{name}: p50={results[-1]['p50_ms']}ms p99={results[-1]['p99_ms']}ms "
+                    f"qps={results[-1]['qps']} recall@{top_k}={results[-1]['recall_at_k']}"
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark retrieval latency, throughput and recall")
+    parser.add_argument("--corpus-sizes", type=int, nargs="+", default=[10_000], help="Chunks per corpus")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per scenario (default: 200)")
+    parser.add_argument("--top-k", type=int, default=10, help="Chunks retrieved per query (default: 10)")
+    parser.add_argument("--embedding-size", type=int, default=256, help="Mock embedding size (default: 256)")
+    parser.add_argument("--hnsw", action="store_true", help="Use the HNSW index (requires hnswlib)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent queries (default: 1)")
+    parser.add_argument(
+        "--entrypoints",
+        nargs="+",
+        choices=["qdrant_service", "retriever"],
+        default=["qdrant_service", "retriever"],
+    )
+    parser.add_argument(
+        "--search-modes", nargs="+", choices=[mode.value for mode in SearchMode], default=[m.value for m in SearchMode]
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results/retrieval.json"))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    for noisy_logger in ("engine.qdrant_service", "engine.components.rag.retriever"):
+        logging.getLogger(noisy_logger).setLevel(logging.WARNING)
+
+    results = []
+    # Ascending sizes keep the process-wide peak RSS meaningful for each size
+    for corpus_size in sorted(args.corpus_sizes):
+        results.extend(
+            asyncio.run(
+                benchmark_corpus_size(
+                    corpus_size=corpus_size,
+                    number_of_queries=args.queries,
+                    top_k=args.top_k,
+                    embedding_size=args.embedding_size,
+                    use_hnsw=args.hnsw,
+                    concurrency=args.concurrency,
+                    entrypoints=args.entrypoints,
+                    search_modes=[SearchMode(mode) for mode in args.search_modes],
+                    seed=args.seed,
+                )
+            )
+        )
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    write_results("retrieval", config, results, args.output)
+    print(f"✅ Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Trace payload serialization benchmark: time to serialize representative agent payloads (message histories,
+retrieval results, DataFrames) as component spans do, and to turn them into span message content as the SQL
+exporter does.
+
+    uv run python -m scripts.benchmarks.trace_serializer_benchmark --output results.json
+    uv run python -m scripts.benchmarks.trace_serializer_benchmark --legacy
+"""
+
+import argparse
+import json
+import logging
+import random
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pandas as pd
+from pydantic import SecretStr
+
+from engine.components.types import AgentPayload, ChatMessage, SourceChunk
+from engine.components.utils import shorten_base64_string
+from engine.trace import serializer
+from engine.trace.serializer import serialize_to_json_bytes
+from engine.trace.sql_exporter import _message_content, parse_str_or_dict, sanitize_json_string
+from scripts.benchmarks.utils import peak_rss_mb, summarize_latencies, timer, write_results
+from shared.log_redaction import redact_sensitive
+
+LOGGER = logging.getLogger(__name__)
+
+WORDS = ["alpha", "beta", "gamma", "delta", "invoice", "contract", "Paris", "Berlin", "total", "pending", "the", "of"]
+
+
+def _text(rng: random.Random, number_of_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(number_of_words))
+
+
+def generate_message_history(number_of_messages: int, seed: int) -> dict[str, Any]:
+    """AgentPayload of a long conversation with tool calls, as an AI agent receives it."""
+    rng = random.Random(seed)
+    messages = []
+    for index in range(number_of_messages):
+        if index % 5 == 4:
+            messages.append(
+                ChatMessage(
+                    role="assistant",
+                    tool_calls=[
+                        {
+                            "id": f"call_{index}",
+                            "type": "function",
+                            "function": {"name": "search", "arguments": json.dumps({"query": _text(rng, 8)})},
+                        }
+                    ],
+                )
+            )
+            messages.append(ChatMessage(role="tool", tool_call_id=f"call_{index}", content=_text(rng, 300)))
+        else:
+            messages.append(ChatMessage(role="user" if index % 2 else "assistant", content=_text(rng, 80)))
+    return {
+        "messages": AgentPayload(messages=messages).messages,
+        "api_key": SecretStr("sk-benchmark"),
+        "headers": {"Authorization": "Bearer sk-benchmark"},
+    }
+
+
+def generate_retrieval_results(number_of_chunks: int, seed: int) -> dict[str, Any]:
+    """Sources of a retriever output: chunks with their metadata."""
+    rng = random.Random(seed)
+    sources = [
+        SourceChunk(
+            name=f"chunk_{index}",
+            document_name=f"document_{index % 20}.pdf",
+            content=_text(rng, 250),
+            url=f"https://example.com/documents/{index % 20}",
+            metadata={"page": index % 50, "score": rng.random(), "section": _text(rng, 4), "token_count": 300},
+        )
+        for index in range(number_of_chunks)
+    ]
+    return {"response": _text(rng, 120), "sources": sources}
+
+
+def generate_dataframe(number_of_rows: int, seed: int) -> dict[str, Any]:
+    """A table output, as produced by the table and database components."""
+    rng = random.Random(seed)
+    dataframe = pd.DataFrame({
+        "id": range(number_of_rows),
+        "customer": [_text(rng, 2) for _ in range(number_of_rows)],
+        "city": [rng.choice(["Paris", "Berlin", "Madrid"]) for _ in range(number_of_rows)],
+        "amount": [rng.random() * 1000 for _ in range(number_of_rows)],
+        "status": [rng.choice(["paid", "pending"]) for _ in range(number_of_rows)],
+        "notes": [_text(rng, 12) for _ in range(number_of_rows)],
+    })
+    return {"table": dataframe, "rows": dataframe.to_dict(orient="records")}
+
+
+def _legacy_serialize_object(obj: Any, visited: Optional[set] = None) -> Any:
+    """Previous implementation: a copy of the payload, with plain model_dump() of the models."""
+    if visited is None:
+        visited = set()
+    if obj is None:
+        return None
+    elif isinstance(obj, SecretStr):
+        return str(obj)
+    elif isinstance(obj, str):
+        return shorten_base64_string(obj)
+    elif isinstance(obj, (int, float, bool)):
+        return obj
+    elif isinstance(obj, (list, tuple, set)):
+        return [_legacy_serialize_object(item, visited) for item in obj]
+    elif isinstance(obj, dict):
+        if id(obj) in visited:
+            return f"<Circular reference to {type(obj).__name__}>"
+        visited.add(id(obj))
+        try:
+            return {key: _legacy_serialize_object(value, visited) for key, value in obj.items()}
+        finally:
+            visited.remove(id(obj))
+    elif hasattr(obj, "model_dump"):
+        return _legacy_serialize_object(obj.model_dump(), visited)
+    return str(obj)
+
+
+def legacy_serialize(payload: Any, max_chars: int, max_items: int, max_total_chars: int) -> str:
+    """Previous implementation: a copy, then a redacted copy, then json.dumps. It had no caps."""
+    return json.dumps(redact_sensitive(_legacy_serialize_object(payload)))
+
+
+def legacy_message_content(serialized: str) -> str:
+    """Previous exporter path: the attribute is parsed and dumped again."""
+    parsed = parse_str_or_dict(serialized)
+    return sanitize_json_string(json.dumps(parsed if isinstance(parsed, list) else [parsed], ensure_ascii=False))
+
+
+def serialize(payload: Any, max_chars: int, max_items: int, max_total_chars: int) -> bytes:
+    return serialize_to_json_bytes(
+        payload,
+        shorten_string=True,
+        max_string_chars=max_chars,
+        max_items=max_items,
+        max_total_chars=max_total_chars,
+    )
+
+
+def message_content(serialized: bytes) -> str:
+    return _message_content([], serialized)
+
+
+def benchmark_serializer(
+    name: str,
+    payload: Any,
+    serialize_function: Callable[[Any, int, int, int], Any],
+    content_function: Callable[[Any], str],
+    max_chars: int,
+    max_items: int,
+    max_total_chars: int,
+    repeats: int,
+) -> dict[str, Any]:
+    serialize_durations = []
+    content_durations = []
+    serialized: Any = b""
+    content = ""
+    for _ in range(repeats):
+        with timer() as elapsed:
+            serialized = serialize_function(payload, max_chars, max_items, max_total_chars)
+        serialize_durations.append(elapsed["seconds"])
+        with timer() as elapsed:
+            content = content_function(serialized)
+        content_durations.append(elapsed["seconds"])
+    serialize_summary = summarize_latencies(serialize_durations)
+    content_summary = summarize_latencies(content_durations)
+    return {
+        "name": name,
+        "repeats": repeats,
+        "p50_ms": round(serialize_summary["p50_ms"] + content_summary["p50_ms"], 3),
+        "p95_ms": round(serialize_summary["p95_ms"] + content_summary["p95_ms"], 3),
+        "p99_ms": round(serialize_summary["p99_ms"] + content_summary["p99_ms"], 3),
+        "serialize_p50_ms": serialize_summary["p50_ms"],
+        "message_content_p50_ms": content_summary["p50_ms"],
+        "serialized_bytes": len(serialized),
+        "message_content_chars": len(content),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the serialization of trace payloads")
+    parser.add_argument("--messages", type=int, default=200, help="Messages in the conversation history")
+    parser.add_argument("--chunks", type=int, default=50, help="Chunks in the retrieval results")
+    parser.add_argument("--rows", type=int, default=2000, help="Rows of the DataFrame")
+    parser.add_argument("--max-chars", type=int, default=100_000, help="String cap (TRACE_PAYLOAD_MAX_CHARS)")
+    parser.add_argument("--max-items", type=int, default=1_000, help="Collection cap (TRACE_PAYLOAD_MAX_ITEMS)")
+    parser.add_argument(
+        "--max-total-chars", type=int, default=500_000, help="Payload cap (TRACE_PAYLOAD_MAX_TOTAL_CHARS)"
+    )
+    parser.add_argument("--repeats", type=int, default=50, help="Timed runs per payload (default: 50)")
+    parser.add_argument("--legacy", action="store_true", help="Also time the previous copy-redact-dump pipeline")
+    parser.add_argument("--no-orjson", action="store_true", help="Encode with the json module even if orjson is there")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results/trace_serializer.json"))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.no_orjson:
+        serializer.orjson = None
+    LOGGER.info(f"Encoder: {'orjson' if serializer.orjson is not None else 'json'}")
+
+    payloads = {
+        f"message_history/{args.messages}": generate_message_history(args.messages, seed=args.seed),
+        f"retrieval_results/{args.chunks}": generate_retrieval_results(args.chunks, seed=args.seed + 1),
+        f"dataframe/{args.rows}": generate_dataframe(args.rows, seed=args.seed + 2),
+    }
+    results = []
+    for shape, payload in payloads.items():
+        runs = [(f"trace_serializer/{shape}", serialize, message_content)]
+        if args.legacy:
+            runs.append((f"trace_serializer_legacy/{shape}", legacy_serialize, legacy_message_content))
+        for name, serialize_function, content_function in runs:
+            result = benchmark_serializer(
+                name,
+                payload,
+                serialize_function,
+                content_function,
+                args.max_chars,
+                args.max_items,
+                args.max_total_chars,
+                args.repeats,
+            )
+            results.append(result)
+            LOGGER.info(
+                f"{name}: p50={result['p50_ms']}ms (serialize={result['serialize_p50_ms']}ms, "
+                f"message content={result['message_content_p50_ms']}ms) bytes={result['serialized_bytes']}"
+            )
+
+    write_results(
+        "trace_serializer", {key: value for key, value in vars(args).items() if key != "output"}, results, args.output
+    )
+    print(f"✅ Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Shared helpers for the benchmark scripts: latency statistics, memory measurement and JSON results."""
+
+import json
+import platform
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+
+def summarize_latencies(latencies_seconds: list[float], wall_time_seconds: Optional[float] = None) -> dict[str, float]:
+    """Return p50/p95/p99/mean latencies in milliseconds and the achieved throughput."""
+    latencies_ms = np.asarray(latencies_seconds, dtype=np.float64) * 1000
+    if wall_time_seconds is None:
+        wall_time_seconds = float(np.sum(latencies_seconds))
+    return {
+        "count": len(latencies_seconds),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+        "mean_ms": round(float(np.mean(latencies_ms)), 3),
+        "qps": round(len(latencies_seconds) / wall_time_seconds, 2) if wall_time_seconds > 0 else 0.0,
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process, in MB."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(max_rss / divisor, 1)
+
+
+@contextmanager
+def timer() -> Iterator[dict[str, float]]:
+    """Measure the wall time of a block: `with timer() as elapsed: ...` then read `elapsed["seconds"]`."""
+    elapsed = {"seconds": 0.0}
+    start = time.perf_counter()
+    try:
+        yield elapsed
+    finally:
+        elapsed["seconds"] = time.perf_counter() - start
+
+
+def write_results(benchmark: str, config: dict[str, Any], results: list[dict[str, Any]], output: Path) -> None:
+    """Write benchmark results in the JSON layout read by compare_results."""
+    document = {
+        "benchmark": benchmark,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "config": config,
+        "results": results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(document, indent=2))
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text())
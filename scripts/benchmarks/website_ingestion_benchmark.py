@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Website ingestion benchmark: crawls a generated website served by the fake Firecrawl server and ingests it with
+upload_website_source into in-memory chunk table and vector store fakes, then recrawls it with some pages edited.
+
+    uv run python -m scripts.benchmarks.website_ingestion_benchmark --output results.json
+    uv run python -m scripts.benchmarks.website_ingestion_benchmark --pages 2000 --pages-per-second 100 --legacy
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+from ingestion_script import ingest_website_source
+from scripts.benchmarks.fake_firecrawl_server import FakeFirecrawlServer, generate_website
+from scripts.benchmarks.utils import peak_rss_mb, timer, write_results
+from settings import settings
+
+LOGGER = logging.getLogger(__name__)
+
+
+class InMemoryDBService:
+    """The DBService calls made by website ingestion, on dicts. SQL filters are ignored: there is one source."""
+
+    def __init__(self):
+        self.tables: dict[str, dict[tuple, dict]] = {}
+
+    def create_schema(self, schema_name: str) -> None:
+        pass
+
+    def table_exists(self, table_name: str, schema_name: Optional[str] = None) -> bool:
+        return table_name in self.tables
+
+    def create_table(self, table_name: str, table_definition, schema_name: Optional[str] = None) -> None:
+        self.tables[table_name] = {}
+
+    def upsert_rows(self, table_name: str, rows: list[dict], schema_name: Optional[str], id_column_names) -> None:
+        table = self.tables[table_name]
+        for row in rows:
+            table[tuple(row[column] for column in id_column_names)] = dict(row)
+
+    def fetch_selected_columns(self, table_name: str, columns: list[str], **kwargs) -> list[dict]:
+        return [{column: row.get(column) for column in columns} for row in self.tables[table_name].values()]
+
+    def delete_rows_from_table(self, table_name: str, ids: list, id_column_name: str, **kwargs) -> None:
+        ids = set(ids)
+        table = self.tables[table_name]
+        for key in [key for key, row in table.items() if row[id_column_name] in ids]:
+            del table[key]
+
+
+class FakeQdrantService:
+    """Counts the chunks embedded and upserted, with a fixed latency per batch standing for the embedding call."""
+
+    def __init__(self, embedding_latency_seconds: float):
+        self.embedding_latency_seconds = embedding_latency_seconds
+        self.embedded_chunks = 0
+        self.first_chunk_indexed_at: Optional[float] = None
+
+    async def collection_exists_async(self, collection_name: str) -> bool:
+        return True
+
+    async def create_index_if_needed_async(self, *args, **kwargs) -> None:
+        pass
+
+    async def add_chunks_async(self, chunks: list[dict], collection_name: str) -> bool:
+        await asyncio.sleep(self.embedding_latency_seconds)
+        self.embedded_chunks += len(chunks)
+        if self.first_chunk_indexed_at is None:
+            self.first_chunk_indexed_at = time.perf_counter()
+        return True
+
+    async def delete_chunks_async(self, *args, **kwargs) -> bool:
+        return True
+
+
+def _buffer_whole_crawl(iter_crawled_pages):
+    """Previous behavior: wait for the whole crawl before processing any page."""
+
+    async def iter_buffered_pages(*args, **kwargs) -> AsyncIterator[ingest_website_source.ScrapedPage]:
+        pages = [page async for page in iter_crawled_pages(*args, **kwargs)]
+        for page in pages:
+            yield page
+
+    return iter_buffered_pages
+
+
+async def ingest(
+    db_service: InMemoryDBService,
+    qdrant_service: FakeQdrantService,
+    source_id: uuid.UUID,
+    number_of_pages: int,
+    batch_size: int,
+) -> None:
+    await ingest_website_source.upload_website_source(
+        db_service=db_service,
+        qdrant_service=qdrant_service,
+        storage_schema_name="public",
+        storage_table_name="org_benchmark_chunks",
+        qdrant_collection_name="org_benchmark_collection",
+        source_id=source_id,
+        url="https://example.com",
+        limit=number_of_pages,
+        batch_size=batch_size,
+        crawl_poll_interval_seconds=0.1,
+    )
+
+
+def benchmark_crawl(
+    name: str,
+    server: FakeFirecrawlServer,
+    db_service: InMemoryDBService,
+    source_id: uuid.UUID,
+    args: argparse.Namespace,
+) -> dict[str, Any]:
+    qdrant_service = FakeQdrantService(args.embedding_latency_ms / 1000)
+    with timer() as elapsed:
+        start = time.perf_counter()
+        asyncio.run(ingest(db_service, qdrant_service, source_id, args.pages, args.batch_size))
+    first_chunk_seconds = (qdrant_service.first_chunk_indexed_at or start) - start
+    return {
+        "name": name,
+        "pages": args.pages,
+        "pages_per_second_crawled": args.pages_per_second,
+        "wall_seconds": round(elapsed["seconds"], 3),
+        "first_chunk_indexed_seconds": round(first_chunk_seconds, 3),
+        "embedded_chunks": qdrant_service.embedded_chunks,
+        "stored_chunks": len(db_service.tables["org_benchmark_chunks"]),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark website ingestion against a fake Firecrawl server")
+    parser.add_argument("--pages", type=int, default=500, help="Number of pages of the website (default: 500)")
+    parser.add_argument(
+        "--pages-per-second", type=float, default=50, help="Crawl rate of the fake Firecrawl server (default: 50)"
+    )
+    parser.add_argument(
+        "--embedding-latency-ms", type=float, default=50, help="Latency of each embedding batch (default: 50)"
+    )
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument(
+        "--changed-fraction", type=float, default=0.1, help="Share of pages edited before the recrawl (default: 0.1)"
+    )
+    parser.add_argument("--legacy", action="store_true", help="Also run with the whole crawl awaited before chunking")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results/website_ingestion.json"))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+
+    pages = generate_website(args.pages, seed=args.seed)
+    iter_crawled_pages = ingest_website_source.iter_crawled_pages
+    results = []
+    with FakeFirecrawlServer(pages=pages, pages_per_second=args.pages_per_second) as server:
+        settings.FIRECRAWL_API_URL = server.url
+        settings.FIRECRAWL_API_KEY = settings.FIRECRAWL_API_KEY or "fc-benchmark"
+
+        modes = [("streaming", iter_crawled_pages)]
+        if args.legacy:
+            modes.append(("legacy", _buffer_whole_crawl(iter_crawled_pages)))
+        for mode, crawl_function in modes:
+            ingest_website_source.iter_crawled_pages = crawl_function
+            db_service = InMemoryDBService()
+            source_id = uuid.uuid4()
+            results.append(
+                benchmark_crawl(f"website_ingestion/{mode}/crawl/{args.pages}", server, db_service, source_id, args)
+            )
+
+            rng = random.Random(args.seed)
+            for page_url in rng.sample(list(pages), int(args.pages * args.changed_fraction)):
+                pages[page_url] += "\n\nEdited paragraph."
+            results.append(
+                benchmark_crawl(f"website_ingestion/{mode}/recrawl/{args.pages}", server, db_service, source_id, args)
+            )
+            pages.update(generate_website(args.pages, seed=args.seed))
+        ingest_website_source.iter_crawled_pages = iter_crawled_pages
+
+    for result in results:
+        LOGGER.warning(
+            f"{result['name']}: wall={result['wall_seconds']}s first_chunk={result['first_chunk_indexed_seconds']}s "
+            f"embedded_chunks={result['embedded_chunks']} peak_rss={result['peak_rss_mb']}MB"
+        )
+    write_results(
+        "website_ingestion", {key: value for key, value in vars(args).items() if key != "output"}, results, args.output
+    )
+    print(f"✅ Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
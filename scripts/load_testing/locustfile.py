@@ -1,6 +1,41 @@
 """FastAPI Load Testing with Locust"""
 
+import json
+import os
+import random
+import time
+import uuid
+from typing import Optional
+
 from locust import HttpUser, between, task
+from locust.exception import StopUser
+from websockets.sync.client import connect
+
+# Think time between two tasks of a user, in seconds
+THINK_TIME_MIN = float(os.getenv("LOAD_TEST_THINK_TIME_MIN", "0"))
+THINK_TIME_MAX = float(os.getenv("LOAD_TEST_THINK_TIME_MAX", str(THINK_TIME_MIN)))
+# Size of the user message of each run, in characters
+PAYLOAD_CHARS = int(os.getenv("LOAD_TEST_PAYLOAD_CHARS", "20"))
+# Entries of the QA dataset, traces per listed page
+QA_ENTRIES = int(os.getenv("LOAD_TEST_QA_ENTRIES", "5"))
+PAGE_SIZE = int(os.getenv("LOAD_TEST_PAGE_SIZE", "20"))
+DURATION_DAYS = int(os.getenv("LOAD_TEST_DURATION_DAYS", "7"))
+# Queued runs are polled until they finish or time out
+RUN_POLL_INTERVAL_SECONDS = float(os.getenv("LOAD_TEST_RUN_POLL_INTERVAL", "0.5"))
+RUN_TIMEOUT_SECONDS = float(os.getenv("LOAD_TEST_RUN_TIMEOUT", "120"))
+
+_MESSAGE = "Hello, how are you? "
+
+
+def user_message() -> str:
+    """A user message of PAYLOAD_CHARS characters, unique so that no cache answers it."""
+    suffix = f" [{uuid.uuid4().hex[:8]}]"
+    body_chars = max(PAYLOAD_CHARS - len(suffix), 0)
+    return (_MESSAGE * (body_chars // len(_MESSAGE) + 1))[:body_chars] + suffix
+
+
+def run_input() -> dict:
+    return {"messages": [{"role": "user", "content": user_message()}]}
 
 
 class BasicEndpointsUser(HttpUser):
@@ -29,5 +64,221 @@ class BasicEndpointsUser(HttpUser):
         self.client.get("/metrics")
 
 
+class RunThroughputUser(HttpUser):
+    """
+    Agent runs through the API key endpoint, back to back: measures runs/sec of the run hot path
+    (run creation and status updates, variable resolution, credit checks, graph loading).
+
+    Point it at a project whose graph answers quickly (e.g. a single Start block), or at a backend
+    whose LLM calls go to the stub servers, so that the backend rather than the providers is measured.
+    """
+
+    wait_time = between(THINK_TIME_MIN, THINK_TIME_MAX)
+
+    def on_start(self):
+        self.project_id = os.environ["LOAD_TEST_PROJECT_ID"]
+        self.env = os.getenv("LOAD_TEST_ENV", "production")
+        self.client.headers["X-API-Key"] = os.environ["LOAD_TEST_API_KEY"]
+
+    @task
+    def run_agent(self):
+        """POST /projects/{project_id}/{env}/run"""
+        self.client.post(
+            f"/projects/{self.project_id}/{self.env}/run",
+            json=run_input(),
+            name="/projects/[project_id]/[env]/run",
+        )
+
+
+class ProjectUser(HttpUser):
+    """
+    Base of the scenarios of the frontend endpoints, authenticated with a bearer token: LOAD_TEST_TOKEN, any
+    value when the backend runs with OFFLINE_MODE=true.
+    """
+
+    abstract = True
+    wait_time = between(THINK_TIME_MIN, THINK_TIME_MAX)
+
+    def on_start(self):
+        self.project_id = os.environ["LOAD_TEST_PROJECT_ID"]
+        self.env = os.getenv("LOAD_TEST_ENV", "production")
+        self.token = os.getenv("LOAD_TEST_TOKEN", "offline-mode-token")
+        self.client.headers["Authorization"] = f"Bearer {self.token}"
+
+        response = self.client.get(f"/projects/{self.project_id}", name="/projects/[project_id]")
+        if not response.ok:
+            raise StopUser()
+        project = response.json()
+        self.organization_id = project["organization_id"]
+        self.graph_runner_id = os.getenv("LOAD_TEST_GRAPH_RUNNER_ID") or next(
+            (runner["graph_runner_id"] for runner in project["graph_runners"] if runner.get("env") == self.env),
+            None,
+        )
+        if self.graph_runner_id is None:
+            raise StopUser()
+
+    def report(self, name: str, started_at: float, exception: Optional[Exception] = None) -> None:
+        """Record a measure spanning several requests (a run from enqueueing to completion) in the statistics."""
+        self.environment.events.request.fire(
+            request_type="RUN",
+            name=name,
+            response_time=(time.perf_counter() - started_at) * 1000,
+            response_length=0,
+            exception=exception,
+            context={},
+        )
+
+    def enqueue_run(self) -> Optional[str]:
+        """POST /projects/{project_id}/graphs/{graph_runner_id}/chat/async, run by the RunQueueWorker"""
+        response = self.client.post(
+            f"/projects/{self.project_id}/graphs/{self.graph_runner_id}/chat/async",
+            json=run_input(),
+            name="/projects/[project_id]/graphs/[graph_runner_id]/chat/async",
+        )
+        return response.json()["run_id"] if response.ok else None
+
+
+class QueuedRunUser(ProjectUser):
+    """Async runs through the Redis queue and the RunQueueWorker, polled until they complete."""
+
+    @task
+    def run_queued(self):
+        started_at = time.perf_counter()
+        run_id = self.enqueue_run()
+        if run_id is None:
+            return
+        deadline = started_at + RUN_TIMEOUT_SECONDS
+        exception: Optional[Exception] = TimeoutError(f"Run {run_id} did not finish in {RUN_TIMEOUT_SECONDS}s")
+        while time.perf_counter() < deadline:
+            time.sleep(RUN_POLL_INTERVAL_SECONDS)
+            response = self.client.get(
+                f"/projects/{self.project_id}/runs/{run_id}", name="/projects/[project_id]/runs/[run_id]"
+            )
+            status = response.json().get("status") if response.ok else None
+            if status == "completed":
+                exception = None
+                break
+            if status == "failed":
+                exception = RuntimeError(f"Run failed: {response.json().get('error')}")
+                break
+        self.report("queued run (end to end)", started_at, exception)
+
+
+class StreamingRunUser(ProjectUser):
+    """Async runs whose events are streamed over the run WebSocket until the run completes."""
+
+    @task
+    def stream_run(self):
+        started_at = time.perf_counter()
+        run_id = self.enqueue_run()
+        if run_id is None:
+            return
+        websocket_url = self.host.replace("http", "ws", 1) + f"/ws/runs/{run_id}?token={self.token}"
+        exception: Optional[Exception] = None
+        first_event = True
+        try:
+            with connect(websocket_url, open_timeout=RUN_TIMEOUT_SECONDS) as websocket:
+                while True:
+                    event = json.loads(websocket.recv(timeout=RUN_TIMEOUT_SECONDS))
+                    if event.get("type") == "ping":
+                        continue
+                    if first_event:
+                        self.report("streamed run (first event)", started_at)
+                        first_event = False
+                    if event.get("type") == "run.completed":
+                        break
+                    if event.get("type") in ("run.failed", "error"):
+                        raise RuntimeError(f"Run failed: {event}")
+        except Exception as e:
+            exception = e
+        self.report("streamed run (end to end)", started_at, exception)
+
+
+class QADatasetRunUser(ProjectUser):
+    """
+    Runs of a QA dataset of LOAD_TEST_QA_ENTRIES entries against the graph runner of the environment.
+    Each user creates its dataset when it starts and deletes it when it stops.
+    """
+
+    def on_start(self):
+        super().on_start()
+        datasets_url = f"/organizations/{self.organization_id}/qa/datasets"
+        response = self.client.post(
+            datasets_url,
+            json={"datasets_name": [f"load-test-{uuid.uuid4()}"]},
+            name="/organizations/[organization_id]/qa/datasets",
+        )
+        if not response.ok:
+            raise StopUser()
+        self.dataset_id = response.json()["datasets"][0]["id"]
+        self.client.put(
+            f"{datasets_url}/{self.dataset_id}/projects",
+            json={"project_ids": [self.project_id]},
+            name="/organizations/[organization_id]/qa/datasets/[dataset_id]/projects",
+        )
+        self.client.post(
+            f"{datasets_url}/{self.dataset_id}/entries",
+            json={
+                "inputs_groundtruths": [
+                    {"input": run_input(), "groundtruth": user_message()} for _ in range(QA_ENTRIES)
+                ]
+            },
+            name="/organizations/[organization_id]/qa/datasets/[dataset_id]/entries",
+        )
+
+    def on_stop(self):
+        if getattr(self, "dataset_id", None):
+            self.client.delete(
+                f"/organizations/{self.organization_id}/qa/datasets",
+                json={"dataset_ids": [self.dataset_id]},
+                name="/organizations/[organization_id]/qa/datasets",
+            )
+
+    @task
+    def run_dataset(self):
+        """POST /projects/{project_id}/qa/datasets/{dataset_id}/run"""
+        self.client.post(
+            f"/projects/{self.project_id}/qa/datasets/{self.dataset_id}/run",
+            json={"graph_runner_id": self.graph_runner_id, "run_all": True},
+            name="/projects/[project_id]/qa/datasets/[dataset_id]/run",
+        )
+
+
+class MonitoringUser(ProjectUser):
+    """Charts and trace listing of the monitoring pages, over the last LOAD_TEST_DURATION_DAYS days."""
+
+    def on_start(self):
+        super().on_start()
+        self.trace_ids: list[str] = []
+
+    @task(1)
+    def get_charts(self):
+        """GET /monitor/org/{organization_id}/charts"""
+        self.client.get(
+            f"/monitor/org/{self.organization_id}/charts",
+            params={"duration": DURATION_DAYS, "project_ids": [self.project_id]},
+            name="/monitor/org/[organization_id]/charts",
+        )
+
+    @task(3)
+    def list_traces(self):
+        """GET /projects/{project_id}/traces"""
+        response = self.client.get(
+            f"/projects/{self.project_id}/traces",
+            params={"duration": DURATION_DAYS, "page_size": PAGE_SIZE},
+            name="/projects/[project_id]/traces",
+        )
+        if response.ok:
+            self.trace_ids = [trace["trace_id"] for trace in response.json()["traces"]]
+
+    @task(2)
+    def get_trace_tree(self):
+        """GET /traces/{trace_id}/tree"""
+        if self.trace_ids:
+            self.client.get(f"/traces/{random.choice(self.trace_ids)}/tree", name="/traces/[trace_id]/tree")
+
+
 # Manual testing:
 # locust -f locustfile.py BasicEndpointsUser --host=http://localhost:8000
+# LOAD_TEST_PROJECT_ID=... LOAD_TEST_API_KEY=... locust -f locustfile.py RunThroughputUser --host=http://localhost:8000
+# LOAD_TEST_PROJECT_ID=... locust -f locustfile.py QueuedRunUser StreamingRunUser --host=http://localhost:8000
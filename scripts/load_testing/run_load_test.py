@@ -2,9 +2,11 @@
 """FastAPI Load Testing Runner Script"""
 
 import argparse
+import os
 import subprocess
 import sys
 from pathlib import Path
+from typing import Optional
 
 import requests
 
@@ -46,6 +48,9 @@ def run_locust_command(
     host: str,
     interactive: bool,
     skip_validation: bool,
+    user_class: str = "BasicEndpointsUser",
+    think_time: Optional[tuple[float, float]] = None,
+    payload_chars: Optional[int] = None,
 ) -> None:
     """Run the locust command with specified parameters"""
     if not skip_validation:
@@ -57,6 +62,16 @@ def run_locust_command(
     print(f"   Spawn rate: {spawn_rate}/sec")
     print(f"   Duration: {duration}s")
     print(f"   Host: {host}")
+    print(f"   User class: {user_class}")
+
+    # The scenario settings are read by the locustfile from the environment
+    env = os.environ.copy()
+    if think_time is not None:
+        env["LOAD_TEST_THINK_TIME_MIN"], env["LOAD_TEST_THINK_TIME_MAX"] = (str(seconds) for seconds in think_time)
+        print(f"   Think time: {think_time[0]}-{think_time[1]}s")
+    if payload_chars is not None:
+        env["LOAD_TEST_PAYLOAD_CHARS"] = str(payload_chars)
+        print(f"   Payload: {payload_chars} chars")
 
     # Build the locust command
     locust_path = Path(__file__).parent / "locustfile.py"
@@ -70,7 +85,7 @@ def run_locust_command(
         str(users),
         "--spawn-rate",
         str(spawn_rate),
-        "BasicEndpointsUser",
+        user_class,
     ]
 
     # Add duration for headless mode
@@ -82,7 +97,7 @@ def run_locust_command(
 
     # Run the command
     try:
-        subprocess.run(cmd, check=True)
+        subprocess.run(cmd, check=True, env=env)
         print("\n✅ Load test completed successfully!")
     except subprocess.CalledProcessError as e:
         print(f"\n❌ Load test failed with exit code: {e.returncode}")
@@ -110,6 +125,12 @@ Examples:
 
     # Interactive mode (opens web UI)
     python run_load_test.py --users 10 --interactive
+
+    # Agent runs/sec (needs LOAD_TEST_PROJECT_ID and LOAD_TEST_API_KEY)
+    python run_load_test.py --user-class RunThroughputUser --users 50 --spawn-rate 10 --duration 60
+
+    # Queued runs with 1-3s of think time and 2000-char messages (needs LOAD_TEST_PROJECT_ID)
+    python run_load_test.py --user-class QueuedRunUser --think-time 1 3 --payload-chars 2000
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
@@ -142,6 +163,31 @@ Examples:
         action="store_true",
         help="Run in interactive mode (opens web UI)",
     )
+    parser.add_argument(
+        "--user-class",
+        default="BasicEndpointsUser",
+        choices=[
+            "BasicEndpointsUser",
+            "RunThroughputUser",
+            "QueuedRunUser",
+            "StreamingRunUser",
+            "QADatasetRunUser",
+            "MonitoringUser",
+        ],
+        help="Locust user class to run (default: BasicEndpointsUser)",
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        nargs=2,
+        metavar=("MIN", "MAX"),
+        help="Seconds between two tasks of a run scenario user (default: 0)",
+    )
+    parser.add_argument(
+        "--payload-chars",
+        type=int,
+        help="Characters of the user message sent by the run scenarios (default: 20)",
+    )
     parser.add_argument(
         "--skip-validation",
         action="store_true",
@@ -160,6 +206,9 @@ Examples:
         host=args.host,
         interactive=args.interactive,
         skip_validation=args.skip_validation,
+        user_class=args.user_class,
+        think_time=tuple(args.think_time) if args.think_time else None,
+        payload_chars=args.payload_chars,
     )
 
 
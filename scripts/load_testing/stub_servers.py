@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Stub LLM, embedding and Qdrant servers for load tests: the endpoints of the OpenAI API used by the providers
+(Responses, Chat Completions, Embeddings) and of the Qdrant REST API used by the retrievers, on one local port,
+each answering after a delay drawn from its own latency distribution.
+
+Point a locally started backend at it to find its capacity limits without paying providers or needing network
+access:
+
+    uv run python -m scripts.load_testing.stub_servers --port 8100 --llm-latency lognormal:800:0.5
+    eval "$(uv run python -m scripts.load_testing.stub_servers --port 8100 --print-env)"
+
+Latency distributions, in milliseconds: `constant:MS`, `uniform:MIN:MAX`, `normal:MEAN:STDDEV`,
+`lognormal:MEDIAN:SIGMA`, `exponential:MEAN` (a bare number is a constant).
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import socket
+import struct
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+
+WORDS = ["alpha", "beta", "gamma", "delta", "invoice", "contract", "Paris", "Berlin", "total", "pending", "the", "of"]
+STUB_API_KEY = "sk-stub"
+QDRANT_VERSION = "1.13.0"
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """A distribution of response delays, parameters in milliseconds (sigma of lognormal excepted)."""
+
+    kind: str
+    parameters: tuple[float, ...] = ()
+
+    _ARITIES = {"constant": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, *values = spec.split(":")
+        if not values:
+            kind, values = "constant", [kind]
+        if kind not in cls._ARITIES:
+            raise ValueError(f"Unknown latency distribution {kind!r}, expected one of {', '.join(cls._ARITIES)}")
+        if len(values) != cls._ARITIES[kind]:
+            raise ValueError(f"The {kind} distribution takes {cls._ARITIES[kind]} parameters, got {spec!r}")
+        parameters = tuple(float(value) for value in values)
+        if any(parameter < 0 for parameter in parameters):
+            raise ValueError(f"Negative latency parameter in {spec!r}")
+        return cls(kind, parameters)
+
+    def sample(self, rng: random.Random) -> float:
+        """A delay in seconds, never negative."""
+        if self.kind == "constant":
+            milliseconds = self.parameters[0]
+        elif self.kind == "uniform":
+            milliseconds = rng.uniform(*self.parameters)
+        elif self.kind == "normal":
+            milliseconds = rng.gauss(*self.parameters)
+        elif self.kind == "lognormal":
+            median, sigma = self.parameters
+            milliseconds = rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        else:
+            mean = self.parameters[0]
+            milliseconds = rng.expovariate(1 / mean) if mean > 0 else 0.0
+        return max(milliseconds, 0.0) / 1000
+
+
+NO_LATENCY = LatencyDistribution("constant", (0.0,))
+
+
+def example_from_schema(schema: dict, definitions: Optional[dict] = None) -> Any:
+    """A minimal value valid against a JSON schema, to answer structured output and tool call requests."""
+    definitions = definitions if definitions is not None else schema.get("$defs", schema.get("definitions", {}))
+    if "$ref" in schema:
+        return example_from_schema(definitions.get(schema["$ref"].rsplit("/", 1)[-1], {}), definitions)
+    if "const" in schema:
+        return schema["const"]
+    if schema.get("enum"):
+        return schema["enum"][0]
+    for combinator in ("anyOf", "oneOf", "allOf"):
+        if schema.get(combinator):
+            options = [option for option in schema[combinator] if option.get("type") != "null"]
+            return example_from_schema((options or schema[combinator])[0], definitions)
+    schema_type = schema.get("type", "object" if "properties" in schema else "string")
+    if isinstance(schema_type, list):
+        schema_type = next((option for option in schema_type if option != "null"), "null")
+    if schema_type == "object":
+        return {
+            name: example_from_schema(property_schema, definitions)
+            for name, property_schema in schema.get("properties", {}).items()
+        }
+    if schema_type == "array":
+        return [example_from_schema(schema.get("items", {}), definitions)] * schema.get("minItems", 1)
+    return {"string": "stub", "integer": 0, "number": 0.0, "boolean": False, "null": None}.get(schema_type, "stub")
+
+
+def _count_tokens(value: Any) -> int:
+    # Rough estimate (4 characters per token), enough for the usage of the runs
+    return max(1, len(str(value)) // 4)
+
+
+def embedding_vector(text: str, dimensions: int) -> list[float]:
+    """A deterministic unit vector for a text."""
+    rng = random.Random(hashlib.sha256(text.encode()).digest())
+    vector = [rng.gauss(0, 1) for _ in range(dimensions)]
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+@dataclass
+class StubDependencyServer:
+    """
+    llm_latency, embedding_latency, qdrant_latency: delay before each response of the dependency.
+    completion_words: length of the generated answers.
+    embedding_dimensions: size of the vectors, by default that of the requested model.
+    qdrant_points, chunk_words: number and length of the chunks returned by each vector search.
+    """
+
+    llm_latency: LatencyDistribution = NO_LATENCY
+    embedding_latency: LatencyDistribution = NO_LATENCY
+    qdrant_latency: LatencyDistribution = NO_LATENCY
+    completion_words: int = 50
+    embedding_dimensions: Optional[int] = None
+    qdrant_points: int = 10
+    chunk_words: int = 100
+    seed: int = 0
+    host: str = "127.0.0.1"
+    port: int = 0
+    request_counts: Counter = field(default_factory=Counter)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self.app = self._create_app()
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    @property
+    def qdrant_url(self) -> str:
+        return f"{self.url}/qdrant"
+
+    def backend_environment(self) -> dict[str, str]:
+        """Settings of a backend whose LLM, embedding and Qdrant calls go to this server."""
+        return {
+            # Read by the OpenAI SDK when the providers pass no base URL
+            "OPENAI_BASE_URL": self.openai_base_url,
+            "OPENAI_API_KEY": STUB_API_KEY,
+            "GOOGLE_BASE_URL": self.openai_base_url,
+            "GOOGLE_API_KEY": STUB_API_KEY,
+            "VECTOR_STORE_BACKEND": "qdrant",
+            "QDRANT_CLUSTER_URL": self.qdrant_url,
+            "QDRANT_API_KEY": STUB_API_KEY,
+        }
+
+    async def _wait(self, endpoint: str, latency: LatencyDistribution) -> None:
+        self.request_counts[endpoint] += 1
+        delay = latency.sample(self._rng)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _completion_text(self) -> str:
+        return " ".join(self._rng.choice(WORDS) for _ in range(self.completion_words))
+
+    def _tool_to_call(self, tools: list[dict], tool_choice: Any) -> Optional[dict]:
+        """The tool the model is forced to call, if any: the named one, or the last one (structured output)."""
+        if not tools or tool_choice in (None, "auto", "none"):
+            return None
+        if isinstance(tool_choice, dict):
+            name = tool_choice.get("name") or tool_choice.get("function", {}).get("name")
+            return next((tool for tool in tools if _tool_name(tool) == name), tools[-1])
+        return tools[-1]
+
+    def _chunk(self, index: int) -> dict:
+        return {
+            "chunk_id": f"stub-chunk-{index}",
+            "content": " ".join(self._rng.choice(WORDS) for _ in range(self.chunk_words)),
+            "file_id": f"stub-document-{index % 3}",
+            "url": f"https://example.com/stub-document-{index % 3}",
+            "last_edited_ts": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def _points(self, limit: int) -> list[dict]:
+        return [
+            {"id": str(uuid.UUID(int=index + 1)), "score": 1 / (index + 1), "payload": self._chunk(index)}
+            for index in range(min(limit, self.qdrant_points))
+        ]
+
+    def _create_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.get("/stats")
+        async def get_stats() -> dict:
+            return {"requests": dict(self.request_counts)}
+
+        @app.post("/v1/responses")
+        async def create_response(request: Request) -> dict:
+            body = await request.json()
+            if body.get("stream"):
+                raise HTTPException(status_code=400, detail="Streaming is not supported by the stub server")
+            await self._wait("responses", self.llm_latency)
+            text_format = (body.get("text") or {}).get("format") or {}
+            tool = self._tool_to_call(body.get("tools") or [], body.get("tool_choice"))
+            if tool is not None:
+                output = [
+                    {
+                        "type": "function_call",
+                        "id": f"fc_{uuid.uuid4().hex}",
+                        "call_id": f"call_{uuid.uuid4().hex}",
+                        "name": _tool_name(tool),
+                        "arguments": _json(example_from_schema(_tool_parameters(tool))),
+                        "status": "completed",
+                    }
+                ]
+            else:
+                if text_format.get("type") == "json_schema":
+                    text = _json(example_from_schema(text_format.get("schema") or {}))
+                elif text_format.get("type") == "json_object":
+                    text = _json({"answer": self._completion_text()})
+                else:
+                    text = self._completion_text()
+                output = [
+                    {
+                        "type": "message",
+                        "id": f"msg_{uuid.uuid4().hex}",
+                        "role": "assistant",
+                        "status": "completed",
+                        "content": [{"type": "output_text", "text": text, "annotations": []}],
+                    }
+                ]
+            input_tokens = _count_tokens(body.get("input"))
+            output_tokens = _count_tokens(output)
+            return {
+                "id": f"resp_{uuid.uuid4().hex}",
+                "object": "response",
+                "created_at": int(time.time()),
+                "model": body.get("model", "stub"),
+                "status": "completed",
+                "output": output,
+                "parallel_tool_calls": True,
+                "tool_choice": body.get("tool_choice", "auto"),
+                "tools": body.get("tools") or [],
+                "usage": {
+                    "input_tokens": input_tokens,
+                    "input_tokens_details": {"cached_tokens": 0},
+                    "output_tokens": output_tokens,
+                    "output_tokens_details": {"reasoning_tokens": 0},
+                    "total_tokens": input_tokens + output_tokens,
+                },
+            }
+
+        @app.post("/v1/chat/completions")
+        async def create_chat_completion(request: Request) -> dict:
+            body = await request.json()
+            if body.get("stream"):
+                raise HTTPException(status_code=400, detail="Streaming is not supported by the stub server")
+            await self._wait("chat_completions", self.llm_latency)
+            response_format = body.get("response_format") or {}
+            tool = self._tool_to_call(body.get("tools") or [], body.get("tool_choice"))
+            message: dict[str, Any] = {"role": "assistant", "content": None}
+            if tool is not None:
+                message["tool_calls"] = [
+                    {
+                        "id": f"call_{uuid.uuid4().hex}",
+                        "type": "function",
+                        "function": {
+                            "name": _tool_name(tool),
+                            "arguments": _json(example_from_schema(_tool_parameters(tool))),
+                        },
+                    }
+                ]
+            elif response_format.get("type") == "json_schema":
+                message["content"] = _json(
+                    example_from_schema((response_format.get("json_schema") or {}).get("schema") or {})
+                )
+            elif response_format.get("type") == "json_object":
+                message["content"] = _json({"answer": self._completion_text()})
+            else:
+                message["content"] = self._completion_text()
+            prompt_tokens = _count_tokens(body.get("messages"))
+            completion_tokens = _count_tokens(message)
+            return {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": message,
+                        "finish_reason": "tool_calls" if tool is not None else "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }
+
+        @app.post("/v1/embeddings")
+        async def create_embeddings(request: Request) -> dict:
+            body = await request.json()
+            await self._wait("embeddings", self.embedding_latency)
+            texts = body.get("input")
+            texts = [texts] if isinstance(texts, str) else texts or []
+            model = body.get("model", "stub")
+            dimensions = body.get("dimensions") or self.embedding_dimensions or (3072 if "large" in model else 1536)
+            data = []
+            for index, text in enumerate(texts):
+                vector = embedding_vector(str(text), dimensions)
+                if body.get("encoding_format") == "base64":
+                    # The OpenAI SDK asks for base64 float32 vectors unless told otherwise
+                    embedding: Any = base64.b64encode(struct.pack(f"<{dimensions}f", *vector)).decode()
+                else:
+                    embedding = vector
+                data.append({"object": "embedding", "index": index, "embedding": embedding})
+            prompt_tokens = sum(_count_tokens(text) for text in texts)
+            return {
+                "object": "list",
+                "model": model,
+                "data": data,
+                "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens},
+            }
+
+        @app.get("/qdrant")
+        @app.get("/qdrant/")
+        async def get_qdrant_version() -> dict:
+            return {"title": "qdrant - vector search engine", "version": QDRANT_VERSION}
+
+        @app.get("/qdrant/collections/{collection_name}/exists")
+        async def collection_exists(collection_name: str) -> dict:
+            await self._wait("qdrant_collection", self.qdrant_latency)
+            return _qdrant_result({"exists": True})
+
+        @app.get("/qdrant/collections/{collection_name}")
+        async def get_collection(collection_name: str) -> dict:
+            await self._wait("qdrant_collection", self.qdrant_latency)
+            return _qdrant_result({"status": "green", "points_count": self.qdrant_points, "payload_schema": {}})
+
+        @app.post("/qdrant/collections/{collection_name}/points/query")
+        async def query_points(collection_name: str, request: Request) -> dict:
+            body = await request.json()
+            await self._wait("qdrant_query", self.qdrant_latency)
+            return _qdrant_result({"points": self._points(body.get("limit", 10))})
+
+        @app.post("/qdrant/collections/{collection_name}/points/query/batch")
+        async def query_points_batch(collection_name: str, request: Request) -> dict:
+            body = await request.json()
+            await self._wait("qdrant_query", self.qdrant_latency)
+            return _qdrant_result([
+                {"points": self._points(search.get("limit", 10))} for search in body.get("searches", [])
+            ])
+
+        @app.post("/qdrant/collections/{collection_name}/points")
+        async def get_points(collection_name: str, request: Request) -> dict:
+            body = await request.json()
+            await self._wait("qdrant_points", self.qdrant_latency)
+            return _qdrant_result([
+                {"id": point_id, "payload": self._chunk(index)} for index, point_id in enumerate(body.get("ids", []))
+            ])
+
+        @app.post("/qdrant/collections/{collection_name}/points/count")
+        async def count_points(collection_name: str) -> dict:
+            await self._wait("qdrant_points", self.qdrant_latency)
+            return _qdrant_result({"count": self.qdrant_points})
+
+        @app.api_route("/qdrant/{path:path}", methods=["POST", "PUT", "PATCH", "DELETE"])
+        async def acknowledge_write(path: str) -> dict:
+            # Collection, index and point writes are accepted and dropped
+            await self._wait("qdrant_write", self.qdrant_latency)
+            return _qdrant_result({"operation_id": 0, "status": "acknowledged"})
+
+        return app
+
+    def start(self) -> str:
+        """Serve in a background thread and return the base URL."""
+        if self.port == 0:
+            with socket.socket() as free_socket:
+                free_socket.bind((self.host, 0))
+                self.port = free_socket.getsockname()[1]
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=self.host, port=self.port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self) -> "StubDependencyServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def _tool_name(tool: dict) -> str:
+    # Responses API tools are flat, Chat Completions tools are nested under "function"
+    return tool.get("name") or tool.get("function", {}).get("name", "")
+
+
+def _tool_parameters(tool: dict) -> dict:
+    return tool.get("parameters") or tool.get("function", {}).get("parameters") or {}
+
+
+def _json(value: Any) -> str:
+    return json.dumps(value)
+
+
+def _qdrant_result(result: Any) -> dict:
+    return {"result": result, "status": "ok", "time": 0.0}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-latency", type=LatencyDistribution.parse, default=NO_LATENCY)
+    parser.add_argument("--embedding-latency", type=LatencyDistribution.parse, default=NO_LATENCY)
+    parser.add_argument("--qdrant-latency", type=LatencyDistribution.parse, default=NO_LATENCY)
+    parser.add_argument("--completion-words", type=int, default=50, help="Length of the generated answers")
+    parser.add_argument(
+        "--embedding-dimensions", type=int, default=None, help="Vector size, by default that of the model"
+    )
+    parser.add_argument("--qdrant-points", type=int, default=10, help="Chunks returned by each vector search")
+    parser.add_argument("--chunk-words", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--print-env", action="store_true", help="Print the backend settings pointing at the server and exit"
+    )
+    args = parser.parse_args()
+
+    server = StubDependencyServer(
+        llm_latency=args.llm_latency,
+        embedding_latency=args.embedding_latency,
+        qdrant_latency=args.qdrant_latency,
+        completion_words=args.completion_words,
+        embedding_dimensions=args.embedding_dimensions,
+        qdrant_points=args.qdrant_points,
+        chunk_words=args.chunk_words,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    if args.print_env:
+        for name, value in server.backend_environment().items():
+            print(f"export {name}={value}")
+        return
+    uvicorn.run(server.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
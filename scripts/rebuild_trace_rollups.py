@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Rebuild the hourly trace rollups from the stored spans, one day per transaction.
+
+Run it once after the rollup tables are created to backfill the spans exported before, or to repair a period.
+
+Usage:
+    uv run python scripts/rebuild_trace_rollups.py --since 2025-01-01
+    uv run python scripts/rebuild_trace_rollups.py --since 2026-06-01 --until 2026-07-01 --project-id <uuid>
+"""
+
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from ada_backend.repositories.trace_rollup_repository import rebuild_trace_rollups
+from engine.trace.sql_exporter import get_session_trace
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _parse_date(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the hourly trace rollups from the spans")
+    parser.add_argument("--since", type=_parse_date, required=True, help="ISO date or datetime, UTC if naive")
+    parser.add_argument("--until", type=_parse_date, default=None, help="ISO date or datetime (default: now)")
+    parser.add_argument("--project-id", type=UUID, action="append", dest="project_ids", help="Repeatable")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    until = args.until or datetime.now(tz=timezone.utc)
+    day_start = args.since
+    session = get_session_trace()
+    try:
+        while day_start < until:
+            day_end = min(day_start + timedelta(days=1), until)
+            rebuild_trace_rollups(session, day_start, day_end, project_ids=args.project_ids)
+            LOGGER.info(f"Rebuilt trace rollups from {day_start.isoformat()} to {day_end.isoformat()}")
+            day_start = day_end
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -45,6 +45,10 @@ class BaseConfig(BaseSettings):
     CEREBRAS_API_KEY: Optional[str] = None
     CEREBRAS_BASE_URL: Optional[str] = None
     COHERE_API_KEY: Optional[str] = None
+    # "cohere" for the Cohere API, "local" for the CPU cross-encoder of engine/components/rag/local_reranker.py,
+    # which needs the local_reranker dependency group (uv sync --group local_reranker)
+    RERANKER_BACKEND: str = "cohere"
+    LOCAL_RERANKER_MODEL: Optional[str] = None
     ANTHROPIC_API_KEY: Optional[str] = None
     ANTHROPIC_BASE_URL: Optional[str] = "https://api.anthropic.com/v1/messages"
 
@@ -54,11 +58,17 @@ class BaseConfig(BaseSettings):
 
     QDRANT_CLUSTER_URL: Optional[str] = None
     QDRANT_API_KEY: Optional[str] = None
+    # "qdrant" for a Qdrant cluster, "local" for the in-memory, non-persistent store of engine/local_vector_store.py
+    # (tests, benchmarks and local development only)
+    VECTOR_STORE_BACKEND: str = "qdrant"
+    LOCAL_VECTOR_STORE_USE_HNSW: bool = False
 
     TAVILY_API_KEY: Optional[str] = None
     LINKUP_API_KEY: Optional[str] = None
     E2B_API_KEY: Optional[str] = None
     FIRECRAWL_API_KEY: Optional[str] = None
+    # Defaults to the Firecrawl cloud API; set for a self-hosted Firecrawl or the fake server of scripts/benchmarks
+    FIRECRAWL_API_URL: Optional[str] = None
     RESEND_API_KEY: Optional[str] = None
     RESEND_FROM_EMAIL: Optional[str] = None
 
@@ -102,6 +112,13 @@ class BaseConfig(BaseSettings):
     ADA_DB_MAX_OVERFLOW: int = 20
     ADA_DB_POOL_TIMEOUT: int = 30
     ADA_DB_POOL_RECYCLE: int = 1800
+    # Async pools of the run hot path, one per event loop, on top of the sync pool. Per process, at most
+    # ASYNC_POOL_SIZE + ASYNC_MAX_OVERFLOW connections for the API loop, plus ASYNC_WORKER_POOL_SIZE
+    # + ASYNC_WORKER_MAX_OVERFLOW for each of the 3 queue worker loops, which process one item at a time.
+    ADA_DB_ASYNC_POOL_SIZE: int = 5
+    ADA_DB_ASYNC_MAX_OVERFLOW: int = 5
+    ADA_DB_ASYNC_WORKER_POOL_SIZE: int = 2
+    ADA_DB_ASYNC_WORKER_MAX_OVERFLOW: int = 0
 
     # Ingestion database settings
     INGESTION_DB_URL: Optional[str] = None
@@ -109,6 +126,11 @@ class BaseConfig(BaseSettings):
     SUPABASE_PROJECT_URL: Optional[str] = None
     SUPABASE_PROJECT_KEY: Optional[str] = None
     SUPABASE_SERVICE_ROLE_SECRET_KEY: Optional[str] = None
+    # Legacy HS256 signing secret; projects on asymmetric signing keys are verified with their JWKS
+    SUPABASE_JWT_SECRET: Optional[str] = None
+    # API key, token and role checks are reused for this long (revocations made in the backend are immediate)
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10_000
     CORS_ALLOW_ORIGINS: str = (
         "http://localhost:3000,http://localhost:5173,http://127.0.0.1:3000,http://127.0.0.1:5173,*"
     )
@@ -144,6 +166,8 @@ class BaseConfig(BaseSettings):
     # Must be less than the pod's terminationGracePeriodSeconds to leave room for uvicorn
     # and other cleanup before the SIGKILL arrives.
     WORKER_SHUTDOWN_TIMEOUT_SECONDS: int = 60
+    # Port of the Prometheus endpoint of the Redis Streams workers (leave unset to not expose it)
+    WORKER_METRICS_PORT: Optional[int] = None
 
     # Rate limiting configuration
     RATE_LIMIT_ENABLED: bool = True
@@ -165,9 +189,23 @@ class BaseConfig(BaseSettings):
     # Ingestion parameters
     NUMBER_OF_PAGES_TO_DETECT_DOCUMENT_TYPE: Optional[int] = 5
     PAGE_RESOLUTION_ZOOM: Optional[float] = 3.0
+    # Overrides PAGE_RESOLUTION_ZOOM when set (72 DPI is a zoom of 1.0)
+    PAGE_RESOLUTION_DPI: Optional[int] = None
+    # Processes rendering PDF pages, 0 renders them in a thread of the ingestion process
+    PDF_RENDER_PROCESSES: int = 2
+    PDF_VISION_MAX_CONCURRENCY: int = 4
+    # Pages with at least this many readable characters and no image use their text layer instead of a vision call
+    PDF_TEXT_LAYER_MIN_CHARACTERS: Optional[int] = None
     USE_LLM_FOR_PDF_PARSING: bool = True
     INGESTION_VIA_CUSTOM_MODEL: Optional[bool] = False
     INGESTION_BATCH_SIZE: int = 500
+    # Processes parsing files of the standard reading mode: one per available CPU core, at most 4, when unset;
+    # 0 parses in the ingestion process
+    INGESTION_PARSER_PROCESSES: Optional[int] = None
+    INGESTION_PARSER_MEMORY_LIMIT_MB: int = 2048
+    INGESTION_PARSER_TIMEOUT_SECONDS: int = 600
+    # Rows per COPY into PostgreSQL chunk tables, 0 writes them with INSERT ... ON CONFLICT statements instead
+    DB_COPY_BATCH_SIZE: int = 5000
 
     # Google OAuth configuration
     GOOGLE_CLIENT_ID: Optional[str] = None
@@ -186,6 +224,15 @@ class BaseConfig(BaseSettings):
     GF_SECURITY_ADMIN_USER: Optional[str] = None
     GF_SECURITY_ADMIN_PASSWORD: Optional[str] = None
 
+    # Agent traces: share of API, webhook and cron runs whose component inputs/outputs are recorded
+    # (sandbox and QA runs always are), optionally per project id, and caps on each string, on each
+    # list or dict and on the whole JSON of a recorded payload
+    TRACE_PAYLOAD_SAMPLE_RATE: float = Field(1.0, ge=0.0, le=1.0)
+    TRACE_PAYLOAD_SAMPLE_RATES_BY_PROJECT: Dict[str, float] = {}
+    TRACE_PAYLOAD_MAX_CHARS: int = 100_000
+    TRACE_PAYLOAD_MAX_ITEMS: int = 1_000
+    TRACE_PAYLOAD_MAX_TOTAL_CHARS: int = 500_000
+
     # Observability stack feature flag
     ENABLE_OBSERVABILITY_STACK: bool = False
 
@@ -314,6 +361,10 @@ class _SettingsProxy:
         "ADA_DB_MAX_OVERFLOW",
         "ADA_DB_POOL_TIMEOUT",
         "ADA_DB_POOL_RECYCLE",
+        "ADA_DB_ASYNC_POOL_SIZE",
+        "ADA_DB_ASYNC_MAX_OVERFLOW",
+        "ADA_DB_ASYNC_WORKER_POOL_SIZE",
+        "ADA_DB_ASYNC_WORKER_MAX_OVERFLOW",
     }
 
     def __init__(self, delegate: BaseConfig) -> None:
@@ -9,6 +9,7 @@ log.
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Any
 
 from pydantic import SecretStr
@@ -34,17 +35,27 @@ SENSITIVE_FIELD_MARKERS: tuple[str, ...] = (
 )
 
 _BEARER_TOKEN_RE = re.compile(r"Bearer\s+[A-Za-z0-9._\-+/=]+", re.IGNORECASE)
+_SENSITIVE_KEY_RE = re.compile("|".join(re.escape(marker) for marker in SENSITIVE_FIELD_MARKERS))
 
 
 def _normalize_key(key: str | None) -> str:
     return (key or "").lower().replace("-", "_")
 
 
+# Payload keys repeat across spans (role, content, metadata...), so the match is cached per key
+@lru_cache(maxsize=4096)
 def is_sensitive_key(key: str | None) -> bool:
     normalized = _normalize_key(key)
     if not normalized:
         return False
-    return any(marker in normalized for marker in SENSITIVE_FIELD_MARKERS)
+    return _SENSITIVE_KEY_RE.search(normalized) is not None
+
+
+def redact_bearer_tokens(value: str) -> str:
+    # Most strings have no token, and the substring test is far cheaper than the case-insensitive regex scan
+    if "bearer" not in value.lower():
+        return value
+    return _BEARER_TOKEN_RE.sub(f"Bearer {REDACTED_PLACEHOLDER}", value)
 
 
 def redact_sensitive(value: Any, key: str | None = None) -> Any:
@@ -68,7 +79,7 @@ def redact_sensitive(value: Any, key: str | None = None) -> Any:
         return {redact_sensitive(item) for item in value}
 
     if isinstance(value, str):
-        return _BEARER_TOKEN_RE.sub(f"Bearer {REDACTED_PLACEHOLDER}", value)
+        return redact_bearer_tokens(value)
 
     return value
 
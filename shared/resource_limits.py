@@ -0,0 +1,30 @@
+"""Resource limits for the processes running untrusted or heavy work (ingestion subprocesses, parser processes)."""
+
+import resource
+
+
+def set_memory_limit(limit_mb: int) -> None:
+    """Cap the virtual address space of the current process. A limit of 0 or less leaves it unchanged."""
+    if limit_mb <= 0:
+        return
+    limit_bytes = limit_mb * 1024 * 1024
+    _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+    # An unprivileged process can lower its hard limit but never raise it
+    if hard_limit != resource.RLIM_INFINITY:
+        limit_bytes = min(limit_bytes, hard_limit)
+    resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+
+
+def set_cpu_time_limit(seconds: int) -> None:
+    """
+    Allow the current process `seconds` more CPU time from now, after which the kernel kills it (SIGXCPU).
+    Only the soft limit moves, so it can be set again for the next job of a long-lived process.
+    """
+    if seconds <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft_limit = int(usage.ru_utime + usage.ru_stime) + seconds
+    _, hard_limit = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard_limit != resource.RLIM_INFINITY:
+        soft_limit = min(soft_limit, hard_limit)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft_limit, hard_limit))
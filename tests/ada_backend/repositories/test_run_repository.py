@@ -1,5 +1,21 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
 from ada_backend.database import models as db
-from ada_backend.repositories.run_repository import create_run
+from ada_backend.database import setup_db
+from ada_backend.database.setup_db import (
+    dispose_async_db_engine,
+    get_async_db_session,
+    get_db_session,
+    set_async_db_pool_size,
+)
+from ada_backend.repositories.project_repository import get_project_async
+from ada_backend.repositories.run_repository import create_run, create_run_async, get_run, update_run_status_async
+from ada_backend.services.project_service import delete_project_service
+from tests.ada_backend.test_utils import create_project_and_graph_runner
 
 
 class _FakeRun:
@@ -31,3 +47,46 @@ def test_create_run_defaults_retry_group_id_to_distinct_group(monkeypatch):
 
     assert run_without_retry_group.kwargs["retry_group_id"] != run_without_retry_group.kwargs["id"]
     assert run_with_retry_group.kwargs["retry_group_id"] == "retry-group-id"
+
+
+@pytest.mark.asyncio
+async def test_async_session_creates_and_updates_runs():
+    with get_db_session() as session:
+        project_id, graph_runner_id = create_project_and_graph_runner(session, project_name_prefix="async_run")
+    try:
+        async with get_async_db_session() as session:
+            run = await create_run_async(session, project_id=project_id, env=db.EnvType.DRAFT)
+            assert (run.status, run.retry_group_id != run.id) == (db.RunStatus.PENDING, True)
+
+            await update_run_status_async(session, run.id, db.RunStatus.RUNNING, graph_runner_id=graph_runner_id)
+
+        with get_db_session() as session:
+            stored_run = get_run(session, run.id)
+            assert (stored_run.status, stored_run.graph_runner_id) == (db.RunStatus.RUNNING, graph_runner_id)
+
+        async with get_async_db_session() as session:
+            assert await update_run_status_async(session, uuid4(), db.RunStatus.FAILED) is None
+            assert (await get_project_async(session, project_id)).id == project_id
+    finally:
+        with get_db_session() as session:
+            delete_project_service(session, project_id)
+
+
+def test_worker_loop_uses_its_pool_size_and_disposes_of_its_engine():
+    async def query_and_dispose():
+        async with get_async_db_session() as session:
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
+            pool = session.bind.pool
+        if hasattr(pool, "size"):
+            assert (pool.size(), pool._max_overflow) == (1, 0)
+        await dispose_async_db_engine()
+        return pool
+
+    loop = asyncio.new_event_loop()
+    try:
+        set_async_db_pool_size(loop, pool_size=1, max_overflow=0)
+        pool = loop.run_until_complete(query_and_dispose())
+        assert loop not in setup_db._async_sessionmakers
+        assert pool.checkedin() == 0
+    finally:
+        loop.close()
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from openinference.semconv.trace import SpanAttributes
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+from ada_backend.database.models import CallType
+from ada_backend.database.setup_db import get_db_session
+from ada_backend.database.trace_models import ConversationRollup, Span, SpanRollup
+from ada_backend.repositories.trace_rollup_repository import (
+    SpanRollupEntry,
+    TraceRollups,
+    rebuild_trace_rollups,
+    rollup_bucket_start,
+)
+from engine.trace.sql_exporter import SQLSpanExporter
+
+
+def _rollup_rows(session, project_id: UUID) -> tuple[list[tuple], list[tuple]]:
+    session.expire_all()
+    span_rollups = [
+        (
+            rollup.bucket_start,
+            rollup.call_type,
+            rollup.model_id,
+            rollup.span_count,
+            rollup.root_span_count,
+            rollup.llm_span_count,
+            rollup.input_tokens,
+            rollup.output_tokens,
+            round(rollup.root_duration_seconds, 6),
+            rollup.credits,
+        )
+        for rollup in session.query(SpanRollup).filter(SpanRollup.project_id == project_id)
+    ]
+    conversation_rollups = [
+        (rollup.bucket_start, rollup.call_type, rollup.conversation_id, rollup.credits)
+        for rollup in session.query(ConversationRollup).filter(ConversationRollup.project_id == project_id)
+    ]
+    return sorted(span_rollups, key=str), sorted(conversation_rollups, key=str)
+
+
+def test_rollup_bucket_start_truncates_to_the_utc_hour():
+    paris = timezone(timedelta(hours=2))
+    assert rollup_bucket_start(datetime(2026, 7, 1, 1, 59, 30, 12, tzinfo=paris)) == datetime(
+        2026, 6, 30, 23, tzinfo=timezone.utc
+    )
+
+
+def test_trace_rollups_sum_the_spans_of_a_batch():
+    project_id = uuid4()
+    start_time = datetime(2026, 7, 1, 10, 15, tzinfo=timezone.utc)
+    rollups = TraceRollups()
+    common = {"project_id": project_id, "call_type": "api", "model_id": None, "conversation_id": "conversation"}
+    rollups.add(
+        SpanRollupEntry(
+            start_time=start_time,
+            is_root=True,
+            duration_seconds=2.0,
+            input_tokens=None,
+            output_tokens=None,
+            credits=0.0,
+            **common,
+        )
+    )
+    rollups.add(
+        SpanRollupEntry(
+            start_time=start_time + timedelta(minutes=10),
+            is_root=False,
+            duration_seconds=1.0,
+            input_tokens=10,
+            output_tokens=None,
+            credits=1.5,
+            **common,
+        )
+    )
+    rollups.add(None)
+
+    bucket_start = datetime(2026, 7, 1, 10, tzinfo=timezone.utc)
+    assert rollups.spans == {
+        (bucket_start, project_id, "api", None): {
+            "span_count": 2,
+            "root_span_count": 1,
+            "llm_span_count": 1,
+            "input_tokens": 10,
+            "output_tokens": 0,
+            "root_duration_seconds": 2.0,
+            "credits": 1.5,
+        }
+    }
+    assert rollups.conversations == {(bucket_start, project_id, "api", "conversation"): 1.5}
+
+
+def test_exported_spans_update_the_rollups_like_a_rebuild():
+    project_id = uuid4()
+    conversation_id = str(uuid4())
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(SQLSpanExporter()))
+    tracer = tracer_provider.get_tracer(__name__)
+    common_attributes = {
+        "project_id": str(project_id),
+        "call_type": CallType.API.value,
+        "conversation_id": conversation_id,
+        # Credits of providers paid by the organization are not counted as project usage
+        "provider": "organization-provider",
+        "organization_llm_providers": ["organization-provider"],
+    }
+    started_at = datetime.now(tz=timezone.utc)
+    for _ in range(2):
+        with tracer.start_as_current_span("workflow", attributes=common_attributes):
+            with tracer.start_as_current_span(
+                "llm",
+                attributes={
+                    **common_attributes,
+                    SpanAttributes.LLM_TOKEN_COUNT_PROMPT: 100,
+                    SpanAttributes.LLM_TOKEN_COUNT_COMPLETION: 20,
+                    "credits.input_token": 1.0,
+                    "credits.output_token": 0.5,
+                },
+            ):
+                pass
+    with tracer.start_as_current_span("other", attributes={"project_id": "not-a-project-id"}):
+        pass
+    tracer_provider.shutdown()
+
+    with get_db_session() as session:
+        try:
+            exported_span_rollups, exported_conversation_rollups = _rollup_rows(session, project_id)
+            bucket_start = rollup_bucket_start(started_at)
+            assert len(exported_span_rollups) in (1, 2)  # The spans may straddle an hour
+            assert sum(row[3] for row in exported_span_rollups) == 4
+            assert sum(row[4] for row in exported_span_rollups) == 2
+            assert sum(row[5] for row in exported_span_rollups) == 2
+            assert sum(row[6] for row in exported_span_rollups) == 200
+            assert sum(row[7] for row in exported_span_rollups) == 40
+            assert sum(row[9] for row in exported_span_rollups) == 3.0
+            assert exported_span_rollups[0][0] == bucket_start
+            assert exported_span_rollups[0][1] == CallType.API
+            assert {row[2] for row in exported_conversation_rollups} == {conversation_id}
+            assert sum(row[3] for row in exported_conversation_rollups) == 3.0
+
+            rebuild_trace_rollups(session, started_at, datetime.now(tz=timezone.utc), project_ids=[project_id])
+
+            assert _rollup_rows(session, project_id) == (exported_span_rollups, exported_conversation_rollups)
+        finally:
+            session.query(Span).filter(Span.project_id.in_([str(project_id), "not-a-project-id"])).delete(
+                synchronize_session=False
+            )
+            for rollup_model in (SpanRollup, ConversationRollup):
+                session.query(rollup_model).filter(rollup_model.project_id == project_id).delete(
+                    synchronize_session=False
+                )
+            session.commit()
@@ -0,0 +1,144 @@
+import json
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+import numpy as np
+from openinference.semconv.trace import OpenInferenceSpanKindValues
+from opentelemetry.trace.status import StatusCode
+
+from ada_backend.database.models import EnvType
+from ada_backend.database.setup_db import get_db_session
+from ada_backend.database.trace_models import Span
+from ada_backend.services.metrics.utils import TOKENS_DISTRIBUTION_BINS, query_chart_aggregates
+
+
+def _span(
+    *,
+    trace_rowid: UUID,
+    project_id: UUID,
+    start_time: datetime,
+    duration_seconds: float = 1.0,
+    parent_id: str | None = None,
+    attributes: dict | str | None = None,
+    input_tokens: int | None = None,
+    output_tokens: int | None = None,
+) -> Span:
+    return Span(
+        trace_rowid=str(trace_rowid),
+        span_id=str(uuid4()),
+        parent_id=parent_id,
+        graph_runner_id=None,
+        name="LLM" if parent_id else "Workflow",
+        span_kind=OpenInferenceSpanKindValues.LLM if parent_id else OpenInferenceSpanKindValues.CHAIN,
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=duration_seconds),
+        attributes=attributes or {},
+        events="[]",
+        status_code=StatusCode.OK,
+        status_message="",
+        cumulative_error_count=0,
+        cumulative_llm_token_count_prompt=input_tokens or 0,
+        cumulative_llm_token_count_completion=output_tokens or 0,
+        llm_token_count_prompt=input_tokens,
+        llm_token_count_completion=output_tokens,
+        environment=EnvType.DRAFT,
+        call_type=None,
+        project_id=str(project_id),
+        tag_name=None,
+        component_instance_id=None,
+        model_id=None,
+    )
+
+
+def test_query_chart_aggregates_matches_the_spans_of_the_window():
+    project_id = uuid4()
+    now = datetime.now(tz=timezone.utc).replace(microsecond=0)
+    today = now - timedelta(minutes=5)
+    yesterday = now - timedelta(days=1)
+    durations = [0.5, 1.0, 1.5, 4.0, 12.0]
+    start_times = [today, today, today, yesterday, yesterday]
+    conversation_ids = ["conversation-1", "conversation-1", "conversation-2", None, None]
+
+    spans = []
+    for index, (duration, start_time, conversation_id) in enumerate(zip(durations, start_times, conversation_ids)):
+        attributes = {"conversation_id": conversation_id} if conversation_id else {}
+        root = _span(
+            trace_rowid=uuid4(),
+            project_id=project_id,
+            start_time=start_time,
+            duration_seconds=duration,
+            # Some exporters store the attributes as a JSON string
+            attributes=json.dumps(attributes) if index == 2 else attributes,
+        )
+        spans.append(root)
+        spans.append(
+            _span(
+                trace_rowid=UUID(root.trace_rowid),
+                project_id=project_id,
+                start_time=start_time,
+                parent_id=root.span_id,
+                input_tokens=1500 * (index + 1),
+                output_tokens=10000 if index == 0 else 100 * index,
+            )
+        )
+    spans.append(
+        _span(
+            trace_rowid=UUID(spans[0].trace_rowid),
+            project_id=project_id,
+            start_time=today,
+            parent_id=spans[0].span_id,
+            attributes={
+                "original_retrieval_rank": "[1, 3, 3]",
+                "original_reranker_rank": "[2, null]",
+                "total_retrieved_chunks": "8",
+            },
+        )
+    )
+    spans.append(
+        _span(
+            trace_rowid=UUID(spans[2].trace_rowid),
+            project_id=project_id,
+            start_time=today,
+            parent_id=spans[2].span_id,
+            attributes={"original_retrieval_rank": "[5]", "total_retrieved_chunks": "10"},
+        )
+    )
+    # Outside of the window
+    spans.append(_span(trace_rowid=uuid4(), project_id=project_id, start_time=now - timedelta(days=30)))
+
+    with get_db_session() as session:
+        session.add_all(spans)
+        session.commit()
+
+        try:
+            aggregates = query_chart_aggregates([project_id], duration_days=7)
+
+            assert aggregates.days[-2:] == [str(yesterday.date()), str(today.date())]
+            assert len(aggregates.days) == 8
+            assert aggregates.calls_per_day[-2:] == [2, 3]
+            assert sum(aggregates.calls_per_day) == 5
+            # Traces without a conversation_id count as one conversation each
+            assert aggregates.conversations_per_day[-2:] == [2, 2]
+            assert aggregates.input_tokens_per_day[-2:] == [1500 * (4 + 5), 1500 * (1 + 2 + 3)]
+            assert aggregates.output_tokens_per_day[-2:] == [300 + 400, 10000 + 100 + 200]
+
+            expected_latency_counts, expected_latency_edges = np.histogram(durations, bins="fd")
+            assert aggregates.latency_counts == expected_latency_counts.tolist()
+            np.testing.assert_allclose(aggregates.latency_bin_edges, expected_latency_edges)
+            input_tokens = [1500 * (index + 1) for index in range(5)]
+            output_tokens = [10000, 100, 200, 300, 400]
+            assert aggregates.input_tokens_counts == np.histogram(input_tokens, TOKENS_DISTRIBUTION_BINS)[0].tolist()
+            assert aggregates.output_tokens_counts == np.histogram(output_tokens, TOKENS_DISTRIBUTION_BINS)[0].tolist()
+
+            assert aggregates.rank_counts == {"retrieval": {1: 1, 3: 2, 5: 1}, "reranker": {2: 1}}
+            assert aggregates.rank_queries == {"retrieval": 2, "reranker": 1}
+            assert aggregates.max_ranked_chunks == {"retrieval": 10, "reranker": 0}
+
+            empty = query_chart_aggregates([uuid4()], duration_days=7)
+            assert empty.calls_per_day == [0] * 8
+            assert sum(empty.latency_counts) == 0
+            assert empty.rank_counts == {}
+        finally:
+            span_ids = [span.span_id for span in spans]
+            session.query(Span).filter(Span.span_id.in_(span_ids)).delete(synchronize_session=False)
+            session.commit()
@@ -1,5 +1,5 @@
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from uuid import UUID, uuid4
 
 import numpy as np
@@ -8,9 +8,10 @@ from opentelemetry.trace.status import StatusCode
 
 from ada_backend.database.models import CallType, EnvType, SpanUsage
 from ada_backend.database.setup_db import get_db_session
-from ada_backend.database.trace_models import Span
+from ada_backend.database.trace_models import ConversationRollup, Span, SpanRollup
 from ada_backend.repositories.llm_models_repository import create_llm_model, delete_llm_model
-from ada_backend.services.metrics.monitor_kpis_service import get_trace_cost_kpis
+from ada_backend.repositories.trace_rollup_repository import rebuild_trace_rollups
+from ada_backend.services.metrics.monitor_kpis_service import get_trace_cost_kpis, get_trace_metrics
 
 
 def _generate_span(
@@ -85,8 +86,8 @@ def test_get_trace_cost_kpis():
     trace_rowid_2_project1 = uuid4()
     span_id_1_project1 = uuid4()
     span_id_2_project1 = uuid4()
-    parent_id_1_project1 = uuid4()
-    parent_id_2_project1 = uuid4()
+    parent_id_1_project1 = None
+    parent_id_2_project1 = None
     credits_input_token_1_project1 = 34.0
     credits_output_token_1_project1 = 38.0
     credits_input_token_2_project1 = 80.0
@@ -99,8 +100,8 @@ def test_get_trace_cost_kpis():
     trace_rowid_2_project2 = uuid4()
     span_id_1_project2 = uuid4()
     span_id_2_project2 = uuid4()
-    parent_id_1_project2 = uuid4()
-    parent_id_2_project2 = uuid4()
+    parent_id_1_project2 = None
+    parent_id_2_project2 = None
     credits_input_token_1_project2 = 36.0
     credits_output_token_1_project2 = 22.0
     credits_input_token_2_project2 = 67.0
@@ -222,6 +223,7 @@ def test_get_trace_cost_kpis():
             session.add(span_usage)
 
         session.commit()
+        rebuild_trace_rollups(session, now - timedelta(days=1), now, project_ids=[project1, project2])
 
         try:
             # Test project 1
@@ -278,7 +280,59 @@ def test_get_trace_cost_kpis():
             # Delete spans
             trace_rowids_to_delete = [str(s["trace_rowid"]) for s in spans_project1 + spans_project2]
             session.query(Span).filter(Span.trace_rowid.in_(trace_rowids_to_delete)).delete(synchronize_session=False)
+            for rollup_model in (SpanRollup, ConversationRollup):
+                session.query(rollup_model).filter(rollup_model.project_id.in_([project1, project2])).delete(
+                    synchronize_session=False
+                )
 
             delete_llm_model(session, model_id)
 
             session.commit()
+
+
+def test_get_trace_metrics_reads_the_span_rollups():
+    project_id = uuid4()
+    now = datetime.now(tz=timezone.utc)
+
+    def rollup(bucket_start: datetime, root_span_count: int, tokens: int, duration_seconds: float, **keys):
+        return SpanRollup(
+            bucket_start=bucket_start.replace(minute=0, second=0, microsecond=0),
+            project_id=project_id,
+            span_count=2 * root_span_count,
+            root_span_count=root_span_count,
+            llm_span_count=root_span_count,
+            input_tokens=tokens,
+            output_tokens=tokens,
+            root_duration_seconds=duration_seconds,
+            credits=0.0,
+            **keys,
+        )
+
+    rollups = [
+        rollup(now - timedelta(hours=1), 3, 100, 6.0, call_type=CallType.API),
+        rollup(now - timedelta(hours=1), 1, 50, 4.0, call_type=CallType.SANDBOX),
+        rollup(now - timedelta(days=1, hours=1), 2, 100, 2.0, call_type=CallType.API),
+        rollup(now - timedelta(days=3), 5, 1000, 50.0, call_type=CallType.API),
+    ]
+    with get_db_session() as session:
+        session.add_all(rollups)
+        session.commit()
+        try:
+            metrics = get_trace_metrics([project_id], duration_days=1)
+            assert metrics.nb_request == 4
+            assert metrics.tokens_count == 300
+            assert metrics.average_latency == 2.5
+            assert metrics.nb_request_comparison_percentage == 100.0
+            assert metrics.token_comparison_percentage == 50.0
+            assert metrics.latency_comparison_percentage == 150.0
+
+            api_metrics = get_trace_metrics([project_id], duration_days=1, call_type=CallType.API)
+            assert api_metrics.nb_request == 3
+            assert api_metrics.average_latency == 2.0
+
+            empty_metrics = get_trace_metrics([uuid4()], duration_days=1)
+            assert empty_metrics.nb_request == 0
+            assert empty_metrics.average_latency is None
+        finally:
+            session.query(SpanRollup).filter(SpanRollup.project_id == project_id).delete(synchronize_session=False)
+            session.commit()
@@ -6,8 +6,9 @@ from opentelemetry.trace.status import StatusCode
 
 from ada_backend.database.models import EnvType, Project, WorkflowProject
 from ada_backend.database.setup_db import get_db_session
-from ada_backend.database.trace_models import Span
+from ada_backend.database.trace_models import Span, SpanRollup
 from ada_backend.repositories.llm_models_repository import create_llm_model, delete_llm_model
+from ada_backend.repositories.trace_rollup_repository import rebuild_trace_rollups
 from ada_backend.services.metrics.monitor_kpis_service import get_org_token_usage
 
 
@@ -126,6 +127,12 @@ def test_get_org_token_usage_aggregates_monthly_tokens_by_model():
         ]
         session.add_all(spans)
         session.commit()
+        rebuild_trace_rollups(
+            session,
+            previous_month,
+            month_start + timedelta(days=4),
+            project_ids=[project_id, project_id_2, other_org_project_id],
+        )
 
         try:
             result = get_org_token_usage(organization_id=organization_id, years=[2026], months=[7])
@@ -181,6 +188,7 @@ def test_get_org_token_usage_aggregates_monthly_tokens_by_model():
             span_ids = [span.span_id for span in spans]
             project_ids = [project.id for project in projects]
             session.query(Span).filter(Span.span_id.in_(span_ids)).delete(synchronize_session=False)
+            session.query(SpanRollup).filter(SpanRollup.project_id.in_(project_ids)).delete(synchronize_session=False)
             session.query(WorkflowProject).filter(WorkflowProject.id.in_([project.id for project in projects])).delete(
                 synchronize_session=False
             )
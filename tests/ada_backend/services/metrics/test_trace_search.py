@@ -2,12 +2,14 @@ import json
 from datetime import datetime, timedelta
 from uuid import uuid4
 
+import pytest
 from openinference.semconv.trace import OpenInferenceSpanKindValues
 from opentelemetry.trace.status import StatusCode
 
 from ada_backend.database.models import CallType, EnvType
 from ada_backend.database.setup_db import get_db_session
 from ada_backend.database.trace_models import Span, SpanMessage
+from ada_backend.services.metrics import utils
 from ada_backend.services.metrics.utils import query_root_trace_duration
 
 
@@ -83,24 +85,26 @@ def test_search_traces_by_keyword():
         session.commit()
 
         try:
-            rows_all, _ = query_root_trace_duration(project_id, duration_days=1)
+            rows_all = query_root_trace_duration(project_id, duration_days=1).rows
             assert len(rows_all) == 3
 
-            rows_hello, total_pages = query_root_trace_duration(project_id, duration_days=1, search="Hello")
+            page_hello = query_root_trace_duration(project_id, duration_days=1, search="Hello")
+            rows_hello = page_hello.rows
             assert len(rows_hello) == 2
-            assert total_pages == 1
+            assert page_hello.total_pages == 1
+            assert page_hello.next_cursor is None
             trace_ids = {row["trace_rowid"] for row in rows_hello}
             assert str(trace1_id) in trace_ids
             assert str(trace3_id) in trace_ids
 
-            rows_goodbye, _ = query_root_trace_duration(project_id, duration_days=1, search="Goodbye")
+            rows_goodbye = query_root_trace_duration(project_id, duration_days=1, search="Goodbye").rows
             assert len(rows_goodbye) == 1
             assert rows_goodbye[0]["trace_rowid"] == str(trace2_id)
 
-            rows_none, _ = query_root_trace_duration(project_id, duration_days=1, search="nonexistent_xyz")
+            rows_none = query_root_trace_duration(project_id, duration_days=1, search="nonexistent_xyz").rows
             assert len(rows_none) == 0
 
-            rows_case, _ = query_root_trace_duration(project_id, duration_days=1, search="hello")
+            rows_case = query_root_trace_duration(project_id, duration_days=1, search="hello").rows
             assert len(rows_case) == 2
 
         finally:
@@ -147,17 +151,17 @@ def test_search_traces_with_special_characters():
         all_trace_ids = [str(trace_utf8_id), str(trace_escaped_id), str(trace_plain_id)]
 
         try:
-            rows_accent, _ = query_root_trace_duration(project_id, duration_days=1, search="résumé")
+            rows_accent = query_root_trace_duration(project_id, duration_days=1, search="résumé").rows
             assert len(rows_accent) == 2
             trace_ids = {row["trace_rowid"] for row in rows_accent}
             assert str(trace_utf8_id) in trace_ids
             assert str(trace_escaped_id) in trace_ids
 
-            rows_percent, _ = query_root_trace_duration(project_id, duration_days=1, search="100%")
+            rows_percent = query_root_trace_duration(project_id, duration_days=1, search="100%").rows
             assert len(rows_percent) == 1
             assert rows_percent[0]["trace_rowid"] == str(trace_plain_id)
 
-            rows_bare_percent, _ = query_root_trace_duration(project_id, duration_days=1, search="%")
+            rows_bare_percent = query_root_trace_duration(project_id, duration_days=1, search="%").rows
             assert len(rows_bare_percent) == 1
             assert rows_bare_percent[0]["trace_rowid"] == str(trace_plain_id)
 
@@ -193,38 +197,38 @@ def test_filter_traces_by_date_range():
         session.commit()
 
         try:
-            rows, _ = query_root_trace_duration(
+            rows = query_root_trace_duration(
                 project_id,
                 start_time=now - timedelta(hours=6),
                 end_time=now,
-            )
+            ).rows
             assert len(rows) == 2
             trace_ids = {row["trace_rowid"] for row in rows}
             assert str(trace1_id) in trace_ids
             assert str(trace2_id) in trace_ids
 
-            rows_start_only, _ = query_root_trace_duration(
+            rows_start_only = query_root_trace_duration(
                 project_id,
                 start_time=now - timedelta(hours=2),
-            )
+            ).rows
             assert len(rows_start_only) == 1
             assert rows_start_only[0]["trace_rowid"] == str(trace1_id)
 
-            rows_end_only, _ = query_root_trace_duration(
+            rows_end_only = query_root_trace_duration(
                 project_id,
                 end_time=now - timedelta(hours=4),
-            )
+            ).rows
             assert len(rows_end_only) == 2
             trace_ids_end = {row["trace_rowid"] for row in rows_end_only}
             assert str(trace2_id) in trace_ids_end
             assert str(trace3_id) in trace_ids_end
 
-            rows_range_takes_precedence, _ = query_root_trace_duration(
+            rows_range_takes_precedence = query_root_trace_duration(
                 project_id,
                 duration_days=1,
                 start_time=now - timedelta(hours=2),
                 end_time=now,
-            )
+            ).rows
             assert len(rows_range_takes_precedence) == 1
             assert rows_range_takes_precedence[0]["trace_rowid"] == str(trace1_id)
 
@@ -234,3 +238,57 @@ def test_filter_traces_by_date_range():
             session.query(SpanMessage).filter(SpanMessage.span_id.in_(span_ids)).delete(synchronize_session=False)
             session.query(Span).filter(Span.trace_rowid.in_(trace_ids_cleanup)).delete(synchronize_session=False)
             session.commit()
+
+
+def test_paginate_traces_with_cursor(monkeypatch):
+    now = datetime.now()
+    project_id = uuid4()
+    trace_ids = [uuid4() for _ in range(5)]
+    span_ids = [uuid4() for _ in range(5)]
+    # The last two traces start at the same time and are ordered by span_id
+    start_times = [now - timedelta(hours=1), now - timedelta(hours=2), now - timedelta(hours=3)] + [
+        now - timedelta(hours=4)
+    ] * 2
+
+    with get_db_session() as session:
+        session.add_all([
+            _create_root_span(project_id, trace_id, span_id, start_time)
+            for trace_id, span_id, start_time in zip(trace_ids, span_ids, start_times)
+        ])
+        session.commit()
+
+        try:
+            expected_span_ids = [str(span_id) for span_id in span_ids[:3]] + sorted(
+                [str(span_id) for span_id in span_ids[3:]], reverse=True
+            )
+            first_page = query_root_trace_duration(project_id, duration_days=1, page_size=2)
+            assert [row["span_id"] for row in first_page.rows] == expected_span_ids[:2]
+            assert first_page.total_pages == 3
+            assert first_page.next_cursor is not None
+
+            second_page = query_root_trace_duration(
+                project_id, duration_days=1, page_size=2, cursor=first_page.next_cursor
+            )
+            assert [row["span_id"] for row in second_page.rows] == expected_span_ids[2:4]
+            assert second_page.total_pages == 3
+
+            last_page = query_root_trace_duration(
+                project_id, duration_days=1, page_size=2, page=2, cursor=second_page.next_cursor
+            )
+            assert [row["span_id"] for row in last_page.rows] == expected_span_ids[4:]
+            assert last_page.next_cursor is None
+            offset_page = query_root_trace_duration(project_id, duration_days=1, page_size=2, page=3)
+            assert offset_page.rows == last_page.rows
+
+            monkeypatch.setattr(utils, "ROOT_TRACES_COUNT_CAP", 3)
+            capped_page = query_root_trace_duration(project_id, duration_days=1, page_size=2)
+            assert capped_page.total_pages == 2
+            assert capped_page.total_capped is True
+
+            with pytest.raises(ValueError):
+                query_root_trace_duration(project_id, duration_days=1, cursor="not-a-cursor")
+        finally:
+            session.query(Span).filter(Span.trace_rowid.in_([str(trace_id) for trace_id in trace_ids])).delete(
+                synchronize_session=False
+            )
+            session.commit()
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import time
+from uuid import uuid4
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+from fastapi.security import HTTPAuthorizationCredentials
+
+from ada_backend.routers import auth_router
+from ada_backend.schemas.auth_schema import SupabaseUser, VerifiedApiKey
+from ada_backend.services import auth_cache_service, user_roles_service
+from ada_backend.services.auth_cache_service import (
+    get_or_verify_api_key,
+    handle_auth_invalidation,
+    invalidate_api_key,
+    verify_supabase_token_locally,
+)
+
+JWT_SECRET = "test-jwt-secret-with-enough-entropy-for-hs256"
+
+
+@pytest.fixture(autouse=True)
+def auth_caches(monkeypatch):
+    published = []
+    auth_cache_service.clear_auth_caches()
+    monkeypatch.setattr(auth_cache_service, "SUPABASE_JWT_SECRET", JWT_SECRET)
+    monkeypatch.setattr(auth_cache_service, "_publish_invalidation", lambda kind, id: published.append((kind, id)))
+    yield published
+    auth_cache_service.clear_auth_caches()
+
+
+def _token(key=JWT_SECRET, algorithm="HS256", expires_in=3600, **claims) -> str:
+    payload = {"sub": str(uuid4()), "email": "user@example.com", "aud": "authenticated"}
+    payload["exp"] = int(time.time()) + expires_in
+    payload.update(claims)
+    return jwt.encode(payload, key, algorithm=algorithm)
+
+
+def _verified_api_key(project_id=None) -> VerifiedApiKey:
+    return VerifiedApiKey(api_key_id=uuid4(), scope_type="project", project_id=project_id, organization_id=None)
+
+
+def test_api_key_verifications_are_reused_until_revoked(auth_caches):
+    verified_api_key = _verified_api_key()
+    calls = []
+
+    def verify(private_key: str) -> VerifiedApiKey:
+        calls.append(private_key)
+        return verified_api_key
+
+    assert get_or_verify_api_key("taylor_key", verify) == verified_api_key
+    assert get_or_verify_api_key("taylor_key", verify) == verified_api_key
+    assert calls == ["taylor_key"]
+
+    invalidate_api_key(verified_api_key.api_key_id)
+    assert auth_caches == [("api_key", verified_api_key.api_key_id)]
+    get_or_verify_api_key("taylor_key", verify)
+    assert len(calls) == 2
+
+
+def test_invalidations_from_other_processes_drop_the_project_and_its_keys():
+    project_id = uuid4()
+    verified_api_key = _verified_api_key(project_id=project_id)
+    auth_cache_service._project_organizations.set(project_id, uuid4())
+    get_or_verify_api_key("taylor_key", lambda _key: verified_api_key)
+
+    handle_auth_invalidation("not json")
+    handle_auth_invalidation(json.dumps({"kind": "project", "id": str(project_id)}))
+
+    assert auth_cache_service._project_organizations.get(project_id) is None
+    assert get_or_verify_api_key("taylor_key", lambda _key: _verified_api_key()) != verified_api_key
+
+
+def test_tokens_are_verified_locally_with_the_shared_secret():
+    user_id = uuid4()
+    token = _token(sub=str(user_id))
+
+    user, expires_at = verify_supabase_token_locally(token)
+
+    assert (user.id, user.email, user.token) == (user_id, "user@example.com", token)
+    assert expires_at > time.time()
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verify_supabase_token_locally(_token(expires_in=-10))
+    with pytest.raises(jwt.InvalidSignatureError):
+        verify_supabase_token_locally(_token(key="another-secret-with-enough-entropy-for-hs256"))
+    # Tokens that are not user access tokens are left to Supabase
+    assert verify_supabase_token_locally(_token(aud="service")) is None
+
+
+def test_tokens_are_verified_locally_with_the_project_signing_keys(monkeypatch):
+    private_key = ec.generate_private_key(ec.SECP256R1())
+
+    class FakeJWKClient:
+        def get_signing_key_from_jwt(self, token):
+            return jwt.PyJWK.from_dict(json.loads(jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key())))
+
+    monkeypatch.setattr(auth_cache_service, "_get_jwks_client", FakeJWKClient)
+    user_id = uuid4()
+
+    user, _expires_at = verify_supabase_token_locally(_token(key=private_key, algorithm="ES256", sub=str(user_id)))
+
+    assert user.id == user_id
+
+
+def test_supabase_is_only_asked_once_per_token(monkeypatch):
+    calls = []
+    user = SupabaseUser(id=uuid4(), email="user@example.com", token="opaque")
+    monkeypatch.setattr(auth_cache_service, "SUPABASE_JWT_SECRET", None)
+
+    def get_user(token):
+        calls.append(token)
+        return type("UserResponse", (), {"user": user})()
+
+    monkeypatch.setattr(auth_router.supabase.auth, "get_user", get_user)
+    token = _token()
+    authorization = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    for _ in range(3):
+        assert asyncio.run(auth_router.get_user_from_supabase_token(authorization)).id == user.id
+    assert calls == [token]
+
+
+def test_organization_accesses_are_reused(monkeypatch):
+    calls = []
+
+    async def fake_get_user_access(endpoint, jwt_token, identifier_key, identifier_value):
+        calls.append(identifier_value)
+        return {"access": True, "role": "admin"}
+
+    monkeypatch.setattr(user_roles_service, "_get_user_access", fake_get_user_access)
+    monkeypatch.setattr(user_roles_service, "identify_user", lambda *args: None)
+    user = SupabaseUser(id=uuid4(), email="user@example.com", token="token")
+    organization_id = uuid4()
+
+    for _ in range(3):
+        access = asyncio.run(user_roles_service.get_user_access_to_organization(user, organization_id))
+        assert access.role == "admin"
+    assert calls == [str(organization_id)]
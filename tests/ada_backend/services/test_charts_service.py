@@ -1,25 +1,55 @@
+from collections import Counter
 from unittest.mock import patch
 from uuid import UUID
 
 import numpy as np
-import pandas as pd
 
 from ada_backend.schemas.chart_schema import Chart, ChartCategory, ChartData, ChartType, Dataset
 from ada_backend.services.charts_service import TOKENS_DISTRIBUTION_BINS, get_tokens_distribution_chart
 from ada_backend.services.metrics.rank_charts import compute_rank_bins, get_ranks_distribution_charts
-
-
-@patch("ada_backend.services.charts_service.query_trace_duration")
-def test_get_tokens_chart(mock_query_trace_duration):
+from ada_backend.services.metrics.utils import ChartAggregates
+
+
+def _aggregates(**fields) -> ChartAggregates:
+    number_of_token_bins = len(TOKENS_DISTRIBUTION_BINS) - 1
+    defaults = {
+        "days": [],
+        "calls_per_day": [],
+        "conversations_per_day": [],
+        "input_tokens_per_day": [],
+        "output_tokens_per_day": [],
+        "latency_bin_edges": [0.0, 1.0],
+        "latency_counts": [0],
+        "input_tokens_counts": [0] * number_of_token_bins,
+        "output_tokens_counts": [0] * number_of_token_bins,
+    }
+    return ChartAggregates(**{**defaults, **fields})
+
+
+def _rank_aggregates(attributes: list[dict]) -> ChartAggregates:
+    """Aggregates of spans with these rank attributes, as query_chart_aggregates computes them."""
+    rank_counts, rank_queries, max_ranked_chunks = {}, {}, {}
+    for ranker, total_attribute in (("retrieval", "total_retrieved_chunks"), ("reranker", "total_reranked_chunks")):
+        rank_lists = [span[f"original_{ranker}_rank"] for span in attributes if span.get(f"original_{ranker}_rank")]
+        if rank_lists:
+            rank_counts[ranker] = dict(Counter(rank for ranks in rank_lists for rank in ranks))
+            rank_queries[ranker] = len(rank_lists)
+        totals = [span[total_attribute] for span in attributes if total_attribute in span]
+        max_ranked_chunks[ranker] = max(totals, default=0)
+    return _aggregates(rank_counts=rank_counts, rank_queries=rank_queries, max_ranked_chunks=max_ranked_chunks)
+
+
+@patch("ada_backend.services.charts_service.query_chart_aggregates")
+def test_get_tokens_chart(mock_query_chart_aggregates):
     input_data = [100, 200, 300]
     output_data = [50, 100, 70]
-    mock_df = pd.DataFrame({"llm_token_count_prompt": input_data, "llm_token_count_completion": output_data})
-    mock_query_trace_duration.return_value = mock_df
-
     expected_bins = TOKENS_DISTRIBUTION_BINS
     expected_bin_centers = [(expected_bins[i] + expected_bins[i + 1]) / 2 for i in range(len(expected_bins) - 1)]
     expected_input_n = np.histogram(input_data, bins=expected_bins)[0]
     expected_output_n = np.histogram(output_data, bins=expected_bins)[0]
+    mock_query_chart_aggregates.return_value = _aggregates(
+        input_tokens_counts=expected_input_n.tolist(), output_tokens_counts=expected_output_n.tolist()
+    )
 
     project_id = UUID("12345678123456781234567812345678")
     duration_days = 7
@@ -75,36 +105,33 @@ def test_compute_rank_bins_large():
     assert labels[-1] == "31-33"
 
 
-@patch("ada_backend.services.metrics.rank_charts.query_trace_duration")
-def test_get_ranks_distribution_charts_with_totals(mock_query_trace_duration):
+@patch("ada_backend.services.metrics.rank_charts.query_chart_aggregates")
+def test_get_ranks_distribution_charts_with_totals(mock_query_chart_aggregates):
     total_retrieved = 50
     total_reranked = 10
     retrieval_ranks = [1, 2, 3, 1, 5, 7, 10]
     reranker_ranks = [1, 1, 2, 4, 6, 9]
 
-    mock_df = pd.DataFrame({
-        "attributes": [
-            {
-                "original_retrieval_rank": [1, 2, 3],
-                "original_reranker_rank": [1, 1, 2],
-                "total_retrieved_chunks": total_retrieved,
-                "total_reranked_chunks": total_reranked,
-            },
-            {
-                "original_retrieval_rank": [1, 5],
-                "original_reranker_rank": [4, 6],
-                "total_retrieved_chunks": total_retrieved,
-                "total_reranked_chunks": total_reranked,
-            },
-            {
-                "original_retrieval_rank": [7, 10],
-                "original_reranker_rank": [9],
-                "total_retrieved_chunks": total_retrieved,
-                "total_reranked_chunks": total_reranked,
-            },
-        ]
-    })
-    mock_query_trace_duration.return_value = mock_df
+    mock_query_chart_aggregates.return_value = _rank_aggregates([
+        {
+            "original_retrieval_rank": [1, 2, 3],
+            "original_reranker_rank": [1, 1, 2],
+            "total_retrieved_chunks": total_retrieved,
+            "total_reranked_chunks": total_reranked,
+        },
+        {
+            "original_retrieval_rank": [1, 5],
+            "original_reranker_rank": [4, 6],
+            "total_retrieved_chunks": total_retrieved,
+            "total_reranked_chunks": total_reranked,
+        },
+        {
+            "original_retrieval_rank": [7, 10],
+            "original_reranker_rank": [9],
+            "total_retrieved_chunks": total_retrieved,
+            "total_reranked_chunks": total_reranked,
+        },
+    ])
 
     num_queries = 3
 
@@ -169,15 +196,10 @@ def test_get_ranks_distribution_charts_with_totals(mock_query_trace_duration):
     assert reranker_chart.data.datasets[0].data == expected_reranker_pct
 
 
-@patch("ada_backend.services.metrics.rank_charts.query_trace_duration")
-def test_get_ranks_distribution_charts_fallback_to_max_rank(mock_query_trace_duration):
+@patch("ada_backend.services.metrics.rank_charts.query_chart_aggregates")
+def test_get_ranks_distribution_charts_fallback_to_max_rank(mock_query_chart_aggregates):
     """When total_*_chunks attributes are missing, fall back to max(ranks)."""
-    mock_df = pd.DataFrame({
-        "attributes": [
-            {"original_retrieval_rank": [1, 3, 7]},
-        ]
-    })
-    mock_query_trace_duration.return_value = mock_df
+    mock_query_chart_aggregates.return_value = _rank_aggregates([{"original_retrieval_rank": [1, 3, 7]}])
 
     project_id = UUID("12345678123456781234567812345678")
     charts = get_ranks_distribution_charts([project_id], 7)
@@ -188,10 +210,9 @@ def test_get_ranks_distribution_charts_fallback_to_max_rank(mock_query_trace_dur
     assert retrieval_chart.data.labels == expected_labels
 
 
-@patch("ada_backend.services.metrics.rank_charts.query_trace_duration")
-def test_get_ranks_distribution_charts_empty(mock_query_trace_duration):
-    mock_df = pd.DataFrame({"attributes": [{}]})
-    mock_query_trace_duration.return_value = mock_df
+@patch("ada_backend.services.metrics.rank_charts.query_chart_aggregates")
+def test_get_ranks_distribution_charts_empty(mock_query_chart_aggregates):
+    mock_query_chart_aggregates.return_value = _rank_aggregates([{}])
 
     project_id = UUID("12345678123456781234567812345678")
     charts = get_ranks_distribution_charts([project_id], 7)
@@ -10,9 +10,10 @@ import pytest
 
 from ada_backend.database.models import EnvType
 from ada_backend.database.seed.utils import COMPONENT_UUIDS
-from ada_backend.database.setup_db import get_db_session
+from ada_backend.database.setup_db import get_async_db_session, get_db_session
 from ada_backend.schemas.parameter_schema import ParameterKind
 from ada_backend.schemas.pipeline.graph_schema import GraphUpdateSchema
+from ada_backend.services.agent_runner_service import load_graph_topology_async
 from ada_backend.services.graph.deploy_graph_service import deploy_graph_service
 from ada_backend.services.graph.get_graph_service import get_graph_service
 from ada_backend.services.graph.load_copy_graph_service import load_copy_graph_service
@@ -656,3 +657,32 @@ def test_invalid_reference_unknown_port_returns_error():
             _run_update_graph(session, graph_runner_id, project_id, payload)
 
         delete_project_service(session, project_id)
+
+
+def test_graph_topology_is_loaded_on_the_async_session():
+    """Nodes, edges and field expressions of the run hot path come from a single async session."""
+    with get_db_session() as session:
+        project_id, graph_runner_id = create_project_and_graph_runner(session, "field_expressions_topology")
+        src_instance_id, dst_instance_id = str(uuid4()), str(uuid4())
+        payload = _create_graph_payload_with_field_expressions(
+            src_instance_id, dst_instance_id, str(uuid4()), f"@{{{{{src_instance_id}.output}}}}"
+        )
+        _run_update_graph(session, graph_runner_id, project_id, payload)
+
+    async def _load():
+        async with get_async_db_session() as async_session:
+            return await load_graph_topology_async(async_session, graph_runner_id)
+
+    try:
+        topology = asyncio.run(_load())
+
+        assert {str(node.id) for node in topology.component_nodes} == {src_instance_id, dst_instance_id}
+        assert [(str(edge.source_node_id), str(edge.target_node_id)) for edge in topology.edges] == [
+            (src_instance_id, dst_instance_id)
+        ]
+        expression_ports = {port.name: port for port in topology.expression_ports[UUID(dst_instance_id)]}
+        assert expression_ports["messages"].field_expression.expression_json["instance"] == src_instance_id
+        assert "messages" not in {port.name for port in topology.expression_ports.get(UUID(src_instance_id), [])}
+    finally:
+        with get_db_session() as session:
+            delete_project_service(session, project_id)
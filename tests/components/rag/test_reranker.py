@@ -0,0 +1,130 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from engine.components.rag import reranker as reranker_module
+from engine.components.rag.cohere_reranker import CohereReranker
+from engine.components.rag.reranker import Reranker, build_rerank_cache_key, truncate_to_token_budget
+from engine.components.types import SourceChunk
+from tests.mocks.trace_manager import MockTraceManager
+
+
+class LengthReranker(Reranker):
+    """Scores documents by length, recording the documents it was asked to score."""
+
+    def __init__(self, **kwargs):
+        super().__init__(MockTraceManager(project_name="project_name"), model="length", **kwargs)
+        self.scored_documents: list[list[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _score_documents(self, query, documents, top_n):
+        self.scored_documents.append(documents)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        scores = sorted(((i, len(doc) / 100) for i, doc in enumerate(documents)), key=lambda x: x[1], reverse=True)
+        return scores[:top_n]
+
+
+def _chunks(*contents: str) -> list[SourceChunk]:
+    return [
+        SourceChunk(name=f"id-{i}", document_name=f"doc-{i}", content=content, url="", metadata={})
+        for i, content in enumerate(contents)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def clear_rerank_cache():
+    reranker_module._rerank_cache.clear()
+    yield
+    reranker_module._rerank_cache.clear()
+
+
+def test_truncate_to_token_budget():
+    long_text = "word " * 1000
+
+    truncated = truncate_to_token_budget(long_text, 10)
+
+    assert len(truncated) < len(long_text)
+    assert truncate_to_token_budget("short text", 10) == "short text"
+    assert truncate_to_token_budget(long_text, None) == long_text
+
+
+def test_cache_key_ignores_chunk_order_and_requires_unique_ids():
+    chunks = _chunks("a", "b")
+
+    assert build_rerank_cache_key("m", "q", chunks, 5) == build_rerank_cache_key("m", "q", chunks[::-1], 5)
+    assert build_rerank_cache_key("m", "q", [chunks[0], chunks[0]], 5) is None
+
+
+@pytest.mark.asyncio
+async def test_rerank_truncates_documents_and_applies_threshold():
+    reranker = LengthReranker(num_doc_reranked=3, score_threshold=0.05, max_tokens_per_document=5)
+
+    reranked = await reranker.rerank("query", _chunks("x" * 400, "abc", "word " * 100))
+
+    assert all(len(document) < 100 for document in reranker.scored_documents[0])
+    assert [chunk.name for chunk in reranked] == ["id-0", "id-2"]
+    assert reranked[0].metadata["reranked_score"] >= reranked[1].metadata["reranked_score"]
+
+
+@pytest.mark.asyncio
+async def test_rerank_results_are_cached_by_query_and_chunk_ids():
+    reranker = LengthReranker(num_doc_reranked=2)
+    chunks = _chunks("long document", "short")
+
+    first = await reranker.rerank("query", chunks)
+    second = await reranker.rerank("query", chunks[::-1])
+    await reranker.rerank("another query", chunks)
+
+    assert len(reranker.scored_documents) == 2
+    assert [chunk.name for chunk in first] == [chunk.name for chunk in second]
+
+
+@pytest.mark.asyncio
+async def test_rerank_maps_results_by_index_when_chunk_ids_repeat():
+    reranker = LengthReranker(num_doc_reranked=2)
+    chunks = [
+        SourceChunk(name="same-id", document_name="doc", content=content, url="", metadata={})
+        for content in ("first", "second document")
+    ]
+
+    reranked = await reranker.rerank("query", chunks)
+
+    assert [chunk.content for chunk in reranked] == ["second document", "first"]
+
+
+@pytest.mark.asyncio
+async def test_rerank_many_runs_queries_concurrently():
+    reranker = LengthReranker(num_doc_reranked=1, enable_cache=False)
+
+    results = await reranker.rerank_many(
+        [f"query {i}" for i in range(4)], [_chunks("a", "bb") for _ in range(4)], max_concurrency=2
+    )
+
+    assert [[chunk.name for chunk in chunks] for chunks in results] == [["id-1"]] * 4
+    assert reranker.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_cohere_reranker_maps_results_to_chunks():
+    reranker = CohereReranker(
+        trace_manager=MockTraceManager(project_name="project_name"), cohere_api_key="key", num_doc_reranked=2
+    )
+    reranker._async_cohere_client = SimpleNamespace(
+        rerank=AsyncMock(
+            return_value=SimpleNamespace(
+                results=[SimpleNamespace(index=1, relevance_score=0.9), SimpleNamespace(index=0, relevance_score=0.2)]
+            )
+        )
+    )
+
+    reranked = await reranker.rerank("query", _chunks("first", "second"))
+
+    assert [chunk.name for chunk in reranked] == ["id-1", "id-0"]
+    assert reranked[0].metadata["reranked_score"] == 0.9
+    assert reranker._async_cohere_client.rerank.call_args.kwargs["documents"] == ["first", "second"]
@@ -2,7 +2,7 @@ from unittest.mock import AsyncMock, Mock
 
 import pytest
 
-from engine.components.rag.retriever import Retriever, RetrieverInputs
+from engine.components.rag.retriever import Retriever, RetrieverInputs, fuse_chunk_rankings
 from engine.components.types import SourceChunk
 from engine.llm_services.llm_service import EmbeddingService
 from engine.qdrant_service import QdrantService, SearchMode
@@ -139,3 +139,58 @@ class TestRetrieverSearchMode:
                 max_retrieved_chunks=TEST_MAX_RETRIEVED_CHUNKS,
                 search_mode="invalid_mode",
             )
+
+
+class TestRetrieverMultiQuery:
+    @pytest.mark.asyncio
+    async def test_queries_are_batched_and_fused(self, retriever, mock_qdrant_service):
+        chunk_a = SourceChunk(content="a", name="a", document_name="a", url="url_a", metadata={})
+        chunk_b = SourceChunk(content="b", name="b", document_name="b", url="url_b", metadata={})
+        chunk_c = SourceChunk(content="c", name="c", document_name="c", url="url_c", metadata={})
+        mock_qdrant_service.retrieve_similar_chunks_batch_async = AsyncMock(
+            return_value=[[chunk_a, chunk_b], [chunk_c, chunk_b]]
+        )
+
+        chunks = await retriever.get_chunks_for_queries(["first question", "second question", "first question"])
+
+        mock_qdrant_service.retrieve_similar_chunks_async.assert_not_called()
+        call_kwargs = mock_qdrant_service.retrieve_similar_chunks_batch_async.call_args.kwargs
+        assert call_kwargs["query_texts"] == ["first question", "second question"]
+        assert [chunk.name for chunk in chunks] == ["b", "a"]
+        assert chunks[0].metadata["_retrieval_rank"] == 1
+
+    @pytest.mark.asyncio
+    async def test_single_query_uses_single_search(self, retriever, mock_qdrant_service):
+        mock_qdrant_service.retrieve_similar_chunks_async.return_value = []
+        mock_qdrant_service.retrieve_similar_chunks_batch_async = AsyncMock()
+
+        await retriever.get_chunks_for_queries(["only question", " only question "])
+
+        mock_qdrant_service.retrieve_similar_chunks_async.assert_called_once()
+        mock_qdrant_service.retrieve_similar_chunks_batch_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_run_with_additional_queries(self, retriever, mock_qdrant_service):
+        mock_qdrant_service.retrieve_similar_chunks_batch_async = AsyncMock(
+            return_value=[
+                [SourceChunk(content="chunk1", name="1", document_name="1", url="url1", metadata={})],
+                [SourceChunk(content="chunk2", name="2", document_name="2", url="url2", metadata={})],
+            ]
+        )
+
+        result = await retriever._run_without_io_trace(
+            RetrieverInputs(query="main question", queries=["sub question"]), ctx={}
+        )
+
+        assert len(result.artifacts["sources"]) == 2
+        call_kwargs = mock_qdrant_service.retrieve_similar_chunks_batch_async.call_args.kwargs
+        assert call_kwargs["query_texts"] == ["main question", "sub question"]
+
+
+def test_fuse_chunk_rankings_deduplicates_by_chunk_id():
+    chunk = SourceChunk(content="x", name="x", document_name="x", url="url_x", metadata={})
+    other = SourceChunk(content="y", name="y", document_name="y", url="url_y", metadata={})
+
+    fused = fuse_chunk_rankings([[chunk, chunk], [other, chunk]], limit=5)
+
+    assert [c.name for c in fused] == ["x", "y"]
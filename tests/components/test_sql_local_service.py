@@ -2,8 +2,12 @@ import asyncio
 from unittest.mock import patch
 
 import pytest
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
 
-from engine.storage_service.local_service import SQLLocalService
+from engine.storage_service.db_utils import DBColumn, DBDefinition
+from engine.storage_service.local_service import SQLLocalService, _build_copy_upsert_statements
+from settings import settings
 from tests.mocks.db_service import TEST_SCHEMA_NAME
 
 
@@ -175,3 +179,133 @@ def test_sql_local_service_reuses_engine_pool_per_url_postgres(postgres_service)
         asyncio.run(service_b.close())
         assert engine_url not in SQLLocalService._engine_cache
         mock_dispose.assert_called_once()
+
+
+def test_bulk_upsert_rows_copies_rows_and_merges_changes(postgres_service, sample_table_definition, monkeypatch):
+    monkeypatch.setattr(settings, "DB_COPY_BATCH_SIZE", 2)
+    postgres_service.create_table(
+        "test_table",
+        table_definition=sample_table_definition,
+        schema_name=TEST_SCHEMA_NAME,
+    )
+    rows = [
+        {"chunk_id": 1, "name": "Alice", "created_at": None},
+        {"chunk_id": 2, "name": "Tab\tnew\nline and \\N", "created_at": "2021-01-01 11:10:00"},
+        {"chunk_id": 3, "name": "", "created_at": "2021-01-01 11:10:00"},
+    ]
+    with patch.object(postgres_service, "upsert_rows") as mock_upsert_rows:
+        postgres_service.bulk_upsert_rows("test_table", rows, TEST_SCHEMA_NAME)
+        postgres_service.bulk_upsert_rows(
+            "test_table",
+            [
+                {"chunk_id": 1, "name": "Alice", "created_at": None},
+                {"chunk_id": 3, "name": "Carol", "created_at": None},
+            ],
+            TEST_SCHEMA_NAME,
+        )
+    mock_upsert_rows.assert_not_called()
+
+    stored_rows = {
+        row["chunk_id"]: (row["name"], row["created_at"])
+        for row in postgres_service.get_table_rows("test_table", TEST_SCHEMA_NAME)
+    }
+    assert stored_rows == {
+        1: ("Alice", None),
+        2: ("Tab\tnew\nline and \\N", "2021-01-01 11:10:00"),
+        3: ("Carol", None),
+    }
+
+
+def test_bulk_upsert_rows_copies_json_columns(postgres_service):
+    postgres_service.create_table(
+        "json_table",
+        table_definition=DBDefinition(
+            columns=[
+                DBColumn(name="chunk_id", type="VARCHAR", is_primary=True),
+                DBColumn(name="metadata", type="VARIANT", is_nullable=True),
+                DBColumn(name="tags", type="ARRAY", is_nullable=True),
+            ]
+        ),
+        schema_name=TEST_SCHEMA_NAME,
+    )
+    rows = [
+        {"chunk_id": "a", "metadata": '{"page": 1}', "tags": ["x", "y"]},
+        {"chunk_id": "b", "metadata": {"page": 2}, "tags": None},
+    ]
+    postgres_service.bulk_upsert_rows("json_table", rows, TEST_SCHEMA_NAME)
+    postgres_service.bulk_upsert_rows("json_table", rows, TEST_SCHEMA_NAME)
+
+    stored_rows = {row["chunk_id"]: row for row in postgres_service.get_table_rows("json_table", TEST_SCHEMA_NAME)}
+    assert stored_rows["a"]["metadata"] == {"page": 1}
+    assert stored_rows["a"]["tags"] == ["x", "y"]
+    assert stored_rows["b"]["metadata"] == {"page": 2}
+    assert stored_rows["b"]["tags"] is None
+
+
+def test_bulk_upsert_rows_copies_array_and_bytea_columns(postgres_service):
+    postgres_service.create_schema(TEST_SCHEMA_NAME)
+    with postgres_service.engine.begin() as connection:
+        connection.execute(
+            sqlalchemy.text(
+                f"CREATE TABLE {TEST_SCHEMA_NAME}.binary_table "
+                "(chunk_id VARCHAR PRIMARY KEY, labels TEXT[], grid INTEGER[][], content BYTEA)"
+            )
+        )
+    rows = [
+        {
+            "chunk_id": "a",
+            "labels": ["x, y", 'quote " and \\', None, "{}"],
+            "grid": [[1, 2], [3, 4]],
+            "content": b"\x00\t\\",
+        },
+        {"chunk_id": "b", "labels": [], "grid": None, "content": bytearray(b"raw")},
+    ]
+    postgres_service.bulk_upsert_rows("binary_table", rows, TEST_SCHEMA_NAME)
+
+    with pytest.raises(ValueError, match="unknown_column"):
+        postgres_service.bulk_upsert_rows("binary_table", [{"chunk_id": "c", "unknown_column": 1}], TEST_SCHEMA_NAME)
+
+    stored_rows = {row["chunk_id"]: row for row in postgres_service.get_table_rows("binary_table", TEST_SCHEMA_NAME)}
+    assert stored_rows["a"]["labels"] == ["x, y", 'quote " and \\', None, "{}"]
+    assert stored_rows["a"]["grid"] == [[1, 2], [3, 4]]
+    assert bytes(stored_rows["a"]["content"]) == b"\x00\t\\"
+    assert (stored_rows["b"]["labels"], bytes(stored_rows["b"]["content"])) == ([], b"raw")
+    assert "c" not in stored_rows
+
+
+def test_bulk_upsert_rows_uses_upsert_statements_without_postgres(tmp_path, sample_table_definition):
+    service = SQLLocalService(engine_url=f"sqlite:///{tmp_path / 'bulk.db'}")
+    service.create_table("test_table", table_definition=sample_table_definition)
+    rows = [{"chunk_id": chunk_id, "name": f"name {chunk_id}", "created_at": None} for chunk_id in range(5)]
+
+    with patch.object(service, "upsert_rows", wraps=service.upsert_rows) as mock_upsert_rows:
+        service.bulk_upsert_rows("test_table", rows, batch_size=2)
+
+    assert [len(call.args[1]) for call in mock_upsert_rows.call_args_list] == [2, 2, 1]
+    assert len(service.get_table_rows("test_table")) == 5
+    asyncio.run(service.close())
+
+
+def test_copy_merge_only_updates_rows_whose_values_changed():
+    table = sqlalchemy.Table(
+        "chunks",
+        sqlalchemy.MetaData(),
+        sqlalchemy.Column("chunk_id", sqlalchemy.String, primary_key=True),
+        sqlalchemy.Column("content", sqlalchemy.Text),
+        sqlalchemy.Column("tags", sqlalchemy.JSON),
+        schema="org",
+    )
+    create_statement, copy_statement, merge_statement = _build_copy_upsert_statements(
+        table, ["chunk_id", "content", "tags"], ["chunk_id"], postgresql.dialect().identifier_preparer
+    )
+
+    assert create_statement == (
+        "CREATE TEMPORARY TABLE bulk_upsert_staging (LIKE org.chunks INCLUDING DEFAULTS) ON COMMIT DROP"
+    )
+    assert copy_statement == "COPY bulk_upsert_staging (chunk_id, content, tags) FROM STDIN"
+    assert merge_statement == (
+        "INSERT INTO org.chunks AS existing (chunk_id, content, tags) "
+        "SELECT chunk_id, content, tags FROM bulk_upsert_staging ON CONFLICT (chunk_id) "
+        "DO UPDATE SET content = EXCLUDED.content, tags = EXCLUDED.tags "
+        "WHERE (existing.content, existing.tags::jsonb) IS DISTINCT FROM (EXCLUDED.content, EXCLUDED.tags::jsonb)"
+    )
@@ -38,3 +38,25 @@ def test_chunk_tree(chunker):
     assert len(chunks) == 1
     assert chunks[0].formatted_path == " root\n# child1"
     assert chunks[0].content == "content1\n\n## child2\n\n### child3"
+
+
+def test_chunk_tree_with_many_siblings(chunker):
+    root = MarkdownNode("root", level=MarkdownLevel.ROOT)
+    for index in range(5000):
+        MarkdownNode(level=MarkdownLevel.TEXT, content=f"line {index}", parent=root)
+
+    chunks = chunker.chunk_tree(root)
+
+    assert len(chunks) > 1
+    assert "\n\n".join(chunk.content for chunk in chunks).count("line ") == 5000
+
+
+def test_merged_chunks_carry_their_token_count(chunker):
+    root = MarkdownNode("root", level=MarkdownLevel.ROOT)
+    for index in range(3):
+        header = MarkdownNode(level=MarkdownLevel.H1, content=f"header{index}", parent=root)
+        MarkdownNode(level=MarkdownLevel.TEXT, content=f"text {index}", parent=header)
+
+    chunks = chunker.chunk_tree(root)
+
+    assert all(chunk.token_count == chunker._count_tokens(chunk.content) for chunk in chunks)
@@ -1,11 +1,16 @@
 import asyncio
+import json
 import uuid
 from unittest.mock import Mock, patch
 
+import pandas as pd
 import pytest
 
+from data_ingestion.document import document_chunking
 from data_ingestion.document.document_chunking import get_chunks_dataframe_from_doc
 from data_ingestion.document.folder_management.folder_management import FileChunk, FileDocument, FileDocumentType
+from ingestion_script.folder_pipeline import chunks_df_to_rows
+from ingestion_script.utils import CHUNK_COLUMN_NAME, METADATA_COLUMN_NAME
 
 
 @pytest.fixture
@@ -83,3 +88,41 @@ def test_get_chunks_dataframe_from_docs(mock_file_document, mock_file_chunk):
     assert result_df["bounding_boxes"].iloc[0] == '[{"xmin": 1, "ymin": 2, "xmax": 3, "ymax": 4, "page": 1}]'
     assert result_df["url"].iloc[0] == "None"
     assert result_df["order"].iloc[0] == 0
+
+
+def test_chunks_dataframe_to_rows(mock_file_document, mock_file_chunk):
+    chunk_without_order = mock_file_chunk.model_copy(update={"order": None, "url": "https://example.com"})
+    empty_chunk = chunk_without_order.model_copy(update={"content": "  "})
+    document_chunk_mapping = {FileDocumentType.PDF.value: Mock(return_value=[chunk_without_order] * 3 + [empty_chunk])}
+
+    result_df = asyncio.run(
+        get_chunks_dataframe_from_doc(document=mock_file_document, document_chunk_mapping=document_chunk_mapping)
+    )
+
+    assert result_df["order"].tolist() == [0, 1, 2, 3]
+    rows = chunks_df_to_rows(result_df, uuid.uuid4())
+    assert [row[CHUNK_COLUMN_NAME] for row in rows] == ["dummy content"] * 3
+    assert json.loads(rows[0][METADATA_COLUMN_NAME])["url"] == "https://example.com"
+
+
+@pytest.mark.parametrize("pyarrow_installed", [True, False])
+def test_chunks_dataframe_string_columns_use_the_string_dtype(
+    monkeypatch, mock_file_document, mock_file_chunk, pyarrow_installed
+):
+    if pyarrow_installed:
+        pytest.importorskip("pyarrow")
+        string_dtype = pd.StringDtype("pyarrow")
+    else:
+        string_dtype = object
+    monkeypatch.setattr(document_chunking, "CHUNK_STRING_DTYPE", string_dtype)
+    document_chunk_mapping = {FileDocumentType.PDF.value: Mock(return_value=[mock_file_chunk] * 2)}
+
+    result_df = asyncio.run(
+        get_chunks_dataframe_from_doc(document=mock_file_document, document_chunk_mapping=document_chunk_mapping)
+    )
+
+    string_columns = [column for column in result_df.columns if column != "order"]
+    assert {result_df[column].dtype for column in string_columns} == {pd.Series([], dtype=string_dtype).dtype}
+    assert result_df["order"].dtype.kind == "i"
+    assert result_df["content"].tolist() == ["dummy content"] * 2
+    assert chunks_df_to_rows(result_df, uuid.uuid4())[0][CHUNK_COLUMN_NAME] == "dummy content"
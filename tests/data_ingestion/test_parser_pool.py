@@ -0,0 +1,75 @@
+import asyncio
+import signal
+
+import pytest
+
+from data_ingestion.document import parser_pool
+from data_ingestion.document.document_chunking import document_chunking_mapping, get_chunks_dataframe_from_doc
+from data_ingestion.document.folder_management.folder_management import FileDocument, FileDocumentType
+from data_ingestion.document.parser_pool import ParserPool
+
+MARKDOWN_CONTENT = "\n".join(
+    f"# Section {section}\n\nParagraph {section} about invoices, contracts and totals." for section in range(20)
+).encode("utf-8")
+
+
+def _document(file_type: FileDocumentType = FileDocumentType.MARKDOWN) -> FileDocument:
+    return FileDocument(
+        id="doc.md",
+        type=file_type,
+        last_edited_ts="2024-01-01",
+        file_name="doc.md",
+        folder_name="folder",
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_returns_the_same_chunks_as_in_process_parsing():
+    document = _document()
+    pool = ParserPool(chunk_size=64, chunk_overlap=0, max_workers=2)
+    try:
+        chunks_dfs = await asyncio.gather(*(pool.parse(document, MARKDOWN_CONTENT) for _ in range(3)))
+    finally:
+        pool.shutdown()
+
+    expected_df = await get_chunks_dataframe_from_doc(
+        document,
+        document_chunk_mapping=document_chunking_mapping(
+            get_file_content_func=lambda file_id: MARKDOWN_CONTENT, chunk_size=64, overlapping_size=0
+        ),
+        default_chunk_size=64,
+    )
+    assert len(expected_df) > 1
+    for chunks_df in chunks_dfs:
+        assert chunks_df["content"].tolist() == expected_df["content"].tolist()
+        assert chunks_df["order"].tolist() == expected_df["order"].tolist()
+
+
+def test_only_local_parsers_run_in_the_pool():
+    assert ParserPool.supports(_document(FileDocumentType.PDF))
+    assert ParserPool.supports(_document(FileDocumentType.MARKDOWN))
+    assert not ParserPool.supports(_document(FileDocumentType.EXCEL))
+
+
+def test_default_processes_follow_cpu_affinity_with_a_cap(monkeypatch):
+    monkeypatch.setattr(parser_pool.os, "cpu_count", lambda: 64)
+    monkeypatch.setattr(parser_pool.os, "sched_getaffinity", lambda pid: {0, 1}, raising=False)
+    assert ParserPool(chunk_size=64, chunk_overlap=0).max_workers == 2
+
+    monkeypatch.setattr(parser_pool.os, "sched_getaffinity", lambda pid: set(range(32)), raising=False)
+    assert ParserPool(chunk_size=64, chunk_overlap=0).max_workers == parser_pool.MAX_DEFAULT_PARSER_PROCESSES
+
+
+def test_parsing_over_the_timeout_fails_the_file(monkeypatch):
+    async def slow_parsing(*args, **kwargs):
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(parser_pool, "get_chunks_dataframe_from_doc", slow_parsing)
+    # The CPU time limit would apply to the test process itself
+    monkeypatch.setattr(parser_pool, "set_cpu_time_limit", lambda seconds: None)
+    previous_handler = signal.signal(signal.SIGALRM, parser_pool._raise_parse_timeout)
+    try:
+        with pytest.raises(TimeoutError):
+            parser_pool._parse_file(_document(), MARKDOWN_CONTENT, 64, 0, timeout_seconds=1)
+    finally:
+        signal.signal(signal.SIGALRM, previous_handler)
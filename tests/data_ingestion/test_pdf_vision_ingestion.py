@@ -0,0 +1,121 @@
+import asyncio
+import random
+
+import fitz
+import pytest
+
+from data_ingestion.document.folder_management.folder_management import FileDocument, FileDocumentType
+from data_ingestion.document.pdf_rendering import get_zoom, render_page, temporary_pdf_file
+from data_ingestion.document.pdf_vision_ingestion import _process_pdf_page_by_page
+from settings import settings
+
+NUMBER_OF_PAGES = 12
+LONG_TEXT = "This page has a clean and complete text layer. " * 10
+
+
+def _pdf_content() -> bytes:
+    pdf_document = fitz.open()
+    for page_index in range(NUMBER_OF_PAGES):
+        page = pdf_document.new_page()
+        # Even pages carry enough text to skip the vision model when the text layer is used
+        text = f"Page {page_index}. {LONG_TEXT}" if page_index % 2 == 0 else f"Slide {page_index}"
+        page.insert_textbox(fitz.Rect(36, 36, 560, 800), text)
+    content = pdf_document.tobytes()
+    pdf_document.close()
+    return content
+
+
+class FakeVisionService:
+    def __init__(self, page_number_by_image: dict[bytes, int]):
+        self.page_number_by_image = page_number_by_image
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+
+    async def get_image_description_async(self, image_content_list, text_prompt, response_format=None):
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        # Random latencies so pages complete out of order
+        await asyncio.sleep(random.uniform(0, 0.01))
+        self.running -= 1
+        return f"vision page {self.page_number_by_image[image_content_list[0]]}"
+
+
+@pytest.fixture
+def pdf_path():
+    with temporary_pdf_file(_pdf_content()) as path:
+        yield path
+
+
+@pytest.fixture
+def document():
+    return FileDocument(
+        id="file.pdf",
+        type=FileDocumentType.PDF,
+        last_edited_ts="2024-01-01",
+        file_name="file.pdf",
+        folder_name="folder",
+        metadata={},
+    )
+
+
+@pytest.fixture
+def vision_service(pdf_path):
+    return FakeVisionService({
+        render_page(pdf_path, page_index, zoom=1.0).image: page_index + 1 for page_index in range(NUMBER_OF_PAGES)
+    })
+
+
+@pytest.mark.parametrize("render_processes", [0, 1])
+@pytest.mark.asyncio
+async def test_page_by_page_keeps_page_order_with_bounded_concurrency(
+    monkeypatch, pdf_path, document, vision_service, render_processes
+):
+    monkeypatch.setattr(settings, "PDF_RENDER_PROCESSES", render_processes)
+
+    chunks = await _process_pdf_page_by_page(
+        document=document,
+        pdf_path=pdf_path,
+        total_pages=NUMBER_OF_PAGES,
+        google_llm_service=vision_service,
+        openai_llm_service=vision_service,
+        prompt="extract",
+        zoom=1.0,
+        text_layer_min_characters=None,
+        max_concurrency=3,
+    )
+
+    assert [chunk.content for chunk in chunks] == [f"vision page {i + 1}" for i in range(NUMBER_OF_PAGES)]
+    assert [chunk.metadata["page_number"] for chunk in chunks] == list(range(1, NUMBER_OF_PAGES + 1))
+    assert [chunk.order for chunk in chunks] == list(range(NUMBER_OF_PAGES))
+    assert vision_service.max_running <= 3
+
+
+@pytest.mark.asyncio
+async def test_pages_with_a_dense_text_layer_skip_the_vision_model(monkeypatch, pdf_path, document, vision_service):
+    monkeypatch.setattr(settings, "PDF_RENDER_PROCESSES", 0)
+
+    chunks = await _process_pdf_page_by_page(
+        document=document,
+        pdf_path=pdf_path,
+        total_pages=NUMBER_OF_PAGES,
+        google_llm_service=vision_service,
+        openai_llm_service=vision_service,
+        prompt="extract",
+        zoom=1.0,
+        text_layer_min_characters=200,
+        max_concurrency=4,
+    )
+
+    assert vision_service.calls == NUMBER_OF_PAGES // 2
+    for page_index, chunk in enumerate(chunks):
+        if page_index % 2 == 0:
+            assert chunk.content.startswith(f"Page {page_index}. This page has a clean and complete text layer.")
+        else:
+            assert chunk.content == f"vision page {page_index + 1}"
+
+
+def test_dpi_overrides_zoom():
+    assert get_zoom(3.0, dpi=144) == 2.0
+    assert get_zoom(3.0, dpi=None) == 3.0
@@ -0,0 +1,80 @@
+import re
+
+import pandas as pd
+import pytest
+
+from data_ingestion import utils
+from data_ingestion.utils import get_chunk_token_count, split_df_by_token_limit, split_df_to_markdown_by_token_limit
+
+
+class WordEncoding:
+    """
+    Offline stand-in for a tiktoken encoding: one token per word, punctuation mark or run of spaces.
+    Like tiktoken, special tokens in the text are rejected unless disallowed_special=() is passed.
+    """
+
+    _token_re = re.compile(r"\w+| +|[^\w ]")
+
+    def encode(self, text, disallowed_special="all"):
+        if disallowed_special == "all" and "<|endoftext|>" in text:
+            raise ValueError("Encountered text corresponding to disallowed special token '<|endoftext|>'")
+        return self._token_re.findall(text)
+
+    def encode_batch(self, texts, disallowed_special="all"):
+        return [self.encode(text, disallowed_special) for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def word_encoding(monkeypatch):
+    monkeypatch.setattr(utils, "get_token_encoding", lambda model_name=None: WordEncoding())
+
+
+def _make_df(number_of_rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": range(number_of_rows),
+        "name": [f"name {'x' * (i % 7)}" for i in range(number_of_rows)],
+        "description": [" ".join(["word"] * (i % 5 + 1)) for i in range(number_of_rows)],
+    })
+
+
+def test_chunks_fit_the_budget_and_keep_every_row_in_order():
+    df = _make_df(300)
+
+    chunks = split_df_by_token_limit(df, max_tokens=200)
+
+    assert len(chunks) > 1
+    assert all(get_chunk_token_count(chunk_df=chunk) <= 200 for chunk in chunks)
+    assert pd.concat(chunks, ignore_index=True).equals(df)
+
+
+def test_markdown_chunks_match_dataframe_chunks():
+    df = _make_df(50)
+
+    markdown_chunks = split_df_to_markdown_by_token_limit(df, max_tokens=150)
+
+    assert markdown_chunks == [chunk.to_markdown(index=False) for chunk in split_df_by_token_limit(df, 150)]
+
+
+def test_row_larger_than_budget_gets_its_own_chunk():
+    df = pd.DataFrame({"text": ["short", " ".join(["long"] * 100), "short again"]})
+
+    chunks = split_df_by_token_limit(df, max_tokens=30)
+
+    assert [len(chunk) for chunk in chunks] == [1, 1, 1]
+
+
+def test_special_tokens_are_tokenized_as_text():
+    df = pd.DataFrame({"text": ["<|endoftext|> " + " ".join(["word"] * (i % 9)) for i in range(100)]})
+
+    chunks = split_df_by_token_limit(df, max_tokens=100)
+
+    assert len(chunks) > 1
+
+    assert pd.concat(chunks, ignore_index=True).equals(df)
+
+
+def test_small_or_empty_dataframe():
+    df = _make_df(3)
+
+    assert len(split_df_by_token_limit(df, max_tokens=10_000)) == 1
+    assert split_df_by_token_limit(df.iloc[:0], max_tokens=100) == []
@@ -0,0 +1,173 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from engine.llm_services.llm_service import EmbeddingService
+from engine.local_vector_store import LocalQdrantService, LocalVectorStore, hnswlib, payload_matches_filter
+from engine.qdrant_service import FieldSchema, QdrantCollectionSchema, QdrantService, SearchMode
+
+VOCABULARY = ["cat", "dog", "invoice", "contract", "paris", "berlin"]
+
+
+def _embed(text: str) -> list[float]:
+    words = text.lower().split()
+    return [float(words.count(word)) + 0.01 for word in VOCABULARY]
+
+
+def _make_service(use_hnsw: bool = False) -> LocalQdrantService:
+    embedding_service = MagicMock(spec=EmbeddingService)
+    embedding_service.embedding_size = len(VOCABULARY)
+
+    async def embed_text_async(texts):
+        return [SimpleNamespace(embedding=_embed(text)) for text in texts]
+
+    embedding_service.embed_text_async = embed_text_async
+    schema = QdrantCollectionSchema(
+        chunk_id_field="chunk_id",
+        content_field="content",
+        file_id_field="file_id",
+        url_id_field="url",
+        source_id_field="source_id",
+    )
+    return LocalQdrantService(
+        default_schema=schema,
+        embedding_service=embedding_service,
+        store=LocalVectorStore(use_hnsw=use_hnsw),
+    )
+
+
+CHUNKS = [
+    {"chunk_id": "1", "content": "cat cat dog", "file_id": "f1", "url": "u1", "source_id": "a", "year": 2020},
+    {"chunk_id": "2", "content": "invoice paris", "file_id": "f2", "url": "u2", "source_id": "a", "year": 2023},
+    {"chunk_id": "3", "content": "dog berlin", "file_id": "f3", "url": "u3", "source_id": "b", "year": 2024},
+]
+
+
+async def _populated_service(use_hnsw: bool = False) -> LocalQdrantService:
+    service = _make_service(use_hnsw=use_hnsw)
+    assert await service.create_collection_async("col") is True
+    assert await service.add_chunks_async(CHUNKS, "col") is True
+    return service
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("search_mode", list(SearchMode))
+async def test_retrieve_similar_chunks_in_every_search_mode(search_mode):
+    service = await _populated_service()
+
+    chunks = await service.retrieve_similar_chunks_async(
+        query_text="invoice paris", collection_name="col", limit=2, search_mode=search_mode
+    )
+
+    assert chunks[0].name == "2"
+
+
+@pytest.mark.asyncio
+async def test_filters_are_applied_to_search_count_and_scroll():
+    service = await _populated_service()
+    source_filter = {"must": [{"key": "source_id", "match": {"value": "a"}}]}
+
+    chunks = await service.retrieve_similar_chunks_async(
+        query_text="dog", collection_name="col", filter=source_filter, search_mode=SearchMode.HYBRID
+    )
+    assert {chunk.name for chunk in chunks} == {"1", "2"}
+    assert await service.count_points_async("col", filter=source_filter) == 2
+    points = await service.get_points_async("col", filter=source_filter, batch_size=1)
+    assert sorted(point["payload"]["chunk_id"] for point in points) == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_upsert_replaces_existing_point_and_delete_removes_it():
+    service = await _populated_service()
+
+    await service.add_chunks_async([{**CHUNKS[0], "content": "berlin berlin"}], "col")
+    assert await service.count_points_async("col") == 3
+    chunks = await service.retrieve_similar_chunks_async(
+        query_text="berlin", collection_name="col", limit=1, search_mode=SearchMode.KEYWORD
+    )
+    assert chunks[0].name == "1"
+
+    await service.delete_chunks_async(point_ids=["1"], id_field="chunk_id", collection_name="col")
+    assert await service.count_points_async("col") == 2
+
+
+@pytest.mark.asyncio
+async def test_missing_collection_raises_http_status_error():
+    service = _make_service()
+
+    assert await service.collection_exists_async("missing") is False
+    with pytest.raises(httpx.HTTPStatusError):
+        await service.get_collection_info_async("missing")
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(hnswlib is None, reason="hnswlib is not installed")
+async def test_hnsw_index_returns_same_top_result_as_brute_force():
+    service = await _populated_service(use_hnsw=True)
+
+    chunks = await service.retrieve_similar_chunks_async(query_text="dog berlin", collection_name="col", limit=1)
+
+    assert chunks[0].name == "3"
+
+
+@pytest.mark.asyncio
+async def test_indexed_filters_follow_upserts_and_deletes():
+    service = await _populated_service()
+    source_filter = {
+        "must": [{"key": "source_id", "match": {"any": ["a", "c"]}}, {"key": "year", "range": {"gt": 2020}}]
+    }
+
+    await service.create_index_if_needed_async("col", "source_id", FieldSchema.KEYWORD)
+    assert await service.count_points_async("col", filter=source_filter) == 1
+    assert await service.count_points_async("col", filter={"must": [source_filter]}) == 1
+
+    await service.add_chunks_async([{**CHUNKS[2], "source_id": "c"}], "col")
+    await service.delete_chunks_async(point_ids=["2"], id_field="chunk_id", collection_name="col")
+    points = await service.get_points_async("col", filter=source_filter)
+    assert [point["payload"]["chunk_id"] for point in points] == ["3"]
+
+
+@pytest.mark.parametrize("distance", ["Cosine", "Dot", "Euclid"])
+def test_dense_search_scores_match_for_all_and_filtered_candidates(distance):
+    store = LocalVectorStore()
+    store.handle("PUT", "/collections/col", {"vectors": {"size": 2, "distance": distance}})
+    vectors = [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0], [3.0, 4.0], [2.0, 0.5]]
+    points = [
+        {"id": index, "vector": vector, "payload": {"even": index % 2 == 0}} for index, vector in enumerate(vectors)
+    ]
+    store.handle("PUT", "/collections/col/points", {"points": points})
+    store.handle("POST", "/collections/col/points/delete", {"points": [1]})
+
+    def query(filter=None):
+        request = {"query": [1.0, 2.0], "limit": 5, "filter": filter}
+        return {
+            point["id"]: point["score"]
+            for point in store.handle("POST", "/collections/col/points/query", request)["result"]["points"]
+        }
+
+    all_scores = query()
+    one_point_scores = query({"must": [{"has_id": ["3"]}]})
+    assert set(all_scores) == {"0", "2", "3", "4"}
+    assert one_point_scores == {"3": pytest.approx(all_scores["3"])}
+    if distance == "Euclid":
+        assert all_scores["3"] == pytest.approx(8**0.5)
+
+
+def test_payload_filter_semantics():
+    payload = {"tags": ["x", "y"], "year": 2023, "date": "2024-05-01"}
+
+    assert payload_matches_filter("id", payload, {"must": [{"key": "tags", "match": {"any": ["y", "z"]}}]})
+    assert payload_matches_filter("id", payload, {"should": [{"key": "year", "range": {"gte": 2023}}]})
+    assert payload_matches_filter("id", payload, {"must": [{"key": "date", "range": {"gt": "2024-01-01"}}]})
+    assert not payload_matches_filter("id", payload, {"must_not": [{"key": "tags", "match": {"value": "x"}}]})
+    assert not payload_matches_filter("id", payload, {"must": [{"has_id": ["other"]}]})
+
+
+def test_from_defaults_returns_local_service_when_configured(monkeypatch):
+    monkeypatch.setattr("engine.qdrant_service.settings.VECTOR_STORE_BACKEND", "local", raising=False)
+
+    service = QdrantService.from_defaults()
+
+    assert isinstance(service, LocalQdrantService)
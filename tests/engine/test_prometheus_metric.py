@@ -0,0 +1,66 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from engine.prometheus_metric import (
+    qdrant_endpoint_label,
+    qdrant_request_duration,
+    track_calls,
+    track_duration,
+)
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_track_duration_observes_successes_and_counts_errors():
+    labels = {"method": "POST", "endpoint": "collections/{collection}/points/query"}
+    ok_before = _sample("qdrant_request_duration_seconds_count", **labels, status="ok")
+    error_before = _sample("qdrant_request_duration_seconds_count", **labels, status="error")
+    errors_before = _sample("operation_errors_total", operation="qdrant_request", error_type="TimeoutError")
+
+    with track_duration(qdrant_request_duration, "qdrant_request", **labels):
+        pass
+    with pytest.raises(TimeoutError):
+        with track_duration(qdrant_request_duration, "qdrant_request", **labels):
+            raise TimeoutError()
+
+    assert _sample("qdrant_request_duration_seconds_count", **labels, status="ok") == ok_before + 1
+    assert _sample("qdrant_request_duration_seconds_count", **labels, status="error") == error_before + 1
+    assert (
+        _sample("operation_errors_total", operation="qdrant_request", error_type="TimeoutError") == errors_before + 1
+    )
+
+
+@pytest.mark.parametrize(
+    "endpoint, expected",
+    [
+        ("collections/my_collection/points/query", "collections/{collection}/points/query"),
+        ("collections/my_collection?wait=true", "collections/{collection}"),
+        ("collections/my_collection/index/source_id?wait=true", "collections/{collection}/index/{field_name}"),
+        ("collections", "collections"),
+        ("", ""),
+    ],
+)
+def test_qdrant_endpoint_label_drops_the_names(endpoint, expected):
+    assert qdrant_endpoint_label(endpoint) == expected
+
+
+@patch("engine.prometheus_metric.get_tracing_span")
+def test_track_calls_times_the_component_run(get_span_mock):
+    get_span_mock.return_value = MagicMock(project_id="test_project")
+
+    class TimedComponent:
+        @track_calls
+        async def run(self, value):
+            return value * 2
+
+    labels = {"class_name": "TimedComponent", "status": "ok"}
+    count_before = _sample("component_run_duration_seconds_count", **labels)
+
+    assert asyncio.run(TimedComponent().run(21)) == 42
+    assert _sample("component_run_duration_seconds_count", **labels) == count_before + 1
+    assert _sample("agent_calls_total", class_name="TimedComponent", project_id="test_project") >= 1
@@ -0,0 +1,69 @@
+from contextlib import nullcontext
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from ada_backend.repositories.credits_repository import CostTablesDTO
+from engine.trace import credit_calculator
+from engine.trace.credit_calculator import (
+    calculate_and_set_component_credits,
+    get_cached_llm_cost,
+    register_component_instance_version,
+)
+
+MODEL_ID = uuid4()
+COMPONENT_VERSION_ID = uuid4()
+
+
+@pytest.fixture
+def cost_tables(monkeypatch):
+    """Counts the loads of the cost tables and lets the tests change the Redis version and the clock."""
+    state = {"loads": 0, "version": "1", "now": 1000.0, "input_token_cost": 2.0}
+
+    def fake_get_cost_tables(session):
+        state["loads"] += 1
+        return CostTablesDTO(
+            llm_costs={MODEL_ID: (state["input_token_cost"], 4.0)},
+            component_costs_per_call={COMPONENT_VERSION_ID: 0.5},
+        )
+
+    monkeypatch.setattr(credit_calculator, "_snapshot", None)
+    monkeypatch.setattr(credit_calculator, "get_db_session", nullcontext)
+    monkeypatch.setattr(credit_calculator, "get_cost_tables", fake_get_cost_tables)
+    monkeypatch.setattr(credit_calculator, "_get_cost_tables_version", lambda: state["version"])
+    monkeypatch.setattr(credit_calculator.time, "monotonic", lambda: state["now"])
+    return state
+
+
+def test_costs_are_read_from_the_snapshot_without_queries(cost_tables):
+    component_instance_id = uuid4()
+    register_component_instance_version(component_instance_id, COMPONENT_VERSION_ID)
+    span = MagicMock()
+    span.attributes = {"component_instance_id": str(component_instance_id)}
+
+    for _ in range(100):
+        assert get_cached_llm_cost(MODEL_ID) == (2.0, 4.0)
+        calculate_and_set_component_credits(span)
+
+    assert get_cached_llm_cost(uuid4()) == (None, None)
+    span.set_attributes.assert_called_with({"credits.per_call": 0.5})
+    assert cost_tables["loads"] == 1
+
+
+def test_snapshot_is_reloaded_when_the_version_changes_or_it_gets_old(cost_tables):
+    assert get_cached_llm_cost(MODEL_ID) == (2.0, 4.0)
+
+    cost_tables["input_token_cost"] = 3.0
+    cost_tables["version"] = "2"
+    # The version is only checked every _VERSION_CHECK_INTERVAL_SECONDS
+    assert get_cached_llm_cost(MODEL_ID) == (2.0, 4.0)
+    cost_tables["now"] += credit_calculator._VERSION_CHECK_INTERVAL_SECONDS
+    assert get_cached_llm_cost(MODEL_ID) == (3.0, 4.0)
+
+    cost_tables["input_token_cost"] = 5.0
+    cost_tables["now"] += credit_calculator._VERSION_CHECK_INTERVAL_SECONDS
+    assert get_cached_llm_cost(MODEL_ID) == (3.0, 4.0)
+    cost_tables["now"] += credit_calculator._MAX_SNAPSHOT_AGE_SECONDS
+    assert get_cached_llm_cost(MODEL_ID) == (5.0, 4.0)
+    assert cost_tables["loads"] == 3
@@ -0,0 +1,102 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import BaseModel, SecretStr
+
+from engine.trace import serializer
+from engine.trace.serializer import serialize_to_json, serialize_to_json_bytes
+
+
+class Document(BaseModel):
+    content: str
+    api_key: str
+    created_at: datetime
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serializer, "orjson", None)
+
+
+def test_serialize_to_json_bytes_redacts_while_encoding(encoder):
+    payload = {
+        "messages": [{"role": "user", "content": "call it with Bearer abc.def"}],
+        "headers": {"Authorization": "Bearer abc.def"},
+        "password": SecretStr("hunter2"),
+        "token_count": {"prompt": 12},
+        "secret_value": SecretStr("hunter2"),
+        "count": 3,
+    }
+
+    serialized = serialize_to_json_bytes(payload)
+
+    assert b"abc.def" not in serialized
+    assert b"hunter2" not in serialized
+    assert json.loads(serialized) == {
+        "messages": [{"role": "user", "content": "call it with Bearer [REDACTED]"}],
+        "headers": {"Authorization": "[REDACTED]"},
+        "password": "[REDACTED]",
+        "token_count": "[REDACTED]",
+        "secret_value": "[REDACTED]",
+        "count": 3,
+    }
+
+
+def test_serialize_to_json_bytes_caps_strings_and_collections(encoder):
+    payload = {"text": "é" * 12, "items": list(range(5)), "metadata": {f"key_{i}": i for i in range(4)}}
+
+    serialized = serialize_to_json_bytes(payload, max_string_chars=10, max_items=3)
+
+    assert json.loads(serialized) == {
+        "text": "é" * 10 + "... [truncated 2 chars]",
+        "items": [0, 1, 2, "... [2 more items]"],
+        "metadata": {"key_0": 0, "key_1": 1, "key_2": 2, "...": "[1 more keys]"},
+    }
+
+
+def test_serialize_to_json_bytes_dumps_models_in_json_mode(encoder):
+    document = Document(content="x" * 40, api_key="sk-secret", created_at=datetime(2026, 1, 2, tzinfo=timezone.utc))
+    payload = {"documents": [document, document], 1: {"a", "b"}, "ratio": 0.5, "empty": None}
+
+    serialized = serialize_to_json_bytes(payload, max_string_chars=30)
+
+    loaded = json.loads(serialized)
+    expected_document = {
+        "content": "x" * 30 + "... [truncated 10 chars]",
+        "api_key": "[REDACTED]",
+        "created_at": "2026-01-02T00:00:00Z",
+    }
+    assert loaded["documents"] == [expected_document, expected_document]
+    assert sorted(loaded["1"]) == ["a", "b"]
+    assert (loaded["ratio"], loaded["empty"]) == (0.5, None)
+    # The model is dumped, not modified
+    assert document.api_key == "sk-secret"
+
+
+def test_serialize_to_json_bytes_stops_at_the_total_cap(encoder):
+    documents = [Document(content="x" * 100, api_key="sk", created_at=datetime(2026, 1, 2)) for _ in range(50)]
+    payload = {"documents": documents, "rows": [list(range(100)) for _ in range(100)]}
+
+    serialized = serialize_to_json_bytes(payload, max_total_chars=1_000)
+
+    loaded = json.loads(serialized)
+    assert len(serialized) < 1_500
+    *built_documents, marker = loaded["documents"]
+    assert marker == f"... [{50 - len(built_documents)} more items]"
+    assert built_documents[0]["content"] == "x" * 100
+    assert loaded["..."] == "[1 more keys]"
+
+
+def test_serialize_to_json_bytes_handles_circular_references(encoder):
+    payload: dict = {"name": "root"}
+    payload["self"] = payload
+
+    assert json.loads(serialize_to_json_bytes(payload)) == {"name": "root", "self": "<Circular reference to dict>"}
+
+
+def test_serialize_to_json_keeps_its_indented_output():
+    assert serialize_to_json({"a": [1], "api_key": "sk"}) == '{\n  "a": [\n    1\n  ],\n  "api_key": "[REDACTED]"\n}'
@@ -0,0 +1,174 @@
+import gc
+import json
+import time
+from uuid import uuid4
+
+import pytest
+from openinference.semconv.trace import SpanAttributes
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from ada_backend.database.models import CallType
+from ada_backend.database.setup_db import get_db_session
+from ada_backend.database.trace_models import Span, SpanMessage, SpanRollup
+from engine.trace import trace_policy
+from engine.trace.span_context import _tracing_context, set_tracing_span
+from engine.trace.trace_manager import TraceManager
+from engine.trace.trace_policy import (
+    DeferredPayloadSpanProcessor,
+    resolve_payload_attributes,
+    serialize_payload,
+    set_payload_attributes,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing_context():
+    token = _tracing_context.set(None)
+    yield
+    _tracing_context.reset(token)
+
+
+@pytest.fixture
+def payload_settings(monkeypatch):
+    def _set(
+        sample_rate: float = 1.0,
+        sample_rates_by_project: dict | None = None,
+        max_chars: int = 100_000,
+        max_items: int = 1_000,
+        max_total_chars: int = 500_000,
+    ):
+        monkeypatch.setattr(
+            trace_policy,
+            "_payload_settings",
+            trace_policy._PayloadSettings(
+                sample_rate=sample_rate,
+                sample_rates_by_project=sample_rates_by_project or {},
+                max_chars=max_chars,
+                max_items=max_items,
+                max_total_chars=max_total_chars,
+                read_at=time.monotonic(),
+            ),
+        )
+
+    _set()
+    return _set
+
+
+@pytest.fixture
+def tracer_and_exporter():
+    exporter = InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(DeferredPayloadSpanProcessor())
+    tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+    yield tracer_provider.get_tracer(__name__), exporter
+    tracer_provider.shutdown()
+
+
+def test_serialize_payload_is_compact_and_capped(payload_settings):
+    payload_settings(max_chars=10, max_items=2)
+
+    assert serialize_payload({"a": [1, 2]}) == b'{"a":[1,2]}'
+    assert json.loads(serialize_payload({"text": "x" * 30, "items": [1, 2, 3]})) == {
+        "text": "xxxxxxxxxx... [truncated 20 chars]",
+        "items": [1, 2, "... [1 more items]"],
+    }
+
+
+def test_serialize_payload_caps_the_total_length(payload_settings):
+    payload_settings(max_chars=1_000, max_items=1_000, max_total_chars=5_000)
+
+    serialized = serialize_payload({"rows": [{"text": "x" * 1_000} for _ in range(1_000)]})
+
+    assert len(serialized) < 6_000
+    assert json.loads(serialized)["rows"][-1].endswith("more items]")
+
+
+def test_payloads_are_serialized_when_the_span_is_exported(payload_settings, tracer_and_exporter):
+    tracer, exporter = tracer_and_exporter
+    payload = {"messages": [{"role": "user", "content": "hello"}], "api_key": "sk-secret"}
+
+    with tracer.start_as_current_span("component") as span:
+        set_payload_attributes(span, {SpanAttributes.INPUT_VALUE: payload})
+        payload["added_after"] = True
+        payload["messages"].append({"role": "assistant", "content": "added after"})
+        payload["messages"][0]["content"] = "changed after"
+
+    (exported_span,) = exporter.get_finished_spans()
+    assert SpanAttributes.INPUT_VALUE not in exported_span.attributes
+    attributes = resolve_payload_attributes(exported_span)
+    assert json.loads(attributes[SpanAttributes.INPUT_VALUE]) == {
+        "messages": [{"role": "user", "content": "hello"}],
+        "api_key": "[REDACTED]",
+    }
+    assert len(trace_policy._spans_with_payloads) == 0
+
+
+def test_payloads_go_away_with_their_span_without_the_processor(payload_settings):
+    tracer_provider = TracerProvider()
+    tracer = tracer_provider.get_tracer(__name__)
+
+    with tracer.start_as_current_span("component") as span:
+        set_payload_attributes(span, {SpanAttributes.INPUT_VALUE: {"messages": []}})
+    del span
+    gc.collect()
+
+    assert len(trace_policy._spans_with_payloads) == 0
+    tracer_provider.shutdown()
+
+
+def test_attributes_set_by_the_span_afterwards_take_precedence(payload_settings, tracer_and_exporter):
+    tracer, exporter = tracer_and_exporter
+
+    with tracer.start_as_current_span("component") as span:
+        set_payload_attributes(span, {SpanAttributes.INPUT_VALUE: {"messages": []}})
+        span.set_attribute(SpanAttributes.INPUT_VALUE, "prompt sent by the component")
+        span.set_attribute(SpanAttributes.OUTPUT_VALUE, "raw response")
+        set_payload_attributes(span, {SpanAttributes.OUTPUT_VALUE: {"output": "response"}})
+
+    (exported_span,) = exporter.get_finished_spans()
+    assert resolve_payload_attributes(exported_span) == {SpanAttributes.OUTPUT_VALUE: b'{"output":"response"}'}
+
+
+def test_payload_sampling_keeps_sandbox_runs_and_project_overrides(payload_settings, tracer_and_exporter):
+    tracer, exporter = tracer_and_exporter
+    payload_settings(sample_rate=0.0, sample_rates_by_project={"sampled-project": 1.0})
+
+    for project_id, call_type in [
+        ("project", CallType.API),
+        ("project", CallType.SANDBOX),
+        ("sampled-project", CallType.API),
+    ]:
+        set_tracing_span(project_id=project_id, call_type=call_type)
+        with tracer.start_as_current_span(f"{project_id}-{call_type.value}") as span:
+            set_payload_attributes(span, {SpanAttributes.OUTPUT_VALUE: "output"})
+
+    recorded = {span.name: resolve_payload_attributes(span) for span in exporter.get_finished_spans()}
+    assert recorded == {
+        "project-api": {},
+        "project-sandbox": {SpanAttributes.OUTPUT_VALUE: b'"output"'},
+        "sampled-project-api": {SpanAttributes.OUTPUT_VALUE: b'"output"'},
+    }
+
+
+def test_sql_exporter_stores_the_deferred_payloads(payload_settings):
+    trace_manager = TraceManager(project_name="test_trace_policy", use_simple_processor=True)
+    project_id = str(uuid4())
+    set_tracing_span(project_id=project_id, call_type=CallType.API)
+
+    with trace_manager.start_span("component") as span:
+        set_payload_attributes(span, {SpanAttributes.INPUT_VALUE: {"question": "Capital of France?\u0000"}})
+        set_payload_attributes(span, {SpanAttributes.OUTPUT_VALUE: "Paris\u0000"})
+    trace_manager.tracer_provider.shutdown()
+
+    with get_db_session() as session:
+        try:
+            stored_span = session.query(Span).filter(Span.project_id == project_id).one()
+            message = session.query(SpanMessage).filter(SpanMessage.span_id == stored_span.span_id).one()
+            assert json.loads(message.input_content) == [{"question": "Capital of France?"}]
+            assert json.loads(message.output_content) == ['"Paris"']
+        finally:
+            session.query(Span).filter(Span.project_id == project_id).delete(synchronize_session=False)
+            session.query(SpanRollup).filter(SpanRollup.project_id == project_id).delete(synchronize_session=False)
+            session.commit()
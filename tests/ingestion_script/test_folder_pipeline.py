@@ -0,0 +1,104 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from data_ingestion.document.folder_management.folder_management import FileDocument, FileDocumentType
+from ingestion_script.folder_manifest import FileContentCache
+from ingestion_script.folder_pipeline import FolderIngestionPipeline
+
+CHUNKS_PER_FILE = 7
+
+
+def _documents(count: int) -> list[FileDocument]:
+    return [
+        FileDocument(
+            id=f"file-{index}",
+            type=FileDocumentType.MARKDOWN,
+            last_edited_ts="2024-01-01",
+            file_name=f"file-{index}.md",
+            folder_name="folder",
+        )
+        for index in range(count)
+    ]
+
+
+class Recorder:
+    def __init__(self, content_cache: FileContentCache, fail_on: str | None = None):
+        self.content_cache = content_cache
+        self.fail_on = fail_on
+        self.max_files_in_memory = 0
+        self.written: list[str] = []
+        self.indexed: list[str] = []
+
+    async def parse_file(self, document: FileDocument) -> pd.DataFrame:
+        self.max_files_in_memory = max(self.max_files_in_memory, len(self.content_cache))
+        if document.id == self.fail_on:
+            raise ValueError("corrupted file")
+        content = self.content_cache.get_file_content(document.id)
+        return pd.DataFrame([
+            {
+                "chunk_id": f"{document.id}-{index}",
+                "file_id": document.id,
+                "content": f"{content} {index}",
+                "document_title": document.file_name,
+                "url": "",
+                "last_edited_ts": document.last_edited_ts,
+                "metadata": "{}",
+                "order": index,
+            }
+            for index in range(CHUNKS_PER_FILE)
+        ])
+
+    def write_rows(self, rows: list[dict]) -> None:
+        self.written.extend(row["chunk_id"] for row in rows)
+
+    async def index_rows(self, rows: list[dict]) -> None:
+        await asyncio.sleep(0.001)
+        self.indexed.extend(row["chunk_id"] for row in rows)
+
+
+def _pipeline(recorder: Recorder, **kwargs) -> FolderIngestionPipeline:
+    return FolderIngestionPipeline(
+        content_cache=recorder.content_cache,
+        parse_file=recorder.parse_file,
+        write_rows=recorder.write_rows,
+        index_rows=recorder.index_rows,
+        source_id="00000000-0000-0000-0000-000000000001",
+        parser_version="1",
+        embedding_model_reference="openai:model",
+        batch_size=3,
+        queue_size=2,
+        download_concurrency=2,
+        parse_concurrency=2,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_every_chunk_is_written_then_indexed_once_with_bounded_files_in_memory():
+    recorder = Recorder(FileContentCache(lambda file_id: f"content of {file_id}"), fail_on="file-3")
+
+    result = await _pipeline(recorder).run(_documents(40), manifest={})
+
+    expected_chunk_ids = {f"file-{i}-{j}" for i in range(40) if i != 3 for j in range(CHUNKS_PER_FILE)}
+    assert sorted(recorder.written) == sorted(recorder.indexed) == sorted(expected_chunk_ids)
+    assert result.new_chunk_ids == expected_chunk_ids
+    assert [failed_file["file_id"] for failed_file in result.failed_files] == ["file-3"]
+    assert len(result.manifest_entries) == 39
+    # downloads waiting for a parser + queued files + files being parsed
+    assert recorder.max_files_in_memory <= 2 + 2 + 2
+    assert len(recorder.content_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_indexing_failure_stops_the_pipeline():
+    recorder = Recorder(FileContentCache(lambda file_id: "content"))
+
+    async def failing_index_rows(rows):
+        raise RuntimeError("qdrant unavailable")
+
+    recorder.index_rows = failing_index_rows
+
+    with pytest.raises(RuntimeError, match="qdrant unavailable"):
+        await _pipeline(recorder).run(_documents(10), manifest={})
@@ -1,10 +1,15 @@
+import asyncio
+from functools import partial
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
+import sqlalchemy
 
+from engine.storage_service.local_service import SQLLocalService
 from ingestion_script import ingest_db_source
-from ingestion_script.utils import SYNC_ID_COLUMN_NAME, UNIFIED_TABLE_DEFINITION
+from ingestion_script.db_source_hashes import SourceRowHash, compute_source_row_sha256
+from ingestion_script.utils import CHUNK_COLUMN_NAME, SYNC_ID_COLUMN_NAME, UNIFIED_TABLE_DEFINITION
 
 
 @pytest.mark.asyncio
@@ -18,6 +23,8 @@ async def test_upload_db_source_closes_sql_service_on_success(monkeypatch: pytes
     monkeypatch.setattr(ingest_db_source, "get_db_source_ids", mock_get_ids)
     sync_chunks_to_qdrant_mock = AsyncMock()
     monkeypatch.setattr(ingest_db_source, "sync_chunks_to_qdrant", sync_chunks_to_qdrant_mock)
+    update_db_source_chunks_mock = AsyncMock()
+    monkeypatch.setattr(ingest_db_source, "update_db_source_chunks", update_db_source_chunks_mock)
 
     db_service = MagicMock()
     qdrant_service = MagicMock()
@@ -41,10 +48,10 @@ async def test_upload_db_source_closes_sql_service_on_success(monkeypatch: pytes
     instance = mock_sql_cls.return_value
     mock_get_ids.assert_called_once()
     assert mock_get_ids.call_args.kwargs["sql_local_service"] is instance
-    fetch_rows_fn = db_service.update_table.call_args.kwargs["fetch_rows_fn"]
-    assert fetch_rows_fn.keywords["sql_local_service"] is instance
+    fetch_chunks_fn = update_db_source_chunks_mock.call_args.kwargs["fetch_chunks_fn"]
+    assert fetch_chunks_fn.keywords["sql_local_service"] is instance
     instance.close.assert_awaited_once()
-    db_service.update_table.assert_called_once()
+    update_db_source_chunks_mock.assert_awaited_once()
     sync_chunks_to_qdrant_mock.assert_awaited_once()
 
 
@@ -78,40 +85,9 @@ async def test_upload_db_source_closes_sql_service_on_failure(monkeypatch: pytes
     fake_sql_local_service.close.assert_awaited_once()
 
 
-@pytest.mark.asyncio
-async def test_upload_db_source_uses_sync_id_as_id_column(monkeypatch: pytest.MonkeyPatch) -> None:
-    fake_sql_local_service = MagicMock()
-    fake_sql_local_service.close = AsyncMock()
-    monkeypatch.setattr(ingest_db_source, "SQLLocalService", MagicMock(return_value=fake_sql_local_service))
-    monkeypatch.setattr(ingest_db_source, "_validate_source_columns", lambda *args, **kwargs: {"id": "VARCHAR"})
-    monkeypatch.setattr(ingest_db_source, "get_db_source_ids", MagicMock(return_value={"row_1": None}))
-    monkeypatch.setattr(ingest_db_source, "sync_chunks_to_qdrant", AsyncMock())
-
-    db_service = MagicMock()
-    qdrant_service = MagicMock()
-    qdrant_service._build_combined_filter.return_value = None
-
-    await ingest_db_source.upload_db_source(
-        db_service=db_service,
-        qdrant_service=qdrant_service,
-        db_definition=UNIFIED_TABLE_DEFINITION,
-        storage_schema_name="storage_schema",
-        storage_table_name="storage_table",
-        qdrant_collection_name="qdrant_collection",
-        source_id=uuid4(),
-        source_db_url="postgresql://example",
-        source_table_name="source_table",
-        id_column_name="id",
-        text_column_names=["content"],
-    )
-
-    call_kwargs = db_service.update_table.call_args.kwargs
-    assert call_kwargs["id_column_name"] == SYNC_ID_COLUMN_NAME
-
-
 def test_fetch_db_source_chunks_sets_sync_id() -> None:
     fake_sql = MagicMock()
-    fake_sql.get_table_rows.return_value = [
+    fake_sql.get_rows_by_ids.return_value = [
         {"id": 42, "content": "hello world"},
         {"id": 99, "content": "foo bar"},
     ]
@@ -119,7 +95,7 @@ def test_fetch_db_source_chunks_sets_sync_id() -> None:
     with patch("ingestion_script.ingest_db_source.SentenceSplitter") as mock_splitter_cls:
         mock_splitter_cls.return_value.split_text.side_effect = lambda txt: [txt]
 
-        chunks = ingest_db_source.fetch_db_source_chunks(
+        rows_update = ingest_db_source.fetch_db_source_chunks(
             sync_ids={"42", "99"},
             sql_local_service=fake_sql,
             table_name="source_table",
@@ -127,8 +103,102 @@ def test_fetch_db_source_chunks_sets_sync_id() -> None:
             text_column_names=["content"],
         )
 
+    chunks = rows_update.chunks
     assert len(chunks) == 2
     assert chunks[0][SYNC_ID_COLUMN_NAME] == "42"
     assert chunks[1][SYNC_ID_COLUMN_NAME] == "99"
     for chunk in chunks:
         assert SYNC_ID_COLUMN_NAME in chunk
+
+
+@pytest.fixture
+def source_sql_service(tmp_path):
+    engine_url = f"sqlite:///{tmp_path / 'source.db'}"
+    engine = sqlalchemy.create_engine(engine_url)
+    with engine.begin() as connection:
+        connection.execute(
+            sqlalchemy.text("CREATE TABLE articles (id INTEGER PRIMARY KEY, body TEXT, updated_at TEXT)")
+        )
+        connection.execute(
+            sqlalchemy.text(
+                "INSERT INTO articles VALUES "
+                "(1, 'same body', '2024-02-01'), (2, 'untouched body', '2024-01-01'), (3, 'edited body', '2024-02-01')"
+            )
+        )
+    engine.dispose()
+    service = SQLLocalService(engine_url=engine_url)
+    yield service
+    asyncio.run(service.close())
+
+
+def test_get_db_source_ids_streams_ids_and_timestamps(source_sql_service) -> None:
+    ids_with_ts = ingest_db_source.get_db_source_ids(
+        sql_local_service=source_sql_service,
+        table_name="articles",
+        id_column_name="id",
+        timestamp_column_name="updated_at",
+    )
+
+    assert ids_with_ts == {"1": "2024-02-01", "2": "2024-01-01", "3": "2024-02-01"}
+
+
+@pytest.mark.asyncio
+async def test_only_rows_with_a_new_content_are_rechunked(monkeypatch, source_sql_service) -> None:
+    def known_hash(sync_id: str, text: str, timestamp: str) -> SourceRowHash:
+        return SourceRowHash(
+            sync_id=sync_id,
+            content_sha256=compute_source_row_sha256(text, {}, None, chunk_size=1024, chunk_overlap=0),
+            last_edited_ts=timestamp,
+        )
+
+    known_row_hashes = {
+        # New timestamp, same content
+        "1": known_hash("1", "same body", "2024-01-01"),
+        # Same timestamp
+        "2": known_hash("2", "untouched body", "2024-01-01"),
+        # New timestamp and new content
+        "3": known_hash("3", "original body", "2024-01-01"),
+    }
+    monkeypatch.setattr(ingest_db_source, "load_row_hashes", lambda *args, **kwargs: known_row_hashes)
+    save_row_hashes_mock = MagicMock()
+    monkeypatch.setattr(ingest_db_source, "save_row_hashes", save_row_hashes_mock)
+    db_service = MagicMock()
+    db_service.table_exists.return_value = True
+    db_service.fetch_selected_columns.return_value = [{SYNC_ID_COLUMN_NAME: sync_id} for sync_id in ("1", "2", "3")]
+    qdrant_service = MagicMock()
+    qdrant_service.collection_exists_async = AsyncMock(return_value=True)
+    qdrant_service.delete_chunks_async = AsyncMock(return_value=True)
+
+    with patch("ingestion_script.ingest_db_source.SentenceSplitter") as mock_splitter_cls:
+        mock_splitter_cls.return_value.split_text.side_effect = lambda txt: [txt]
+        await ingest_db_source.update_db_source_chunks(
+            db_service=db_service,
+            qdrant_service=qdrant_service,
+            incoming_ids_with_timestamp={"1": "2024-02-01", "2": "2024-01-01", "3": "2024-02-01"},
+            fetch_chunks_fn=partial(
+                ingest_db_source.fetch_db_source_chunks,
+                sql_local_service=source_sql_service,
+                table_name="articles",
+                id_column_name="id",
+                text_column_names=["body"],
+                source_id="source",
+                timestamp_column_name="updated_at",
+            ),
+            source_table_name="articles",
+            storage_table_name="org_chunks",
+            storage_schema_name="storage_schema",
+            table_definition=UNIFIED_TABLE_DEFINITION,
+            qdrant_collection_name="collection",
+            source_id="source",
+            has_timestamp_column=True,
+        )
+
+    upserted_chunks = [chunk for call in db_service.bulk_upsert_rows.call_args_list for chunk in call.args[1]]
+    assert [chunk[CHUNK_COLUMN_NAME] for chunk in upserted_chunks] == ["edited body"]
+    assert qdrant_service.delete_chunks_async.await_args.kwargs["point_ids"] == ["articles_3"]
+    assert db_service.delete_rows_from_table.call_args.kwargs["ids"] == ["3"]
+    saved_hashes = {row_hash.sync_id: row_hash for row_hash in save_row_hashes_mock.call_args.args[3]}
+    assert set(saved_hashes) == {"1", "3"}
+    assert saved_hashes["1"].content_sha256 == known_row_hashes["1"].content_sha256
+    assert saved_hashes["1"].last_edited_ts == "2024-02-01"
+    assert saved_hashes["3"].content_sha256 != known_row_hashes["3"].content_sha256
@@ -0,0 +1,239 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pandas as pd
+import pytest
+
+from ada_backend.database import models as db
+from data_ingestion.document.folder_management.folder_management import FileDocument, FileDocumentType
+from data_ingestion.utils import DocumentReadingMode
+from ingestion_script import ingest_folder_source
+from ingestion_script.folder_manifest import (
+    FileContentCache,
+    FileManifestEntry,
+    build_parser_version,
+    compute_content_sha256,
+    is_file_unchanged,
+    load_manifest,
+    save_manifest,
+)
+from settings import settings
+from tests.mocks.db_service import TEST_SCHEMA_NAME
+
+EMBEDDING_MODEL_REFERENCE = "openai:text-embedding-3-large"
+PARSER_VERSION = build_parser_version(1024, 0, DocumentReadingMode.STANDARD)
+
+
+class FakeFolderManager:
+    def __init__(self, files: dict[str, tuple[str, bytes]]):
+        # file_id -> (last_edited_ts, content)
+        self._files = files
+        self.downloaded: list[str] = []
+
+    def list_all_files_info(self) -> list[FileDocument]:
+        return [
+            FileDocument(
+                id=file_id,
+                type=FileDocumentType.MARKDOWN,
+                last_edited_ts=last_edited_ts,
+                file_name=file_id,
+                folder_name="folder",
+            )
+            for file_id, (last_edited_ts, _) in self._files.items()
+        ]
+
+    def get_file_content(self, file_id: str) -> bytes:
+        self.downloaded.append(file_id)
+        return self._files[file_id][1]
+
+    def get_file_presigned_url(self, file_id: str) -> None:
+        return None
+
+
+def _manifest_entry(file_id: str, last_edited_ts: str, content: bytes, chunk_ids: list[str], **kwargs):
+    return FileManifestEntry(
+        file_id=file_id,
+        file_name=file_id,
+        last_edited_ts=last_edited_ts,
+        content_sha256=compute_content_sha256(content),
+        chunk_ids=chunk_ids,
+        parser_version=kwargs.get("parser_version", PARSER_VERSION),
+        embedding_model_reference=EMBEDDING_MODEL_REFERENCE,
+    )
+
+
+def _chunks_df(document: FileDocument, *args, **kwargs) -> pd.DataFrame:
+    return pd.DataFrame([
+        {
+            "chunk_id": f"{document.id}-new",
+            "file_id": document.id,
+            "content": f"content of {document.id}",
+            "document_title": document.file_name,
+            "url": "",
+            "last_edited_ts": document.last_edited_ts,
+            "metadata": "{}",
+            "order": 0,
+        }
+    ])
+
+
+@pytest.fixture
+def ingestion(monkeypatch):
+    db_service = MagicMock()
+    db_service.close = AsyncMock()
+    db_service.table_exists.return_value = True
+    monkeypatch.setattr(settings, "USE_LLM_FOR_PDF_PARSING", False)
+    monkeypatch.setattr(settings, "INGESTION_PARSER_PROCESSES", 0)
+    monkeypatch.setattr(settings, "INGESTION_DB_URL", "postgresql://ingestion")
+    monkeypatch.setattr(ingest_folder_source, "create_db_if_not_exists", lambda url: None)
+    monkeypatch.setattr(ingest_folder_source, "SQLLocalService", lambda engine_url: db_service)
+    monkeypatch.setattr(
+        ingest_folder_source,
+        "load_embedding_service",
+        lambda: SimpleNamespace(_provider="openai", _model_name="text-embedding-3-large"),
+    )
+    qdrant_service = MagicMock()
+    for method in ("collection_exists_async", "create_index_if_needed_async", "delete_chunks_async"):
+        setattr(qdrant_service, method, AsyncMock(return_value=True))
+    qdrant_service.add_chunks_async = AsyncMock(return_value=True)
+    monkeypatch.setattr(
+        ingest_folder_source, "QdrantService", SimpleNamespace(from_defaults=lambda **kwargs: qdrant_service)
+    )
+    monkeypatch.setattr(ingest_folder_source, "document_chunking_mapping", lambda **kwargs: {})
+    get_chunks = AsyncMock(side_effect=_chunks_df)
+    monkeypatch.setattr(ingest_folder_source, "get_chunks_dataframe_from_doc", get_chunks)
+    monkeypatch.setattr(ingest_folder_source, "create_source", MagicMock())
+    update_task = MagicMock()
+    monkeypatch.setattr(ingest_folder_source, "update_ingestion_task", update_task)
+    save_manifest = MagicMock()
+    monkeypatch.setattr(ingest_folder_source, "save_manifest", save_manifest)
+
+    async def run(folder_manager, manifest, existing_chunks):
+        monkeypatch.setattr(ingest_folder_source, "load_manifest", lambda *args, **kwargs: manifest)
+        db_service.fetch_selected_columns.return_value = [
+            {"chunk_id": chunk_id, "file_id": file_id} for chunk_id, file_id in existing_chunks
+        ]
+        await ingest_folder_source._ingest_folder_source(
+            folder_manager=folder_manager,
+            organization_id=str(uuid4()),
+            source_name="source",
+            source_type=db.SourceType.LOCAL,
+            task_id=uuid4(),
+            source_id=uuid4(),
+        )
+        deleted_chunk_ids = {
+            chunk_id
+            for call in db_service.delete_rows_from_table.call_args_list
+            if call.kwargs["id_column_name"] == "chunk_id"
+            for chunk_id in call.kwargs["ids"]
+        }
+        return SimpleNamespace(
+            parsed_file_ids=sorted(call.args[0].id for call in get_chunks.call_args_list),
+            written_chunk_ids={
+                row["chunk_id"] for call in db_service.upsert_rows.call_args_list for row in call.kwargs["rows"]
+            },
+            indexed_chunk_ids={
+                row["chunk_id"] for call in qdrant_service.add_chunks_async.call_args_list for row in call.args[0]
+            },
+            deleted_chunk_ids=deleted_chunk_ids,
+            manifest_call=save_manifest.call_args,
+            final_status=update_task.call_args.kwargs["ingestion_task"].status,
+        )
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_only_new_and_modified_files_are_reprocessed(ingestion):
+    folder_manager = FakeFolderManager({
+        "unchanged.md": ("2024-01-01", b"same"),
+        "modified.md": ("2024-02-01", b"new content"),
+        "new.md": ("2024-01-01", b"brand new"),
+    })
+    manifest = {
+        "unchanged.md": _manifest_entry("unchanged.md", "2024-01-01", b"same", ["unchanged-1"]),
+        "modified.md": _manifest_entry("modified.md", "2024-01-01", b"old content", ["modified-1"]),
+        "removed.md": _manifest_entry("removed.md", "2024-01-01", b"gone", ["removed-1"]),
+    }
+    existing_chunks = [("unchanged-1", "unchanged.md"), ("modified-1", "modified.md"), ("removed-1", "removed.md")]
+
+    result = await ingestion(folder_manager, manifest, existing_chunks)
+
+    assert result.parsed_file_ids == ["modified.md", "new.md"]
+    assert "unchanged.md" not in folder_manager.downloaded
+    assert result.deleted_chunk_ids == {"modified-1", "removed-1"}
+    saved_entries, removed_file_ids = result.manifest_call.args[3], result.manifest_call.args[4]
+    assert {entry.file_id: entry.chunk_ids for entry in saved_entries} == {
+        "modified.md": ["modified.md-new"],
+        "new.md": ["new.md-new"],
+    }
+    assert removed_file_ids == ["removed.md"]
+    assert result.written_chunk_ids == result.indexed_chunk_ids == {"modified.md-new", "new.md-new"}
+    assert result.final_status == db.TaskStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_touched_file_with_same_content_is_not_reparsed(ingestion):
+    folder_manager = FakeFolderManager({"touched.md": ("2024-03-01", b"same")})
+    manifest = {"touched.md": _manifest_entry("touched.md", "2024-01-01", b"same", ["touched-1"])}
+
+    result = await ingestion(folder_manager, manifest, [("touched-1", "touched.md")])
+
+    assert result.parsed_file_ids == []
+    assert result.deleted_chunk_ids == set()
+    assert result.written_chunk_ids == result.indexed_chunk_ids == set()
+    [saved_entry] = result.manifest_call.args[3]
+    assert saved_entry.last_edited_ts == "2024-03-01"
+    assert saved_entry.chunk_ids == ["touched-1"]
+
+
+@pytest.mark.asyncio
+async def test_parser_version_change_rebuilds_every_file(ingestion):
+    folder_manager = FakeFolderManager({"a.md": ("2024-01-01", b"a"), "b.md": ("2024-01-01", b"b")})
+    manifest = {
+        file_id: _manifest_entry(file_id, "2024-01-01", content, [f"{file_id}-old"], parser_version="0:standard")
+        for file_id, content in [("a.md", b"a"), ("b.md", b"b")]
+    }
+
+    result = await ingestion(folder_manager, manifest, [("a.md-old", "a.md"), ("b.md-old", "b.md")])
+
+    assert result.parsed_file_ids == ["a.md", "b.md"]
+    assert result.deleted_chunk_ids == {"a.md-old", "b.md-old"}
+
+
+def test_is_file_unchanged_compares_known_markers():
+    entry = _manifest_entry("a.md", "2024-01-01", b"a", [])
+    document = FileDocument(
+        id="a.md", type=FileDocumentType.MARKDOWN, last_edited_ts="2024-01-01", file_name="a.md", folder_name=""
+    )
+
+    assert is_file_unchanged(entry, document)
+    assert is_file_unchanged(entry.model_copy(update={"etag": "x"}), document)
+    assert not is_file_unchanged(entry.model_copy(update={"etag": "x"}), document.model_copy(update={"etag": "y"}))
+    assert not is_file_unchanged(entry, document.model_copy(update={"last_edited_ts": "2024-01-02"}))
+
+
+def test_manifest_stores_file_sizes_above_2_gib(postgres_service):
+    source_id = uuid4()
+    entry = _manifest_entry("big.bin", "2024-01-01", b"big", ["big.bin-0"]).model_copy(
+        update={"file_size": 5 * 1024**3}
+    )
+
+    save_manifest(postgres_service, "big_file_manifest", source_id, [entry], [], schema_name=TEST_SCHEMA_NAME)
+
+    assert load_manifest(postgres_service, "big_file_manifest", source_id, schema_name=TEST_SCHEMA_NAME) == {
+        "big.bin": entry
+    }
+
+
+def test_file_content_cache_serves_downloaded_files_until_released():
+    folder_manager = FakeFolderManager({"a.md": ("2024-01-01", b"a")})
+    cache = FileContentCache(folder_manager.get_file_content)
+
+    cache.download("a.md")
+    assert cache.get_file_content("a.md") == b"a"
+    assert folder_manager.downloaded == ["a.md"]
+    cache.release("a.md")
+    assert cache.get_file_content("a.md") == b"a"
+    assert folder_manager.downloaded == ["a.md", "a.md"]
@@ -1,42 +1,43 @@
-from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID
 
-import pandas as pd
 import pytest
 
 from data_ingestion.utils import DocumentReadingMode
-from ingestion_script.ingest_website_source import ScrapedPage, scrape_website, upload_website_source
-from ingestion_script.utils import UNIFIED_TABLE_DEFINITION
+from ingestion_script import ingest_website_source
+from ingestion_script.ingest_website_source import (
+    ScrapedPage,
+    iter_crawled_pages,
+    scrape_website,
+    upload_website_source,
+)
+from ingestion_script.utils import CHUNK_COLUMN_NAME, URL_COLUMN_NAME
+from scripts.benchmarks.fake_firecrawl_server import FakeFirecrawlServer
+from scripts.benchmarks.website_ingestion_benchmark import InMemoryDBService
 from settings import settings
 
+TABLE_NAME = "org_test_chunks"
 
-@pytest.mark.asyncio
-async def test_scrape_website_builds_expected_firecrawl_options(monkeypatch):
-    monkeypatch.setattr(settings, "FIRECRAWL_API_KEY", "test-key", raising=False)
-
-    captured_call = {}
 
-    class FakePage:
-        def __init__(self):
-            self.metadata = SimpleNamespace(url="https://example.com/page", title="Example page")
-            self.markdown = "# Heading\nSome content"
-
-    class FakeResult:
-        def __init__(self, data):
-            self.data = data
+def _site(number_of_pages: int) -> dict[str, str]:
+    return {
+        f"https://example.com/page-{index}": f"# Page {index}\n\nContent of page {index}."
+        for index in range(number_of_pages)
+    }
 
-    class FakeFirecrawl:
-        def __init__(self, api_key):
-            self.api_key = api_key
 
-        async def crawl(self, url, **kwargs):
-            captured_call["url"] = url
-            captured_call["kwargs"] = kwargs
-            return FakeResult([FakePage()])
+@pytest.fixture
+def firecrawl_server(monkeypatch):
+    server = FakeFirecrawlServer(pages=_site(3), documents_per_response=4)
+    server.start()
+    monkeypatch.setattr(settings, "FIRECRAWL_API_KEY", "test-key", raising=False)
+    monkeypatch.setattr(settings, "FIRECRAWL_API_URL", server.url, raising=False)
+    yield server
+    server.stop()
 
-    monkeypatch.setattr("ingestion_script.ingest_website_source.AsyncFirecrawl", FakeFirecrawl)
 
+@pytest.mark.asyncio
+async def test_scrape_website_sends_crawl_options(firecrawl_server):
     pages = await scrape_website(
         url="https://example.com",
         follow_links=True,
@@ -48,127 +49,99 @@ async def test_scrape_website_builds_expected_firecrawl_options(monkeypatch):
         exclude_tags=["img"],
     )
 
-    assert len(pages) == 1
-    page = pages[0]
-    assert isinstance(page, ScrapedPage)
-    assert page.url == "https://example.com/page"
-    assert page.title == "Example page"
-    assert page.content == "# Heading\nSome content"
-    assert captured_call["url"] == "https://example.com"
-    options = captured_call["kwargs"]
-    assert options["limit"] == 5
-    assert options["includePaths"] == ["/docs"]
-    assert options["excludePaths"] == ["/admin"]
-    assert options["crawlEntireDomain"] is True
-    assert options["maxDepth"] == 2
-    assert options["scrapeOptions"] == {
-        "formats": ["markdown"],
-        "onlyMainContent": True,
-        "includeTags": ["p"],
-        "excludeTags": ["img"],
-    }
+    assert pages == [
+        ScrapedPage(url=page_url, title=page_url, content=content) for page_url, content in _site(3).items()
+    ]
+    (crawl,) = firecrawl_server.crawls.values()
+    assert crawl.request["url"] == "https://example.com"
+    assert crawl.request["limit"] == 5
+    assert crawl.request["includePaths"] == ["/docs"]
+    assert crawl.request["excludePaths"] == ["/admin"]
+    assert crawl.request["crawlEntireDomain"] is True
+    assert crawl.request["maxDiscoveryDepth"] == 2
+    scrape_options = crawl.request["scrapeOptions"]
+    assert scrape_options["formats"] == ["markdown"]
+    assert scrape_options["onlyMainContent"] is True
+    assert scrape_options["includeTags"] == ["p"]
+    assert scrape_options["excludeTags"] == ["img"]
 
 
 @pytest.mark.asyncio
-async def test_upload_website_source_syncs_scraped_pages(monkeypatch):
-    scraped_pages = [
-        ScrapedPage(
-            url="https://example.com/page",
-            title="Example page",
-            content="# Heading\nSome content",
-        )
-    ]
-    scrape_mock = AsyncMock(return_value=scraped_pages)
-    monkeypatch.setattr("ingestion_script.ingest_website_source.scrape_website", scrape_mock)
-
-    chunk_df = pd.DataFrame({
-        "chunk_id": ["chunk-1"],
-        "file_id": ["file-1"],
-        "content": ["chunk content"],
-        "url": ["https://example.com/page"],
-        "document_title": ["Example page"],
-        "last_edited_ts": ["2025-01-01T00:00:00Z"],
-        "metadata": ["{}"],
-        "order": [0],
-    })
-    chunks_mock = AsyncMock(return_value=chunk_df)
-    monkeypatch.setattr(
-        "ingestion_script.ingest_website_source.get_chunks_dataframe_from_doc",
-        chunks_mock,
-    )
+async def test_pages_are_yielded_while_the_crawl_is_running(firecrawl_server):
+    firecrawl_server.pages = _site(30)
+    firecrawl_server.pages_per_second = 100
 
-    mapping_sentinel = object()
-    mapping_mock = MagicMock(return_value=mapping_sentinel)
-    monkeypatch.setattr(
-        "ingestion_script.ingest_website_source.document_chunking_mapping",
-        mapping_mock,
-    )
+    page_urls = []
+    completed_at_first_page = None
+    async for page in iter_crawled_pages("https://example.com", poll_interval_seconds=0.01):
+        if completed_at_first_page is None:
+            (crawl_id,) = firecrawl_server.crawls
+            completed_at_first_page = firecrawl_server.is_completed(crawl_id)
+        page_urls.append(page.url)
+
+    assert page_urls == list(_site(30))
+    assert completed_at_first_page is False
+    (crawl,) = firecrawl_server.crawls.values()
+    # Each status response holds at most 4 pages
+    assert crawl.status_requests >= 30 / 4
 
-    sync_mock = AsyncMock()
-    monkeypatch.setattr(
-        "ingestion_script.ingest_website_source.sync_chunks_to_qdrant",
-        sync_mock,
-    )
 
-    db_service = MagicMock()
+@pytest.mark.asyncio
+async def test_recrawl_only_embeds_changed_pages(monkeypatch, firecrawl_server):
+    mapping_mock = MagicMock(wraps=ingest_website_source.document_chunking_mapping)
+    monkeypatch.setattr(ingest_website_source, "document_chunking_mapping", mapping_mock)
+    db_service = InMemoryDBService()
     qdrant_service = MagicMock()
-    test_source_id = UUID("12345678-1234-5678-1234-567812345678")
-
-    await upload_website_source(
-        db_service=db_service,
-        qdrant_service=qdrant_service,
-        storage_schema_name="web_schema",
-        storage_table_name="web_table",
-        qdrant_collection_name="web_collection",
-        source_id=test_source_id,
-        url="https://example.com",
-        follow_links=True,
-        max_depth=3,
-        limit=42,
-        include_paths=["/docs"],
-        exclude_paths=["/admin"],
-        include_tags=["p"],
-        exclude_tags=["img"],
-        chunk_size=256,
-        chunk_overlap=16,
-        update_existing=False,
-    )
+    qdrant_service.collection_exists_async = AsyncMock(return_value=True)
+    qdrant_service.create_index_if_needed_async = AsyncMock()
+    qdrant_service.add_chunks_async = AsyncMock(return_value=True)
+    qdrant_service.delete_chunks_async = AsyncMock(return_value=True)
+    source_id = UUID("12345678-1234-5678-1234-567812345678")
+
+    async def crawl() -> None:
+        await upload_website_source(
+            db_service=db_service,
+            qdrant_service=qdrant_service,
+            storage_schema_name="web_schema",
+            storage_table_name=TABLE_NAME,
+            qdrant_collection_name="web_collection",
+            source_id=source_id,
+            url="https://example.com",
+            chunk_size=256,
+            chunk_overlap=16,
+            crawl_poll_interval_seconds=0.01,
+        )
 
-    scrape_mock.assert_awaited_once_with(
-        url="https://example.com",
-        follow_links=True,
-        max_depth=3,
-        limit=42,
-        include_paths=["/docs"],
-        exclude_paths=["/admin"],
-        include_tags=["p"],
-        exclude_tags=["img"],
-    )
-    mapping_mock.assert_called_once()
+    await crawl()
     _, mapping_kwargs = mapping_mock.call_args
     assert mapping_kwargs["chunk_size"] == 256
     assert mapping_kwargs["overlapping_size"] == 16
     assert mapping_kwargs["document_reading_mode"] == DocumentReadingMode.STANDARD
+    first_rows = list(db_service.tables[TABLE_NAME].values())
+    assert {row[URL_COLUMN_NAME] for row in first_rows} == set(_site(3))
+    assert sum(len(call.args[0]) for call in qdrant_service.add_chunks_async.await_args_list) == len(first_rows)
+
+    qdrant_service.add_chunks_async.reset_mock()
+    firecrawl_server.pages["https://example.com/page-1"] = "# Page 1\n\nEdited content of page 1."
+    del firecrawl_server.pages["https://example.com/page-2"]
+    await crawl()
+
+    embedded_chunks = [chunk for call in qdrant_service.add_chunks_async.await_args_list for chunk in call.args[0]]
+    assert len(embedded_chunks) == 1
+    assert "Edited content of page 1." in embedded_chunks[0][CHUNK_COLUMN_NAME]
+    rows = list(db_service.tables[TABLE_NAME].values())
+    assert sorted(row[URL_COLUMN_NAME] for row in rows) == ["https://example.com/page-0", "https://example.com/page-1"]
+    assert any("Edited content of page 1." in row[CHUNK_COLUMN_NAME] for row in rows)
+    stale_chunk_ids = {
+        chunk_id
+        for call in qdrant_service.delete_chunks_async.await_args_list
+        for chunk_id in call.kwargs["point_ids"]
+    }
+    assert stale_chunk_ids == {
+        row["chunk_id"] for row in first_rows if row[URL_COLUMN_NAME] != "https://example.com/page-0"
+    }
 
-    document_arg = chunks_mock.await_args.args[0]
-    assert document_arg.metadata["source_url"] == "https://example.com/page"
-    assert document_arg.metadata["title"] == "Example page"
-
-    assert chunks_mock.await_args.kwargs["document_chunk_mapping"] is mapping_sentinel
-    db_service.create_schema.assert_called_once_with("web_schema")
-    db_service.update_table.assert_called_once()
-    update_kwargs = db_service.update_table.call_args.kwargs
-    assert update_kwargs["table_name"] == "web_table"
-    assert update_kwargs["schema_name"] == "web_schema"
-    assert update_kwargs["table_definition"] is UNIFIED_TABLE_DEFINITION
-    assert update_kwargs["append_mode"] is True
-
-    sync_mock.assert_awaited_once_with(
-        "web_schema",
-        "web_table",
-        "web_collection",
-        db_service,
-        qdrant_service,
-        source_id=str(test_source_id),
-        batch_size=50,
-    )
+    firecrawl_server.pages.clear()
+    with pytest.raises(ValueError, match="Failed to crawl"):
+        await crawl()
+    assert list(db_service.tables[TABLE_NAME].values()) == rows
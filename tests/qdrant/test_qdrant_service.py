@@ -9,11 +9,14 @@ from engine.llm_services.llm_service import EmbeddingService
 from engine.qdrant_service import (
     BM25_MODEL,
     FieldSchema,
+    HybridFusion,
     QdrantCollectionSchema,
     QdrantService,
     SearchMode,
+    fuse_ranked_results,
     get_qdrant_field_schema_payload,
     map_metadata_field_to_qdrant_field_schema,
+    parse_server_version,
     should_create_payload_index,
 )
 from tests.mocks.trace_manager import MockTraceManager
@@ -1163,3 +1166,128 @@ class TestQueryPointsAsync:
         call_payload = mock_send.call_args.kwargs["payload"]
         assert call_payload["query"] == {"text": "test query", "model": BM25_MODEL}
         assert call_payload["using"] == "sparse"
+
+
+class TestHybridFusion:
+    @pytest.mark.asyncio
+    async def test_dbsf_fusion_sent_to_server(self):
+        service, mock_send = _make_qdrant_service_with_mock_http()
+        mock_send.side_effect = [{"version": "1.12.4"}, {"result": {"points": []}}]
+
+        await service._search_hybrid_async(
+            query_text="test query",
+            query_vector=[0.1, 0.2],
+            collection_name="col",
+            limit=5,
+            fusion=HybridFusion.DBSF,
+        )
+        call_payload = mock_send.call_args.kwargs["payload"]
+        assert call_payload["query"] == {"fusion": "dbsf"}
+        assert call_payload["with_payload"] is True
+
+    @pytest.mark.asyncio
+    async def test_old_server_falls_back_to_client_side_fusion(self):
+        service, mock_send = _make_qdrant_service_with_mock_http()
+        mock_send.return_value = {"version": "1.10.1"}
+        service._search_sparse_async = AsyncMock(return_value=[("a", 5.0, {"content": "a"}), ("b", 3.0, {})])
+        service._search_dense_named_async = AsyncMock(return_value=[("b", 0.9, {"content": "b"}), ("c", 0.5, {})])
+
+        results = await service._search_hybrid_async(
+            query_text="test query",
+            query_vector=[0.1, 0.2],
+            collection_name="col",
+            limit=2,
+            fusion=HybridFusion.DBSF,
+        )
+        service._search_sparse_async.assert_awaited_once()
+        service._search_dense_named_async.assert_awaited_once()
+        assert [point_id for point_id, _, _ in results] == ["b", "a"]
+
+    @pytest.mark.asyncio
+    async def test_server_version_is_fetched_once(self):
+        service, mock_send = _make_qdrant_service_with_mock_http()
+        mock_send.return_value = {"version": "1.9.0"}
+
+        assert await service.get_server_version_async() == (1, 9, 0)
+        assert await service.get_server_version_async() == (1, 9, 0)
+        assert mock_send.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retrieve_uses_search_payloads_without_refetch(self):
+        service, mock_send = _make_qdrant_service_with_mock_http()
+        service._build_vectors_async = AsyncMock(return_value=[[0.1, 0.2]])
+        service._search_hybrid_async = AsyncMock(
+            return_value=[
+                ("id2", 0.9, {"chunk_id": "2", "content": "c2", "file_id": "f2", "url": "u2"}),
+                ("id1", 0.8, {"chunk_id": "1", "content": "c1", "file_id": "f1", "url": "u1"}),
+            ]
+        )
+        service.get_chunk_data_by_id_async = AsyncMock()
+
+        result = await service.retrieve_similar_chunks_async(
+            query_text="test", collection_name="col", search_mode=SearchMode.HYBRID
+        )
+        service.get_chunk_data_by_id_async.assert_not_called()
+        assert [chunk.name for chunk in result] == ["2", "1"]
+
+
+def test_parse_server_version():
+    assert parse_server_version("1.12.4") == (1, 12, 4)
+    assert parse_server_version("v1.10") == (1, 10, 0)
+    assert parse_server_version(None) is None
+    assert parse_server_version("dev") is None
+
+
+def test_fuse_ranked_results_rrf_rewards_points_found_by_both_searches():
+    sparse = [("a", 12.0, {}), ("b", 8.0, {})]
+    dense = [("c", 0.95, {}), ("b", 0.9, {})]
+
+    fused = fuse_ranked_results([sparse, dense], HybridFusion.RRF, limit=3)
+
+    assert [point_id for point_id, _, _ in fused] == ["b", "a", "c"]
+
+
+class TestRetrieveSimilarChunksBatch:
+    @pytest.mark.asyncio
+    async def test_queries_use_one_embedding_call_and_one_batch_request(self):
+        service, mock_send = _make_qdrant_service_with_mock_http()
+        service._build_vectors_async = AsyncMock(return_value=[[0.1, 0.2], [0.3, 0.4]])
+        mock_send.return_value = {
+            "result": [
+                {"points": [{"id": "id1", "score": 0.9, "payload": {"chunk_id": "1", "content": "c1"}}]},
+                {"points": [{"id": "id2", "score": 0.8, "payload": {"chunk_id": "2", "content": "c2"}}]},
+            ]
+        }
+
+        results = await service.retrieve_similar_chunks_batch_async(
+            query_texts=["first", "second"], collection_name="col", limit=3
+        )
+
+        service._build_vectors_async.assert_awaited_once_with(["first", "second"])
+        mock_send.assert_awaited_once()
+        assert mock_send.call_args.kwargs["endpoint"] == "collections/col/points/query/batch"
+        searches = mock_send.call_args.kwargs["payload"]["searches"]
+        assert [search["query"] for search in searches] == [[0.1, 0.2], [0.3, 0.4]]
+        assert [[chunk.name for chunk in chunks] for chunks in results] == [["1"], ["2"]]
+
+    @pytest.mark.asyncio
+    async def test_hybrid_on_old_server_fuses_batched_searches_client_side(self):
+        service, mock_send = _make_qdrant_service_with_mock_http()
+        service._build_vectors_async = AsyncMock(return_value=[[0.1, 0.2]])
+        mock_send.side_effect = [
+            {"version": "1.9.0"},
+            {
+                "result": [
+                    {"points": [{"id": "a", "score": 5.0, "payload": {"chunk_id": "a", "content": "a"}}]},
+                    {"points": [{"id": "b", "score": 0.9, "payload": {"chunk_id": "b", "content": "b"}}]},
+                ]
+            },
+        ]
+
+        results = await service.retrieve_similar_chunks_batch_async(
+            query_texts=["query"], collection_name="col", limit=2, search_mode=SearchMode.HYBRID
+        )
+
+        searches = mock_send.call_args.kwargs["payload"]["searches"]
+        assert [search["using"] for search in searches] == ["sparse", "dense"]
+        assert sorted(chunk.name for chunk in results[0]) == ["a", "b"]
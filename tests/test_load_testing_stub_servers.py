@@ -0,0 +1,74 @@
+import asyncio
+import random
+
+import pytest
+from pydantic import BaseModel
+
+from engine.llm_services.providers.openai_provider import OpenAIProvider
+from engine.qdrant_service import QdrantCollectionSchema, QdrantService
+from scripts.load_testing.stub_servers import (
+    STUB_API_KEY,
+    LatencyDistribution,
+    StubDependencyServer,
+    example_from_schema,
+)
+
+
+class Invoice(BaseModel):
+    number: str
+    total: float
+    lines: list[str]
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    with StubDependencyServer(embedding_dimensions=8, qdrant_points=3) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.openai_base_url)
+        yield server
+
+
+def test_latency_distributions_are_parsed_and_never_negative():
+    rng = random.Random(0)
+
+    assert LatencyDistribution.parse("250").sample(rng) == 0.25
+    assert LatencyDistribution.parse("constant:250") == LatencyDistribution.parse("250")
+    assert 0.1 <= LatencyDistribution.parse("uniform:100:200").sample(rng) <= 0.2
+    assert all(LatencyDistribution.parse("normal:10:100").sample(rng) >= 0 for _ in range(100))
+    assert LatencyDistribution.parse("lognormal:800:0.5").sample(rng) > 0
+    for spec in ("gaussian:10:2", "uniform:100", "normal:ten:2"):
+        with pytest.raises(ValueError):
+            LatencyDistribution.parse(spec)
+
+
+def test_examples_follow_the_schema():
+    example = example_from_schema(Invoice.model_json_schema())
+
+    assert Invoice.model_validate(example)
+
+
+def test_openai_provider_runs_against_the_stub(stub_server):
+    provider = OpenAIProvider(api_key=STUB_API_KEY, base_url=None, model_name="gpt-4.1-mini")
+
+    text, input_tokens, output_tokens, _total_tokens = asyncio.run(provider.complete("Hello", 0.0, False))
+    assert len(text.split()) == stub_server.completion_words
+    assert input_tokens > 0 and output_tokens > 0
+
+    invoice, *_tokens = asyncio.run(provider.constrained_complete_with_pydantic("Hello", Invoice, 0.0, False))
+    assert isinstance(invoice, Invoice)
+
+    embeddings, *_tokens = asyncio.run(provider.embed(["first", "second"]))
+    assert [len(embedding) for embedding in embeddings] == [8, 8]
+    assert stub_server.request_counts["responses"] == 2 and stub_server.request_counts["embeddings"] == 1
+
+
+def test_qdrant_service_searches_the_stub(stub_server):
+    qdrant_service = QdrantService(
+        qdrant_api_key=STUB_API_KEY,
+        qdrant_cluster_url=stub_server.qdrant_url,
+        default_schema=QdrantCollectionSchema(
+            chunk_id_field="chunk_id", content_field="content", file_id_field="file_id"
+        ),
+    )
+
+    assert qdrant_service.collection_exists("documents")
+    assert len(qdrant_service.search_vectors([0.1] * 8, "documents", limit=3)) == 3
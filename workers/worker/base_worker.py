@@ -12,7 +12,9 @@ from typing import Any, Dict, NamedTuple
 import redis
 import sentry_sdk
 from dotenv import load_dotenv
+from prometheus_client import start_http_server
 
+from engine.prometheus_metric import queue_depth, worker_in_flight
 from settings import settings
 from shared.log_redaction import scrub_sentry_event
 
@@ -114,12 +116,23 @@ class BaseWorker:
         with self.lock:
             if self.current_threads < self.max_concurrent:
                 self.current_threads += 1
+                worker_in_flight.labels(worker=self.worker_type).set(self.current_threads)
                 return True
             return False
 
     def _decrement_thread_count(self) -> None:
         with self.lock:
             self.current_threads -= 1
+            worker_in_flight.labels(worker=self.worker_type).set(self.current_threads)
+
+    def _sample_queue_depth(self) -> None:
+        """Record the messages of the stream not yet delivered to the consumer group."""
+        try:
+            for group in redis_client.xinfo_groups(self.stream_name):
+                if group.get("name") == CONSUMER_GROUP and group.get("lag") is not None:
+                    queue_depth.labels(queue=self.stream_name).set(group["lag"])
+        except Exception as e:
+            logger.debug(f"queue_depth_sample_failed stream={self.stream_name} error={str(e)}")
 
     def process_task(self, payload: Dict[str, Any]) -> ProcessTaskOutcome:
         """Process a single task. Must be implemented by subclasses."""
@@ -347,12 +360,15 @@ class BaseWorker:
         """Main worker loop — crash-safe via Redis Streams consumer groups."""
         consumer_name = self._consumer_name()
         logger.info(f"worker_starting stream={self.stream_name} consumer={consumer_name} group={CONSUMER_GROUP}")
+        if settings.WORKER_METRICS_PORT:
+            start_http_server(port=settings.WORKER_METRICS_PORT, addr="0.0.0.0")
 
         self._reclaim_pending(consumer_name)
         last_reclaim_at = time.monotonic()
 
         while True:
             try:
+                self._sample_queue_depth()
                 self._dispatch_due_retries(consumer_name)
 
                 now = time.monotonic()
@@ -2,7 +2,6 @@ import json
 import logging
 import os
 import re
-import resource
 import subprocess
 from pathlib import Path
 from typing import Any, Dict
@@ -11,6 +10,7 @@ import requests
 
 from ada_backend.database import models as db
 from ada_backend.schemas.ingestion_task_schema import IngestionTaskUpdate, ResultType, TaskResultMetadata
+from shared.resource_limits import set_memory_limit
 from workers.worker.base_worker import BaseWorker, ProcessTaskOutcome, logger, redis_client
 
 _LEVEL_RE = re.compile(r"\b(DEBUG|INFO|WARNING|ERROR|CRITICAL)\b")
@@ -38,9 +38,7 @@ INGESTION_BATCH_SIZE = int(os.getenv("INGESTION_BATCH_SIZE", "50"))
 
 def _set_memory_limit() -> None:
     """preexec_fn callback: cap virtual address space for the child process."""
-    if SUBPROCESS_MEMORY_LIMIT_MB > 0:
-        limit_bytes = SUBPROCESS_MEMORY_LIMIT_MB * 1024 * 1024
-        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+    set_memory_limit(SUBPROCESS_MEMORY_LIMIT_MB)
 
 
 # Default API base URL - use HTTP for localhost